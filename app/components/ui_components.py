@@ -128,10 +128,10 @@ def render_prediction_cards(result: PredictionResult):
     # 2. Score Matrix (Poisson)
     with st.expander("🎲 Matriz de Resultados Probables (Poisson)"):
         # Sort matrix and show top 5
-        if not result.poisson_matrix:
+        sorted_matrix = result.top_scores(5)
+        if not sorted_matrix:
             st.warning("⚠️ Los datos detallados de la Matriz Poisson no están disponibles para este estudio (posiblemente un estudio antiguo o error de cálculo).")
         else:
-            sorted_matrix = sorted(result.poisson_matrix.items(), key=lambda x: x[1], reverse=True)[:5]
             cols = st.columns(max(1, len(sorted_matrix)))
             for i, (score, prob) in enumerate(sorted_matrix):
                 cols[i].markdown(f"""
@@ -601,15 +601,20 @@ def render_semaforo_history(db_manager):
         ("Tarjetas", "🟨 Tarjetas", "#ff6b6b"),
         ("Remates",  "⚽ Remates",  "#51cf66"),
     ]
-    precision_from_history = {}
-    for key, _, _ in MERCADOS:
-        hits = sum(1 for p in history if p["mercados"].get(key, {}).get("acierto", False))
-        tot  = sum(1 for p in history if key in p["mercados"])
-        precision_from_history[key] = {
-            "hits": hits,
-            "total": tot,
-            "precision": round(hits / tot * 100) if tot > 0 else 0
-        }
+    # Precisión acumulada agregada en la BD (SQL); si falla, desde el historial
+    try:
+        precision_from_history = db_manager.get_market_hit_rates()
+    except Exception:
+        precision_from_history = {}
+    if not precision_from_history:
+        for key, _, _ in MERCADOS:
+            hits = sum(1 for p in history if p["mercados"].get(key, {}).get("acierto", False))
+            tot  = sum(1 for p in history if key in p["mercados"])
+            precision_from_history[key] = {
+                "hits": hits,
+                "total": tot,
+                "precision": round(hits / tot * 100) if tot > 0 else 0
+            }
     total = len(history)
 
     # KPIs globales
@@ -852,3 +857,37 @@ def render_lineup_check_ui(team_name: str, players: list[Player], side: str = "h
                 confirmed_players.append(player.name)
     
     return confirmed_players
+
+
+def render_diagnostics_panel(metrics=None, services=None):
+    """
+    Panel de diagnóstico: percentiles de latencia por etapa del predictor y por
+    fuente externa (src/services/metrics.py) y tiempos de arranque de servicios.
+    """
+    if metrics is None:
+        from src.services.metrics import METRICS as metrics
+
+    rows = metrics.rows()
+    if not rows:
+        st.caption("Sin mediciones todavía: lanza una predicción para ver latencias.")
+    else:
+        df = pd.DataFrame(rows)
+        for col in ("mean", "max", "p50", "p95", "p99"):
+            df[col] = (df[col] * 1000).round(1)
+        df = df.rename(columns={"mean": "media ms", "max": "máx ms", "p50": "p50 ms",
+                                "p95": "p95 ms", "p99": "p99 ms", "count": "n"})
+        st.dataframe(df[["metric", "labels", "n", "p50 ms", "p95 ms", "p99 ms", "media ms", "máx ms"]],
+                     use_container_width=True, hide_index=True)
+        c1, c2 = st.columns(2)
+        c1.download_button("JSON", metrics.to_json(), file_name="lagema_metrics.json",
+                           mime="application/json", use_container_width=True)
+        c2.download_button("Prometheus", metrics.to_prometheus(), file_name="lagema_metrics.prom",
+                           mime="text/plain", use_container_width=True)
+
+    if services is not None:
+        st.markdown("**Arranque de servicios**")
+        svc = [{"servicio": name, "cargado": "✅" if t["loaded"] else "—",
+                "import ms": round(t["import_s"] * 1000, 1) if t["loaded"] else None,
+                "init ms": round(t["init_s"] * 1000, 1) if t["loaded"] else None}
+               for name, t in services.timings().items()]
+        st.dataframe(pd.DataFrame(svc), use_container_width=True, hide_index=True)
@@ -1,6 +1,5 @@
 import sys
 import os
-import importlib
 from dotenv import load_dotenv
 
 # Add the project root directory to Python path
@@ -21,6 +20,10 @@ except Exception:
 # Load environment variables
 load_dotenv()
 
+# Modo offline/CI: LAGEMA_HTTP_REPLAY=<cassette> sirve las APIs desde grabaciones
+from src.data.replay import install_from_env
+install_from_env()
+
 # --- AUTHENTICATION ---
 if "authenticated" not in st.session_state:
     st.session_state.authenticated = False
@@ -43,21 +46,16 @@ if not st.session_state.authenticated:
         st.text_input("Código de Acceso", type="password", key="password_input", on_change=check_password)
     st.stop()
 
-from src.data.mock_provider import MockDataProvider
-from src.data.db_manager import DataManager
-from src.logic.bpa_engine import BPAEngine
-from src.logic.predictors import Predictor
-from src.logic.validator import Validator
+from src.services.registry import build_app_registry
 from src.logic.lineup_fetcher import LineupFetcher
 from app.components.ui_components import (
     render_header, render_bpa_display, render_prediction_cards, 
     render_lineup_check_ui, render_league_selector, render_date_selector, 
     render_team_selector, render_player_selector, render_time_selector,
     render_result_validation_form, render_historical_dashboard,
-    render_bankroll_ui, render_value_analysis_chart, render_semaforo_history
+    render_bankroll_ui, render_value_analysis_chart, render_semaforo_history,
+    render_diagnostics_panel
 )
-from src.data.bankroll_manager import BankrollManager
-from src.logic.report_engine import ReportEngine
 from src.models.base import Match, MatchConditions, Referee, RefereeStrictness, Player, PlayerPosition, PlayerStatus, NodeRole
 
 # --- PAGE CONFIGURATION ---
@@ -80,47 +78,20 @@ if os.path.exists(css_path):
 # Initialize Services
 @st.cache_resource
 def get_services(version: str = "6.70.3 (Global Generic)"):
-    # NUCLEAR RELOAD: Ensure Streamlit Cloud sees disk changes
-    import importlib
-    import src.models.base
-    import src.logic.poisson_engine
-    import src.logic.predictors
-    import src.logic.bpa_engine
-    import src.logic.external_analyst
-    import src.data.mock_provider
-    import src.data.bankroll_manager
-    import src.data.db_manager
-
-    importlib.reload(src.models.base)
-    importlib.reload(src.logic.poisson_engine)
-    importlib.reload(src.logic.bpa_engine)
-    importlib.reload(src.logic.external_analyst)
-    importlib.reload(src.logic.predictors)
-    importlib.reload(src.data.mock_provider)
-    importlib.reload(src.data.bankroll_manager)
-    importlib.reload(src.data.db_manager)
-
-    from src.data.mock_provider import MockDataProvider
-    from src.data.db_manager import DataManager
-    from src.logic.bpa_engine import BPAEngine
-    from src.logic.predictors import Predictor
-    from src.logic.validator import Validator
-    from src.data.bankroll_manager import BankrollManager
-    from src.logic.report_engine import ReportEngine
-
-    data_provider = MockDataProvider()
-    db_manager = DataManager()
-    bpa_engine = BPAEngine()
-    predictor = Predictor(bpa_engine)
-    validator = Validator()
-    bankroll_manager = BankrollManager()
-    report_engine = ReportEngine()
-    
-    return data_provider, db_manager, bpa_engine, predictor, validator, bankroll_manager, report_engine
+    # Registro perezoso: cada servicio se importa y construye en su primer uso.
+    # La recarga de módulos solo se hace con LAGEMA_DEV_RELOAD=1 (modo desarrollo).
+    return build_app_registry()
 
 # --- SERVICE INITIALIZATION ---
 CURRENT_VERSION = "6.70.2"
-data_provider, db_manager, bpa_engine, predictor, validator, bankroll_manager, report_engine = get_services(CURRENT_VERSION)
+services = get_services(CURRENT_VERSION)
+data_provider = services.proxy("data_provider")
+db_manager = services.proxy("db_manager")
+bpa_engine = services.proxy("bpa_engine")
+predictor = services.proxy("predictor")
+validator = services.proxy("validator")
+bankroll_manager = services.proxy("bankroll_manager")
+report_engine = services.proxy("report_engine")
 
 # --- MAIN LAYOUT ---
 render_header()
@@ -279,8 +250,7 @@ if st.session_state.get("review_study"):
                     rss = _RSS()
                     # analyze_team devuelve análisis por equipo; combinar impactos
                     try:
-                        home_intel = rss.analyze_team(home_name_rs, [])
-                        away_intel = rss.analyze_team(away_name_rs, [])
+                        home_intel, away_intel = rss.analyze_match(home_name_rs, away_name_rs)
                         # impacto_partido puede ser "positivo"/"negativo"/"neutro"
                         def _moral(intel):
                             imp = intel.get("impacto_partido", "neutro")
@@ -883,7 +853,10 @@ if home_team and away_team and teams_valid:
                         
                         # Obtener alineaciones si tenemos fixture_id
                         if _fixture_id:
-                            lineups = api.api_football.get_lineups(_fixture_id)
+                            from src.data.multi_source_fetcher import _kickoff_priority
+                            from src.data.rate_limiter import request_priority
+                            with request_priority(_kickoff_priority(match_datetime)):
+                                lineups = api.api_football.get_lineups(_fixture_id)
                             if lineups and len(lineups) >= 2:
                                 home_players = []
                                 away_players = []
@@ -1262,6 +1235,9 @@ with st.sidebar:
         
         st.markdown('<p style="color:#888;font-size:0.7rem;">Las APIs proporcionan datos de árbitros, alineaciones, clasificación y H2H reales.</p>', unsafe_allow_html=True)
 
+    with st.expander("⏱️ Diagnóstico de latencia", expanded=False):
+        render_diagnostics_panel(services=services)
+
     # =====================================================================
     # 📋 PANEL DE ESTUDIOS GUARDADOS
     # =====================================================================
@@ -1289,6 +1265,19 @@ with st.sidebar:
         completados = [s for s in studies if "COMPLETADO" in s["status"]]
         st.markdown(f'<p style="color:#fdffcc;font-size:0.85rem;">🟡 <b>{len(pendientes)}</b> pendientes &nbsp;|&nbsp; ✅ <b>{len(completados)}</b> completados</p>', unsafe_allow_html=True)
 
+        if pendientes and st.button("⚡ Sincronizar resultados", key="sync_results", use_container_width=True,
+                                    help="Descarga solo los partidos finalizados desde la última sincronización"):
+            from src.logic.result_sync import ResultSync
+            with st.spinner("Sincronizando resultados reales..."):
+                try:
+                    reports = ResultSync(db_manager=db_manager).sync_pending()
+                    settled = sum(r["settled"] for r in reports)
+                    st.toast(f"✅ {settled} estudio(s) liquidado(s)", icon="⚡")
+                    if settled:
+                        st.rerun()
+                except Exception as e:
+                    st.error(f"Error al sincronizar: {e}")
+
         # Solo mostrar pendientes en la lista principal
         # Los completados se archivan en Supabase pero no se muestran (ya aprendió la IA)
         display_studies = pendientes
@@ -1421,9 +1410,9 @@ with st.sidebar:
                         if match_obj_p:
                             with st.spinner("📰 Buscando noticias actualizadas..."):
                                 try:
-                                    from src.logic.external_analyst import ExternalAnalyst
-                                    analyst = ExternalAnalyst()
-                                    intel = analyst.get_detailed_intelligence(match_obj_p)
+                                    # Refresco forzado en el analista del predictor: la predicción
+                                    # que se guarda abajo usa ya la prensa recién buscada
+                                    intel = predictor.external_analyst.get_detailed_intelligence(match_obj_p, refresh=True)
                                     # Guardar impacto de prensa en session_state
                                     st.session_state[f"press_intel_{s['match_id']}"] = intel
                                     # RE-CÁLCULO INTEGRAL: Usar el predictor completo para mantener consistencia (Poisson, etc.)
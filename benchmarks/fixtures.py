@@ -0,0 +1,79 @@
+"""
+Fixtures deterministas para benchmarks — LAGEMA JARG74
+=======================================================
+Todo se construye a partir de MockDataProvider (ratings deterministas por
+nombre de jugador), sin red ni aleatoriedad: dos ejecuciones en la misma
+máquina miden exactamente el mismo trabajo.
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from src.data.mock_provider import MockDataProvider
+from src.models.base import Match
+
+BENCH_LEAGUES = ("La Liga", "Premier League", "Serie A", "Bundesliga")
+BASE_DATE = datetime(2026, 1, 10, 21, 0)
+MARKET_ODDS = {"1": 2.10, "X": 3.30, "2": 3.60}
+
+
+def build_matches(n: int = 40, provider: MockDataProvider = None) -> List[Match]:
+    """N partidos reales del mock (emparejando equipos de cada liga en orden alfabético)."""
+    provider = provider or MockDataProvider()
+    pairs: List[Tuple[str, str, str]] = []
+    for league in BENCH_LEAGUES:
+        teams = provider.get_teams_by_league(league)
+        pairs.extend((league, teams[i], teams[i + 1]) for i in range(0, len(teams) - 1, 2))
+    matches = []
+    for i in range(n):
+        league, home, away = pairs[i % len(pairs)]
+        matches.append(Match(
+            id=f"BENCH_{i:04d}",
+            home_team=provider.get_team_data(home),
+            away_team=provider.get_team_data(away),
+            date=BASE_DATE + timedelta(days=i // len(pairs)),
+            competition=league,
+            market_odds=dict(MARKET_ODDS),
+        ))
+    return matches
+
+
+def offline_predictor():
+    """Predictor con la inteligencia externa sustituida por un reporte neutro (sin red)."""
+    from src.logic.bpa_engine import BPAEngine
+    from src.logic.predictors import Predictor
+
+    predictor = Predictor(BPAEngine())
+    predictor.external_analyst.get_detailed_intelligence = lambda match, freshness=None: {
+        "report": "offline", "impact": {"home": 1.0, "away": 1.0}
+    }
+    return predictor
+
+
+def temp_db_path(name: str = "bench.db") -> str:
+    return os.path.join(tempfile.mkdtemp(prefix="lagema_bench_"), name)
+
+
+def scraped_names(matches: List[Match]) -> List[str]:
+    """Nombres "extraídos" tal como llegan de scraping/OCR: mezcla de aciertos, apellidos y ruido."""
+    names = []
+    for m in matches:
+        for p in m.home_team.players + m.away_team.players:
+            names.append(p.name)
+            names.append(p.name.split()[-1].upper())
+        names.append(f"Entrenador {m.home_team.name}")
+        names.append("Ver alineaciones completas")
+    return names
+
+
+def referee_queries() -> List[str]:
+    """Consultas de árbitro: exactas, por apellido, desconocidas y vacías."""
+    from src.data.referee_database import REFEREE_DB
+
+    known = list(REFEREE_DB)
+    queries = list(known[:20])
+    queries += [f"Árbitro {name.split()[-1]}" for name in known[:20]]
+    queries += ["Árbitro Desconocido", "John Smith", "Por Confirmar", ""]
+    return queries
@@ -0,0 +1,119 @@
+"""
+Arnés de benchmarks — LAGEMA JARG74
+====================================
+Mide funciones con ``timeit`` (número de llamadas autoajustado), guarda los
+resultados en JSON y compara contra una línea base para señalar regresiones.
+
+Formato del JSON:
+    {"meta": {...}, "results": {"nombre": {"median_s", "min_s", "mean_s",
+     "stdev_s", "ops_per_s", "number", "repeat", "unit_items"}}}
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+DEFAULT_REPEAT = 5
+QUICK_REPEAT = 3
+MIN_RUN_TIME = 0.05          # segundos mínimos por repetición al autoajustar
+REGRESSION_THRESHOLD = 0.20  # +20% de mediana respecto a la base = regresión
+
+
+def measure(fn: Callable[[], object], repeat: int = DEFAULT_REPEAT,
+            min_time: float = MIN_RUN_TIME, unit_items: int = 1) -> Dict[str, float]:
+    """
+    Cronometra ``fn`` sin argumentos. ``unit_items`` indica cuántos elementos
+    procesa cada llamada (p. ej. partidos de un lote) para expresar
+    ``ops_per_s`` por elemento.
+    """
+    fn()  # calentamiento (imports perezosos, cachés de primer uso)
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    median = statistics.median(runs)
+    return {
+        "median_s": median,
+        "min_s": min(runs),
+        "mean_s": statistics.fmean(runs),
+        "stdev_s": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        "ops_per_s": (unit_items / median) if median > 0 else float("inf"),
+        "number": number,
+        "repeat": repeat,
+        "unit_items": unit_items,
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def save_results(results: Dict[str, dict], path: str, meta: Optional[dict] = None) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {"meta": {**environment(), **(meta or {})}, "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def compare(baseline: Dict[str, dict], current: Dict[str, dict],
+            threshold: float = REGRESSION_THRESHOLD) -> Dict[str, dict]:
+    """
+    Compara medianas caso a caso. ``ratio`` = actual / base (>1 es más lento).
+    Estado: "regresion" si ratio > 1 + threshold, "mejora" si ratio < 1 - threshold,
+    "igual" en otro caso y "nuevo" si el caso no estaba en la base.
+    """
+    out = {}
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base or not base.get("median_s"):
+            out[name] = {"status": "nuevo", "current_s": cur["median_s"]}
+            continue
+        ratio = cur["median_s"] / base["median_s"]
+        if ratio > 1 + threshold:
+            status = "regresion"
+        elif ratio < 1 - threshold:
+            status = "mejora"
+        else:
+            status = "igual"
+        out[name] = {"status": status, "ratio": round(ratio, 3),
+                     "baseline_s": base["median_s"], "current_s": cur["median_s"]}
+    return out
+
+
+def format_seconds(secs: float) -> str:
+    if secs >= 1:
+        return f"{secs:.2f} s"
+    if secs >= 1e-3:
+        return f"{secs * 1e3:.2f} ms"
+    return f"{secs * 1e6:.1f} µs"
+
+
+def format_table(results: Dict[str, dict], comparison: Optional[Dict[str, dict]] = None) -> str:
+    lines = [f"{'caso':<34} {'mediana':>11} {'ops/s':>12}" + ("  vs base" if comparison else "")]
+    for name, r in results.items():
+        line = f"{name:<34} {format_seconds(r['median_s']):>11} {r['ops_per_s']:>12,.0f}"
+        if comparison and name in comparison:
+            c = comparison[name]
+            line += f"  {c['status']}" + (f" (x{c['ratio']})" if "ratio" in c else "")
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,101 @@
+"""
+Benchmarks de caminos calientes — LAGEMA JARG74
+================================================
+Suite offline (sin red) sobre fixtures deterministas de MockDataProvider:
+Poisson, BPA, Predictor.predict_match/predict_matches, lecturas/escrituras de
+DataManager, clasificación fuzzy de alineaciones y get_referee_data.
+
+Uso:
+    python benchmarks/run_benchmarks.py                      # todas las suites
+    python benchmarks/run_benchmarks.py --only poisson,db    # algunas suites
+    python benchmarks/run_benchmarks.py --quick              # menos repeticiones
+    python benchmarks/run_benchmarks.py --save-baseline      # fija la línea base
+    python benchmarks/run_benchmarks.py --compare            # compara con la base
+
+Los resultados se guardan en benchmarks/results/<fecha>.json. Con --compare el
+proceso termina con código 1 si algún caso empeora más que --threshold.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from benchmarks.harness import (
+    DEFAULT_REPEAT, QUICK_REPEAT, REGRESSION_THRESHOLD,
+    measure, save_results, load_results, compare, format_table
+)
+
+BENCH_DIR = os.path.join(ROOT, "benchmarks")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks offline de LAGEMA")
+    parser.add_argument("--only", default="", help="suites separadas por comas (poisson,bpa,predictor,db,lineup,referee)")
+    parser.add_argument("--quick", action="store_true", help=f"{QUICK_REPEAT} repeticiones en lugar de {DEFAULT_REPEAT}")
+    parser.add_argument("--matches", type=int, default=40, help="partidos en las fixtures")
+    parser.add_argument("--out", default=None, help="ruta del JSON de resultados")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON de línea base")
+    parser.add_argument("--save-baseline", action="store_true", help="guarda también como línea base")
+    parser.add_argument("--compare", action="store_true", help="compara contra la línea base")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="empeoramiento relativo de la mediana que cuenta como regresión")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # Los logs INFO de los motores distorsionan las mediciones
+    logging.disable(logging.INFO)
+    try:
+        return _run(args)
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def _run(args) -> int:
+    from benchmarks.suites import collect
+
+    only = {s.strip() for s in args.only.split(",") if s.strip()}
+    cases = collect(only or None, n_matches=args.matches)
+    repeat = QUICK_REPEAT if args.quick else DEFAULT_REPEAT
+
+    results = {}
+    for name, (fn, unit_items) in cases.items():
+        results[name] = measure(fn, repeat=repeat, unit_items=unit_items)
+        print(f"[Bench] {name}: {results[name]['median_s'] * 1e3:.3f} ms")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    meta = {"matches": args.matches, "repeat": repeat, "suites": sorted(only) or "all"}
+    save_results(results, out, meta)
+    if args.save_baseline:
+        save_results(results, args.baseline, meta)
+
+    comparison = None
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"[Bench] ⚠️ No hay línea base en {args.baseline} (usa --save-baseline)")
+        else:
+            comparison = compare(load_results(args.baseline), results, args.threshold)
+
+    print()
+    print(format_table(results, comparison))
+    print(f"\n[Bench] Resultados guardados en {out}")
+
+    if comparison:
+        regressions = [n for n, c in comparison.items() if c["status"] == "regresion"]
+        if regressions:
+            print(f"[Bench] ❌ Regresiones (> +{args.threshold:.0%}): {', '.join(regressions)}")
+            return 1
+        print("[Bench] ✅ Sin regresiones respecto a la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Casos de benchmark — LAGEMA JARG74
+===================================
+Cada suite devuelve ``{nombre_caso: (callable, unit_items)}``. Los callables
+no reciben argumentos y ya tienen sus fixtures preparadas, de forma que el
+arnés solo cronometra el trabajo del camino caliente.
+"""
+
+import itertools
+import os
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from benchmarks.fixtures import (
+    build_matches, offline_predictor, temp_db_path, scraped_names, referee_queries
+)
+
+Case = Tuple[Callable[[], object], int]
+
+
+def poisson_suite(matches) -> Dict[str, Case]:
+    from src.logic.poisson_engine import PoissonEngine
+
+    engine = PoissonEngine()
+    rng = np.random.default_rng(74)
+    home = rng.uniform(0.6, 2.8, 256)
+    away = rng.uniform(0.4, 2.2, 256)
+    matrix = engine.score_matrix(1.45, 1.10)
+    return {
+        "poisson.score_matrix": (lambda: engine.score_matrix(1.45, 1.10), 1),
+        "poisson.market_probabilities": (lambda: engine.market_probabilities(matrix), 1),
+        "poisson.batch_256": (
+            lambda: engine.batch_market_probabilities(engine.score_matrices(home, away)), len(home)),
+        "poisson.estimate_lambdas": (
+            lambda: engine.estimate_lambdas(matches[0].home_team, matches[0].away_team), 1),
+    }
+
+
+def bpa_suite(matches) -> Dict[str, Case]:
+    from src.logic.bpa_engine import BPAEngine
+
+    engine = BPAEngine()
+    press = {"home": 1.02, "away": 0.97}
+
+    def run():
+        for m in matches:
+            engine.calculate_match_bpa(m, press)
+    return {"bpa.calculate_match_bpa": (run, len(matches))}
+
+
+def predictor_suite(matches) -> Dict[str, Case]:
+    predictor = offline_predictor()
+    cycle = itertools.cycle(matches)
+    return {
+        "predictor.predict_match": (lambda: predictor.predict_match(next(cycle)), 1),
+        "predictor.predict_matches": (lambda: predictor.predict_matches(matches), len(matches)),
+    }
+
+
+def db_suite(matches) -> Dict[str, Case]:
+    os.environ.pop("SUPABASE_URL", None)
+    os.environ.pop("SUPABASE_KEY", None)
+    from src.data.db_manager import DataManager
+
+    db = DataManager(db_path=temp_db_path())
+    preds = offline_predictor().predict_matches(matches)
+    for m, p in zip(matches, preds):
+        db.save_match(m)
+        db.save_prediction(p)
+    records = [{
+        "match_id": m.id, "mercado": mercado, "predicho": "LOCAL", "real": "LOCAL",
+        "error_magnitud": 0.1, "acierto": i % 3 != 0, "ajuste_aplicado": 0.0,
+        "home_team": m.home_team.name, "away_team": m.away_team.name, "competition": m.competition,
+    } for i, m in enumerate(matches[:4]) for mercado in ("1X2", "GOLES", "CORNERS", "TARJETAS")]
+    pred_cycle = itertools.cycle(preds)
+    id_cycle = itertools.cycle([m.id for m in matches])
+    return {
+        "db.save_prediction": (lambda: db.save_prediction(next(pred_cycle)), 1),
+        "db.get_prediction": (lambda: db.get_prediction(next(id_cycle)), 1),
+        "db.get_match": (lambda: db.get_match(next(id_cycle)), 1),
+        "db.save_aprendizaje_16": (lambda: db.save_aprendizaje(records), len(records)),
+        "db.get_market_stats": (lambda: db.get_market_stats("global"), 1),
+        "db.get_all_studies_30": (lambda: db.get_all_studies(limit=30), 30),
+    }
+
+
+def lineup_suite(matches) -> Dict[str, Case]:
+    from src.data.auto_lineup_fetcher import AutoLineupFetcher
+    from src.data.mock_provider import MockDataProvider
+    from src.logic.lineup_fetcher import match_roster_player
+
+    names = scraped_names(matches[:10])
+    home, away = matches[0].home_team, matches[0].away_team
+    auto = AutoLineupFetcher(MockDataProvider())
+    extracted = set(names)
+
+    def classify():
+        for n in names:
+            match_roster_player(n, home)
+            match_roster_player(n, away)
+    return {
+        "lineup.match_roster_player": (classify, 2 * len(names)),
+        "lineup.auto_map_to_rosters": (
+            lambda: auto._map_to_rosters(extracted, home.name, away.name), len(extracted)),
+    }
+
+
+def referee_suite(matches) -> Dict[str, Case]:
+    from src.data.referee_database import get_referee_data
+
+    queries = referee_queries()
+
+    def run():
+        for q in queries:
+            get_referee_data(q)
+    return {"referee.get_referee_data": (run, len(queries))}
+
+
+SUITES = {
+    "poisson": poisson_suite,
+    "bpa": bpa_suite,
+    "predictor": predictor_suite,
+    "db": db_suite,
+    "lineup": lineup_suite,
+    "referee": referee_suite,
+}
+
+
+def collect(only=None, n_matches: int = 40) -> Dict[str, Case]:
+    """Construye las fixtures una vez y devuelve los casos de las suites pedidas."""
+    matches = build_matches(n_matches)
+    cases: Dict[str, Case] = {}
+    for name, suite in SUITES.items():
+        if only and name not in only:
+            continue
+        cases.update(suite(matches))
+    return cases
@@ -16,7 +16,7 @@ def run_calibration():
         import io
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-    ml_engine = MLEngine()
+    ml_engine = MLEngine(autoload=False)
     db_manager = DataManager()
     tm = TrainingManager(db_manager, ml_engine)
     
@@ -24,7 +24,7 @@ def run_calibration():
     results = tm.run_full_training_cycle()
     
     print("\n--- RESULTADOS DE CALIBRACION ---")
-    print(f"Muestras Analizadas: {results['samples_analyzed']}")
+    print(f"Muestras Analizadas: {results['samples_analyzed']} (datos: {results['data_source']})")
     
     metrics = results['training_metrics']
     print(f"Accuracy (Test Set): {metrics['accuracy']*100:.2f}%")
@@ -41,5 +41,14 @@ def run_calibration():
     else:
         print("\nAVISO: Precision < 55%. Requiere mas datos.")
 
+    # Persistir el artefacto: la app lo carga bajo demanda en la primera prediccion
+    path = ml_engine.save(metadata={
+        "metrics": metrics,
+        "cv_metrics": cv,
+        "samples": results['samples_analyzed'],
+        "data_source": results['data_source'],
+    })
+    print(f"\nModelos guardados: {path}")
+
 if __name__ == "__main__":
     run_calibration()
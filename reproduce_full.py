@@ -41,7 +41,7 @@ def test_full_prediction():
     print(f"score_prediction: {result.score_prediction}")
     print(f"Win Probs: H={result.win_prob_home}, D={result.draw_prob}, A={result.win_prob_away}")
     
-    top_5 = sorted(result.poisson_matrix.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_5 = result.top_scores(5)
     print(f"Top 5 Poisson: {top_5}")
 
 if __name__ == "__main__":
@@ -20,14 +20,17 @@ Autor: Antigravity - La Gema JARG74
 """
 
 import os
+import json
 import logging
-import time
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 import requests
 
-from .cache_manager import CacheManager, TTLConfig
+from .cache_manager import CacheManager, TTLConfig, get_cache
+from .rate_limiter import (
+    Priority, RateLimitExceeded, get_rate_limiter, retry_after_seconds, with_priority
+)
 
 logger = logging.getLogger(__name__)
 
@@ -89,7 +92,7 @@ class APIFootballClient:
         raw_key = api_key or os.getenv("API_FOOTBALL_KEY", "")
         # Limpiar comillas accidentales al inicio/fin de la key
         self._api_key = raw_key.strip().strip("'\"")
-        self._cache = cache_manager or CacheManager(persist=False)
+        self._cache = cache_manager or get_cache()
 
         # Autodetección del formato de la key
         self._is_rapidapi = self._detect_rapidapi_key(self._api_key)
@@ -113,8 +116,7 @@ class APIFootballClient:
                 "x-apisports-key": self._api_key,
                 "Accept": "application/json"
             })
-        self._last_request_time = 0
-        self._min_interval = 1.0  # Mínimo 1 segundo entre peticiones
+        self._limiter = get_rate_limiter()  # cubo y cuota compartidos con api_manager
 
         if not self._api_key:
             logger.warning(
@@ -140,12 +142,14 @@ class APIFootballClient:
     def is_configured(self) -> bool:
         return bool(self._api_key)
 
+    PROVIDER = "api_football"
+
     def _rate_limit(self):
-        """Respeta el rate limit entre peticiones."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self._min_interval:
-            time.sleep(self._min_interval - elapsed)
-        self._last_request_time = time.time()
+        """Reserva un hueco en el presupuesto compartido o rechaza la petición."""
+        try:
+            self._limiter.acquire(self.PROVIDER)
+        except RateLimitExceeded as e:
+            raise APIFootballError(str(e), status_code=429)
 
     def _request(
         self,
@@ -182,12 +186,20 @@ class APIFootballClient:
 
         try:
             response = self._session.get(url, params=params, timeout=15)
+            if response.status_code == 429:
+                self._limiter.penalize(self.PROVIDER, retry_after_seconds(response))
+                raise APIFootballError(f"Rate limit (429) en {endpoint}", status_code=429)
             data = response.json()
 
             # Verificar errores de la API
             errors = data.get("errors", {})
             if errors:
                 logger.error(f"API-Football errors: {errors}")
+                if isinstance(errors, dict) and "requests" in errors:
+                    # Cuota diaria agotada según el servidor
+                    self._limiter.sync_remaining(self.PROVIDER, 0)
+                elif isinstance(errors, dict) and "rateLimit" in errors:
+                    self._limiter.penalize(self.PROVIDER, retry_after_seconds(response))
                 raise APIFootballError(
                     f"Errores en API-Football: {errors}",
                     api_errors=errors
@@ -196,6 +208,8 @@ class APIFootballClient:
             # Verificar rate limit de la API
             remaining = int(response.headers.get("x-ratelimit-requests-remaining", 999))
             limit = int(response.headers.get("x-ratelimit-requests-limit", 100))
+            if "x-ratelimit-requests-remaining" in response.headers:
+                self._limiter.sync_remaining(self.PROVIDER, remaining)
             if remaining <= 5:
                 logger.warning(
                     f"API-Football rate limit bajo: {remaining}/{limit} peticiones restantes"
@@ -290,6 +304,57 @@ class APIFootballClient:
         responses = data.get("response", [])
         return responses[0] if responses else None
 
+    MAX_IDS_PER_REQUEST = 20  # límite de fixtures?ids= en API-Football v3
+    FINISHED_STATUSES = ("FT", "AET", "PEN")
+
+    def get_fixtures_by_ids(self, fixture_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Detalle de varios partidos con el mínimo de peticiones.
+
+        Los IDs que no están en caché se piden en bloques de MAX_IDS_PER_REQUEST
+        con ``fixtures?ids=a-b-c``; cada respuesta trae además events, lineups y
+        statistics, que se reparten en las cachés por partido de
+        get_fixture_detail, get_lineups, get_fixture_statistics y
+        get_fixture_events. Cerrar una jornada de 10 partidos cuesta 1 petición.
+
+        Returns:
+            {fixture_id: fixture} solo con los partidos encontrados
+        """
+        found: Dict[int, Dict] = {}
+        pending: List[int] = []
+        for fid in dict.fromkeys(int(f) for f in fixture_ids if f):
+            cached = self._cache.get("fixtures_today", f"detail_{fid}")
+            responses = (cached or {}).get("response", [])
+            if responses:
+                found[fid] = responses[0]
+            else:
+                pending.append(fid)
+
+        for i in range(0, len(pending), self.MAX_IDS_PER_REQUEST):
+            chunk = pending[i:i + self.MAX_IDS_PER_REQUEST]
+            data = self._request("fixtures", {"ids": "-".join(str(f) for f in chunk)})
+            for fixture in data.get("response", []):
+                fid = fixture.get("fixture", {}).get("id")
+                if fid is not None:
+                    self._fan_out_fixture(fid, fixture)
+                    found[fid] = fixture
+        return found
+
+    def _fan_out_fixture(self, fid: int, fixture: Dict):
+        """Guarda un fixture completo en las cachés por partido (mismas claves que las peticiones sueltas)."""
+        finished = fixture.get("fixture", {}).get("status", {}).get("short") in self.FINISHED_STATUSES
+        detail_ttl = TTLConfig.SEASON_STATS if finished else TTLConfig.FIXTURES_TODAY
+        self._cache.set("fixtures_today", f"detail_{fid}", {"response": [fixture]}, "api_football", detail_ttl)
+        if fixture.get("lineups"):
+            self._cache.set("lineups_confirmed", f"lineups_{fid}", {"response": fixture["lineups"]},
+                            "api_football", TTLConfig.LINEUPS_CONFIRMED)
+        if finished:
+            # Estadísticas y eventos solo son definitivos con el partido terminado
+            for section, prefix in (("statistics", "stats"), ("events", "events")):
+                if section in fixture:
+                    self._cache.set("season_stats", f"{prefix}_{fid}", {"response": fixture[section]},
+                                    "api_football", TTLConfig.SEASON_STATS)
+
     def get_next_fixtures(self, league_id: int, next_n: int = 10) -> List[Dict]:
         """
         Obtiene los próximos N partidos de una liga.
@@ -317,6 +382,7 @@ class APIFootballClient:
 
         API-Football incluye el árbitro en el campo "referee" del fixture.
         Este es el método más fiable para saber quién arbitra un partido.
+        La prioridad la fija el llamador según el inicio del partido.
         """
         fixture = self.get_fixture_detail(fixture_id)
         if not fixture:
@@ -396,6 +462,7 @@ class APIFootballClient:
 
         return referee_assignments
 
+    @with_priority(Priority.BACKGROUND)
     def compute_referee_profile(self, referee_name: str, league_id: int = None) -> Dict:
         """
         Calcula el perfil estadístico completo de un árbitro.
@@ -487,7 +554,8 @@ class APIFootballClient:
         Obtiene las alineaciones de un partido.
 
         Disponibles 20-40 minutos antes del inicio del partido
-        cuando la competición cubre esta característica.
+        cuando la competición cubre esta característica. La prioridad la
+        fija el llamador según el inicio del partido.
         """
         data = self._request(
             "fixtures/lineups",
@@ -529,6 +597,7 @@ class APIFootballClient:
         )
         return data.get("response", [])
 
+    @with_priority(Priority.BACKGROUND)
     def get_team_statistics(
         self,
         team_id: int,
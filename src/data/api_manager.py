@@ -19,7 +19,6 @@ Uso:
 """
 
 import os
-import time
 import json
 import logging
 import re
@@ -29,28 +28,20 @@ from typing import Dict, List, Optional, Any, Tuple
 import requests
 from dotenv import load_dotenv
 
+from src.data.cache_manager import ObjectCache, TTLConfig, get_cache
+from src.data.rate_limiter import (
+    Priority, RateLimitExceeded, get_rate_limiter, retry_after_seconds, with_priority
+)
+from src.data.single_flight import coalesce
+
 load_dotenv()
 
 logger = logging.getLogger("LAGEMA_API")
 logging.basicConfig(level=logging.INFO)
 
-
-class RateLimiter:
-    """Controla las llamadas por minuto a cada API."""
-
-    def __init__(self, calls_per_minute: int = 30):
-        self.calls_per_minute = calls_per_minute
-        self.calls = []
-    
-    def wait_if_needed(self):
-        now = time.time()
-        self.calls = [t for t in self.calls if now - t < 60]
-        if len(self.calls) >= self.calls_per_minute:
-            sleep_time = 60 - (now - self.calls[0]) + 0.1
-            if sleep_time > 0:
-                logger.info(f"[RateLimiter] Esperando {sleep_time:.1f}s...")
-                time.sleep(sleep_time)
-        self.calls.append(time.time())
+# "1" = la caché de APIManager también se persiste en data/cache/http_cache.db
+API_CACHE_DISK_ENV = "LAGEMA_API_CACHE_DISK"
+LIVE_STATUSES = {"1H", "HT", "2H", "ET", "BT", "P", "LIVE", "INT", "IN_PLAY", "PAUSED"}
 
 
 def _detect_api_key_type(api_key: str) -> str:
@@ -119,6 +110,8 @@ class APIFootballClient:
 
     LEAGUE_NAME_BY_ID = {v: k for k, v in LEAGUE_IDS.items()}
 
+    PROVIDER = "api_football"  # cubo y cuota compartidos en src/data/rate_limiter.py
+
     # Configuraciones de conexión para cada modo
     MODES = {
         "rapidapi": {
@@ -141,9 +134,11 @@ class APIFootballClient:
         if not self.api_key:
             logger.warning("[API-Football] Sin API key configurada")
         
-        self.rate_limiter = RateLimiter(calls_per_minute=28)
+        self.rate_limiter = get_rate_limiter()
         self.detected_type = _detect_api_key_type(self.api_key)
         self.session = requests.Session()
+        # Fixtures completos (events/lineups/statistics) cargados por get_fixtures_by_ids
+        self._fixtures = ObjectCache(max_entries=1024, namespace="api_football_fixtures")
         
         # Estado de probe
         self._probed = False
@@ -233,7 +228,11 @@ class APIFootballClient:
 
     def _get(self, endpoint: str, params: dict = None) -> Optional[dict]:
         """Petición GET con rate limiting, probe automático y manejo de errores."""
-        self.rate_limiter.wait_if_needed()
+        try:
+            self.rate_limiter.acquire(self.PROVIDER)
+        except RateLimitExceeded as e:
+            logger.warning(f"[API-Football] {endpoint} aplazado: {e}")
+            return None
         
         # Probe en la primera petición
         if not self._probed:
@@ -246,6 +245,9 @@ class APIFootballClient:
         
         try:
             response = self.session.get(url, params=params, timeout=15)
+            remaining = response.headers.get("x-ratelimit-requests-remaining")
+            if remaining is not None and str(remaining).isdigit():
+                self.rate_limiter.sync_remaining(self.PROVIDER, int(remaining))
             if response.status_code == 200:
                 data = response.json()
                 results = data.get("results", 0)
@@ -262,9 +264,9 @@ class APIFootballClient:
                         return self._get(endpoint, params)
                 return None
             elif response.status_code == 429:
-                logger.warning("[API-Football] Rate limit alcanzado, esperando 60s...")
-                time.sleep(60)
-                return self._get(endpoint, params)
+                logger.warning("[API-Football] Rate limit alcanzado (429), petición rechazada")
+                self.rate_limiter.penalize(self.PROVIDER, retry_after_seconds(response))
+                return None
             else:
                 logger.error(f"[API-Football] Error {response.status_code}: {response.text[:200]}")
                 return None
@@ -281,10 +283,15 @@ class APIFootballClient:
 
     def get_fixtures(self, date: str = None, league_id: int = None,
                      season: int = None, team_id: int = None,
-                     live: str = None, fixture_id: int = None) -> List[dict]:
-        """Obtiene partidos por fecha, liga, equipo o en vivo."""
+                     live: str = None, fixture_id: int = None,
+                     date_from: str = None, date_to: str = None,
+                     status: str = None) -> List[dict]:
+        """Obtiene partidos por fecha (o rango from/to), liga, equipo, estado o en vivo."""
         params = {}
         if date: params["date"] = date
+        if date_from: params["from"] = date_from
+        if date_to: params["to"] = date_to
+        if status: params["status"] = status
         if league_id: params["league"] = league_id
         if season: params["season"] = season
         if team_id: params["team"] = team_id
@@ -301,9 +308,55 @@ class APIFootballClient:
         return data.get("response", [])
 
     def get_fixture_by_id(self, fixture_id: int) -> Optional[dict]:
-        """Obtiene un partido específico por su ID."""
-        fixtures = self.get_fixtures(fixture_id=fixture_id)
-        return fixtures[0] if fixtures else None
+        """Obtiene un partido específico por su ID (completo, vía get_fixtures_by_ids)."""
+        return self.get_fixtures_by_ids([fixture_id]).get(int(fixture_id))
+
+    MAX_IDS_PER_REQUEST = 20  # límite de fixtures?ids= en API-Football v3
+    FINISHED_STATUSES = {"FT", "AET", "PEN", "AWD", "WO"}
+
+    def get_fixtures_by_ids(self, fixture_ids) -> Dict[int, dict]:
+        """
+        Partidos completos para varios IDs con el mínimo de peticiones.
+
+        Los que no están en caché se piden en bloques de MAX_IDS_PER_REQUEST
+        con ``fixtures?ids=a-b-c``. Cada fixture trae events, lineups y
+        statistics, así que get_fixture_stats, get_fixture_events y
+        get_lineups los sirven después sin más peticiones.
+        """
+        found: Dict[int, dict] = {}
+        pending: List[int] = []
+        for fid in dict.fromkeys(int(f) for f in fixture_ids if f):
+            cached = self._fixtures.get("fixture", str(fid))
+            if cached is not None:
+                found[fid] = cached
+            else:
+                pending.append(fid)
+
+        for i in range(0, len(pending), self.MAX_IDS_PER_REQUEST):
+            chunk = pending[i:i + self.MAX_IDS_PER_REQUEST]
+            data = self._get("fixtures", {"ids": "-".join(str(f) for f in chunk)})
+            for fixture in (data or {}).get("response", []):
+                fid = fixture.get("fixture", {}).get("id")
+                if fid is None:
+                    continue
+                self._fixtures.set("fixture", str(fid), fixture, ttl=self._fixture_ttl(fixture))
+                found[fid] = fixture
+        return found
+
+    def _fixture_ttl(self, fixture: dict) -> float:
+        status = fixture.get("fixture", {}).get("status", {}).get("short")
+        if status in self.FINISHED_STATUSES:
+            return TTLConfig.SEASON_STATS
+        if status in LIVE_STATUSES:
+            return TTLConfig.LIVE_MATCH
+        return TTLConfig.FIXTURES_TODAY
+
+    def _loaded_section(self, fixture_id: int, section: str) -> Optional[list]:
+        """Sección de un fixture ya cargado por get_fixtures_by_ids (None si no está)."""
+        fixture = self._fixtures.get("fixture", str(fixture_id))
+        if fixture is None or section not in fixture:
+            return None
+        return fixture[section]
 
     def get_head_to_head(self, team1_id: int, team2_id: int,
                          last: int = 10) -> List[dict]:
@@ -325,6 +378,7 @@ class APIFootballClient:
             return data["response"][0]
         return None
 
+    @with_priority(Priority.BACKGROUND)
     def get_team_statistics(self, team_id: int, league_id: int,
                             season: int = None) -> Optional[dict]:
         """Estadísticas completas de un equipo en una liga/temporada."""
@@ -357,7 +411,10 @@ class APIFootballClient:
     # =========================================================================
 
     def get_lineups(self, fixture_id: int) -> List[dict]:
-        """Alineaciones confirmadas de un partido."""
+        """Alineaciones confirmadas de un partido (prioridad del contexto del llamador)."""
+        loaded = self._loaded_section(fixture_id, "lineups")
+        if loaded:
+            return loaded
         data = self._get("fixtures/lineups", {"fixture": fixture_id})
         return data.get("response", []) if data else []
 
@@ -379,11 +436,17 @@ class APIFootballClient:
 
     def get_fixture_stats(self, fixture_id: int) -> List[dict]:
         """Estadísticas en tiempo real de un partido."""
+        loaded = self._loaded_section(fixture_id, "statistics")
+        if loaded is not None:
+            return loaded
         data = self._get("fixtures/statistics", {"fixture": fixture_id})
         return data.get("response", []) if data else []
 
     def get_fixture_events(self, fixture_id: int) -> List[dict]:
         """Eventos del partido (goles, tarjetas, sustituciones)."""
+        loaded = self._loaded_section(fixture_id, "events")
+        if loaded is not None:
+            return loaded
         data = self._get("fixtures/events", {"fixture": fixture_id})
         return data.get("response", []) if data else []
 
@@ -449,16 +512,21 @@ class SportmonksClient:
     """
 
     BASE_URL = "https://api.sportmonks.com/v3/football"
+    PROVIDER = "sportmonks"
 
     def __init__(self, api_token: str = None):
         self.api_token = api_token or os.environ.get("SPORTMONKS_API_TOKEN", "")
         if not self.api_token:
             logger.warning("[Sportmonks] Sin API token configurado")
-        self.rate_limiter = RateLimiter(calls_per_minute=28)
+        self.rate_limiter = get_rate_limiter()
         self.session = requests.Session()
 
     def _get(self, endpoint: str, params: dict = None) -> Optional[dict]:
-        self.rate_limiter.wait_if_needed()
+        try:
+            self.rate_limiter.acquire(self.PROVIDER)
+        except RateLimitExceeded as e:
+            logger.warning(f"[Sportmonks] {endpoint} aplazado: {e}")
+            return None
         url = f"{self.BASE_URL}/{endpoint}"
         params = params or {}
         params["api_token"] = self.api_token
@@ -468,9 +536,9 @@ class SportmonksClient:
                 data = response.json()
                 return data.get("data", data)
             elif response.status_code == 429:
-                logger.warning("[Sportmonks] Rate limit, esperando...")
-                time.sleep(60)
-                return self._get(endpoint, params)
+                logger.warning("[Sportmonks] Rate limit (429), petición rechazada")
+                self.rate_limiter.penalize(self.PROVIDER, retry_after_seconds(response))
+                return None
             else:
                 logger.error(f"[Sportmonks] Error {response.status_code}: {response.text[:200]}")
                 return None
@@ -548,6 +616,7 @@ class FootballDataClient:
     """
 
     BASE_URL = "https://api.football-data.org/v4"
+    PROVIDER = "football_data"
 
     COMPETITION_IDS = {
         "PD": "La Liga",
@@ -568,23 +637,27 @@ class FootballDataClient:
         self.api_key = api_key or os.environ.get("FOOTBALL_DATA_API_KEY", "")
         if not self.api_key:
             logger.warning("[football-data.org] Sin API key configurada")
-        self.rate_limiter = RateLimiter(calls_per_minute=9)
+        self.rate_limiter = get_rate_limiter()
         self.session = requests.Session()
         self.session.headers.update({
             "X-Auth-Token": self.api_key
         })
 
     def _get(self, endpoint: str, params: dict = None) -> Optional[dict]:
-        self.rate_limiter.wait_if_needed()
+        try:
+            self.rate_limiter.acquire(self.PROVIDER)
+        except RateLimitExceeded as e:
+            logger.warning(f"[football-data.org] {endpoint} aplazado: {e}")
+            return None
         url = f"{self.BASE_URL}/{endpoint}"
         try:
             response = self.session.get(url, params=params, timeout=15)
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 429:
-                logger.warning("[football-data.org] Rate limit, esperando 60s...")
-                time.sleep(60)
-                return self._get(endpoint, params)
+                logger.warning("[football-data.org] Rate limit (429), petición rechazada")
+                self.rate_limiter.penalize(self.PROVIDER, retry_after_seconds(response))
+                return None
             else:
                 logger.error(f"[football-data.org] Error {response.status_code}: {response.text[:200]}")
                 return None
@@ -687,32 +760,45 @@ class APIManager:
         self.api_football = APIFootballClient()
         self.sportmonks = SportmonksClient()
         self.football_data = FootballDataClient()
-        self._cache: Dict[str, Any] = {}
-        self._cache_ttl = 300
+        disk = get_cache() if os.getenv(API_CACHE_DISK_ENV, "").strip() == "1" else None
+        self._cache = ObjectCache(max_entries=512, max_bytes=16 * 1024 * 1024,
+                                  disk=disk, namespace="api_manager")
 
     def _cache_key(self, method: str, **kwargs) -> str:
         return f"{method}:" + ":".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
 
-    def _get_cached(self, key: str) -> Optional[Any]:
-        if key in self._cache:
-            entry = self._cache[key]
-            if time.time() - entry["ts"] < self._cache_ttl:
-                return entry["data"]
-            del self._cache[key]
-        return None
+    def _get_cached(self, key: str, category: str) -> Optional[Any]:
+        return self._cache.get(category, key)
 
-    def _set_cached(self, key: str, data: Any):
-        self._cache[key] = {"ts": time.time(), "data": data}
+    def _set_cached(self, key: str, data: Any, category: str, ttl: float = None):
+        """Guarda con el TTL de la categoría (ver TTLConfig en cache_manager) o ``ttl``."""
+        self._cache.set(category, key, data, ttl=ttl)
+
+    @staticmethod
+    def _fixtures_ttl(date: str, results: List[dict]) -> float:
+        """
+        Partidos en juego: segundos; de hoy o sin partidos (aún no publicados):
+        minutos; resto de días: una hora.
+        """
+        if any(r.get("status") in LIVE_STATUSES for r in results):
+            return TTLConfig.LIVE_MATCH
+        if not results or date == datetime.now().strftime("%Y-%m-%d"):
+            return TTLConfig.FIXTURES_TODAY
+        return TTLConfig.FIXTURES_WEEK
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
 
     # =========================================================================
     # MÉTODOS PRINCIPALES
     # =========================================================================
 
+    @coalesce("api_manager", key=lambda date, league_name=None: (date, league_name))
     def get_fixtures_for_date(self, date: str,
                                league_name: str = None) -> List[dict]:
         """Obtiene todos los partidos de una fecha."""
         cache_key = self._cache_key("fixtures", date=date, league=league_name)
-        cached = self._get_cached(cache_key)
+        cached = self._get_cached(cache_key, "fixtures")
         if cached is not None:
             return cached
 
@@ -723,35 +809,8 @@ class APIManager:
         fixtures = self.api_football.get_fixtures(date=date, league_id=league_id)
 
         if fixtures:
-            for f in fixtures:
-                league_info = f.get("league", {})
-                home = f.get("teams", {}).get("home", {})
-                away = f.get("teams", {}).get("away", {})
-                goals = f.get("goals", {})
-                score = f.get("score", {})
-
-                results.append({
-                    "fixture_id": f.get("fixture", {}).get("id"),
-                    "date": f.get("fixture", {}).get("date", ""),
-                    "league": league_info.get("name", ""),
-                    "league_id": league_info.get("id"),
-                    "league_country": league_info.get("country", ""),
-                    "home_team": home.get("name", ""),
-                    "away_team": away.get("name", ""),
-                    "home_team_id": home.get("id"),
-                    "away_team_id": away.get("id"),
-                    "home_logo": home.get("logo", ""),
-                    "away_logo": away.get("logo", ""),
-                    "status": f.get("fixture", {}).get("status", {}).get("short", ""),
-                    "home_score": goals.get("home"),
-                    "away_score": goals.get("away"),
-                    "ht_score": score.get("halftime", {}),
-                    "ft_score": score.get("fulltime", {}),
-                    "referee": f.get("fixture", {}).get("referee", ""),
-                    "venue": f.get("fixture", {}).get("venue", {}).get("name", ""),
-                    "source": "api-football"
-                })
-            self._set_cached(cache_key, results)
+            results = [self._normalize_af_fixture(f) for f in fixtures]
+            self._set_cached(cache_key, results, "fixtures", self._fixtures_ttl(date, results))
             return results
 
         # 2. Fallback a football-data.org
@@ -764,7 +823,7 @@ class APIManager:
                 for m in matches:
                     results.append(self._normalize_fd_match(m))
                 if results:
-                    self._set_cached(cache_key, results)
+                    self._set_cached(cache_key, results, "fixtures", self._fixtures_ttl(date, results))
                     return results
 
         # 3. Último intento: football-data.org todas las competiciones
@@ -775,15 +834,38 @@ class APIManager:
             for m in matches:
                 results.append(self._normalize_fd_match(m))
 
-        self._set_cached(cache_key, results)
+        self._set_cached(cache_key, results, "fixtures", self._fixtures_ttl(date, results))
         return results
 
+    @coalesce("api_manager", key=lambda league_name, date_from, date_to: (league_name, date_from, date_to))
+    def get_finished_fixtures(self, league_name: str, date_from: str,
+                              date_to: str) -> List[dict]:
+        """
+        Partidos finalizados de una liga entre dos fechas en UNA petición
+        (fixtures?from=&to=&status=FT-AET-PEN) en lugar de una por día.
+        """
+        league_id = APIFootballClient.LEAGUE_IDS.get(league_name)
+        if not league_id:
+            return []
+        cache_key = self._cache_key("finished", league=league_name, date_from=date_from, date_to=date_to)
+        cached = self._get_cached(cache_key, "fixtures")
+        if cached is not None:
+            return cached
+
+        fixtures = self.api_football.get_fixtures(league_id=league_id, date_from=date_from,
+                                                  date_to=date_to, status="FT-AET-PEN")
+        results = [self._normalize_af_fixture(f) for f in fixtures]
+        self._set_cached(cache_key, results, "fixtures", TTLConfig.FIXTURES_TODAY)
+        return results
+
+    @coalesce("api_manager", key=lambda team_name, league_name, season=None: (team_name, league_name, season))
+    @with_priority(Priority.BACKGROUND)
     def get_team_stats(self, team_name: str, league_name: str,
                         season: int = None) -> Optional[dict]:
         """Estadísticas completas de un equipo en una liga."""
         cache_key = self._cache_key("team_stats", team=team_name,
                                       league=league_name, season=season)
-        cached = self._get_cached(cache_key)
+        cached = self._get_cached(cache_key, "season_stats")
         if cached is not None:
             return cached
 
@@ -805,7 +887,7 @@ class APIManager:
         stats = self.api_football.get_team_statistics(team_id, league_id, season)
         if stats:
             normalized = self._normalize_team_stats(stats, team_name)
-            self._set_cached(cache_key, normalized)
+            self._set_cached(cache_key, normalized, "season_stats")
             return normalized
 
         return None
@@ -815,23 +897,42 @@ class APIManager:
                           date: str = None) -> Optional[dict]:
         """Obtiene el resultado REAL de un partido finalizado."""
         if fixture_id:
-            fixture = self.api_football.get_fixture_by_id(fixture_id)
-        elif home_team and away_team and date:
-            fixtures = self.api_football.get_fixtures(date=date)
-            fixture = None
-            for f in fixtures:
-                ht = f.get("teams", {}).get("home", {}).get("name", "")
-                at = f.get("teams", {}).get("away", {}).get("name", "")
-                if (home_team.lower() in ht.lower() or 
-                    away_team.lower() in at.lower()):
-                    fixture = f
-                    break
-        else:
+            return self.get_match_results([fixture_id]).get(int(fixture_id))
+        if not (home_team and away_team and date):
             return None
 
-        if not fixture:
+        fixtures = self.api_football.get_fixtures(date=date)
+        fixture = None
+        for f in fixtures:
+            ht = f.get("teams", {}).get("home", {}).get("name", "")
+            at = f.get("teams", {}).get("away", {}).get("name", "")
+            if (home_team.lower() in ht.lower() or 
+                away_team.lower() in at.lower()):
+                fixture = f
+                break
+
+        if not fixture or fixture.get("goals", {}).get("home") is None:
             return None
+        fid = fixture.get("fixture", {}).get("id", 0)
+        # El listado por fecha no trae estadísticas ni eventos: una petición ids= trae ambos
+        full = self.api_football.get_fixtures_by_ids([fid]).get(fid, fixture) if fid else fixture
+        return self._result_from_fixture(full)
 
+    def get_match_results(self, fixture_ids: List[int]) -> Dict[int, dict]:
+        """
+        Resultados REALES de varios partidos en bloque: los fixtures completos se
+        piden con ids= (hasta 20 por petición) en lugar de 3 peticiones por partido.
+        Solo incluye los partidos con marcador.
+        """
+        fixtures = self.api_football.get_fixtures_by_ids(fixture_ids)
+        results = {}
+        for fid, fixture in fixtures.items():
+            result = self._result_from_fixture(fixture)
+            if result:
+                results[fid] = result
+        return results
+
+    def _result_from_fixture(self, fixture: dict) -> Optional[dict]:
         goals = fixture.get("goals", {})
         home_score = goals.get("home")
         away_score = goals.get("away")
@@ -846,8 +947,8 @@ class APIManager:
             winner = "VISITANTE"
 
         fid = fixture.get("fixture", {}).get("id", 0)
-        stats_data = self.api_football.get_fixture_stats(fid)
-        events = self.api_football.get_fixture_events(fid)
+        stats_data = fixture["statistics"] if "statistics" in fixture else self.api_football.get_fixture_stats(fid)
+        events = fixture["events"] if "events" in fixture else self.api_football.get_fixture_events(fid)
 
         match_stats = self._parse_match_stats(stats_data, events)
 
@@ -891,8 +992,14 @@ class APIManager:
 
         return results
 
+    @coalesce("api_manager", key=lambda fixture_id: fixture_id)
     def get_lineups_real(self, fixture_id: int) -> Optional[dict]:
         """Alineaciones confirmadas de un partido."""
+        cache_key = self._cache_key("lineups", fixture=fixture_id)
+        cached = self._get_cached(cache_key, "lineups_confirmed")
+        if cached is not None:
+            return cached
+
         lineups = self.api_football.get_lineups(fixture_id)
         if not lineups:
             return None
@@ -918,6 +1025,7 @@ class APIManager:
             result["confirmed"] = True
 
         result["source"] = "api-football"
+        self._set_cached(cache_key, result, "lineups_confirmed")
         return result
 
     def get_injured_players(self, team_name: str = None,
@@ -982,6 +1090,11 @@ class APIManager:
         if not league_id:
             return []
 
+        cache_key = self._cache_key("standings", league=league_name, season=season)
+        cached = self._get_cached(cache_key, "standings")
+        if cached is not None:
+            return cached
+
         standings = self.api_football.get_standings(league_id, season)
         results = []
 
@@ -1005,12 +1118,44 @@ class APIManager:
                         "description": team_data.get("description", ""),
                     })
 
+        if results:
+            self._set_cached(cache_key, results, "standings")
         return results
 
     # =========================================================================
     # HELPERS DE NORMALIZACIÓN
     # =========================================================================
 
+    def _normalize_af_fixture(self, f: dict) -> dict:
+        """Fixture de API-Football → formato común de APIManager."""
+        league_info = f.get("league", {})
+        home = f.get("teams", {}).get("home", {})
+        away = f.get("teams", {}).get("away", {})
+        goals = f.get("goals", {})
+        score = f.get("score", {})
+        return {
+            "fixture_id": f.get("fixture", {}).get("id"),
+            "date": f.get("fixture", {}).get("date", ""),
+            "timestamp": f.get("fixture", {}).get("timestamp"),
+            "league": league_info.get("name", ""),
+            "league_id": league_info.get("id"),
+            "league_country": league_info.get("country", ""),
+            "home_team": home.get("name", ""),
+            "away_team": away.get("name", ""),
+            "home_team_id": home.get("id"),
+            "away_team_id": away.get("id"),
+            "home_logo": home.get("logo", ""),
+            "away_logo": away.get("logo", ""),
+            "status": f.get("fixture", {}).get("status", {}).get("short", ""),
+            "home_score": goals.get("home"),
+            "away_score": goals.get("away"),
+            "ht_score": score.get("halftime", {}),
+            "ft_score": score.get("fulltime", {}),
+            "referee": f.get("fixture", {}).get("referee", ""),
+            "venue": f.get("fixture", {}).get("venue", {}).get("name", ""),
+            "source": "api-football"
+        }
+
     def _normalize_fd_match(self, match: dict) -> dict:
         """Normaliza un partido de football-data.org al formato estándar."""
         home = match.get("homeTeam", {})
@@ -4,6 +4,8 @@ from typing import Dict, List, Optional
 from datetime import datetime
 import re
 from src.data.interface import DataProvider
+from src.data.cache_manager import cached_get
+from src.data.roster_index import roster_index
 
 
 class AutoLineupFetcher:
@@ -100,7 +102,7 @@ class AutoLineupFetcher:
         Scrape a specific lineup page from SportsGambler.
         """
         try:
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = cached_get(url, category="scraper_lineups", headers=self.headers, timeout=10)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -147,27 +149,13 @@ class AutoLineupFetcher:
         team_home = self.data_provider.get_team_data(home_team)
         team_away = self.data_provider.get_team_data(away_team)
         
-        def fuzzy_match(scraped_name, roster):
-            scraped_tokens = set(scraped_name.lower().split())
-            for player in roster:
-                player_tokens = set(player.name.lower().split())
-                if player_tokens.issubset(scraped_tokens) or scraped_tokens.issubset(player_tokens):
-                    return player.name
-                if len(scraped_tokens.intersection(player_tokens)) >= 1:
-                    return player.name
-            return None
-
         # Process Home
-        for name in home_scraped:
-            match = fuzzy_match(name, team_home.players)
-            if match: found_home.append(match)
-            else: found_home.append(name) # Keep raw name if no match (important for new teams)
+        for name, match in roster_index(team_home).resolve(home_scraped).items():
+            found_home.append(match or name) # Keep raw name if no match (important for new teams)
             
         # Process Away
-        for name in away_scraped:
-            match = fuzzy_match(name, team_away.players)
-            if match: found_away.append(match)
-            else: found_away.append(name) # Keep raw name if no match
+        for name, match in roster_index(team_away).resolve(away_scraped).items():
+            found_away.append(match or name) # Keep raw name if no match
             
         return {
             'home': sorted(list(set(found_home))),
@@ -184,7 +172,7 @@ class AutoLineupFetcher:
         try:
             # Search on main lineups page
             search_url = f"{self.BASE_URL}/lineups/football/"
-            resp = requests.get(search_url, headers=self.headers, timeout=10)
+            resp = cached_get(search_url, category="scraper_fixtures", headers=self.headers, timeout=10)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -237,7 +225,7 @@ class AutoLineupFetcher:
         print(f"🔍 Fetching injuries from: {url}")
         
         try:
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = cached_get(url, category="scraper_injuries", headers=self.headers, timeout=10)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -272,7 +260,7 @@ class AutoLineupFetcher:
         """
         try:
             url = f"{self.BASE_URL}/injuries/football/"
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = cached_get(url, category="scraper_injuries", headers=self.headers, timeout=10)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -305,33 +293,13 @@ class AutoLineupFetcher:
         team_home = self.data_provider.get_team_data(home_team)
         team_away = self.data_provider.get_team_data(away_team)
         
-        def fuzzy_match(scraped_name, roster):
-            scraped_tokens = set(scraped_name.lower().split())
-            if not scraped_tokens:
-                return None
-            
-            for player in roster:
-                player_tokens = set(player.name.lower().split())
-                # Match if tokens overlap significantly
-                if player_tokens.issubset(scraped_tokens) or scraped_tokens.issubset(player_tokens):
-                    return player.name
-                if len(scraped_tokens.intersection(player_tokens)) >= 1:
-                    return player.name
-            return None
-        
         # Map to home team
         if team_home:
-            for name in extracted_names:
-                match = fuzzy_match(name, team_home.players)
-                if match and match not in found_home:
-                    found_home.append(match)
+            found_home = roster_index(team_home).matched(extracted_names)
         
         # Map to away team
         if team_away:
-            for name in extracted_names:
-                match = fuzzy_match(name, team_away.players)
-                if match and match not in found_away:
-                    found_away.append(match)
+            found_away = roster_index(team_away).matched(extracted_names)
         
         # Determine status (confirmed vs predicted)
         status = 'confirmed' if len(found_home) + len(found_away) >= 18 else 'predicted'
@@ -0,0 +1,659 @@
+"""
+CacheManager — Caché HTTP persistente compartida por scrapers y clientes API
+============================================================================
+Todas las peticiones salientes (API-Football, SofaScore, scrapers de liga,
+BeSoccer, FutbolFantasy, WorldFootball, RSS, prensa) pasan por `cached_get`,
+que usa una única `requests.Session` con pool de conexiones y esta caché:
+
+- Disco (SQLite) direccionado por contenido: los cuerpos se guardan una sola vez
+  por hash SHA-256, y cada clave de petición apunta a su blob.
+- TTL por categoría (`TTLConfig`): fixtures en minutos, árbitros en horas...
+- Límite de tamaño con expulsión LRU (por último acceso).
+- Revalidación con ETag / Last-Modified: una entrada caducada se pide con
+  If-None-Match / If-Modified-Since y un 304 solo renueva su caducidad.
+- Capa en memoria (LRU acotada) delante del disco para lecturas repetidas.
+
+`ObjectCache` es la versión para objetos ya normalizados (la caché de
+APIManager): LRU acotada por entradas y bytes, TTL por categoría, contadores
+y segundo nivel opcional en este mismo CacheManager.
+
+Uso:
+    from src.data.cache_manager import cached_get
+    resp = cached_get(url, category="scraper_lineups", headers=HEADERS, timeout=10)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.services.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join("data", "cache", "http_cache.db")
+HTTP_METRIC = "http_fetch_seconds"  # latencia de red de cached_get (solo fallos de caché)
+ACCESS_FLUSH_BATCH = 256  # accesos en memoria acumulados antes de anotarlos en disco
+
+
+class TTLConfig:
+    """TTL en segundos por categoría. La categoría en minúsculas coincide con el nombre del atributo."""
+
+    # --- API-Football ---
+    LIVE_MATCH = 30
+    FIXTURES_TODAY = 300
+    FIXTURES_WEEK = 3600
+    LINEUPS_CONFIRMED = 6 * 3600
+    LINEUPS_PREDICTED = 1800
+    INJURIES = 3 * 3600
+    REFEREE_STATS = 24 * 3600
+    SEASON_STATS = 24 * 3600
+    STANDINGS = 6 * 3600
+    ODDS_PREMATCH = 600
+    H2H_RECORDS = 7 * 24 * 3600
+    TEAM_INFO = 7 * 24 * 3600
+    LEAGUE_INFO = 7 * 24 * 3600
+
+    # --- Scrapers y prensa ---
+    SCRAPER_LINEUPS = 600
+    SCRAPER_REFEREE = 6 * 3600
+    SCRAPER_INJURIES = 3 * 3600
+    SCRAPER_FIXTURES = 1800
+    RSS_FEEDS = 600
+    NEWS_SEARCH = 1800
+
+    DEFAULT = 900
+
+    @classmethod
+    def for_category(cls, category: str) -> float:
+        return getattr(cls, category.upper(), cls.DEFAULT)
+
+
+@dataclass
+class CacheEntry:
+    """Metadatos de una respuesta cacheada (el cuerpo vive en la tabla de blobs)."""
+    key: str
+    category: str
+    content_hash: str
+    stored_at: float
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+    encoding: Optional[str] = None
+    source: str = ""
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class CacheManager:
+    """
+    Caché de dos niveles (memoria LRU + SQLite) con TTL por categoría.
+
+    Args:
+        persist: False = solo memoria (tests, clientes efímeros)
+        path: Fichero SQLite de la caché en disco
+        max_bytes: Tamaño máximo de los cuerpos en disco antes de expulsar por LRU
+        max_memory_entries: Entradas en la capa de memoria
+    """
+
+    def __init__(
+        self,
+        persist: bool = True,
+        path: str = DEFAULT_CACHE_PATH,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_memory_entries: int = 256
+    ):
+        self.persist = persist
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_memory_entries = max_memory_entries
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, Tuple[CacheEntry, bytes]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "writes": 0, "evictions": 0}
+        # Accesos servidos desde memoria pendientes de anotar en disco (last_access de la LRU)
+        self._pending_access: Dict[str, float] = {}
+
+        self._conn = None
+        self._disk_bytes = 0     # total de blobs en disco, mantenido en cada escritura
+        if persist:
+            try:
+                self._conn = self._open(path)
+                self._disk_bytes = self._sum_blob_bytes()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Caché en disco no disponible ({e}). Usando solo memoria.")
+                self.persist = False
+
+    # ------------------------------------------------------------------
+    # Almacenamiento
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                category TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                encoding TEXT,
+                source TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_hash ON entries(content_hash)")
+        return conn
+
+    @staticmethod
+    def _full_key(category: str, key: str) -> str:
+        return f"{category}:{key}"
+
+    def _sum_blob_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _flush_access(self):
+        """Escribe en disco el last_access de las entradas servidas desde memoria."""
+        if not (self._conn and self._pending_access):
+            return
+        pending, self._pending_access = self._pending_access, {}
+        self._conn.executemany("UPDATE entries SET last_access = ? WHERE key = ?",
+                               [(ts, key) for key, ts in pending.items()])
+
+    def _remember(self, full_key: str, entry: CacheEntry, body: bytes):
+        """Inserta en la capa de memoria respetando el límite LRU."""
+        old = self._memory.pop(full_key, None)
+        if old:
+            self._memory_bytes -= len(old[1])
+        self._memory[full_key] = (entry, body)
+        self._memory_bytes += len(body)
+        while len(self._memory) > self.max_memory_entries:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get_entry(self, category: str, key: str) -> Optional[Tuple[CacheEntry, bytes]]:
+        """Devuelve (entrada, cuerpo) aunque esté caducada; el llamador decide si revalidar."""
+        full_key = self._full_key(category, key)
+        with self._lock:
+            if full_key in self._memory:
+                self._memory.move_to_end(full_key)
+                if self._conn:
+                    self._pending_access[full_key] = time.time()
+                    if len(self._pending_access) >= ACCESS_FLUSH_BATCH:
+                        self._flush_access()
+                return self._memory[full_key]
+
+            if not self._conn:
+                return None
+
+            row = self._conn.execute("""
+                SELECT e.content_hash, e.stored_at, e.expires_at, e.etag, e.last_modified,
+                       e.content_type, e.encoding, e.source, b.body
+                FROM entries e JOIN blobs b ON b.hash = e.content_hash
+                WHERE e.key = ?
+            """, (full_key,)).fetchone()
+            if not row:
+                return None
+
+            self._pending_access.pop(full_key, None)
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), full_key))
+            entry = CacheEntry(full_key, category, *row[:8])
+            body = row[8]
+            self._remember(full_key, entry, body)
+            return entry, body
+
+    def put_entry(
+        self,
+        category: str,
+        key: str,
+        body: bytes,
+        ttl: Optional[float] = None,
+        source: str = "",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_type: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> CacheEntry:
+        """Guarda un cuerpo; si otra clave ya tiene el mismo contenido se reutiliza su blob."""
+        if ttl is None:
+            ttl = TTLConfig.for_category(category)
+        now = time.time()
+        full_key = self._full_key(category, key)
+        content_hash = hashlib.sha256(body).hexdigest()
+        entry = CacheEntry(full_key, category, content_hash, now, now + ttl,
+                           etag, last_modified, content_type, encoding, source)
+
+        with self._lock:
+            self._remember(full_key, entry, body)
+            self._stats["writes"] += 1
+            if self._conn:
+                try:
+                    self._conn.execute("BEGIN")
+                    inserted = self._conn.execute(
+                        "INSERT OR IGNORE INTO blobs (hash, body, size) VALUES (?, ?, ?)",
+                        (content_hash, body, len(body))
+                    ).rowcount
+                    self._conn.execute("""
+                        INSERT OR REPLACE INTO entries
+                        (key, category, content_hash, stored_at, expires_at, last_access,
+                         etag, last_modified, content_type, encoding, source)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (full_key, category, content_hash, now, now + ttl, now,
+                          etag, last_modified, content_type, encoding, source))
+                    self._conn.execute("COMMIT")
+                    self._pending_access.pop(full_key, None)
+                    if inserted > 0:
+                        self._disk_bytes += len(body)
+                except sqlite3.Error as e:
+                    self._rollback()
+                    logger.warning(f"No se pudo persistir la entrada {full_key}: {e}")
+                    return entry
+                # La entrada ya está guardada: un fallo al expulsar no afecta a la escritura
+                try:
+                    self._evict_if_needed()
+                except sqlite3.Error as e:
+                    self._rollback()
+                    logger.warning(f"No se pudo liberar espacio en la caché: {e}")
+        return entry
+
+    def _rollback(self):
+        """ROLLBACK solo si hay una transacción abierta (si no, SQLite lanza otro error)."""
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def touch(self, category: str, key: str, ttl: Optional[float] = None):
+        """Renueva la caducidad de una entrada tras un 304 Not Modified."""
+        if ttl is None:
+            ttl = TTLConfig.for_category(category)
+        full_key = self._full_key(category, key)
+        now = time.time()
+        with self._lock:
+            if full_key in self._memory:
+                self._memory[full_key][0].expires_at = now + ttl
+            if self._conn:
+                self._conn.execute(
+                    "UPDATE entries SET expires_at = ?, last_access = ? WHERE key = ?",
+                    (now + ttl, now, full_key)
+                )
+
+    def _evict_if_needed(self):
+        """
+        Expulsa las entradas menos usadas hasta dejar el disco por debajo del 90% del límite.
+        Mientras el total mantenido no supere el límite no toca el disco; al
+        superarlo se recalcula el tamaño real (otros procesos comparten el fichero)
+        y se anotan antes los accesos servidos desde memoria.
+        """
+        if self._disk_bytes <= self.max_bytes:
+            return
+        self._flush_access()
+        total = self._disk_bytes = self._sum_blob_bytes()
+        target = self.max_bytes * 0.9
+        while total > self.max_bytes:
+            rows = self._conn.execute("""
+                SELECT e.key, b.size FROM entries e JOIN blobs b ON b.hash = e.content_hash
+                ORDER BY e.last_access ASC
+            """).fetchall()
+            if not rows:
+                break
+
+            victims, freed = [], 0
+            for full_key, size in rows:
+                victims.append((full_key,))
+                freed += size
+                if total - freed <= target:
+                    break
+
+            self._conn.execute("BEGIN")
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+            self._conn.execute(
+                "DELETE FROM blobs WHERE hash NOT IN (SELECT DISTINCT content_hash FROM entries)"
+            )
+            self._conn.execute("COMMIT")
+
+            for (full_key,) in victims:
+                self._memory.pop(full_key, None)
+            self._stats["evictions"] += len(victims)
+            total = self._disk_bytes = self._sum_blob_bytes()
+
+        self._memory_bytes = sum(len(body) for _, body in self._memory.values())
+
+    # ------------------------------------------------------------------
+    # API de valores JSON (usada por APIFootballClient)
+    # ------------------------------------------------------------------
+
+    def get(self, category: str, key: str) -> Optional[Any]:
+        """Devuelve el valor JSON si la entrada existe y no ha caducado."""
+        hit = self.get_entry(category, key)
+        if hit is None or not hit[0].is_fresh:
+            self.record("misses")
+            return None
+        self.record("hits")
+        return json.loads(hit[1])
+
+    def set(self, category: str, key: str, data: Any, source: str = "", ttl: Optional[float] = None):
+        """Guarda un valor JSON-serializable."""
+        body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        self.put_entry(category, key, body, ttl=ttl, source=source, content_type="application/json")
+
+    def invalidate(self, category: Optional[str] = None):
+        """Elimina todas las entradas, o solo las de una categoría."""
+        with self._lock:
+            if category is None:
+                self._memory.clear()
+            else:
+                prefix = f"{category}:"
+                for full_key in [k for k in self._memory if k.startswith(prefix)]:
+                    del self._memory[full_key]
+            self._memory_bytes = sum(len(body) for _, body in self._memory.values())
+
+            if self._conn:
+                if category is None:
+                    self._conn.execute("DELETE FROM entries")
+                else:
+                    self._conn.execute("DELETE FROM entries WHERE category = ?", (category,))
+                self._conn.execute(
+                    "DELETE FROM blobs WHERE hash NOT IN (SELECT DISTINCT content_hash FROM entries)"
+                )
+                self._pending_access.clear()
+                self._disk_bytes = self._sum_blob_bytes()
+
+    def record(self, stat: str):
+        """Suma uno a un contador de ``stats()`` (hits, misses, stale, revalidated...)."""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso y tamaño actual de la caché."""
+        with self._lock:
+            result = dict(self._stats)
+            result["memory_entries"] = len(self._memory)
+            result["memory_bytes"] = self._memory_bytes
+            if self._conn:
+                entries, size = self._conn.execute(
+                    "SELECT (SELECT COUNT(*) FROM entries), (SELECT COALESCE(SUM(size), 0) FROM blobs)"
+                ).fetchone()
+                result["disk_entries"] = entries
+                result["disk_bytes"] = size
+            lookups = result["hits"] + result["misses"]
+            result["hit_ratio"] = round(result["hits"] / lookups, 4) if lookups else 0.0
+            return result
+
+
+class ObjectCache:
+    """
+    Caché en memoria de objetos Python (resultados ya normalizados) con:
+
+    - TTL por categoría (`TTLConfig`): fixtures en vivo segundos, clasificación
+      horas, estadísticas de temporada un día.
+    - Límite por número de entradas y por bytes (tamaño estimado en JSON), con
+      expulsión LRU; las entradas caducadas se eliminan al leerlas o al hacer sitio.
+    - Contadores de aciertos, fallos, caducadas y expulsiones.
+    - Segundo nivel opcional en disco (`CacheManager`): lo que se escribe se
+      persiste y un fallo en memoria se busca allí (sobrevive a reinicios).
+
+    Los valores se devuelven por referencia: no deben mutarse.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_bytes: int = 16 * 1024 * 1024,
+        disk: Optional[CacheManager] = None,
+        namespace: str = "obj",
+        clock=time.time
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.namespace = namespace
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (categoría, clave) -> (valor, caduca, bytes)
+        self._data: "OrderedDict[Tuple[str, str], Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "disk_hits": 0, "writes": 0}
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        try:
+            return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+        except (TypeError, ValueError):
+            return 1024
+
+    def _disk_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, category: str, key: str) -> Optional[Any]:
+        """Valor vigente o None (fallo, caducado o expulsado)."""
+        now = self._clock()
+        with self._lock:
+            item = self._data.get((category, key))
+            if item is not None:
+                if now < item[1]:
+                    self._data.move_to_end((category, key))
+                    self._stats["hits"] += 1
+                    return item[0]
+                self._drop((category, key))
+                self._stats["expired"] += 1
+        if self.disk is not None:
+            hit = self.disk.get_entry(category, self._disk_key(key))
+            if hit is not None and now < hit[0].expires_at:
+                value = json.loads(hit[1])
+                with self._lock:
+                    self._store(category, key, value, hit[0].expires_at, len(hit[1]))
+                    self._stats["disk_hits"] += 1
+                    self._stats["hits"] += 1
+                return value
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, category: str, key: str, value: Any, ttl: Optional[float] = None):
+        """Guarda ``value`` con el TTL de su categoría (o ``ttl``)."""
+        if ttl is None:
+            ttl = TTLConfig.for_category(category)
+        size = self._sizeof(value)
+        with self._lock:
+            self._store(category, key, value, self._clock() + ttl, size)
+            self._stats["writes"] += 1
+        if self.disk is not None:
+            self.disk.set(category, self._disk_key(key), value, source=self.namespace, ttl=ttl)
+
+    def invalidate(self, category: Optional[str] = None):
+        """Vacía la memoria (toda o una categoría); el disco se limpia con su propio invalidate."""
+        with self._lock:
+            for k in [k for k in self._data if category is None or k[0] == category]:
+                self._drop(k)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, item: Tuple[str, str]) -> bool:
+        with self._lock:
+            entry = self._data.get(item)
+            return entry is not None and self._clock() < entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result = dict(self._stats)
+            result["entries"] = len(self._data)
+            result["bytes"] = self._bytes
+            lookups = result["hits"] + result["misses"]
+            result["hit_ratio"] = round(result["hits"] / lookups, 4) if lookups else 0.0
+            return result
+
+    # -- internos (con el lock tomado) --
+
+    def _drop(self, k: Tuple[str, str]):
+        item = self._data.pop(k, None)
+        if item is not None:
+            self._bytes -= item[2]
+
+    def _store(self, category: str, key: str, value: Any, expires_at: float, size: int):
+        self._drop((category, key))
+        self._data[(category, key)] = (value, expires_at, size)
+        self._bytes += size
+        if len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            now = self._clock()
+            for k in [k for k, item in self._data.items() if item[1] <= now]:
+                self._drop(k)
+            while len(self._data) > 1 and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self._stats["evictions"] += 1
+
+
+# ============================================================
+# Capa HTTP compartida
+# ============================================================
+
+_session: Optional[requests.Session] = None
+_default_cache: Optional[CacheManager] = None
+_init_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Sesión única con pool de conexiones reutilizada por todas las fuentes."""
+    global _session
+    with _init_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def get_cache() -> CacheManager:
+    """Caché HTTP persistente por defecto (compartida por todo el proceso)."""
+    global _default_cache
+    with _init_lock:
+        if _default_cache is None:
+            _default_cache = CacheManager(persist=True)
+        return _default_cache
+
+
+def request_key(url: str, params: Optional[Dict] = None) -> str:
+    """Clave estable de una petición GET (URL + parámetros ordenados)."""
+    if params:
+        url = f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _response_from_cache(url: str, entry: CacheEntry, body: bytes) -> requests.Response:
+    """Reconstruye un requests.Response a partir de una entrada cacheada."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp.url = url
+    resp._content = body
+    resp.headers = CaseInsensitiveDict()
+    if entry.content_type:
+        resp.headers["Content-Type"] = entry.content_type
+    if entry.etag:
+        resp.headers["ETag"] = entry.etag
+    if entry.last_modified:
+        resp.headers["Last-Modified"] = entry.last_modified
+    resp.encoding = entry.encoding
+    resp.from_cache = True
+    return resp
+
+
+def cached_get(
+    url: str,
+    category: str = "default",
+    headers: Optional[Dict] = None,
+    params: Optional[Dict] = None,
+    timeout: float = 10,
+    ttl: Optional[float] = None,
+    force_refresh: bool = False,
+    cache: Optional[CacheManager] = None,
+    session: Optional[requests.Session] = None
+) -> requests.Response:
+    """
+    GET con caché. Mismo contrato que `requests.get`: devuelve un `requests.Response`
+    (con atributo extra `from_cache`) y propaga las excepciones de red, salvo que
+    exista una copia caducada, que se sirve como último recurso.
+
+    Solo se cachean respuestas 200.
+    """
+    cache = cache or get_cache()
+    session = session or get_http_session()
+    key = request_key(url, params)
+
+    hit = None if force_refresh else cache.get_entry(category, key)
+    if hit and hit[0].is_fresh:
+        cache.record("hits")
+        return _response_from_cache(url, *hit)
+
+    cache.record("misses")
+    req_headers = dict(headers or {})
+    if hit:
+        entry = hit[0]
+        if entry.etag:
+            req_headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            req_headers["If-Modified-Since"] = entry.last_modified
+
+    t0 = time.perf_counter()
+    try:
+        resp = session.get(url, headers=req_headers, params=params, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        METRICS.observe(HTTP_METRIC, time.perf_counter() - t0, category=category, status="error")
+        if hit:
+            logger.info(f"Red no disponible para {urlparse(url).netloc} ({e}); sirviendo copia caducada")
+            cache.record("stale")
+            return _response_from_cache(url, *hit)
+        raise
+
+    METRICS.observe(HTTP_METRIC, time.perf_counter() - t0, category=category, status=str(resp.status_code))
+
+    if resp.status_code == 304 and hit:
+        cache.touch(category, key, ttl)
+        cache.record("revalidated")
+        return _response_from_cache(url, *hit)
+
+    if resp.status_code == 200:
+        cache.put_entry(
+            category, key, resp.content, ttl=ttl,
+            source=urlparse(url).netloc,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            content_type=resp.headers.get("Content-Type"),
+            encoding=resp.encoding
+        )
+
+    resp.from_cache = False
+    return resp
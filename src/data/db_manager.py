@@ -10,14 +10,217 @@ Para activar Supabase, añade en Streamlit Cloud Secrets:
 """
 
 import os
+import re
 import json
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 import requests
 from src.models.base import Match, PredictionResult
 
 
+# Versión del esquema SQLite (PRAGMA user_version)
+#   1: tablas originales con blobs JSON
+#   2: columnas tipadas en predictions + índices de consulta
+#   3: estadisticas_mercado (aciertos materializados, actualizados en cada resultado)
+#   4: sync_state (marca de agua de la sincronización incremental de resultados)
+SCHEMA_VERSION = 4
+
+# Ámbitos de las estadísticas materializadas: (ámbito, campo del registro que da la clave)
+STATS_SCOPES = [("global", None), ("competicion", "competition"),
+                ("equipo", "home_team"), ("equipo", "away_team")]
+# Últimos N resultados por mercado para la precisión de ventana móvil
+STATS_WINDOW = 20
+
+# Columnas tipadas de predictions extraídas de prediction_json (v2)
+PREDICTION_COLUMNS = [
+    ("win_prob_home", "REAL"), ("draw_prob", "REAL"), ("win_prob_away", "REAL"),
+    ("total_goals_expected", "REAL"), ("btts_prob", "REAL"),
+    ("lambda_home", "REAL"), ("lambda_away", "REAL"),
+    ("corners_lo", "INTEGER"), ("corners_hi", "INTEGER"),
+    ("cards_lo", "INTEGER"), ("cards_hi", "INTEGER"),
+    ("shots_lo", "INTEGER"), ("shots_hi", "INTEGER"),
+]
+
+SQLITE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_matches_comp_date ON matches(competition, date)",
+    "CREATE INDEX IF NOT EXISTS idx_matches_teams ON matches(home_team, away_team)",
+    "CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(date)",
+    "CREATE INDEX IF NOT EXISTS idx_predictions_created ON predictions(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_resultados_created ON resultados(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_aprendizaje_mercado ON aprendizaje(mercado)",
+    "CREATE INDEX IF NOT EXISTS idx_aprendizaje_created ON aprendizaje(created_at)",
+]
+
+# Campos del PredictionResult necesarios para rellenar las columnas tipadas
+_PREDICTION_SOURCE_FIELDS = {
+    "win_prob_home", "draw_prob", "win_prob_away", "total_goals_expected",
+    "both_teams_to_score_prob", "expected_goals_home", "expected_goals_away",
+    "predicted_corners", "predicted_cards", "predicted_shots",
+}
+
+
+def parse_range(s) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Rango total (lo, hi) a partir de "8-11" o del formato por equipo
+    "🏠 4-6 | ✈️ 3-5" (suma local + visitante).
+    """
+    nums = re.findall(r"\d+", str(s or ""))
+    if not nums: return None, None
+    if len(nums) >= 4:
+        c=[int(nums[0])+int(nums[2]),int(nums[1])+int(nums[3]),int(nums[0])+int(nums[3]),int(nums[1])+int(nums[2])]
+        return min(c), max(c)
+    if len(nums) >= 2: return int(nums[0]), int(nums[1])
+    return int(nums[0]), int(nums[0])
+
+
+def _stats_deltas(records: List[dict]) -> List[tuple]:
+    """Incrementos (ambito, clave, mercado, acierto, error) que aporta cada registro de aprendizaje."""
+    deltas = []
+    for rec in records:
+        hit = 1 if rec.get("acierto") else 0
+        err = float(rec.get("error_magnitud") or 0)
+        mercado = rec.get("mercado") or "desconocido"
+        for ambito, field in STATS_SCOPES:
+            clave = "" if field is None else (rec.get(field) or "")
+            if field is None or clave:
+                deltas.append((ambito, clave, mercado, hit, err))
+    return deltas
+
+
+def _format_stats(total: int, aciertos: int, error_total: float, ventana: str) -> dict:
+    """Fila materializada → formato de get_aprendizaje_stats (+ ventana móvil)."""
+    return {
+        "total": total, "aciertos": aciertos, "error_total": error_total,
+        "precision": round(aciertos / total * 100, 1) if total > 0 else 0,
+        "error_medio": round(error_total / total, 2) if total > 0 else 0,
+        "ventana_total": len(ventana),
+        "precision_ventana": round(ventana.count("1") / len(ventana) * 100, 1) if ventana else 0,
+    }
+
+
+def _prediction_columns(pred: dict) -> tuple:
+    """Valores de PREDICTION_COLUMNS (mismo orden) desde un PredictionResult volcado a dict."""
+    c_lo, c_hi = parse_range(pred.get("predicted_corners"))
+    k_lo, k_hi = parse_range(pred.get("predicted_cards"))
+    s_lo, s_hi = parse_range(pred.get("predicted_shots"))
+    return (
+        pred.get("win_prob_home"), pred.get("draw_prob"), pred.get("win_prob_away"),
+        pred.get("total_goals_expected"), pred.get("both_teams_to_score_prob"),
+        pred.get("expected_goals_home") or None, pred.get("expected_goals_away") or None,
+        c_lo, c_hi, k_lo, k_hi, s_lo, s_hi,
+    )
+
+
+class SQLitePool:
+    """
+    Pool de conexiones SQLite compartido por todas las instancias de DataManager
+    que apuntan al mismo fichero (una por sesión de Streamlit).
+
+    - WAL + synchronous=NORMAL: lectores concurrentes mientras otro hilo escribe.
+    - cached_statements: cada conexión mantiene su caché de sentencias preparadas,
+      así que reutilizar conexiones evita recompilar el SQL en cada llamada.
+    - Unidad de trabajo: `transaction()` abre BEGIN IMMEDIATE y confirma con un
+      único COMMIT al salir. Las llamadas anidadas en el mismo hilo reutilizan la
+      conexión y la transacción en curso.
+    """
+
+    _pools: Dict[str, "SQLitePool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0,
+                 cached_statements: int = 128):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def for_path(cls, db_path: str) -> "SQLitePool":
+        """Pool único por fichero de BD (reutilizado entre sesiones)."""
+        key = os.path.abspath(db_path)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls._pools[key] = cls(db_path)
+            return pool
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.timeout, check_same_thread=False,
+            cached_statements=self.cached_statements,
+            isolation_level=None,   # autocommit; las transacciones son explícitas
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"[DB] Pool SQLite agotado ({self.size} conexiones en uso)")
+
+    @contextmanager
+    def connection(self):
+        """Conexión del pool; dentro de una unidad de trabajo devuelve la del hilo."""
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Unidad de trabajo: todo lo ejecutado dentro se confirma en un único COMMIT."""
+        if getattr(self._local, "in_tx", False):
+            yield self._local.conn
+            return
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.in_tx = True
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._local.in_tx = False
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._all:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._all.clear()
+            self._idle = queue.LifoQueue()
+
+
 class DataManager:
 
     def __init__(self, db_path="data/lagema.db"):
@@ -25,14 +228,35 @@ class DataManager:
         self.supabase_url = os.environ.get("SUPABASE_URL", "").rstrip("/")
         self.supabase_key = os.environ.get("SUPABASE_KEY", "")
         self.use_supabase = bool(self.supabase_url and self.supabase_key)
+        self._mem_stats: Optional[Dict[tuple, dict]] = None   # solo Supabase
+        self._stats_lock = threading.Lock()
 
         if self.use_supabase:
             print("[DB] ✅ Usando Supabase (persistencia permanente)")
             self._init_supabase()
         else:
             print("[DB] ⚠️ Usando SQLite local (se borra en redeploy)")
+            self._pool = SQLitePool.for_path(db_path)
             self._init_sqlite()
 
+    def transaction(self):
+        """
+        Unidad de trabajo para agrupar varias escrituras en una sola transacción:
+
+            with db.transaction():
+                db.save_resultado(...)
+                db.save_aprendizaje(records)
+
+        En Supabase no hay transacción local: cada llamada sigue siendo una petición.
+        """
+        if self.use_supabase:
+            return nullcontext()
+        return self._pool.transaction()
+
+    def _conn(self):
+        """Conexión de lectura del pool (autocommit)."""
+        return self._pool.connection()
+
     # =========================================================================
     # SUPABASE (persistencia real)
     # =========================================================================
@@ -68,8 +292,11 @@ class DataManager:
 
     def _init_sqlite(self):
         os.makedirs("data", exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        with self.transaction() as conn:
+            self._create_tables(conn.cursor())
+            self._migrate(conn)
+
+    def _create_tables(self, c):
         c.execute('''CREATE TABLE IF NOT EXISTS matches (
             id TEXT PRIMARY KEY, date TEXT, competition TEXT,
             home_team TEXT, away_team TEXT, data_json TEXT)''')
@@ -93,8 +320,49 @@ class DataManager:
             sesgo_corners REAL DEFAULT 0.0, sesgo_cards REAL DEFAULT 0.0,
             total_partidos INTEGER DEFAULT 0, aciertos INTEGER DEFAULT 0,
             updated_at TEXT)''')
-        conn.commit()
-        conn.close()
+        c.execute('''CREATE TABLE IF NOT EXISTS estadisticas_mercado (
+            ambito TEXT, clave TEXT, mercado TEXT,
+            total INTEGER DEFAULT 0, aciertos INTEGER DEFAULT 0,
+            error_total REAL DEFAULT 0.0, ventana TEXT DEFAULT '',
+            updated_at TEXT, PRIMARY KEY (ambito, clave, mercado))''')
+        c.execute('''CREATE TABLE IF NOT EXISTS sync_state (
+            source TEXT, clave TEXT, last_ts INTEGER DEFAULT 0,
+            last_fixture_id INTEGER, updated_at TEXT, PRIMARY KEY (source, clave))''')
+
+    def _migrate(self, conn):
+        """
+        Migra el esquema hasta SCHEMA_VERSION. La v2 añade columnas tipadas a
+        predictions y las rellena decodificando cada prediction_json UNA sola vez.
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 2:
+            existing = {r[1] for r in conn.execute("PRAGMA table_info(predictions)")}
+            for col, col_type in PREDICTION_COLUMNS:
+                if col not in existing:
+                    conn.execute(f"ALTER TABLE predictions ADD COLUMN {col} {col_type}")
+            rows = conn.execute("SELECT match_id, prediction_json FROM predictions").fetchall()
+            updates = []
+            for match_id, p_json in rows:
+                try:
+                    updates.append(_prediction_columns(json.loads(p_json or "{}")) + (match_id,))
+                except Exception as e:
+                    print(f"[DB] Migración v2: prediction_json ilegible ({match_id}): {e}")
+            set_clause = ", ".join(f"{col}=?" for col, _ in PREDICTION_COLUMNS)
+            conn.executemany(f"UPDATE predictions SET {set_clause} WHERE match_id=?", updates)
+            if rows:
+                print(f"[DB] Migración v2: {len(updates)}/{len(rows)} predicciones normalizadas")
+        if version < 3:
+            # Materializar las estadísticas con el histórico existente (una sola pasada)
+            rows = conn.execute('''SELECT mercado, acierto, error_magnitud, home_team,
+                away_team, competition FROM aprendizaje ORDER BY id''').fetchall()
+            conn.execute("DELETE FROM estadisticas_mercado")
+            records = [{"mercado": r[0], "acierto": r[1], "error_magnitud": r[2],
+                        "home_team": r[3], "away_team": r[4], "competition": r[5]} for r in rows]
+            self._upsert_stats(conn, records)
+        for ddl in SQLITE_INDEXES:
+            conn.execute(ddl)
+        if version < SCHEMA_VERSION:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     # =========================================================================
     # API PÚBLICA — Matches
@@ -111,22 +379,20 @@ class DataManager:
                 "data_json": data_json
             })
         else:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute('''INSERT OR REPLACE INTO matches
-                (id, date, competition, home_team, away_team, data_json)
-                VALUES (?,?,?,?,?,?)''',
-                (match.id, match.date.isoformat(), match.competition,
-                 match.home_team.name, match.away_team.name, data_json))
-            conn.commit(); conn.close()
+            with self.transaction() as conn:
+                conn.execute('''INSERT OR REPLACE INTO matches
+                    (id, date, competition, home_team, away_team, data_json)
+                    VALUES (?,?,?,?,?,?)''',
+                    (match.id, match.date.isoformat(), match.competition,
+                     match.home_team.name, match.away_team.name, data_json))
 
     def get_match(self, match_id: str) -> Optional[Match]:
         if self.use_supabase:
             rows = self._sb_get("matches", f"id=eq.{match_id}&select=data_json")
             if rows: return Match.model_validate_json(rows[0]["data_json"])
         else:
-            conn = sqlite3.connect(self.db_path)
-            r = conn.execute('SELECT data_json FROM matches WHERE id=?', (match_id,)).fetchone()
-            conn.close()
+            with self._conn() as conn:
+                r = conn.execute('SELECT data_json FROM matches WHERE id=?', (match_id,)).fetchone()
             if r: return Match.model_validate_json(r[0])
         return None
 
@@ -135,9 +401,8 @@ class DataManager:
             rows = self._sb_get("matches", f"select=data_json&order=date.desc&limit={limit}")
             return [Match.model_validate_json(r["data_json"]) for r in rows]
         else:
-            conn = sqlite3.connect(self.db_path)
-            rows = conn.execute('SELECT data_json FROM matches ORDER BY date DESC LIMIT ?', (limit,)).fetchall()
-            conn.close()
+            with self._conn() as conn:
+                rows = conn.execute('SELECT data_json FROM matches ORDER BY date DESC LIMIT ?', (limit,)).fetchall()
             return [Match.model_validate_json(r[0]) for r in rows]
 
     # =========================================================================
@@ -153,10 +418,13 @@ class DataManager:
                 "created_at": datetime.now().isoformat()
             })
         else:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute('''INSERT OR REPLACE INTO predictions (match_id, prediction_json, created_at)
-                VALUES (?,?,?)''', (prediction.match_id, data_json, datetime.now().isoformat()))
-            conn.commit(); conn.close()
+            cols = [col for col, _ in PREDICTION_COLUMNS]
+            values = _prediction_columns(prediction.model_dump(include=_PREDICTION_SOURCE_FIELDS))
+            with self.transaction() as conn:
+                conn.execute(f'''INSERT OR REPLACE INTO predictions
+                    (match_id, prediction_json, created_at, {", ".join(cols)})
+                    VALUES (?,?,?{",?" * len(cols)})''',
+                    (prediction.match_id, data_json, datetime.now().isoformat()) + values)
 
     def get_prediction(self, match_id: str) -> Optional[PredictionResult]:
         if self.use_supabase:
@@ -167,9 +435,8 @@ class DataManager:
                     return PredictionResult.model_validate(p_json)
                 return PredictionResult.model_validate_json(p_json)
         else:
-            conn = sqlite3.connect(self.db_path)
-            r = conn.execute('SELECT prediction_json FROM predictions WHERE match_id=?', (match_id,)).fetchone()
-            conn.close()
+            with self._conn() as conn:
+                r = conn.execute('SELECT prediction_json FROM predictions WHERE match_id=?', (match_id,)).fetchone()
             if r: return PredictionResult.model_validate_json(r[0])
         return None
 
@@ -182,23 +449,22 @@ class DataManager:
         if self.use_supabase:
             self._sb_upsert("resultados", {"match_id": match_id, **data, "created_at": now})
         else:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute('''INSERT OR REPLACE INTO resultados
-                (match_id, home_score, away_score, winner, corners, cards, shots,
-                 shots_on_target, home_corners, away_corners, home_cards, away_cards,
-                 home_shots, away_shots, home_shots_on_target, away_shots_on_target, created_at)
-                VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)''', (
-                match_id,
-                data.get("home_score", 0), data.get("away_score", 0), data.get("winner", ""),
-                data.get("corners", 0), data.get("cards", 0), data.get("shots", 0),
-                data.get("shots_on_target", 0),
-                data.get("home_corners", 0), data.get("away_corners", 0),
-                data.get("home_cards", 0), data.get("away_cards", 0),
-                data.get("home_shots", 0), data.get("away_shots", 0),
-                data.get("home_shots_on_target", 0), data.get("away_shots_on_target", 0),
-                now
-            ))
-            conn.commit(); conn.close()
+            with self.transaction() as conn:
+                conn.execute('''INSERT OR REPLACE INTO resultados
+                    (match_id, home_score, away_score, winner, corners, cards, shots,
+                     shots_on_target, home_corners, away_corners, home_cards, away_cards,
+                     home_shots, away_shots, home_shots_on_target, away_shots_on_target, created_at)
+                    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)''', (
+                    match_id,
+                    data.get("home_score", 0), data.get("away_score", 0), data.get("winner", ""),
+                    data.get("corners", 0), data.get("cards", 0), data.get("shots", 0),
+                    data.get("shots_on_target", 0),
+                    data.get("home_corners", 0), data.get("away_corners", 0),
+                    data.get("home_cards", 0), data.get("away_cards", 0),
+                    data.get("home_shots", 0), data.get("away_shots", 0),
+                    data.get("home_shots_on_target", 0), data.get("away_shots_on_target", 0),
+                    now
+                ))
 
     # =========================================================================
     # API PÚBLICA — Registro de Aprendizaje (errores por mercado)
@@ -207,51 +473,95 @@ class DataManager:
     def save_aprendizaje(self, records: List[dict]):
         """Guarda los registros de análisis de error por mercado."""
         now = datetime.now().isoformat()
+        if not records:
+            return
         if self.use_supabase:
-            for rec in records:
-                self._sb_upsert("aprendizaje", {**rec, "created_at": now})
+            # PostgREST acepta un array JSON: una sola petición para todos los registros
+            self._sb_upsert("aprendizaje", [{**rec, "created_at": now} for rec in records])
+            self.update_market_stats(records)
         else:
-            conn = sqlite3.connect(self.db_path)
-            for rec in records:
-                conn.execute('''INSERT INTO aprendizaje
+            with self.transaction() as conn:
+                conn.executemany('''INSERT INTO aprendizaje
                     (match_id, mercado, predicho, real, error_magnitud, acierto,
                      ajuste_aplicado, home_team, away_team, competition, created_at)
-                    VALUES (?,?,?,?,?,?,?,?,?,?,?)''', (
+                    VALUES (?,?,?,?,?,?,?,?,?,?,?)''', [(
                     rec.get("match_id"), rec.get("mercado"), rec.get("predicho"),
                     rec.get("real"), rec.get("error_magnitud", 0),
                     1 if rec.get("acierto") else 0,
                     rec.get("ajuste_aplicado", 0),
                     rec.get("home_team"), rec.get("away_team"),
                     rec.get("competition"), now
-                ))
-            conn.commit(); conn.close()
+                ) for rec in records])
+                # Estadísticas materializadas en la misma transacción
+                self._upsert_stats(conn, records)
 
     def get_aprendizaje_stats(self) -> Dict:
-        """Estadísticas de aprendizaje por mercado."""
-        stats = {}
+        """Estadísticas de aprendizaje por mercado (lectura de la tabla materializada)."""
+        return self.get_market_stats("global")
+
+    # =========================================================================
+    # API PÚBLICA — Estadísticas materializadas (incrementales)
+    # =========================================================================
+
+    def update_market_stats(self, records: List[dict]):
+        """
+        Suma los registros de aprendizaje de un resultado a las estadísticas
+        materializadas (global, competición, equipo y ventana móvil).
+        save_aprendizaje las actualiza en la misma transacción que inserta los
+        registros, así LearningEngine.process_result las mantiene al día.
+        """
+        if not records:
+            return
         if self.use_supabase:
-            rows = self._sb_get("aprendizaje", "select=mercado,acierto,error_magnitud")
+            with self._stats_lock:
+                if self._mem_stats is not None:
+                    self._apply_mem_stats(records)
         else:
-            conn = sqlite3.connect(self.db_path)
-            rows = conn.execute(
-                'SELECT mercado, acierto, error_magnitud FROM aprendizaje'
-            ).fetchall()
-            conn.close()
-            rows = [{"mercado": r[0], "acierto": r[1], "error_magnitud": r[2]} for r in rows]
-
-        mercados = {}
-        for row in rows:
-            m = row.get("mercado", "desconocido")
-            if m not in mercados:
-                mercados[m] = {"total": 0, "aciertos": 0, "error_total": 0.0}
-            mercados[m]["total"] += 1
-            mercados[m]["aciertos"] += int(row.get("acierto", 0))
-            mercados[m]["error_total"] += float(row.get("error_magnitud") or 0)
-
-        for m, d in mercados.items():
-            d["precision"] = round(d["aciertos"] / d["total"] * 100, 1) if d["total"] > 0 else 0
-            d["error_medio"] = round(d["error_total"] / d["total"], 2) if d["total"] > 0 else 0
-        return mercados
+            with self.transaction() as conn:
+                self._upsert_stats(conn, records)
+
+    def get_market_stats(self, ambito: str = "global", clave: str = "") -> Dict[str, dict]:
+        """
+        Estadísticas por mercado de un ámbito: "global", "competicion" (clave = liga)
+        o "equipo" (clave = nombre). Coste independiente del número de resultados.
+        """
+        if self.use_supabase:
+            with self._stats_lock:
+                if self._mem_stats is None:
+                    self._mem_stats = {}
+                    self._apply_mem_stats(self._sb_get("aprendizaje",
+                        "select=mercado,acierto,error_magnitud,home_team,away_team,competition"
+                        "&order=created_at.asc"))
+                return {m: _format_stats(d["total"], d["aciertos"], d["error_total"], d["ventana"])
+                        for (a, k, m), d in self._mem_stats.items() if a == ambito and k == clave}
+        with self._conn() as conn:
+            rows = conn.execute('''SELECT mercado, total, aciertos, error_total, ventana
+                FROM estadisticas_mercado WHERE ambito=? AND clave=?''', (ambito, clave)).fetchall()
+        return {m: _format_stats(t, a, e, v or "") for m, t, a, e, v in rows}
+
+    @staticmethod
+    def _upsert_stats(conn, records: List[dict]):
+        now = datetime.now().isoformat()
+        conn.executemany(f'''INSERT INTO estadisticas_mercado
+            (ambito, clave, mercado, total, aciertos, error_total, ventana, updated_at)
+            VALUES (?,?,?,1,?,?,?,?)
+            ON CONFLICT(ambito, clave, mercado) DO UPDATE SET
+                total = total + 1,
+                aciertos = aciertos + excluded.aciertos,
+                error_total = error_total + excluded.error_total,
+                ventana = substr(ventana || excluded.ventana, -{STATS_WINDOW}),
+                updated_at = excluded.updated_at''',
+            [(a, k, m, hit, err, str(hit), now) for a, k, m, hit, err in _stats_deltas(records)])
+
+    def _apply_mem_stats(self, records: List[dict]):
+        """Agregado en memoria para Supabase (sin tabla materializada remota)."""
+        for a, k, m, hit, err in _stats_deltas(records):
+            d = self._mem_stats.setdefault((a, k, m), {"total": 0, "aciertos": 0,
+                                                       "error_total": 0.0, "ventana": ""})
+            d["total"] += 1
+            d["aciertos"] += hit
+            d["error_total"] += err
+            d["ventana"] = (d["ventana"] + str(hit))[-STATS_WINDOW:]
 
     # =========================================================================
     # API PÚBLICA — Factores de Equipo
@@ -267,11 +577,10 @@ class DataManager:
             rows = self._sb_get("factores_equipo", f"equipo=eq.{requests.utils.quote(team_name)}")
             return rows[0] if rows else defaults
         else:
-            conn = sqlite3.connect(self.db_path)
-            r = conn.execute(
-                'SELECT * FROM factores_equipo WHERE equipo=?', (team_name,)
-            ).fetchone()
-            conn.close()
+            with self._conn() as conn:
+                r = conn.execute(
+                    'SELECT * FROM factores_equipo WHERE equipo=?', (team_name,)
+                ).fetchone()
             if r:
                 cols = ["equipo","sesgo_local","sesgo_visitante","sesgo_empate",
                         "sesgo_corners","sesgo_cards","total_partidos","aciertos","updated_at"]
@@ -279,6 +588,11 @@ class DataManager:
             return defaults
 
     def update_team_factor(self, team_name: str, campo: str, delta: float):
+        # Lectura + escritura en la misma transacción: evita perder incrementos concurrentes
+        with self.transaction():
+            self._update_team_factor(team_name, campo, delta)
+
+    def _update_team_factor(self, team_name: str, campo: str, delta: float):
         now = datetime.now().isoformat()
         current = self.get_team_factor(team_name)
         current[campo] = round(float(current.get(campo, 0.0)) + delta, 4)
@@ -288,32 +602,65 @@ class DataManager:
         if self.use_supabase:
             self._sb_upsert("factores_equipo", current)
         else:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute('''INSERT OR REPLACE INTO factores_equipo
-                (equipo, sesgo_local, sesgo_visitante, sesgo_empate,
-                 sesgo_corners, sesgo_cards, total_partidos, aciertos, updated_at)
-                VALUES (?,?,?,?,?,?,?,?,?)''', (
-                team_name,
-                current.get("sesgo_local", 0.0), current.get("sesgo_visitante", 0.0),
-                current.get("sesgo_empate", 0.0), current.get("sesgo_corners", 0.0),
-                current.get("sesgo_cards", 0.0), current.get("total_partidos", 0),
-                current.get("aciertos", 0), now
-            ))
-            conn.commit(); conn.close()
+            with self.transaction() as conn:
+                conn.execute('''INSERT OR REPLACE INTO factores_equipo
+                    (equipo, sesgo_local, sesgo_visitante, sesgo_empate,
+                     sesgo_corners, sesgo_cards, total_partidos, aciertos, updated_at)
+                    VALUES (?,?,?,?,?,?,?,?,?)''', (
+                    team_name,
+                    current.get("sesgo_local", 0.0), current.get("sesgo_visitante", 0.0),
+                    current.get("sesgo_empate", 0.0), current.get("sesgo_corners", 0.0),
+                    current.get("sesgo_cards", 0.0), current.get("total_partidos", 0),
+                    current.get("aciertos", 0), now
+                ))
 
     def get_all_team_factors(self) -> List[dict]:
         if self.use_supabase:
             return self._sb_get("factores_equipo", "order=total_partidos.desc")
         else:
-            conn = sqlite3.connect(self.db_path)
-            rows = conn.execute(
-                'SELECT * FROM factores_equipo ORDER BY total_partidos DESC'
-            ).fetchall()
-            conn.close()
+            with self._conn() as conn:
+                rows = conn.execute(
+                    'SELECT * FROM factores_equipo ORDER BY total_partidos DESC'
+                ).fetchall()
             cols = ["equipo","sesgo_local","sesgo_visitante","sesgo_empate",
                     "sesgo_corners","sesgo_cards","total_partidos","aciertos","updated_at"]
             return [dict(zip(cols, r)) for r in rows]
 
+    def get_market_hit_rates(self, competition: Optional[str] = None) -> Dict[str, dict]:
+        """
+        Aciertos por mercado {mercado: {"hits", "total", "precision"}}.
+        Lee las estadísticas materializadas; si aún no hay aprendizaje registrado,
+        compara en SQL resultados con las columnas tipadas de predictions
+        (sin decodificar ningún JSON).
+        """
+        stats = (self.get_market_stats("competicion", competition) if competition
+                 else self.get_market_stats("global"))
+        if stats or self.use_supabase:
+            return {m: {"hits": d["aciertos"], "total": d["total"], "precision": round(d["precision"])}
+                    for m, d in stats.items()}
+
+        comp_filter, params = ("WHERE m.competition = ?", (competition,)) if competition else ("", ())
+        with self._conn() as conn:
+            row = conn.execute(f'''
+                SELECT COUNT(*),
+                    SUM(CASE WHEN p.win_prob_home > 0.45 THEN 'LOCAL'
+                             WHEN p.win_prob_away > 0.45 THEN 'VISITANTE'
+                             ELSE 'EMPATE' END = r.winner),
+                    SUM(r.corners BETWEEN p.corners_lo AND p.corners_hi), COUNT(p.corners_lo),
+                    SUM(r.cards BETWEEN p.cards_lo AND p.cards_hi), COUNT(p.cards_lo),
+                    SUM(r.shots BETWEEN p.shots_lo AND p.shots_hi), COUNT(p.shots_lo)
+                FROM resultados r
+                LEFT JOIN predictions p ON p.match_id = r.match_id
+                LEFT JOIN matches m ON m.id = r.match_id
+                {comp_filter}''', params).fetchone()
+        rows = [("1X2", row[1], row[0]), ("Córners", row[2], row[3]),
+                ("Tarjetas", row[4], row[5]), ("Remates", row[6], row[7])]
+        return {
+            m: {"hits": int(hits or 0), "total": total,
+                "precision": round(int(hits or 0) / total * 100) if total else 0}
+            for m, hits, total in rows if total
+        }
+
     def get_total_stats(self) -> dict:
         """Estadísticas globales del sistema."""
         stats = self.get_aprendizaje_stats()
@@ -408,19 +755,18 @@ class DataManager:
                 print(f"[DB] Error get_all_studies Supabase: {e}")
         else:
             try:
-                conn = sqlite3.connect(self.db_path)
-                # Predicciones
-                rows = conn.execute('''
-                    SELECT p.match_id, p.created_at,
-                           m.home_team, m.away_team, m.date, m.competition
-                    FROM predictions p
-                    LEFT JOIN matches m ON p.match_id = m.id
-                    ORDER BY p.created_at DESC LIMIT ?
-                ''', (limit,)).fetchall()
-                # IDs ya validados
-                res_rows = conn.execute('SELECT match_id FROM resultados').fetchall()
+                with self._conn() as conn:
+                    # Predicciones
+                    rows = conn.execute('''
+                        SELECT p.match_id, p.created_at,
+                               m.home_team, m.away_team, m.date, m.competition
+                        FROM predictions p
+                        LEFT JOIN matches m ON p.match_id = m.id
+                        ORDER BY p.created_at DESC LIMIT ?
+                    ''', (limit,)).fetchall()
+                    # IDs ya validados
+                    res_rows = conn.execute('SELECT match_id FROM resultados').fetchall()
                 res_ids = {r[0] for r in res_rows}
-                conn.close()
                 for row in rows:
                     mid, created, home, away, date, comp = row
                     studies.append({
@@ -436,6 +782,61 @@ class DataManager:
                 print(f"[DB] Error get_all_studies: {e}")
 
         return studies
+
+    def get_pending_studies(self, date_from: Optional[str] = None,
+                            date_to: Optional[str] = None) -> List[dict]:
+        """
+        Estudios sin resultado real (predicción guardada, partido entre
+        ``date_from`` y ``date_to`` inclusive, "YYYY-MM-DD"). En SQLite es una
+        sola consulta sobre idx_matches_date y las claves primarias.
+        """
+        if self.use_supabase:
+            studies = [s for s in self.get_all_studies(limit=200) if "PENDIENTE" in s["status"]]
+            return [s for s in studies
+                    if (not date_from or s["date"] >= date_from) and (not date_to or s["date"] <= date_to)]
+        with self._conn() as conn:
+            rows = conn.execute('''
+                SELECT p.match_id, m.home_team, m.away_team, m.date, m.competition
+                FROM matches m
+                JOIN predictions p ON p.match_id = m.id
+                LEFT JOIN resultados r ON r.match_id = m.id
+                WHERE r.match_id IS NULL AND m.date >= ? AND m.date < ?
+            ''', (date_from or "", (date_to or "9999-12-31") + "~")).fetchall()
+        return [{"match_id": r[0], "home_team": r[1], "away_team": r[2],
+                 "date": (r[3] or "")[:10], "competition": r[4] or ""} for r in rows]
+
+    # =========================================================================
+    # API PÚBLICA — Marca de agua de sincronización
+    # =========================================================================
+
+    def get_sync_mark(self, source: str, clave: str) -> int:
+        """Timestamp (unix) del último partido sincronizado para (fuente, liga); 0 si nunca."""
+        if self.use_supabase:
+            rows = self._sb_get("sync_state", f"source=eq.{source}&clave=eq.{clave}&select=last_ts")
+            return int(rows[0]["last_ts"] or 0) if rows else 0
+        with self._conn() as conn:
+            r = conn.execute("SELECT last_ts FROM sync_state WHERE source=? AND clave=?",
+                             (source, clave)).fetchone()
+        return int(r[0] or 0) if r else 0
+
+    def set_sync_mark(self, source: str, clave: str, last_ts: int, last_fixture_id: Optional[int] = None):
+        """Avanza la marca de agua (nunca la retrocede)."""
+        now = datetime.now().isoformat()
+        if self.use_supabase:
+            if int(last_ts) > self.get_sync_mark(source, clave):
+                self._sb_upsert("sync_state", {"source": source, "clave": clave, "last_ts": int(last_ts),
+                                               "last_fixture_id": last_fixture_id, "updated_at": now})
+            return
+        with self.transaction() as conn:
+            conn.execute('''INSERT INTO sync_state (source, clave, last_ts, last_fixture_id, updated_at)
+                VALUES (?,?,?,?,?)
+                ON CONFLICT(source, clave) DO UPDATE SET
+                    last_fixture_id = CASE WHEN excluded.last_ts > last_ts
+                                           THEN excluded.last_fixture_id ELSE last_fixture_id END,
+                    last_ts = MAX(last_ts, excluded.last_ts),
+                    updated_at = excluded.updated_at''',
+                (source, clave, int(last_ts), last_fixture_id, now))
+
     def delete_study(self, match_id: str) -> bool:
         """
         Elimina un estudio (predicción + partido) de la BD.
@@ -452,11 +853,9 @@ class DataManager:
                 url_match = f"{self.supabase_url}/rest/v1/matches?id=eq.{match_id}"
                 _req.delete(url_match, headers=headers, timeout=10)
             else:
-                conn = sqlite3.connect(self.db_path)
-                conn.execute("DELETE FROM predictions WHERE match_id=?", (match_id,))
-                conn.execute("DELETE FROM matches WHERE id=?", (match_id,))
-                conn.commit()
-                conn.close()
+                with self.transaction() as conn:
+                    conn.execute("DELETE FROM predictions WHERE match_id=?", (match_id,))
+                    conn.execute("DELETE FROM matches WHERE id=?", (match_id,))
             print(f"[DB] ✅ Estudio eliminado: {match_id}")
             return True
         except Exception as e:
@@ -470,7 +869,6 @@ class DataManager:
         Si está vacía, reconstruye los semáforos desde resultados+predictions.
         """
         from collections import OrderedDict
-        import json, re
 
         results = []
         try:
@@ -480,11 +878,10 @@ class DataManager:
                     f"select=match_id,mercado,predicho,real,acierto,home_team,away_team,competition,created_at"
                     f"&order=created_at.desc&limit={limit*4}")
             else:
-                conn = sqlite3.connect(self.db_path)
-                raw = conn.execute(
-                    "SELECT match_id,mercado,predicho,real,acierto,home_team,away_team,competition,created_at "
-                    "FROM aprendizaje ORDER BY created_at DESC LIMIT ?", (limit*4,)).fetchall()
-                conn.close()
+                with self._conn() as conn:
+                    raw = conn.execute(
+                        "SELECT match_id,mercado,predicho,real,acierto,home_team,away_team,competition,created_at "
+                        "FROM aprendizaje ORDER BY created_at DESC LIMIT ?", (limit*4,)).fetchall()
                 rows = [{"match_id":r[0],"mercado":r[1],"predicho":r[2],"real":r[3],
                          "acierto":r[4],"home_team":r[5],"away_team":r[6],
                          "competition":r[7],"created_at":r[8]} for r in raw]
@@ -540,19 +937,7 @@ class DataManager:
                 all_preds = {p["match_id"]: p for p in (self._sb_get("predictions",
                     "select=match_id,prediction_json") or [])}
             else:
-                conn = sqlite3.connect(self.db_path)
-                r_raw = conn.execute(
-                    "SELECT match_id,home_score,away_score,winner,corners,cards,shots,created_at "
-                    "FROM resultados ORDER BY created_at DESC LIMIT 50").fetchall()
-                res_rows = [{"match_id":r[0],"home_score":r[1],"away_score":r[2],
-                             "winner":r[3],"corners":r[4],"cards":r[5],
-                             "shots":r[6],"created_at":r[7]} for r in r_raw]
-                m_raw = conn.execute("SELECT id,home_team,away_team,competition,date FROM matches").fetchall()
-                all_matches = {r[0]:{"id":r[0],"home_team":r[1],"away_team":r[2],
-                                     "competition":r[3],"date":r[4]} for r in m_raw}
-                p_raw = conn.execute("SELECT match_id,prediction_json FROM predictions").fetchall()
-                all_preds = {r[0]:{"match_id":r[0],"prediction_json":r[1]} for r in p_raw}
-                conn.close()
+                return self._semaforo_from_columns(limit)
 
             for res in res_rows:
                 mid = res.get("match_id","")
@@ -588,16 +973,7 @@ class DataManager:
                     "acierto": pred_winner == real_winner
                 }
 
-                # Córners
-                def parse_range(s):
-                    nums = re.findall(r"\d+", str(s or ""))
-                    if not nums: return None, None
-                    if len(nums) >= 4:
-                        c=[int(nums[0])+int(nums[2]),int(nums[1])+int(nums[3]),int(nums[0])+int(nums[3]),int(nums[1])+int(nums[2])]
-                        return min(c), max(c)
-                    if len(nums) >= 2: return int(nums[0]), int(nums[1])
-                    return int(nums[0]), int(nums[0])
-
+                # Córners / Tarjetas / Remates
                 for key, pred_key, real_val in [
                     ("Córners",  "predicted_corners", real_corners),
                     ("Tarjetas", "predicted_cards",   real_cards),
@@ -624,3 +1000,40 @@ class DataManager:
         except Exception as e:
             print(f"[DB] Error get_semaforo_history: {e}")
         return results[:limit]
+
+    def _semaforo_from_columns(self, limit: int) -> List[dict]:
+        """Semáforos reconstruidos en SQL desde resultados + columnas tipadas de predictions."""
+        with self._conn() as conn:
+            rows = conn.execute('''
+                SELECT r.match_id, COALESCE(m.home_team, '?'), COALESCE(m.away_team, '?'),
+                       COALESCE(m.competition, ''), r.created_at,
+                       r.winner, r.corners, r.cards, r.shots,
+                       CASE WHEN p.win_prob_home > 0.45 THEN 'LOCAL'
+                            WHEN p.win_prob_away > 0.45 THEN 'VISITANTE'
+                            ELSE 'EMPATE' END,
+                       p.corners_lo, p.corners_hi, p.cards_lo, p.cards_hi,
+                       p.shots_lo, p.shots_hi
+                FROM resultados r
+                LEFT JOIN predictions p ON p.match_id = r.match_id
+                LEFT JOIN matches m ON m.id = r.match_id
+                ORDER BY r.created_at DESC LIMIT 50''').fetchall()
+
+        results = []
+        for (mid, home, away, comp, created, real_winner, corners, cards, shots,
+             pred_winner, c_lo, c_hi, k_lo, k_hi, s_lo, s_hi) in rows:
+            mercados = {"1X2": {"predicho": pred_winner, "real": real_winner or "",
+                                "acierto": pred_winner == real_winner}}
+            for key, lo, hi, real_val in [
+                ("Córners",  c_lo, c_hi, int(corners or 0)),
+                ("Tarjetas", k_lo, k_hi, int(cards or 0)),
+                ("Remates",  s_lo, s_hi, int(shots or 0)),
+            ]:
+                if lo is not None:
+                    mercados[key] = {"predicho": f"{lo}-{hi}", "real": str(real_val),
+                                     "acierto": lo <= real_val <= hi}
+            results.append({
+                "match_id": mid, "home_team": home, "away_team": away,
+                "competition": comp, "created_at": (created or "")[:10],
+                "mercados": mercados
+            })
+        return results[:limit]
@@ -0,0 +1,195 @@
+"""
+Ingesta de feeds RSS (Google News) — LAGEMA JARG74
+===================================================
+Capa de descarga compartida por los analistas de prensa:
+
+- Todas las búsquedas de un partido (3 por equipo) se piden a la vez sobre
+  la sesión HTTP con pool de ``cache_manager``; la latencia en el peor caso
+  es un único timeout en lugar de la suma de seis.
+- ``cached_get`` revalida con If-None-Match / If-Modified-Since: un 304 no
+  vuelve a bajar el XML, y si el cuerpo no cambió tampoco se vuelve a parsear.
+- Los titulares se deduplican por GUID (la misma noticia aparece en varias
+  búsquedas) y se guardan en un ``FeedStore`` con ventana temporal que leen
+  los análisis posteriores; si una búsqueda falla se usan sus últimos
+  titulares dentro de la ventana.
+
+Uso:
+    ingestor = get_feed_ingestor()
+    por_query = ingestor.ingest(["Sevilla lesión baja", "Betis vestuario"])
+    items = ingestor.store.items(por_query.keys())
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from src.data.cache_manager import CacheManager, cached_get
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_NEWS_RSS = "https://news.google.com/rss/search?q={query}&hl=es&gl=ES&ceid=ES:es"
+FEED_CATEGORY = "rss_feeds"
+WINDOW_DAYS = 7
+
+
+def google_news_url(query: str) -> str:
+    return GOOGLE_NEWS_RSS.format(query=quote(query))
+
+
+def parse_rss(content: bytes, max_items: Optional[int] = None,
+              window_days: int = WINDOW_DAYS, now: Optional[datetime] = None) -> List[Dict]:
+    """
+    Titulares de un RSS como {guid, title, source, date, snippet, published}.
+    Descarta los publicados hace más de ``window_days`` días.
+    """
+    root = ET.fromstring(content)
+    channel = root.find('channel')
+    if channel is None:
+        return []
+    cutoff = (now or datetime.now()) - timedelta(days=window_days)
+    items = []
+    for item in channel.findall('item')[:max_items]:
+        title = item.findtext('title', '') or ''
+        pub_date_str = item.findtext('pubDate', '') or ''
+        published = None
+        try:
+            published = parsedate_to_datetime(pub_date_str).replace(tzinfo=None)
+            if published < cutoff:
+                continue
+        except (TypeError, ValueError):
+            pass
+        clean_desc = re.sub(r'<[^>]+>', '', item.findtext('description', '') or '').strip()
+        items.append({
+            "guid": (item.findtext('guid') or item.findtext('link') or title).strip(),
+            "title": title,
+            "source": item.findtext('source', '') or '',
+            "date": pub_date_str[:16] if pub_date_str else "",
+            "snippet": clean_desc[:200] if clean_desc else title,
+            "published": published.isoformat() if published else None,
+        })
+    return items
+
+
+class FeedStore:
+    """Titulares por GUID con ventana temporal, y el último resultado de cada búsqueda."""
+
+    def __init__(self, window_days: int = WINDOW_DAYS, clock=time.time):
+        self.window_s = window_days * 86400
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._items: Dict[str, Tuple[float, Dict]] = {}    # guid → (publicado o visto, item)
+        self._queries: Dict[str, List[str]] = {}           # búsqueda → guids en orden
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, query: str, items: List[Dict]):
+        now = self._clock()
+        with self._lock:
+            for item in items:
+                published = item.get("published")
+                ts = datetime.fromisoformat(published).timestamp() if published else now
+                self._items[item["guid"]] = (ts, item)
+            self._queries[query] = [item["guid"] for item in items]
+            self._prune(now)
+
+    def has(self, query: str) -> bool:
+        return query in self._queries
+
+    def items(self, queries: Iterable[str], per_query: Optional[int] = None) -> List[Dict]:
+        """Titulares vigentes de las búsquedas, sin duplicados y en orden de búsqueda."""
+        out, seen = [], set()
+        now = self._clock()
+        with self._lock:
+            for query in queries:
+                for guid in self._queries.get(query, [])[:per_query]:
+                    if guid in seen or guid not in self._items or now - self._items[guid][0] > self.window_s:
+                        continue
+                    seen.add(guid)
+                    out.append(self._items[guid][1])
+        return out
+
+    def _prune(self, now: float):
+        expired = [g for g, (ts, _) in self._items.items() if now - ts > self.window_s]
+        for guid in expired:
+            del self._items[guid]
+
+
+class FeedIngestor:
+    """Descarga concurrente y condicional de búsquedas de Google News RSS."""
+
+    def __init__(self, store: Optional[FeedStore] = None, max_workers: int = 8,
+                 timeout: float = 8, headers: Optional[Dict] = None, url_for=google_news_url,
+                 cache: Optional[CacheManager] = None, ttl: Optional[float] = None):
+        self.store = store or FeedStore()
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._url_for = url_for
+        self._cache = cache
+        self._ttl = ttl
+        self._parsed: Dict[str, Tuple[str, List[Dict]]] = {}   # url → (hash del cuerpo, items)
+        self._lock = threading.Lock()
+        self.stats = {"fetched": 0, "parsed": 0, "unchanged": 0, "errors": 0}
+
+    def ingest(self, queries: Iterable[str], max_items: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """
+        Descarga todas las búsquedas en paralelo y las publica en el store.
+        Devuelve {búsqueda: titulares}; una búsqueda fallida devuelve los
+        últimos titulares que tenga el store.
+        """
+        queries = list(dict.fromkeys(queries))
+        if not queries:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(queries))),
+                                thread_name_prefix="rss") as pool:
+            fetched = dict(zip(queries, pool.map(lambda q: self._fetch(q, max_items), queries)))
+        for query, items in fetched.items():
+            if items is not None:
+                self.store.add(query, items)
+        return {q: self.store.items([q]) for q in queries}
+
+    def _fetch(self, query: str, max_items: Optional[int]) -> Optional[List[Dict]]:
+        url = self._url_for(query)
+        try:
+            resp = cached_get(url, category=FEED_CATEGORY, headers=self.headers, timeout=self.timeout,
+                              ttl=self._ttl, cache=self._cache)
+            if resp.status_code != 200:
+                return None
+            self.stats["fetched"] += 1
+            digest = hashlib.sha1(resp.content).hexdigest()
+            with self._lock:
+                previous = self._parsed.get(url)
+            if previous and previous[0] == digest:
+                self.stats["unchanged"] += 1
+                return previous[1][:max_items]
+            items = parse_rss(resp.content)
+            self.stats["parsed"] += 1
+            with self._lock:
+                self._parsed[url] = (digest, items)
+            return items[:max_items]
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"[RSS] Error en la búsqueda '{query}': {e}")
+            return None
+
+
+_default_ingestor: Optional[FeedIngestor] = None
+_init_lock = threading.Lock()
+
+
+def get_feed_ingestor(headers: Optional[Dict] = None) -> FeedIngestor:
+    """Ingestor (y store) compartido por todo el proceso."""
+    global _default_ingestor
+    with _init_lock:
+        if _default_ingestor is None:
+            _default_ingestor = FeedIngestor(headers=headers)
+        return _default_ingestor
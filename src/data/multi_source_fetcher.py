@@ -6,14 +6,31 @@ Alineaciones → 0.API-Football  1.SofaScore  2.LigaScraper  3.BeSoccer  4.BD in
 
 ACTUALIZACIÓN: API-Football es ahora FUENTE 0 (máxima prioridad) para árbitros y alineaciones.
 Esto garantiza que los datos oficiales de la API se usen ANTES que cualquier scraper.
+
+MODO RACE (por defecto): todas las fuentes arrancan en paralelo y se acepta la
+respuesta de mayor prioridad que llegue antes del deadline; el resto se cancela.
+La traza (fuente ganadora + tiempo por fuente) queda en `MultiSourceFetcher.last_trace`.
+
+SINGLE-FLIGHT: consultas idénticas simultáneas (mismo partido, varias sesiones)
+comparten una única cascada; las que se suben a una en vuelo quedan con
+`coalesced=True` en su traza.
 """
+import copy
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.data.rate_limiter import Priority, request_priority
+from src.data.single_flight import get_flight_group
+
+_FLIGHTS = get_flight_group("multi_source_fetcher")
 
 
 def _norm_league(league):
     n = league.lower().split("(")[0].strip().replace("ea sports","").replace("santander","").strip()
-    if "la liga" in n or "primera" in n or "espa" in n: return "La Liga"
+    if "la liga" in n or "laliga" in n or "primera" in n or "espa" in n: return "La Liga"
     if "premier" in n: return "Premier League"
     if "serie a" in n or "italia" in n: return "Serie A"
     if "bundesliga" in n or "german" in n: return "Bundesliga"
@@ -87,6 +104,38 @@ def _norm_team_name(name):
     return n.strip()
 
 
+KICKOFF_CRITICAL_HOURS = 3.0   # ventana previa al partido con prioridad CRITICAL
+
+
+def _kickoff_priority(match_date) -> Priority:
+    """
+    Prioridad de las peticiones a APIs para un partido: CRITICAL si empieza en
+    las próximas horas (alineaciones/árbitro), NORMAL en otro caso. Una fecha
+    sin hora cuenta como "hoy".
+    """
+    if isinstance(match_date, str):
+        try:
+            match_date = datetime.fromisoformat(match_date[:19])
+        except ValueError:
+            return Priority.NORMAL
+    if not isinstance(match_date, datetime):
+        return Priority.NORMAL
+    now = datetime.now(match_date.tzinfo)
+    if match_date.time() == datetime.min.time():
+        return Priority.CRITICAL if match_date.date() == now.date() else Priority.NORMAL
+    hours = (match_date - now).total_seconds() / 3600.0
+    return Priority.CRITICAL if -2.0 <= hours <= KICKOFF_CRITICAL_HOURS else Priority.NORMAL
+
+
+def _match_key(home, away, match_date, league) -> Tuple:
+    """Clave de coalescencia de un partido (equipos y liga normalizados + fecha)."""
+    if hasattr(match_date, "isoformat"):
+        when = match_date.isoformat()
+    else:
+        when = str(match_date) if match_date else datetime.now().strftime("%Y-%m-%d")
+    return (_norm_team_name(home), _norm_team_name(away), when, _norm_league(league or ""))
+
+
 def _find_fixture_id(af_client, home, away, league, match_date):
     """
     Busca el fixture_id de un partido en API-Football buscando por equipos y fecha.
@@ -159,7 +208,172 @@ def _find_fixture_id(af_client, home, away, league, match_date):
     return None
 
 
+# Resultado de ejecutar una fuente: (resultado o None, estado, segundos)
+_SourceOutcome = Tuple[Optional[Dict], str, float]
+
+
 class MultiSourceFetcher:
+    """
+    Cascada de fuentes con dos modos de ejecución:
+
+    - race=True (por defecto): todas las fuentes elegibles arrancan a la vez en un
+      pool de hilos. Se acepta la respuesta de MAYOR PRIORIDAD disponible: una fuente
+      gana en cuanto todas las de prioridad superior han terminado sin datos. Si vence
+      el deadline, se usa la mejor respuesta recibida hasta ese momento y el resto se
+      cancela (las que ya están en vuelo se abandonan).
+    - race=False: orden estricto de prioridad, una fuente tras otra (modo original).
+
+    Las fuentes de pago (Claude) son "diferidas": solo se lanzan cuando todas las
+    fuentes de prioridad superior han terminado sin resultado, igual que en la
+    cascada secuencial.
+
+    Cada consulta deja su traza en `last_trace` (fuente ganadora, estado y tiempo
+    de cada fuente) y en el histórico acotado `traces`.
+    """
+
+    RACE_DEADLINE = 20.0   # segundos máximos de espera en modo race
+    MAX_WORKERS = 8
+    TRACE_HISTORY = 50
+
+    def __init__(self, race: bool = True, deadline: float = RACE_DEADLINE,
+                 max_workers: int = MAX_WORKERS):
+        self.race = race
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.last_trace: Dict = {}
+        self.traces: deque = deque(maxlen=self.TRACE_HISTORY)
+
+    # =========================================================================
+    # MOTOR DE CASCADA (secuencial o race)
+    # =========================================================================
+    @staticmethod
+    def _run_source(name: str, fn: Callable[[], Optional[Dict]]) -> _SourceOutcome:
+        t0 = time.perf_counter()
+        try:
+            result = fn()
+            status = "ok" if result else "empty"
+        except Exception as e:
+            print(f"  [{name}] {e}")
+            result, status = None, "error"
+        return result, status, round(time.perf_counter() - t0, 3)
+
+    def _run_cascade(self, kind: str, sources: List[Tuple[str, Callable, bool]],
+                     key: Optional[Tuple] = None, ctx: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Ejecuta `sources` — lista priorizada de (nombre, función, diferida) — y
+        devuelve el resultado de la fuente ganadora (o None si ninguna responde).
+        Con `key`, las llamadas concurrentes con la misma clave comparten la cascada:
+        cada llamada recibe su propia copia del resultado (el llamador la modifica)
+        y `ctx` — datos que dejan las fuentes, como el enlace de SofaScore — se
+        rellena con los de la cascada que realmente se ejecutó.
+        """
+        if key is None:
+            return self._cascade(kind, sources, ctx)[0]
+        (result, trace, shared_ctx), shared = _FLIGHTS.do((kind,) + key, lambda: self._cascade(kind, sources, ctx))
+        if shared:
+            trace = {**trace, "coalesced": True}
+            self.last_trace = trace
+            self.traces.append(trace)
+            if ctx is not None:
+                ctx.update(copy.deepcopy(shared_ctx))
+            print(f"  [MSF] {kind}: compartido con una consulta en vuelo (ganador={trace['winner'] or '—'})")
+        return copy.deepcopy(result)
+
+    def _cascade(self, kind: str, sources, ctx: Optional[Dict] = None) -> Tuple[Optional[Dict], Dict, Dict]:
+        t0 = time.perf_counter()
+        if self.race:
+            winner, result, timings = self._race(sources)
+        else:
+            winner, result, timings = self._sequential(sources)
+
+        trace = {
+            "kind": kind,
+            "mode": "race" if self.race else "sequential",
+            "winner": winner,
+            "total_seconds": round(time.perf_counter() - t0, 3),
+            "sources": timings,
+        }
+        self.last_trace = trace
+        self.traces.append(trace)
+        print(f"  [MSF] {kind}: ganador={winner or '—'} en {trace['total_seconds']}s ({trace['mode']})")
+        return result, trace, dict(ctx or {})
+
+    def _sequential(self, sources):
+        timings: Dict[str, Dict] = {}
+        for name, fn, _deferred in sources:
+            result, status, secs = self._run_source(name, fn)
+            timings[name] = {"status": status, "seconds": secs}
+            if result:
+                for rest, _, _ in sources[len(timings):]:
+                    timings[rest] = {"status": "skipped", "seconds": 0.0}
+                return name, result, timings
+        return None, None, timings
+
+    def _race(self, sources):
+        timings: Dict[str, Dict] = {}
+        futures: Dict[int, Future] = {}
+        start = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="msf")
+
+        def launch(i):
+            name, fn, _ = sources[i]
+            futures[i] = pool.submit(self._run_source, name, fn)
+
+        for i, (_, _, deferred) in enumerate(sources):
+            if not deferred:
+                launch(i)
+
+        winner_idx = None
+        try:
+            while True:
+                # Recorrer en orden de prioridad: la primera fuente sin terminar bloquea
+                # a las de menor prioridad; la primera con datos gana.
+                blocked = False
+                for i in range(len(sources)):
+                    fut = futures.get(i)
+                    if fut is None:
+                        launch(i)   # diferida: las superiores ya fallaron
+                        blocked = True
+                        break
+                    if not fut.done():
+                        blocked = True
+                        break
+                    if fut.result()[0]:
+                        winner_idx = i
+                        break
+                if winner_idx is not None or not blocked:
+                    break
+
+                remaining = self.deadline - (time.perf_counter() - start)
+                if remaining <= 0:
+                    # Deadline: mejor respuesta ya recibida, por prioridad
+                    for i in sorted(futures):
+                        fut = futures[i]
+                        if fut.done() and fut.result()[0]:
+                            winner_idx = i
+                            break
+                    break
+                pending = [f for f in futures.values() if not f.done()]
+                wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        for i, (name, _, _) in enumerate(sources):
+            fut = futures.get(i)
+            if fut is None:
+                timings[name] = {"status": "skipped", "seconds": 0.0}
+            elif fut.cancelled():
+                timings[name] = {"status": "cancelled", "seconds": 0.0}
+            elif not fut.done():
+                timings[name] = {"status": "timeout",
+                                 "seconds": round(time.perf_counter() - start, 3)}
+            else:
+                _, status, secs = fut.result()
+                timings[name] = {"status": status, "seconds": secs}
+
+        if winner_idx is None:
+            return None, None, timings
+        return sources[winner_idx][0], futures[winner_idx].result()[0], timings
 
     # =========================================================================
     # ÁRBITROS — cascada de 7 fuentes (API-Football es FUENTE 0)
@@ -167,7 +381,7 @@ class MultiSourceFetcher:
     def fetch_referee(self, home, away, match_date, league):
         print(f"\n[MSF] ÁRBITRO: {home} vs {away} | {league}")
         safe_date = match_date if match_date else datetime.now()
-        sofa_link = None
+        ctx: Dict = {}   # datos compartidos entre fuentes (enlace SofaScore)
 
         # Calcular horas para el partido
         try:
@@ -175,155 +389,26 @@ class MultiSourceFetcher:
         except Exception:
             hours = 999
 
-        # ── FUENTE 0: API-Football (DATOS OFICIALES — MÁXIMA PRIORIDAD) ──────
-        # API-Football incluye el árbitro en el campo "referee" de cada fixture.
-        # Esta es la fuente más fiable: datos oficiales directamente de la API.
-        af_client = _get_api_football_client()
-        if af_client:
-            try:
-                fixture_id = _find_fixture_id(af_client, home, away, league, safe_date)
-                if fixture_id:
-                    ref_data = af_client.get_referee_from_fixture(fixture_id)
-                    if ref_data and ref_data.get("name"):
-                        ref_name = ref_data["name"]
-                        print(f"  [0-API-Football] ✅ {ref_name} (fixture_id={fixture_id})")
-                        # Obtener perfil estadístico del árbitro
-                        try:
-                            profile = af_client.compute_referee_profile(ref_name)
-                            avg_cards = profile.get("avg_cards", "?")
-                            strictness = profile.get("strictness", "MEDIUM")
-                            matches_count = profile.get("matches_count", 0)
-                        except Exception:
-                            avg_cards = "?"
-                            strictness = "MEDIUM"
-                            matches_count = 0
-
-                        # Mapear strictness al formato de la app
-                        from src.models.base import RefereeStrictness
-                        strict_map = {
-                            "HIGH": RefereeStrictness.HIGH,
-                            "LOW": RefereeStrictness.LOW,
-                            "MEDIUM": RefereeStrictness.MEDIUM,
-                        }
-                        ref_result = {
-                            "name": ref_name,
-                            "strictness": strict_map.get(strictness, RefereeStrictness.MEDIUM),
-                            "avg_cards": avg_cards if avg_cards != "?" else 4.0,
-                            "source": f"API-Football (oficial)",
-                            "verification_link": f"https://www.sofascore.com",
-                            "_is_fallback": False,
-                            "fixture_id": fixture_id,
-                            "profile": profile if 'profile' in dir() else {},
-                            "confidence": ref_data.get("confidence", "HIGH"),
-                        }
-                        return _enrich(ref_result)
-                else:
-                    print(f"  [0-API-Football] No se encontró fixture_id para {home} vs {away}")
-            except Exception as e:
-                print(f"  [0-API-Football] Error: {e}")
-
-        # ── FUENTE 0b: Football-Data.org (verificación adicional) ─────────────
-        fd_client = _get_football_data_client()
-        if fd_client:
-            try:
-                from src.data.football_data_org import COMPETITION_CODES
-                comp_code = COMPETITION_CODES.get(_norm_league(league))
-                if comp_code:
-                    # Buscar partido con árbitro en Football-Data.org
-                    matches = fd_client.get_upcoming_matches(comp_code)
-                    if not matches:
-                        matches = fd_client.get_matches_today(comp_code)
-                    for m in (matches or []):
-                        mh = m.get("homeTeam", {}).get("shortName", "") or m.get("homeTeam", {}).get("name", "")
-                        ma = m.get("awayTeam", {}).get("shortName", "") or m.get("awayTeam", {}).get("name", "")
-                        if (_norm_team_name(mh) in _norm_team_name(home) or
-                            _norm_team_name(home) in _norm_team_name(mh)):
-                            if (_norm_team_name(ma) in _norm_team_name(away) or
-                                _norm_team_name(away) in _norm_team_name(ma)):
-                                # Obtener árbitros del partido
-                                match_id = m.get("id")
-                                if match_id:
-                                    try:
-                                        match_detail = fd_client.get_match_with_referees(match_id)
-                                        if match_detail and match_detail.get("referees"):
-                                            for ref_info in match_detail["referees"]:
-                                                if ref_info.get("role") in ("REFEREE", None, ""):
-                                                    ref_name = ref_info.get("name", "")
-                                                    if ref_name:
-                                                        print(f"  [0b-FootballData] ✅ {ref_name}")
-                                                        from src.models.base import RefereeStrictness
-                                                        return _enrich({
-                                                            "name": ref_name,
-                                                            "strictness": RefereeStrictness.MEDIUM,
-                                                            "avg_cards": 4.0,
-                                                            "source": "Football-Data.org (oficial)",
-                                                            "verification_link": f"https://www.sofascore.com",
-                                                            "_is_fallback": False,
-                                                            "confidence": "HIGH",
-                                                        })
-                                    except Exception as e2:
-                                        print(f"  [0b-FootballData] match detail error: {e2}")
-                                break
-            except Exception as e:
-                print(f"  [0b-FootballData] Error: {e}")
-
-        # ── FUENTE 1: Claude API con web_search ──────────────────────────────
+        sources = [
+            ("0-API-Football", lambda: self._referee_api_football(home, away, league, safe_date), False),
+            ("0b-FootballData", lambda: self._referee_football_data(home, away, league), False),
+        ]
         if hours < 48:
-            try:
-                from src.data.scrapers.sofascore_api import fetch_referee_via_claude
-                r = fetch_referee_via_claude(home, away, league)
-                if r and r.get("name"):
-                    print(f"  [1-Claude] ✅ {r['name']}")
-                    return _enrich(r)
-            except Exception as e:
-                print(f"  [1-Claude] {e}")
-
-        # ── FUENTE 2: SofaScore API ───────────────────────────────────────────
-        try:
-            from src.data.scrapers.sofascore_api import fetch_referee as sf_ref
-            sf = sf_ref(home, away)
-            if sf:
-                sofa_link = sf.get("verification_link")
-                if sf.get("name") and not sf.get("_is_fallback"):
-                    print(f"  [2-SofaScore] ✅ {sf['name']}")
-                    return _enrich(sf)
-        except Exception as e:
-            print(f"  [2-SofaScore] {e}")
-
-        # ── FUENTE 3: Google News RSS ─────────────────────────────────────────
-        try:
-            from src.data.scrapers.sofascore_api import fetch_referee_rss
-            rss = fetch_referee_rss(home, away)
-            if rss and rss.get("name"):
-                print(f"  [3-RSS] ✅ {rss['name']}")
-                if sofa_link: rss.setdefault("verification_link", sofa_link)
-                return _enrich(rss)
-        except Exception as e:
-            print(f"  [3-RSS] {e}")
-
-        # ── FUENTE 4: Scraper específico de liga ─────────────────────────────
-        try:
-            scraper = _get_liga_scraper(league)
-            if scraper:
-                r = scraper.fetch_referee(home, away, safe_date)
-                name = r.get("name","")
-                if name and name not in ["Por Detectar",""] and not r.get("_is_fallback"):
-                    print(f"  [4-LigaScraper] ✅ {name}")
-                    if sofa_link: r.setdefault("verification_link", sofa_link)
-                    return _enrich(r)
-        except Exception as e:
-            print(f"  [4-LigaScraper] {e}")
-
-        # ── FUENTE 5: BeSoccer ────────────────────────────────────────────────
-        try:
-            from src.data.scrapers.besoccer_scraper import fetch_referee as bs_ref
-            bs = bs_ref(home, away)
-            if bs and bs.get("name"):
-                print(f"  [5-BeSoccer] ✅ {bs['name']}")
-                if sofa_link: bs.setdefault("verification_link", sofa_link)
-                return _enrich(bs)
-        except Exception as e:
-            print(f"  [5-BeSoccer] {e}")
+            # Fuente de pago: solo si las oficiales no han dado resultado
+            sources.append(("1-Claude", lambda: self._referee_claude(home, away, league), True))
+        sources += [
+            ("2-SofaScore", lambda: self._referee_sofascore(home, away, ctx), False),
+            ("3-RSS", lambda: self._referee_rss(home, away), False),
+            ("4-LigaScraper", lambda: self._referee_liga(home, away, league, safe_date), False),
+            ("5-BeSoccer", lambda: self._referee_besoccer(home, away), False),
+        ]
+
+        result = self._run_cascade("referee", sources, key=_match_key(home, away, match_date, league), ctx=ctx)
+        sofa_link = ctx.get("sofa_link")
+        if result:
+            if sofa_link:
+                result.setdefault("verification_link", sofa_link)
+            return _enrich(result)
 
         # ── FALLBACK: pedir al usuario ────────────────────────────────────────
         from src.models.base import RefereeStrictness
@@ -337,6 +422,158 @@ class MultiSourceFetcher:
             "_is_fallback": True
         }
 
+    # ── FUENTE 0: API-Football (DATOS OFICIALES — MÁXIMA PRIORIDAD) ──────────
+    # API-Football incluye el árbitro en el campo "referee" de cada fixture.
+    # Esta es la fuente más fiable: datos oficiales directamente de la API.
+    def _referee_api_football(self, home, away, league, safe_date):
+        af_client = _get_api_football_client()
+        if not af_client:
+            return None
+        # La prioridad se fija aquí: el contexto no viaja a los hilos del modo race
+        with request_priority(_kickoff_priority(safe_date)):
+            fixture_id = _find_fixture_id(af_client, home, away, league, safe_date)
+            if not fixture_id:
+                print(f"  [0-API-Football] No se encontró fixture_id para {home} vs {away}")
+                return None
+            ref_data = af_client.get_referee_from_fixture(fixture_id)
+        if not (ref_data and ref_data.get("name")):
+            return None
+        ref_name = ref_data["name"]
+        print(f"  [0-API-Football] ✅ {ref_name} (fixture_id={fixture_id})")
+        # Obtener perfil estadístico del árbitro
+        profile = {}
+        try:
+            profile = af_client.compute_referee_profile(ref_name)
+            avg_cards = profile.get("avg_cards", "?")
+            strictness = profile.get("strictness", "MEDIUM")
+        except Exception:
+            avg_cards = "?"
+            strictness = "MEDIUM"
+        # Árbitros y alias nuevos entran en el índice local sin editar la BD
+        try:
+            from src.data.referee_database import learn_referee
+            learn_referee(ref_name, profile, league)
+        except Exception as e:
+            print(f"  [0-API-Football] No se pudo registrar el árbitro: {e}")
+
+        # Mapear strictness al formato de la app
+        from src.models.base import RefereeStrictness
+        strict_map = {
+            "HIGH": RefereeStrictness.HIGH,
+            "LOW": RefereeStrictness.LOW,
+            "MEDIUM": RefereeStrictness.MEDIUM,
+        }
+        return {
+            "name": ref_name,
+            "strictness": strict_map.get(strictness, RefereeStrictness.MEDIUM),
+            "avg_cards": avg_cards if avg_cards != "?" else 4.0,
+            "source": f"API-Football (oficial)",
+            "verification_link": f"https://www.sofascore.com",
+            "_is_fallback": False,
+            "fixture_id": fixture_id,
+            "profile": profile or {},
+            "confidence": ref_data.get("confidence", "HIGH"),
+        }
+
+    # ── FUENTE 0b: Football-Data.org (verificación adicional) ────────────────
+    def _referee_football_data(self, home, away, league):
+        fd_client = _get_football_data_client()
+        if not fd_client:
+            return None
+        from src.data.football_data_org import COMPETITION_CODES
+        comp_code = COMPETITION_CODES.get(_norm_league(league))
+        if not comp_code:
+            return None
+        # Buscar partido con árbitro en Football-Data.org
+        matches = fd_client.get_upcoming_matches(comp_code)
+        if not matches:
+            matches = fd_client.get_matches_today(comp_code)
+        for m in (matches or []):
+            mh = m.get("homeTeam", {}).get("shortName", "") or m.get("homeTeam", {}).get("name", "")
+            ma = m.get("awayTeam", {}).get("shortName", "") or m.get("awayTeam", {}).get("name", "")
+            if not (_norm_team_name(mh) in _norm_team_name(home) or
+                    _norm_team_name(home) in _norm_team_name(mh)):
+                continue
+            if not (_norm_team_name(ma) in _norm_team_name(away) or
+                    _norm_team_name(away) in _norm_team_name(ma)):
+                continue
+            # Obtener árbitros del partido
+            match_id = m.get("id")
+            if match_id:
+                try:
+                    match_detail = fd_client.get_match_with_referees(match_id)
+                    for ref_info in (match_detail or {}).get("referees") or []:
+                        if ref_info.get("role") in ("REFEREE", None, ""):
+                            ref_name = ref_info.get("name", "")
+                            if ref_name:
+                                print(f"  [0b-FootballData] ✅ {ref_name}")
+                                from src.models.base import RefereeStrictness
+                                return {
+                                    "name": ref_name,
+                                    "strictness": RefereeStrictness.MEDIUM,
+                                    "avg_cards": 4.0,
+                                    "source": "Football-Data.org (oficial)",
+                                    "verification_link": f"https://www.sofascore.com",
+                                    "_is_fallback": False,
+                                    "confidence": "HIGH",
+                                }
+                except Exception as e2:
+                    print(f"  [0b-FootballData] match detail error: {e2}")
+            break
+        return None
+
+    # ── FUENTE 1: Claude API con web_search ──────────────────────────────────
+    def _referee_claude(self, home, away, league):
+        from src.data.scrapers.sofascore_api import fetch_referee_via_claude
+        r = fetch_referee_via_claude(home, away, league)
+        if r and r.get("name"):
+            print(f"  [1-Claude] ✅ {r['name']}")
+            return r
+        return None
+
+    # ── FUENTE 2: SofaScore API ──────────────────────────────────────────────
+    def _referee_sofascore(self, home, away, ctx):
+        from src.data.scrapers.sofascore_api import fetch_referee as sf_ref
+        sf = sf_ref(home, away)
+        if not sf:
+            return None
+        if sf.get("verification_link"):
+            ctx["sofa_link"] = sf["verification_link"]
+        if sf.get("name") and not sf.get("_is_fallback"):
+            print(f"  [2-SofaScore] ✅ {sf['name']}")
+            return sf
+        return None
+
+    # ── FUENTE 3: Google News RSS ────────────────────────────────────────────
+    def _referee_rss(self, home, away):
+        from src.data.scrapers.sofascore_api import fetch_referee_rss
+        rss = fetch_referee_rss(home, away)
+        if rss and rss.get("name"):
+            print(f"  [3-RSS] ✅ {rss['name']}")
+            return rss
+        return None
+
+    # ── FUENTE 4: Scraper específico de liga ─────────────────────────────────
+    def _referee_liga(self, home, away, league, safe_date):
+        scraper = _get_liga_scraper(league)
+        if not scraper:
+            return None
+        r = scraper.fetch_referee(home, away, safe_date)
+        name = r.get("name", "")
+        if name and name not in ["Por Detectar", ""] and not r.get("_is_fallback"):
+            print(f"  [4-LigaScraper] ✅ {name}")
+            return r
+        return None
+
+    # ── FUENTE 5: BeSoccer ───────────────────────────────────────────────────
+    def _referee_besoccer(self, home, away):
+        from src.data.scrapers.besoccer_scraper import fetch_referee as bs_ref
+        bs = bs_ref(home, away)
+        if bs and bs.get("name"):
+            print(f"  [5-BeSoccer] ✅ {bs['name']}")
+            return bs
+        return None
+
     # =========================================================================
     # ALINEACIONES — cascada de 5 fuentes (API-Football es FUENTE 0)
     # =========================================================================
@@ -344,111 +581,15 @@ class MultiSourceFetcher:
         print(f"\n[MSF] ALINEACIÓN: {home} vs {away} | {league}")
         safe_date = match_date if match_date else datetime.now()
 
-        # ── FUENTE 0: API-Football (DATOS OFICIALES — MÁXIMA PRIORIDAD) ──────
-        # API-Football proporciona alineaciones oficiales 20-40 min antes del partido
-        af_client = _get_api_football_client()
-        if af_client:
-            try:
-                fixture_id = _find_fixture_id(af_client, home, away, league, safe_date)
-                if fixture_id:
-                    lineups = af_client.get_lineups(fixture_id)
-                    if lineups and len(lineups) >= 2:
-                        home_players = []
-                        away_players = []
-                        home_formation = ""
-                        away_formation = ""
-
-                        for team_lu in lineups:
-                            team_name = team_lu.get("team", {}).get("name", "")
-                            formation = team_lu.get("formation", "")
-                            starters = []
-                            for p in team_lu.get("startXI", []):
-                                pname = p.get("player", {}).get("name", "")
-                                if pname:
-                                    starters.append(pname)
-
-                            if (_norm_team_name(team_name) in _norm_team_name(home) or
-                                _norm_team_name(home) in _norm_team_name(team_name)):
-                                home_players = starters
-                                home_formation = formation
-                            else:
-                                away_players = starters
-                                away_formation = formation
-
-                        if home_players or away_players:
-                            print(f"  [0-API-Football] ✅ {len(home_players)}+{len(away_players)} jugadores (formaciones: {home_formation}/{away_formation})")
-                            return {
-                                "home": home_players,
-                                "away": away_players,
-                                "bajas": [],
-                                "source": f"API-Football (oficial) — {home_formation} vs {away_formation}",
-                                "is_official": True,
-                                "verification_link": "https://www.sofascore.com",
-                                "_is_fallback": False,
-                                "formation_home": home_formation,
-                                "formation_away": away_formation,
-                            }
-
-                    # Si solo hay alineaciones predichas
-                    if lineups and len(lineups) == 1:
-                        team_lu = lineups[0]
-                        starters = [p.get("player", {}).get("name", "") for p in team_lu.get("startXI", [])]
-                        starters = [s for s in starters if s]
-                        team_name = team_lu.get("team", {}).get("name", "")
-                        formation = team_lu.get("formation", "")
-                        if starters:
-                            is_home = (_norm_team_name(team_name) in _norm_team_name(home) or
-                                      _norm_team_name(home) in _norm_team_name(team_name))
-                            result = {
-                                "bajas": [],
-                                "source": f"API-Football (parcial) — {formation}",
-                                "is_official": True,
-                                "verification_link": "https://www.sofascore.com",
-                                "_is_fallback": False,
-                            }
-                            if is_home:
-                                result["home"] = starters
-                                result["away"] = []
-                            else:
-                                result["home"] = []
-                                result["away"] = starters
-                            print(f"  [0-API-Football] ✅ Parcial: {len(starters)} jugadores de {team_name}")
-                            return result
-            except Exception as e:
-                print(f"  [0-API-Football] Error: {e}")
-
-        # ── FUENTE 1: SofaScore API ───────────────────────────────────────────
-        try:
-            from src.data.scrapers.sofascore_api import fetch_lineups as sf_lu
-            sf = sf_lu(home, away)
-            if sf and (sf.get("home") or sf.get("away")):
-                sf.setdefault("bajas", [])
-                print(f"  [1-SofaScore] ✅ {len(sf.get('home',[]))}+{len(sf.get('away',[]))}")
-                return sf
-        except Exception as e:
-            print(f"  [1-SofaScore] {e}")
-
-        # ── FUENTE 2: Scraper específico de liga ─────────────────────────────
-        try:
-            scraper = _get_liga_scraper(league)
-            if scraper:
-                r = scraper.fetch_lineup(home, away, safe_date)
-                if r.get("home") or r.get("away"):
-                    r.setdefault("bajas", [])
-                    print(f"  [2-LigaScraper] ✅ {len(r.get('home',[]))}+{len(r.get('away',[]))}")
-                    return r
-        except Exception as e:
-            print(f"  [2-LigaScraper] {e}")
-
-        # ── FUENTE 3: BeSoccer ────────────────────────────────────────────────
-        try:
-            from src.data.scrapers.besoccer_scraper import fetch_lineup as bs_lu
-            bs = bs_lu(home, away)
-            if bs.get("home") or bs.get("away"):
-                print(f"  [3-BeSoccer] ✅ {len(bs.get('home',[]))}+{len(bs.get('away',[]))}")
-                return bs
-        except Exception as e:
-            print(f"  [3-BeSoccer] {e}")
+        sources = [
+            ("0-API-Football", lambda: self._lineup_api_football(home, away, league, safe_date), False),
+            ("1-SofaScore", lambda: self._lineup_sofascore(home, away), False),
+            ("2-LigaScraper", lambda: self._lineup_liga(home, away, league, safe_date), False),
+            ("3-BeSoccer", lambda: self._lineup_besoccer(home, away), False),
+        ]
+        result = self._run_cascade("lineup", sources, key=_match_key(home, away, match_date, league))
+        if result:
+            return result
 
         # ── FUENTE 4: Sin datos web ───────────────────────────────────────────
         print(f"  [MSF] Sin alineaciones disponibles en fuentes web")
@@ -458,3 +599,110 @@ class MultiSourceFetcher:
             "verification_link": "https://www.sofascore.com",
             "_is_fallback": True
         }
+
+    # ── FUENTE 0: API-Football (DATOS OFICIALES — MÁXIMA PRIORIDAD) ──────────
+    # API-Football proporciona alineaciones oficiales 20-40 min antes del partido
+    def _lineup_api_football(self, home, away, league, safe_date):
+        af_client = _get_api_football_client()
+        if not af_client:
+            return None
+        # La prioridad se fija aquí: el contexto no viaja a los hilos del modo race
+        with request_priority(_kickoff_priority(safe_date)):
+            fixture_id = _find_fixture_id(af_client, home, away, league, safe_date)
+            if not fixture_id:
+                return None
+            lineups = af_client.get_lineups(fixture_id)
+        if lineups and len(lineups) >= 2:
+            home_players = []
+            away_players = []
+            home_formation = ""
+            away_formation = ""
+
+            for team_lu in lineups:
+                team_name = team_lu.get("team", {}).get("name", "")
+                formation = team_lu.get("formation", "")
+                starters = []
+                for p in team_lu.get("startXI", []):
+                    pname = p.get("player", {}).get("name", "")
+                    if pname:
+                        starters.append(pname)
+
+                if (_norm_team_name(team_name) in _norm_team_name(home) or
+                    _norm_team_name(home) in _norm_team_name(team_name)):
+                    home_players = starters
+                    home_formation = formation
+                else:
+                    away_players = starters
+                    away_formation = formation
+
+            if home_players or away_players:
+                print(f"  [0-API-Football] ✅ {len(home_players)}+{len(away_players)} jugadores (formaciones: {home_formation}/{away_formation})")
+                return {
+                    "home": home_players,
+                    "away": away_players,
+                    "bajas": [],
+                    "source": f"API-Football (oficial) — {home_formation} vs {away_formation}",
+                    "is_official": True,
+                    "verification_link": "https://www.sofascore.com",
+                    "_is_fallback": False,
+                    "formation_home": home_formation,
+                    "formation_away": away_formation,
+                }
+
+        # Si solo hay alineaciones predichas
+        if lineups and len(lineups) == 1:
+            team_lu = lineups[0]
+            starters = [p.get("player", {}).get("name", "") for p in team_lu.get("startXI", [])]
+            starters = [s for s in starters if s]
+            team_name = team_lu.get("team", {}).get("name", "")
+            formation = team_lu.get("formation", "")
+            if starters:
+                is_home = (_norm_team_name(team_name) in _norm_team_name(home) or
+                          _norm_team_name(home) in _norm_team_name(team_name))
+                result = {
+                    "bajas": [],
+                    "source": f"API-Football (parcial) — {formation}",
+                    "is_official": True,
+                    "verification_link": "https://www.sofascore.com",
+                    "_is_fallback": False,
+                }
+                if is_home:
+                    result["home"] = starters
+                    result["away"] = []
+                else:
+                    result["home"] = []
+                    result["away"] = starters
+                print(f"  [0-API-Football] ✅ Parcial: {len(starters)} jugadores de {team_name}")
+                return result
+        return None
+
+    # ── FUENTE 1: SofaScore API ──────────────────────────────────────────────
+    def _lineup_sofascore(self, home, away):
+        from src.data.scrapers.sofascore_api import fetch_lineups as sf_lu
+        sf = sf_lu(home, away)
+        if sf and (sf.get("home") or sf.get("away")):
+            sf.setdefault("bajas", [])
+            print(f"  [1-SofaScore] ✅ {len(sf.get('home',[]))}+{len(sf.get('away',[]))}")
+            return sf
+        return None
+
+    # ── FUENTE 2: Scraper específico de liga ─────────────────────────────────
+    def _lineup_liga(self, home, away, league, safe_date):
+        scraper = _get_liga_scraper(league)
+        if not scraper:
+            return None
+        r = scraper.fetch_lineup(home, away, safe_date)
+        if r.get("home") or r.get("away"):
+            r.setdefault("bajas", [])
+            print(f"  [2-LigaScraper] ✅ {len(r.get('home',[]))}+{len(r.get('away',[]))}")
+            return r
+        return None
+
+    # ── FUENTE 3: BeSoccer ───────────────────────────────────────────────────
+    def _lineup_besoccer(self, home, away):
+        from src.data.scrapers.besoccer_scraper import fetch_lineup as bs_lu
+        bs = bs_lu(home, away)
+        if bs.get("home") or bs.get("away"):
+            print(f"  [3-BeSoccer] ✅ {len(bs.get('home',[]))}+{len(bs.get('away',[]))}")
+            return bs
+        return None
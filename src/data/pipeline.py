@@ -1,24 +1,80 @@
+"""
+DataPipeline — Ingesta y feature engineering para el entrenamiento de MLEngine
+==============================================================================
+Construye filas de entrenamiento a partir de las tablas reales de la BD
+(matches + predictions + resultados) y calcula, con groupby-rolling vectorizado:
+
+- Forma de xG: media móvil del xG generado por el equipo (últimos 5 partidos).
+- Eficacia defensiva: media móvil de (xG concedido - goles recibidos).
+- Forma de resultados: media móvil de puntos por partido.
+
+Las medias se desplazan un partido (shift) para que cada fila solo vea datos
+anteriores al encuentro que se quiere predecir.
+
+FeatureStore guarda en disco (Parquet, o .npy si no hay pyarrow):
+- Las filas crudas ya extraídas (cada data_json se decodifica una sola vez).
+- La matriz de características, identificada por la versión de los datos.
+Un reentrenamiento solo consulta los resultados añadidos desde la última build.
+"""
+import os
+import json
+import hashlib
+import sqlite3
 import pandas as pd
 import numpy as np
-from typing import List, Dict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pyarrow  # noqa: F401 — motor Parquet de pandas
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+ROLLING_WINDOW = 5
+# Subir si cambia la definición de las características (invalida la caché)
+FEATURE_VERSION = 1
+FEATURE_CACHE_DIR = os.path.join("data", "cache", "features")
+
+# Valores neutros para equipos sin historial previo
+NEUTRAL_XG = 1.35
+NEUTRAL_POSSESSION = 50.0
+NEUTRAL_PPDA = 12.0
+NEUTRAL_FORM = 1.4   # puntos por partido de un equipo medio
+
+RAW_COLUMNS = [
+    'match_id', 'date', 'competition', 'home_team', 'away_team',
+    'home_goals', 'away_goals', 'home_xg', 'away_xg', 'home_possession', 'ppda',
+    'target_winner', 'created_at',
+]
+
+# Clases de MLEngine: 0 Empate, 1 Local, 2 Visitante
+WINNER_TO_TARGET = {"EMPATE": 0, "LOCAL": 1, "VISITANTE": 2}
+FORM_POINTS = {"W": 3, "D": 1, "L": 0, "V": 3, "E": 1}
+
+
+def form_points(form_last_5: List[str]) -> float:
+    """Puntos por partido a partir de una racha tipo ['W', 'D', 'L']."""
+    pts = [FORM_POINTS[r] for r in (form_last_5 or []) if r in FORM_POINTS]
+    return sum(pts) / len(pts) if pts else NEUTRAL_FORM
+
 
 class DataPipeline:
     """
     Gestiona la ingesta, limpieza y feature engineering de los datos deportivos.
     Optimizado para procesar grandes volúmenes de métricas Wyscout/Opta.
     """
-    
+
     def clean_match_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Elimina irregularidades y normaliza nombres de equipos/jugadores."""
         # Eliminar duplicados
         df = df.drop_duplicates()
-        
+
         # Manejo de valores nulos en métricas críticas
         critical_cols = ['xg', 'xa', 'possession']
         for col in critical_cols:
             if col in df.columns:
                 df[col] = df[col].fillna(df[col].median())
-        
+
         return df
 
     def extract_features(self, historical_df: pd.DataFrame) -> pd.DataFrame:
@@ -29,26 +85,312 @@ class DataPipeline:
         - Intensidad de presión (PPDA)
         """
         df = historical_df.copy()
-        
+
         if 'xg' in df.columns:
-            # Media móvil de xG para capturar estado de forma
-            df['xg_rolling_avg'] = df.groupby('team_id')['xg'].transform(lambda x: x.rolling(window=5, min_periods=1).mean())
-            
+            # Media móvil de xG para capturar estado de forma (groupby-rolling vectorizado)
+            df['xg_rolling_avg'] = (
+                df.groupby('team_id')['xg']
+                  .rolling(window=ROLLING_WINDOW, min_periods=1).mean()
+                  .reset_index(level=0, drop=True)
+            )
+
         if 'goals_conceded' in df.columns and 'xga' in df.columns:
             # Over-performance defensivo
             df['defensive_efficiency'] = df['xga'] - df['goals_conceded']
-            
+
         return df
 
     def prepare_for_training(self, enriched_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
         """Prepara los datos finales para ser ingeridos por el MLEngine."""
         # Selección de variables con mayor correlación histórica
         features = [
-            'xg_rolling_avg', 'defensive_efficiency', 'ppda', 
+            'xg_rolling_avg', 'defensive_efficiency', 'ppda',
             'possession_avg', 'h2h_bias', 'home_advantage'
         ]
-        
+
         X = enriched_df[features]
         y = enriched_df['target_winner']
-        
+
         return X, y
+
+    # =========================================================================
+    # HISTÓRICO REAL (matches + predictions + resultados)
+    # =========================================================================
+
+    def load_raw_matches(self, conn: sqlite3.Connection, since: Optional[str] = None) -> pd.DataFrame:
+        """
+        Una fila por partido con resultado real. Con `since`, solo los resultados
+        guardados después de esa marca (carga incremental).
+        """
+        query = '''
+            SELECT r.match_id, m.date, m.competition, m.home_team, m.away_team,
+                   r.home_score, r.away_score, r.winner, r.created_at,
+                   p.lambda_home, p.lambda_away, m.data_json
+            FROM resultados r
+            JOIN matches m ON m.id = r.match_id
+            LEFT JOIN predictions p ON p.match_id = r.match_id'''
+        params: tuple = ()
+        if since:
+            query += " WHERE r.created_at > ?"
+            params = (since,)
+        rows = [self._raw_row(*r) for r in conn.execute(query, params)]
+        return pd.DataFrame(rows, columns=RAW_COLUMNS)
+
+    @staticmethod
+    def _raw_row(match_id, date, competition, home, away, hs, as_, winner, created,
+                 lambda_home, lambda_away, data_json) -> tuple:
+        """Extrae las métricas pre-partido del Match guardado (xG de temporada, posesión, PPDA)."""
+        try:
+            mdata = json.loads(data_json or "{}")
+        except ValueError:
+            mdata = {}
+        ht, at = mdata.get("home_team") or {}, mdata.get("away_team") or {}
+        ppdas = [p.get("ppda", 0) for p in (ht.get("players") or []) + (at.get("players") or [])
+                 if (p.get("ppda") or 0) > 0]
+        return (
+            match_id, date, competition, home, away,
+            int(hs or 0), int(as_ or 0),
+            float(ht.get("avg_xg_season") or lambda_home or NEUTRAL_XG),
+            float(at.get("avg_xg_season") or lambda_away or NEUTRAL_XG),
+            float(ht.get("avg_possession") or NEUTRAL_POSSESSION),
+            float(sum(ppdas) / len(ppdas)) if ppdas else NEUTRAL_PPDA,
+            WINNER_TO_TARGET.get(winner, 1 if (hs or 0) > (as_ or 0) else 2 if (as_ or 0) > (hs or 0) else 0),
+            created,
+        )
+
+    @staticmethod
+    def _team_long(raw: pd.DataFrame) -> pd.DataFrame:
+        """Vista larga: dos filas por partido (perspectiva local y visitante)."""
+        home = pd.DataFrame({
+            'match_id': raw['match_id'], 'date': raw['date'], 'is_home': True,
+            'team': raw['home_team'], 'xg_for': raw['home_xg'], 'xg_against': raw['away_xg'],
+            'goals_for': raw['home_goals'], 'goals_against': raw['away_goals'],
+        })
+        away = pd.DataFrame({
+            'match_id': raw['match_id'], 'date': raw['date'], 'is_home': False,
+            'team': raw['away_team'], 'xg_for': raw['away_xg'], 'xg_against': raw['home_xg'],
+            'goals_for': raw['away_goals'], 'goals_against': raw['home_goals'],
+        })
+        long = pd.concat([home, away], ignore_index=True)
+        long['def_eff'] = long['xg_against'] - long['goals_against']
+        long['points'] = np.select(
+            [long['goals_for'] > long['goals_against'], long['goals_for'] == long['goals_against']],
+            [3, 1], default=0)
+        return long.sort_values(['date', 'match_id'], kind='stable').reset_index(drop=True)
+
+    def _rolling(self, long: pd.DataFrame, shift: bool) -> pd.DataFrame:
+        cols = ['xg_for', 'def_eff', 'points']
+        grouped = long.groupby('team', sort=False)[cols]
+        if shift:
+            # Solo partidos anteriores: desplazar dentro de cada equipo antes de promediar
+            source = grouped.shift(1)
+            source['team'] = long['team']
+            grouped = source.groupby('team', sort=False)[cols]
+        rolled = grouped.rolling(window=ROLLING_WINDOW, min_periods=1).mean()
+        return rolled.reset_index(level=0, drop=True).sort_index()
+
+    def build_training_features(self, raw: pd.DataFrame) -> pd.DataFrame:
+        """
+        Matriz de entrenamiento: match_id, columnas de MLEngine.FEATURE_COLUMNS y target_winner.
+        """
+        from src.logic.ml_engine import MLEngine
+        columns = ['match_id', *MLEngine.FEATURE_COLUMNS, 'target_winner']
+        if raw.empty:
+            return pd.DataFrame(columns=columns)
+
+        long = self._team_long(raw)
+        rolled = self._rolling(long, shift=True)
+        long['xg_roll'] = rolled['xg_for'].fillna(long['xg_for'])
+        long['def_eff_roll'] = rolled['def_eff'].fillna(0.0)
+        long['form'] = rolled['points'].fillna(NEUTRAL_FORM)
+
+        per_side = long.set_index(['match_id', 'is_home'])[['xg_roll', 'def_eff_roll', 'form']]
+        home = per_side.xs(True, level='is_home')
+        away = per_side.xs(False, level='is_home')
+
+        df = raw.set_index('match_id')
+        df['home_xg_roll'], df['away_xg_roll'] = home['xg_roll'], away['xg_roll']
+        df['home_def_eff'], df['away_def_eff'] = home['def_eff_roll'], away['def_eff_roll']
+        df['home_form'], df['away_form'] = home['form'], away['form']
+        df = df.reset_index()
+        return df.sort_values(['date', 'match_id'], kind='stable')[columns].reset_index(drop=True)
+
+    def latest_team_state(self, raw: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+        """
+        Estado actual de cada equipo (medias móviles incluyendo su último partido),
+        para construir las características de los próximos encuentros.
+        """
+        if raw.empty:
+            return {}
+        long = self._team_long(raw)
+        rolled = self._rolling(long, shift=False)
+        long[['xg_roll', 'def_eff', 'form']] = rolled[['xg_for', 'def_eff', 'points']].to_numpy()
+        last = long.groupby('team', sort=False).tail(1)
+        return {
+            row.team: {'xg_roll': float(row.xg_roll), 'def_eff': float(row.def_eff),
+                       'form': float(row.form)}
+            for row in last.itertuples(index=False)
+        }
+
+
+class FeatureStore:
+    """
+    Caché columnar de la matriz de características, identificada por versión de datos.
+
+    - raw: filas crudas ya extraídas + marca de agua (created_at del último resultado).
+      En cada build solo se leen los resultados posteriores a la marca.
+    - features_<version>: matriz final; si la versión de datos no cambia, se
+      devuelve directamente desde disco sin tocar la BD más que para la versión.
+    """
+
+    def __init__(self, db_path: str = "data/lagema.db", cache_dir: str = FEATURE_CACHE_DIR,
+                 pipeline: Optional[DataPipeline] = None):
+        self.db_path = db_path
+        self.cache_dir = cache_dir
+        self.pipeline = pipeline or DataPipeline()
+        self.last_build: Dict = {}
+        self._raw: Optional[pd.DataFrame] = None
+
+    # --- Persistencia columnar ----------------------------------------------
+    @property
+    def _ext(self) -> str:
+        return ".parquet" if HAS_PARQUET else ".npy"
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name + self._ext)
+
+    def _write(self, df: pd.DataFrame, name: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(name)
+        tmp = path + ".tmp"
+        if HAS_PARQUET:
+            df.to_parquet(tmp, index=False)
+        else:
+            text_cols = {c: f"U{max(1, int(df[c].astype(str).str.len().max() or 1))}"
+                         for c in df.columns if pd.api.types.is_string_dtype(df[c]) or df[c].dtype == object}
+            with open(tmp, "wb") as f:
+                np.save(f, df.to_records(index=False, column_dtypes=text_cols), allow_pickle=False)
+        os.replace(tmp, path)
+
+    def _read(self, name: str) -> Optional[pd.DataFrame]:
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            if HAS_PARQUET:
+                return pd.read_parquet(path)
+            df = pd.DataFrame(np.load(path, allow_pickle=False))
+            for c in df.columns:
+                if df[c].dtype.kind == 'U':
+                    df[c] = df[c].astype(object)
+            return df
+        except Exception as e:
+            print(f"[FeatureStore] Caché ilegible ({path}): {e}")
+            return None
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.cache_dir, "manifest.json")
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self._manifest_path(), encoding="utf-8") as f:
+                manifest = json.load(f)
+            return manifest if manifest.get("feature_version") == FEATURE_VERSION else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._manifest_path(), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    # --- Versión de datos ----------------------------------------------------
+    @staticmethod
+    def _data_stats(conn) -> Tuple[int, str]:
+        count, last = conn.execute('''SELECT COUNT(*), MAX(r.created_at)
+            FROM resultados r JOIN matches m ON m.id = r.match_id''').fetchone()
+        return int(count or 0), last or ""
+
+    @staticmethod
+    def data_version(count: int, last: str) -> str:
+        key = f"{FEATURE_VERSION}|{count}|{last}"
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    # --- Build ---------------------------------------------------------------
+    def load_raw(self) -> pd.DataFrame:
+        """Filas crudas de todos los partidos con resultado (incremental sobre la caché)."""
+        if not os.path.exists(self.db_path):
+            self.last_build = {"new_rows": 0, "rows": 0, "data_version": "empty"}
+            return pd.DataFrame(columns=RAW_COLUMNS)
+        manifest = self._read_manifest()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            count, last = self._data_stats(conn)
+            cached = self._read("raw") if manifest else None
+            watermark = manifest.get("watermark") if cached is not None else None
+            new_rows = self.pipeline.load_raw_matches(conn, since=watermark)
+        finally:
+            conn.close()
+
+        if cached is not None and not new_rows.empty:
+            raw = pd.concat([cached, new_rows], ignore_index=True)
+        else:
+            raw = new_rows if cached is None else cached
+        raw = raw.drop_duplicates('match_id', keep='last').reset_index(drop=True)
+
+        if len(raw) != count:
+            # Resultados borrados o reescritos con fecha anterior: reconstruir entero
+            conn = sqlite3.connect(self.db_path)
+            try:
+                raw = self.pipeline.load_raw_matches(conn)
+            finally:
+                conn.close()
+            new_rows = raw
+
+        self.last_build = {"new_rows": len(new_rows), "rows": len(raw),
+                           "data_version": self.data_version(count, last)}
+        if len(new_rows) or not manifest:
+            self._write(raw, "raw")
+            self._write_manifest({**manifest, "feature_version": FEATURE_VERSION,
+                                  "watermark": last, "rows": len(raw)})
+        self._raw = raw
+        return raw
+
+    def build(self) -> pd.DataFrame:
+        """Matriz de características actual (desde caché si la versión de datos no cambió)."""
+        manifest = self._read_manifest()
+        if os.path.exists(self.db_path):
+            conn = sqlite3.connect(self.db_path)
+            try:
+                version = self.data_version(*self._data_stats(conn))
+            finally:
+                conn.close()
+            if manifest.get("features_version") == version:
+                cached = self._read(f"features_{version}")
+                if cached is not None:
+                    self.last_build = {"cached": True, "new_rows": 0, "rows": len(cached),
+                                       "data_version": version}
+                    print(f"[FeatureStore] ✅ Características en caché ({len(cached)} partidos)")
+                    return cached
+
+        raw = self.load_raw()
+        features = self.pipeline.build_training_features(raw)
+        version = self.last_build.get("data_version", "empty")
+        self._write(features, f"features_{version}")
+        old = self._read_manifest().get("features_version")
+        if old and old != version:
+            try:
+                os.remove(self._path(f"features_{old}"))
+            except OSError:
+                pass
+        self._write_manifest({**self._read_manifest(), "feature_version": FEATURE_VERSION,
+                              "features_version": version})
+        self.last_build["cached"] = False
+        print(f"[FeatureStore] Características reconstruidas: {len(features)} partidos "
+              f"({self.last_build['new_rows']} nuevos)")
+        return features
+
+    def team_state(self) -> Dict[str, Dict[str, float]]:
+        """Estado móvil más reciente por equipo (ver DataPipeline.latest_team_state)."""
+        raw = self._raw if self._raw is not None else self.load_raw()
+        return self.pipeline.latest_team_state(raw)
@@ -0,0 +1,290 @@
+"""
+Limitador de peticiones compartido — LAGEMA JARG74
+===================================================
+Un único token bucket por proveedor (API-Football, Sportmonks,
+football-data.org) usado por todos los clientes, con:
+
+- Estado en SQLite (``data/cache/rate_limits.db``) actualizado dentro de
+  transacciones ``BEGIN IMMEDIATE``: varios hilos y varios procesos
+  (workers de Streamlit, scripts de calibración) comparten cubo y cuota.
+- Cuota diaria persistida por proveedor y día.
+- Clases de prioridad: CRITICAL (alineaciones/árbitro cerca del inicio)
+  puede gastar toda la cuota y esperar un poco por un token; NORMAL se
+  queda con una reserva para CRITICAL; BACKGROUND (estadísticas, perfiles)
+  solo usa la parte baja de la cuota y nunca espera.
+
+Una petición que no cabe en el presupuesto lanza ``RateLimitExceeded`` con
+``retry_after``: el cliente la rechaza o la aplaza en lugar de dormir el
+worker (antes había ``time.sleep(60)`` ante cada 429).
+
+La ruta de la BD se puede cambiar con ``LAGEMA_RATE_LIMITS_DB``.
+
+Uso:
+    limiter = get_rate_limiter()
+    limiter.acquire("api_football")                  # prioridad del contexto
+    with request_priority(Priority.CRITICAL):
+        client.get_lineups(fixture_id)
+"""
+
+import functools
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMITS_PATH = os.path.join("data", "cache", "rate_limits.db")
+LIMITS_PATH_ENV = "LAGEMA_RATE_LIMITS_DB"
+
+
+class Priority(IntEnum):
+    BACKGROUND = 0
+    NORMAL = 1
+    CRITICAL = 2
+
+
+# Fracción de la cuota diaria que puede consumir cada prioridad
+PRIORITY_QUOTA_SHARE = {Priority.BACKGROUND: 0.6, Priority.NORMAL: 0.9, Priority.CRITICAL: 1.0}
+# Espera máxima (s) por un token antes de rechazar la petición
+PRIORITY_MAX_WAIT = {Priority.BACKGROUND: 0.0, Priority.NORMAL: 0.5, Priority.CRITICAL: 2.0}
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    per_minute: float              # ritmo de reposición del cubo
+    burst: int                     # capacidad del cubo
+    daily_quota: Optional[int]     # None = sin cuota diaria
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    raw = os.getenv(name, "").strip()
+    return int(raw) if raw.isdigit() else default
+
+
+PROVIDER_LIMITS: Dict[str, ProviderLimits] = {
+    # Plan gratuito: 100 peticiones/día (API_FOOTBALL_DAILY_QUOTA para planes de pago)
+    "api_football": ProviderLimits(28, 5, _env_int("API_FOOTBALL_DAILY_QUOTA", 100)),
+    "sportmonks": ProviderLimits(28, 5, _env_int("SPORTMONKS_DAILY_QUOTA", None)),
+    "football_data": ProviderLimits(9, 3, _env_int("FOOTBALL_DATA_DAILY_QUOTA", None)),
+}
+DEFAULT_PROVIDER_LIMITS = ProviderLimits(30, 5, None)
+
+_priority: ContextVar[Priority] = ContextVar("lagema_request_priority", default=Priority.NORMAL)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """Fija la prioridad de las peticiones a APIs hechas dentro del bloque (por hilo/contexto)."""
+    token = _priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def with_priority(priority: Priority):
+    """Decorador: el método hace sus peticiones con la prioridad dada."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with request_priority(priority):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RateLimitExceeded(Exception):
+    """La petición no cabe ahora en el presupuesto del proveedor."""
+
+    def __init__(self, provider: str, reason: str, retry_after: float):
+        self.provider = provider
+        self.reason = reason              # "rate" | "quota" | "blocked"
+        self.retry_after = max(0.0, retry_after)
+        super().__init__(f"[RateLimiter] {provider}: {reason}, reintentar en {self.retry_after:.0f}s")
+
+
+def retry_after_seconds(response, default: float = 60.0) -> float:
+    """Segundos de la cabecera Retry-After (número o fecha HTTP) o ``default``."""
+    raw = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(raw)
+            return max(0.0, (when - datetime.now(when.tzinfo)).total_seconds())
+        except (TypeError, ValueError):
+            return default
+
+
+class RateLimiter:
+    """Token bucket + cuota diaria por proveedor, persistido en SQLite."""
+
+    def __init__(self, db_path: str = DEFAULT_LIMITS_PATH,
+                 limits: Optional[Dict[str, ProviderLimits]] = None,
+                 clock=time.time, sleep=time.sleep):
+        self.db_path = db_path
+        self.limits = dict(PROVIDER_LIMITS if limits is None else limits)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS buckets (
+            provider TEXT PRIMARY KEY, tokens REAL, updated REAL, blocked_until REAL DEFAULT 0)''')
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS quota (
+            provider TEXT, day TEXT, used INTEGER DEFAULT 0, PRIMARY KEY (provider, day))''')
+
+    def limits_for(self, provider: str) -> ProviderLimits:
+        return self.limits.get(provider, DEFAULT_PROVIDER_LIMITS)
+
+    # ── API pública ──────────────────────────────────────────────────────────
+
+    def acquire(self, provider: str, priority: Optional[Priority] = None,
+                max_wait: Optional[float] = None):
+        """
+        Consume un token y una unidad de cuota o lanza RateLimitExceeded.
+        Solo espera si el próximo token llega antes de ``max_wait`` (por
+        defecto según la prioridad); nunca duerme por un bloqueo o cuota.
+        """
+        priority = current_priority() if priority is None else Priority(priority)
+        budget = PRIORITY_MAX_WAIT[priority] if max_wait is None else max_wait
+        deadline = self._clock() + budget
+        while True:
+            wait = self._try_take(provider, priority)
+            if wait is None:
+                return
+            if self._clock() + wait > deadline:
+                raise RateLimitExceeded(provider, "rate", wait)
+            self._sleep(wait)
+
+    def try_acquire(self, provider: str, priority: Optional[Priority] = None) -> bool:
+        try:
+            self.acquire(provider, priority, max_wait=0.0)
+            return True
+        except RateLimitExceeded:
+            return False
+
+    def penalize(self, provider: str, retry_after: float = 60.0):
+        """El servidor respondió 429: bloquear el proveedor sin dormir a nadie."""
+        until = self._clock() + max(1.0, retry_after)
+        with self._tx() as conn:
+            blocked = self._bucket(conn, provider)[2]
+            conn.execute("INSERT OR REPLACE INTO buckets VALUES (?,?,?,?)",
+                         (provider, 0.0, self._clock(), max(blocked, until)))
+        logger.warning(f"[RateLimiter] {provider} bloqueado {retry_after:.0f}s por 429 del servidor")
+
+    def sync_remaining(self, provider: str, remaining: int):
+        """Ajusta la cuota local con lo que informa el proveedor (p. ej. x-ratelimit-requests-remaining)."""
+        quota = self.limits_for(provider).daily_quota
+        if quota is None:
+            return
+        used = max(0, quota - int(remaining))
+        with self._tx() as conn:
+            conn.execute('''INSERT INTO quota (provider, day, used) VALUES (?,?,?)
+                ON CONFLICT(provider, day) DO UPDATE SET used = MAX(used, excluded.used)''',
+                         (provider, self._day(), used))
+
+    def status(self, provider: str) -> dict:
+        lim = self.limits_for(provider)
+        with self._tx() as conn:
+            tokens, updated, blocked = self._bucket(conn, provider)
+            used = self._used(conn, provider)
+        now = self._clock()
+        return {
+            "tokens": round(min(lim.burst, tokens + (now - updated) * lim.per_minute / 60.0), 3),
+            "burst": lim.burst,
+            "used_today": used,
+            "daily_quota": lim.daily_quota,
+            "blocked_for": round(max(0.0, blocked - now), 1),
+        }
+
+    # ── Internos ─────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _tx(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _day(self) -> str:
+        return datetime.fromtimestamp(self._clock()).strftime("%Y-%m-%d")
+
+    def _seconds_to_midnight(self) -> float:
+        now = datetime.fromtimestamp(self._clock())
+        tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (tomorrow - now).total_seconds()
+
+    def _bucket(self, conn, provider: str):
+        row = conn.execute("SELECT tokens, updated, blocked_until FROM buckets WHERE provider=?",
+                           (provider,)).fetchone()
+        if row is None:
+            return float(self.limits_for(provider).burst), self._clock(), 0.0
+        return row[0], row[1], row[2] or 0.0
+
+    def _used(self, conn, provider: str) -> int:
+        row = conn.execute("SELECT used FROM quota WHERE provider=? AND day=?",
+                           (provider, self._day())).fetchone()
+        return row[0] if row else 0
+
+    def _try_take(self, provider: str, priority: Priority) -> Optional[float]:
+        """None si se concedió el token; si no, segundos hasta el próximo token."""
+        lim = self.limits_for(provider)
+        now = self._clock()
+        with self._tx() as conn:
+            tokens, updated, blocked = self._bucket(conn, provider)
+            if blocked > now:
+                raise RateLimitExceeded(provider, "blocked", blocked - now)
+            if lim.daily_quota is not None:
+                cap = int(lim.daily_quota * PRIORITY_QUOTA_SHARE[priority])
+                if self._used(conn, provider) >= cap:
+                    raise RateLimitExceeded(provider, "quota", self._seconds_to_midnight())
+            tokens = min(lim.burst, tokens + (now - updated) * lim.per_minute / 60.0)
+            if tokens < 1.0:
+                conn.execute("INSERT OR REPLACE INTO buckets VALUES (?,?,?,?)", (provider, tokens, now, blocked))
+                return (1.0 - tokens) * 60.0 / lim.per_minute
+            conn.execute("INSERT OR REPLACE INTO buckets VALUES (?,?,?,?)", (provider, tokens - 1.0, now, blocked))
+            conn.execute('''INSERT INTO quota (provider, day, used) VALUES (?,?,1)
+                ON CONFLICT(provider, day) DO UPDATE SET used = used + 1''', (provider, self._day()))
+        return None
+
+
+_default_limiter: Optional[RateLimiter] = None
+_init_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Limitador compartido por todos los clientes del proceso."""
+    global _default_limiter
+    with _init_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter(os.getenv(LIMITS_PATH_ENV, "").strip() or DEFAULT_LIMITS_PATH)
+        return _default_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> Optional[RateLimiter]:
+    """Sustituye el limitador compartido (pruebas, benchmarks); devuelve el anterior."""
+    global _default_limiter
+    with _init_lock:
+        previous, _default_limiter = _default_limiter, limiter
+        return previous
@@ -10,8 +10,28 @@ Strictness:
   LOW    → <4.0 tarjetas/partido o permisivo
 
 penalty_rate → penaltis señalados por cada 10 partidos (aprox)
+
+Búsqueda: ``RefereeIndex`` se construye una vez al importar el módulo con
+los nombres completos sin acentos, un multimapa apellido → árbitros con
+pesos IDF y una tabla de alias (apellidos compuestos y alias aprendidos).
+``find_referees`` devuelve candidatos ordenados con su confianza y
+``get_referee_data`` solo resuelve si el mejor es claro. Los árbitros y
+alias vistos en fixtures de API-Football se añaden con ``learn_referee``
+y se guardan en ``data/cache/referees_learned.json`` (editable a mano).
 """
 
+import json
+import logging
+import math
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from src.data.roster_index import name_tokens
+
+logger = logging.getLogger(__name__)
+
 REFEREE_DB = {
 
     # =========================================================================
@@ -502,27 +522,233 @@ REFEREE_DB = {
 }
 
 
+LEARNED_PATH = os.path.join("data", "cache", "referees_learned.json")
+MIN_CONFIDENCE = 0.5           # por debajo no se resuelve
+AMBIGUITY_MARGIN = 0.05        # si los dos mejores están más cerca, es ambiguo
+UNIQUE_SURNAME_CONFIDENCE = 0.7
+LEARN_ALIAS_CONFIDENCE = 0.7   # confianza mínima para guardar un nombre como alias
+
+_PLACEHOLDERS = {"Por Detectar", "Por Confirmar", ""}
+
+
+def _clean(name: str) -> str:
+    """API-Football añade el país: "Jesús Gil Manzano, Spain" → "Jesús Gil Manzano"."""
+    return (name or "").split(",")[0].strip()
+
+
+def _key(tokens) -> Tuple[str, ...]:
+    return tuple(sorted(set(tokens)))
+
+
+class RefereeIndex:
+    """
+    Índice de árbitros: nombre completo, multimapa de tokens y alias.
+
+    Confianza de un candidato:
+    - 1.0  nombre completo (sin acentos, en cualquier orden)
+    - 0.95 alias (apellidos compuestos "Gil Manzano" o alias aprendidos)
+    - parcial: peso IDF de los tokens del árbitro presentes en la consulta;
+      un apellido que solo tiene ese árbitro sube a 0.7, y si solo coincide
+      el nombre de pila ("John Smith" vs "John Brooks") se queda por debajo
+      del mínimo. Se multiplica por la parte de la consulta (tokens
+      conocidos) que explica el candidato.
+    """
+
+    def __init__(self, referees: Dict[str, dict], learned_path: Optional[str] = LEARNED_PATH):
+        self.learned_path = learned_path
+        self._base = referees
+        self._learned: Dict[str, dict] = {}
+        self._learned_aliases: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._load_learned()
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+    def _build(self):
+        """Reconstruye el índice; se publica de una vez para lecturas sin lock."""
+        entries = {**self._learned, **self._base}       # la BD manda sobre lo aprendido
+        tokens: Dict[str, Tuple[str, ...]] = {}
+        full: Dict[Tuple[str, ...], str] = {}
+        postings: Dict[str, set] = defaultdict(set)
+        for name in entries:
+            tokens[name] = tuple(dict.fromkeys(name_tokens(name)))
+            if tokens[name]:
+                full.setdefault(_key(tokens[name]), name)
+            for t in tokens[name]:
+                postings[t].add(name)
+
+        # Alias automáticos: apellidos compuestos de nombres de 3+ tokens, si no chocan
+        aliases: Dict[Tuple[str, ...], Optional[str]] = {}
+        for name, toks in tokens.items():
+            if len(toks) >= 3:
+                key = _key(toks[-2:])
+                if key not in full:
+                    aliases[key] = None if aliases.get(key, name) != name else name
+        for alias, name in self._learned_aliases.items():
+            key = _key(name_tokens(alias))
+            if name in entries and key and key not in full:
+                aliases[key] = name
+
+        n = max(1, len(entries))
+        idf = {t: math.log(1.0 + n / len(names)) for t, names in postings.items()}
+        self._state = (entries, tokens, full,
+                       {k: v for k, v in aliases.items() if v},
+                       {t: frozenset(names) for t, names in postings.items()}, idf)
+
+    def find(self, name: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """Candidatos [(nombre en la BD, confianza)] de mayor a menor confianza."""
+        query = name_tokens(_clean(name))
+        if not query:
+            return []
+        entries, tokens, full, aliases, postings, idf = self._state
+        key = _key(query)
+        if key in full:
+            return [(full[key], 1.0)]
+
+        ranked: Dict[str, float] = {}
+        if key in aliases:
+            ranked[aliases[key]] = 0.95
+        known = {t for t in query if t in postings}     # "árbitro", "spain"... no cuentan
+        candidates: FrozenSet[str] = frozenset().union(*(postings[t] for t in known))
+        for cand in candidates:
+            toks = tokens[cand]
+            matched = known.intersection(toks)
+            conf = sum(idf[t] for t in matched) / sum(idf[t] for t in toks)
+            surnames = matched.difference(toks[:1]) if len(toks) > 1 else matched
+            if not surnames:
+                conf = min(conf, MIN_CONFIDENCE - 0.1)
+            elif any(len(postings[t]) == 1 and len(t) >= 4 for t in surnames):
+                conf = max(conf, UNIQUE_SURNAME_CONFIDENCE)
+            # Tokens conocidos de la consulta que apuntan a otro árbitro restan confianza
+            # ("Martínez Munuera" no es "Sánchez Martínez")
+            conf *= sum(idf[t] for t in matched) / sum(idf[t] for t in known)
+            conf = round(min(conf, 0.9), 3)
+            ranked[cand] = max(ranked.get(cand, 0.0), conf)
+        return sorted(ranked.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+
+    def lookup(self, name: str) -> Optional[Tuple[str, float]]:
+        """Mejor candidato si supera el mínimo y no empata con el segundo."""
+        ranked = self.find(name, limit=2)
+        if not ranked or ranked[0][1] < MIN_CONFIDENCE:
+            return None
+        if len(ranked) > 1 and ranked[1][1] >= ranked[0][1] - AMBIGUITY_MARGIN:
+            return None
+        return ranked[0]
+
+    def data(self, name: str) -> dict:
+        return self._state[0].get(name, {})
+
+    def learn(self, name: str, profile: Optional[dict] = None, league: Optional[str] = None) -> Optional[str]:
+        """
+        Incorpora un árbitro visto en un fixture de API-Football.
+        Si resuelve con confianza alta a un árbitro conocido se guarda como
+        alias; si no está y hay perfil con partidos se añade como árbitro
+        aprendido. Solo se reconstruye el índice y se escribe a disco si
+        cambia algo (el fetcher lo llama en cada cascada). Devuelve el
+        nombre canónico o None.
+        """
+        clean = _clean(name)
+        if not name_tokens(clean):
+            return None
+        best = self.lookup(clean)
+        learned_entry = None
+        if profile and profile.get("matches_count"):
+            learned_entry = {
+                "league": league or profile.get("league", ""),
+                "strictness": profile.get("strictness", "MEDIUM"),
+                "matches_count": profile["matches_count"],
+                "profile": f"Perfil aprendido de API-Football ({profile['matches_count']} partidos).",
+                "source": "api_football",
+                **{k: profile[k] for k in ("avg_cards", "avg_yellows", "avg_reds", "penalty_rate") if k in profile},
+            }
+        with self._lock:
+            if best and best[1] >= 1.0:
+                if not (best[0] in self._learned and learned_entry) or self._learned[best[0]] == learned_entry:
+                    return best[0]
+                self._learned[best[0]] = learned_entry
+                canonical = best[0]
+            elif best and best[1] >= LEARN_ALIAS_CONFIDENCE:
+                # Alias ya conocido (aprendido o automático): nada que guardar
+                if self._state[3].get(_key(name_tokens(clean))) == best[0]:
+                    return best[0]
+                self._learned_aliases[clean] = best[0]
+                canonical = best[0]
+            elif learned_entry:
+                self._learned[clean] = learned_entry
+                canonical = clean
+            else:
+                return None
+            self._build()
+            self._save_learned()
+        logger.info(f"[Referee] Aprendido: {clean} → {canonical}")
+        return canonical
+
+    # ── Árbitros y alias aprendidos en disco ─────────────────────────────────
+
+    def _load_learned(self):
+        if not self.learned_path or not os.path.exists(self.learned_path):
+            return
+        try:
+            with open(self.learned_path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._learned = dict(data.get("referees", {}))
+            self._learned_aliases = dict(data.get("aliases", {}))
+        except (OSError, ValueError) as e:
+            logger.warning(f"[Referee] Árbitros aprendidos ilegibles, se ignoran: {e}")
+
+    def _save_learned(self):
+        if not self.learned_path:
+            return
+        data = json.dumps({"referees": self._learned, "aliases": self._learned_aliases},
+                          ensure_ascii=False, indent=1)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.learned_path)), exist_ok=True)
+            tmp = f"{self.learned_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.learned_path)
+        except OSError as e:
+            logger.warning(f"[Referee] No se pudieron guardar los árbitros aprendidos: {e}")
+
+
+# Índice construido una vez al importar
+REFEREE_INDEX = RefereeIndex(REFEREE_DB)
+
+
+def find_referees(name: str, limit: int = 3) -> List[Tuple[str, float]]:
+    """Candidatos [(nombre, confianza)] para un nombre de árbitro."""
+    if not name or name in _PLACEHOLDERS:
+        return []
+    return REFEREE_INDEX.find(name, limit)
+
+
+def learn_referee(name: str, profile: Optional[dict] = None, league: Optional[str] = None) -> Optional[str]:
+    """Añade al índice un árbitro (o alias) visto en API-Football."""
+    if not name or name in _PLACEHOLDERS:
+        return None
+    return REFEREE_INDEX.learn(name, profile, league)
+
+
 def get_referee_data(name: str) -> dict:
     """
     Busca datos de un árbitro por nombre (búsqueda flexible).
     Devuelve dict completo o datos básicos si no se encuentra.
     """
-    if not name or name in ["Por Detectar", "Por Confirmar", ""]:
+    if not name or name in _PLACEHOLDERS:
         return {}
 
-    name_lower = name.lower().strip()
-
     # Búsqueda exacta primero
     if name in REFEREE_DB:
         return REFEREE_DB[name]
 
-    # Búsqueda flexible por apellido o fragmento
-    for ref_name, data in REFEREE_DB.items():
-        ref_parts = ref_name.lower().split()
-        if any(part in name_lower for part in ref_parts if len(part) > 4):
-            return {**data, "name": ref_name}
-
-    return {}
+    # Búsqueda indexada: nombre sin acentos, apellidos y alias
+    best = REFEREE_INDEX.lookup(name)
+    if not best:
+        return {}
+    ref_name, confidence = best
+    return {**REFEREE_INDEX.data(ref_name), "name": ref_name, "match_confidence": confidence}
 
 
 def enrich_referee(ref_dict: dict) -> dict:
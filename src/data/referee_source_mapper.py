@@ -1,9 +1,9 @@
-import requests
 from bs4 import BeautifulSoup
 from typing import Optional, Dict
 from datetime import datetime
 import re
 from src.models.base import Referee, RefereeStrictness
+from src.data.cache_manager import cached_get
 
 
 class RefereeSourceMapper:
@@ -120,7 +120,7 @@ class LaLigaRefereeScraper(BaseRefereeScraper):
         """
         try:
             url = "https://www.rfef.es/noticias/arbitros/designaciones"
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = cached_get(url, category="scraper_referee", headers=self.headers, timeout=10)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -176,7 +176,7 @@ class PremierLeagueRefereeScraper(BaseRefereeScraper):
         """
         try:
             url = "https://www.premierleague.com/referees/overview"
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = cached_get(url, category="scraper_referee", headers=self.headers, timeout=10)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -223,7 +223,7 @@ class SerieARefereeScraper(BaseRefereeScraper):
     def fetch_referee(self, home_team: str, away_team: str, match_date: datetime) -> Dict:
         try:
             url = "https://www.aia-figc.it/designazioni/cana/"
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = cached_get(url, category="scraper_referee", headers=self.headers, timeout=10)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -270,7 +270,7 @@ class BundesligaRefereeScraper(BaseRefereeScraper):
     def fetch_referee(self, home_team: str, away_team: str, match_date: datetime) -> Dict:
         try:
             url = "https://www.dfb.de/sportl-strukturen/schiedsrichter/ansetzungen/"
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = cached_get(url, category="scraper_referee", headers=self.headers, timeout=10)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -316,7 +316,7 @@ class Ligue1RefereeScraper(BaseRefereeScraper):
     def fetch_referee(self, home_team: str, away_team: str, match_date: datetime) -> Dict:
         try:
             url = "http://arbitrezvous.blogspot.com/"
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = cached_get(url, category="scraper_referee", headers=self.headers, timeout=10)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, 'html.parser')
             
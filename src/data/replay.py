@@ -0,0 +1,332 @@
+"""
+Grabación y reproducción HTTP (cassettes) — LAGEMA JARG74
+==========================================================
+Sustituto local de API-Football, football-data.org, Sportmonks y SofaScore
+para pruebas de carga y CI sin gastar la cuota diaria (100 peticiones en el
+plan gratuito).
+
+``ReplayAdapter`` es un adaptador de ``requests`` respaldado por un cassette
+JSON: en modo ``record`` reenvía la petición a la red y guarda la respuesta;
+en ``replay`` la sirve desde disco (sin red) con latencia y límites de
+peticiones configurables; en ``auto`` reproduce lo grabado y graba lo que
+falte.
+
+``replay_http(...)`` lo instala para TODAS las sesiones de ``requests`` del
+proceso (las de los clientes de APIManager, ``requests.get`` sueltos y la
+sesión compartida de ``cached_get``), así que no hay que tocar los clientes:
+
+    from src.data.replay import replay_http
+    with replay_http("data/cassettes/laliga.json", mode="record"):
+        get_api_manager().get_fixtures_for_date("2026-05-12", "La Liga")
+
+    with replay_http("data/cassettes/laliga.json", latency=(0.05, 0.2),
+                     rate_limit=(10, 60), daily_quota=100) as adapter:
+        ...  # mismo código, sin red
+        print(adapter.stats)
+
+Con las variables de entorno ``LAGEMA_HTTP_REPLAY=<cassette>`` y
+``LAGEMA_HTTP_REPLAY_MODE=replay|record|auto`` se activa para todo el proceso
+(``install_from_env``).
+
+Las claves de API nunca se graban: no se guardan cabeceras de la petición y
+los parámetros de autenticación de la URL se eliminan de la clave.
+"""
+
+import atexit
+import base64
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+REPLAY_ENV = "LAGEMA_HTTP_REPLAY"
+REPLAY_MODE_ENV = "LAGEMA_HTTP_REPLAY_MODE"
+CASSETTE_DIR = os.path.join("data", "cassettes")
+MODES = ("record", "replay", "auto")
+
+# Parámetros de query con credenciales: no forman parte de la clave grabada
+SENSITIVE_PARAMS = {"api_token", "apikey", "api_key", "key", "token", "access_token"}
+# Cabeceras de respuesta que no tiene sentido reproducir
+_DROP_RESPONSE_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection", "set-cookie"}
+
+Latency = Union[float, Tuple[float, float]]
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Petición sin grabación en modo replay (los clientes la tratan como fallo de red)."""
+
+
+def interaction_key(method: str, url: str) -> str:
+    """Clave estable: método + URL sin credenciales y con la query ordenada."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k.lower() not in SENSITIVE_PARAMS)
+    clean = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ""))
+    return f"{method.upper()} {clean}"
+
+
+class Cassette:
+    """
+    Grabaciones en un fichero JSON ``{"version": 1, "interactions": {clave: [resp, ...]}}``.
+    Si una clave tiene varias respuestas se reproducen en orden y la última se repite.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions: Dict[str, list] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.dirty = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.interactions = json.load(f).get("interactions", {})
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.interactions.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.interactions
+
+    def next_response(self, key: str) -> Optional[dict]:
+        with self._lock:
+            recorded = self.interactions.get(key)
+            if not recorded:
+                return None
+            idx = self._cursor.get(key, 0)
+            self._cursor[key] = idx + 1
+            return recorded[min(idx, len(recorded) - 1)]
+
+    def add(self, key: str, resp: requests.Response):
+        body = resp.content or b""
+        try:
+            entry_body = {"text": body.decode(resp.encoding or "utf-8")}
+        except (UnicodeDecodeError, LookupError):
+            entry_body = {"base64": base64.b64encode(body).decode("ascii")}
+        entry = {
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_RESPONSE_HEADERS},
+            "encoding": resp.encoding,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            **entry_body,
+        }
+        with self._lock:
+            self.interactions.setdefault(key, []).append(entry)
+            self.dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "interactions": self.interactions}, f,
+                          indent=1, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self.dirty = False
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Adaptador de transporte de ``requests`` respaldado por un Cassette.
+
+    Args:
+        cassette: Cassette o ruta al JSON.
+        mode: "record", "replay" o "auto".
+        latency: segundos fijos o rango (min, max) añadidos a cada respuesta reproducida.
+        rate_limit: (peticiones, segundos) por host; al superarlo responde 429 con Retry-After.
+        daily_quota: peticiones totales por host antes de responder 429 "cuota agotada".
+        seed: semilla de la latencia aleatoria (reproducible).
+        sleep: función de espera (inyectable para pruebas).
+    """
+
+    def __init__(self, cassette: Union[Cassette, str], mode: str = "replay",
+                 latency: Latency = 0.0, rate_limit: Optional[Tuple[int, float]] = None,
+                 daily_quota: Optional[int] = None, seed: int = 74,
+                 sleep: Callable[[float], None] = time.sleep,
+                 real_adapter: Optional[BaseAdapter] = None):
+        super().__init__()
+        if mode not in MODES:
+            raise ValueError(f"Modo de replay desconocido: {mode} (usa {', '.join(MODES)})")
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette(cassette)
+        self.mode = mode
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.daily_quota = daily_quota
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._real = real_adapter or HTTPAdapter()
+        self._lock = threading.Lock()
+        self._windows: Dict[str, deque] = {}
+        self._used: Dict[str, int] = {}
+        self.stats = {"replayed": 0, "recorded": 0, "misses": 0, "throttled": 0, "quota_exhausted": 0}
+
+    # ── Transporte ───────────────────────────────────────────────────────────
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = interaction_key(request.method, request.url)
+        host = urlsplit(request.url).netloc.lower()
+
+        if self.mode != "record":
+            # Latencia y límites simulan el servicio real; al grabar manda el servicio
+            limited = self._check_limits(host, request)
+            if limited is not None:
+                return limited
+            entry = self.cassette.next_response(key)
+            if entry is not None:
+                self._delay()
+                self._count("replayed")
+                return self._build_response(request, entry)
+            if self.mode == "replay":
+                self._count("misses")
+                raise CassetteMiss(f"Sin grabación para {key}", request=request)
+
+        resp = self._real.send(request, stream=False, timeout=timeout, verify=verify,
+                               cert=cert, proxies=proxies)
+        self.cassette.add(key, resp)
+        self._count("recorded")
+        return resp
+
+    def close(self):
+        self._real.close()
+
+    # ── Internos ─────────────────────────────────────────────────────────────
+
+    def _count(self, field: str):
+        with self._lock:
+            self.stats[field] += 1
+
+    def _delay(self):
+        if isinstance(self.latency, (tuple, list)):
+            lo, hi = self.latency
+            with self._lock:
+                secs = self._rng.uniform(lo, hi)
+        else:
+            secs = float(self.latency or 0.0)
+        if secs > 0:
+            self._sleep(secs)
+
+    def _check_limits(self, host: str, request) -> Optional[requests.Response]:
+        with self._lock:
+            if self.daily_quota is not None:
+                if self._used.get(host, 0) >= self.daily_quota:
+                    self.stats["quota_exhausted"] += 1
+                    body = {"errors": {"requests": "You have reached the request limit for the day"}}
+                    return self._synthetic(request, 429, body, {"Retry-After": "86400"})
+                self._used[host] = self._used.get(host, 0) + 1
+            if self.rate_limit:
+                calls, period = self.rate_limit
+                now = time.monotonic()
+                window = self._windows.setdefault(host, deque())
+                while window and now - window[0] >= period:
+                    window.popleft()
+                if len(window) >= calls:
+                    self.stats["throttled"] += 1
+                    retry = max(0.0, period - (now - window[0]))
+                    body = {"errors": {"rateLimit": "Too many requests"}}
+                    return self._synthetic(request, 429, body, {"Retry-After": f"{retry:.0f}"})
+                window.append(now)
+        return None
+
+    def _synthetic(self, request, status: int, body: dict, headers: dict) -> requests.Response:
+        entry = {"status": status, "reason": "Too Many Requests", "encoding": "utf-8",
+                 "headers": {"Content-Type": "application/json", **headers}, "text": json.dumps(body)}
+        return self._build_response(request, entry)
+
+    def _build_response(self, request, entry: dict) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp.reason = entry.get("reason")
+        resp.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        resp.encoding = entry.get("encoding")
+        if "base64" in entry:
+            resp._content = base64.b64decode(entry["base64"])
+        else:
+            resp._content = entry.get("text", "").encode(resp.encoding or "utf-8")
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        resp.from_replay = True
+        return resp
+
+
+_install_lock = threading.Lock()
+_active: Optional[ReplayAdapter] = None
+_original_get_adapter = requests.Session.get_adapter
+
+
+def _patched_get_adapter(self, url):
+    adapter = _active
+    if adapter is not None and url.lower().startswith(("http://", "https://")):
+        return adapter
+    return _original_get_adapter(self, url)
+
+
+def install(adapter: ReplayAdapter) -> ReplayAdapter:
+    """Enruta todas las sesiones de requests del proceso por ``adapter``."""
+    global _active
+    with _install_lock:
+        _active = adapter
+        requests.Session.get_adapter = _patched_get_adapter
+    logger.info(f"[Replay] Activo en modo {adapter.mode} ({len(adapter.cassette)} grabaciones)")
+    return adapter
+
+
+def uninstall():
+    """Restaura el transporte real y guarda lo grabado."""
+    global _active
+    with _install_lock:
+        adapter, _active = _active, None
+        requests.Session.get_adapter = _original_get_adapter
+    if adapter is not None:
+        adapter.cassette.save()
+
+
+def active_adapter() -> Optional[ReplayAdapter]:
+    return _active
+
+
+@contextmanager
+def replay_http(cassette: Union[Cassette, str], mode: str = "replay", **options) -> Iterator[ReplayAdapter]:
+    """Context manager: instala un ReplayAdapter y lo retira (guardando el cassette) al salir."""
+    adapter = install(ReplayAdapter(cassette, mode=mode, **options))
+    try:
+        yield adapter
+    finally:
+        uninstall()
+
+
+def install_from_env() -> Optional[ReplayAdapter]:
+    """Activa el replay si ``LAGEMA_HTTP_REPLAY`` apunta a un cassette (no-op en otro caso)."""
+    path = os.getenv(REPLAY_ENV, "").strip()
+    if not path:
+        return None
+    if not os.path.dirname(path):
+        path = os.path.join(CASSETTE_DIR, path)
+    mode = os.getenv(REPLAY_MODE_ENV, "replay").strip().lower() or "replay"
+    # Streamlit re-ejecuta el script en cada interacción: se reutiliza el adaptador
+    # activo en lugar de recargar el cassette y registrar otro guardado en atexit
+    # (los adaptadores viejos se guardarían después y pisarían lo grabado)
+    current = _active
+    if current is not None and current.mode == mode and \
+            os.path.abspath(current.cassette.path) == os.path.abspath(path):
+        return current
+    adapter = install(ReplayAdapter(path, mode=mode))
+    atexit.register(adapter.cassette.save)
+    return adapter
@@ -0,0 +1,119 @@
+"""
+Índice de plantilla para resolver nombres de jugadores — LAGEMA JARG74
+======================================================================
+Los nombres que llegan de scraping u OCR ("Lisandro Martinez", "Vinícius
+Jr.", "MARTÍNEZ") se resuelven contra la plantilla con un índice invertido
+construido una vez por versión de plantilla:
+
+- Tokens sin acentos y en minúsculas → ids de jugador (se descartan
+  iniciales y partículas como "de", "da", "van").
+- Puntuación por IDF: un token que solo tiene un jugador pesa más que un
+  apellido que comparten varios.
+- Si los dos mejores candidatos empatan el nombre es ambiguo y no se
+  resuelve (antes "Martínez" se asignaba al primer Martínez del roster).
+
+El índice se guarda en una LRU por contenido de la plantilla (ids y
+nombres), así que una plantilla modificada genera un índice nuevo.
+
+Uso:
+    index = roster_index(team)              # Team, lista de Player o de nombres
+    index.match("Lisandro Martínez")        # → nombre del roster o None
+    index.resolve(nombres_scrapeados)       # → {scrapeado: nombre o None}
+"""
+
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_PARTICLES = frozenset({"de", "da", "das", "del", "do", "dos", "di", "du", "la", "le",
+                        "el", "van", "von", "der", "den", "ter", "jr", "junior"})
+# Siglas y partículas que no distinguen a un club ("Club Atlético de Madrid")
+_TEAM_NOISE = frozenset({"fc", "cf", "cd", "ud", "sd", "rcd", "ca", "ac", "afc", "ssc", "club", "de", "del"})
+
+
+def fold(text: str) -> str:
+    """Minúsculas y sin acentos ("Vinícius" → "vinicius")."""
+    return unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii").lower()
+
+
+def name_tokens(name: str) -> List[str]:
+    """Tokens significativos de un nombre (sin iniciales ni partículas)."""
+    return [t for t in re.split(r"[^a-z0-9]+", fold(name)) if len(t) > 1 and t not in _PARTICLES]
+
+
+def normalize_team(name: str) -> str:
+    """Nombre de equipo comparable: sin acentos, minúsculas y sin siglas de club ("Club Atlético de Madrid" → "atletico madrid")."""
+    return " ".join(t for t in re.split(r"[^a-z0-9]+", fold(name)) if t and t not in _TEAM_NOISE)
+
+
+class RosterIndex:
+    """Índice invertido token → ids de jugador con pesos IDF."""
+
+    def __init__(self, players: Iterable[Tuple[str, str]]):
+        self._names: Dict[str, str] = {}
+        self._exact: Dict[Tuple[str, ...], str] = {}
+        postings: Dict[str, set] = defaultdict(set)
+        for pid, name in players:
+            self._names[pid] = name
+            tokens = name_tokens(name)
+            self._exact.setdefault(tuple(sorted(tokens)), pid)
+            for t in tokens:
+                postings[t].add(pid)
+        n = max(1, len(self._names))
+        self._postings = {t: frozenset(ids) for t, ids in postings.items()}
+        self._idf = {t: math.log(1.0 + n / len(ids)) for t, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def match_id(self, scraped_name: str) -> Optional[str]:
+        """Id del jugador que corresponde a ``scraped_name`` o None (sin candidato o ambiguo)."""
+        tokens = name_tokens(scraped_name)
+        if not tokens:
+            return None
+        exact = self._exact.get(tuple(sorted(tokens)))
+        if exact is not None:
+            return exact
+        scores: Dict[str, float] = defaultdict(float)
+        for t in set(tokens):
+            for pid in self._postings.get(t, ()):
+                scores[pid] += self._idf[t]
+        if not scores:
+            return None
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        if len(ranked) > 1 and ranked[1][1] >= ranked[0][1] - 1e-9:
+            return None
+        return ranked[0][0]
+
+    def match(self, scraped_name: str) -> Optional[str]:
+        """Nombre del roster que corresponde a ``scraped_name`` o None."""
+        pid = self.match_id(scraped_name)
+        return self._names[pid] if pid is not None else None
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Resuelve un lote de nombres (cada nombre distinto se puntúa una vez)."""
+        return {name: self.match(name) for name in dict.fromkeys(names)}
+
+    def matched(self, names: Iterable[str]) -> List[str]:
+        """Nombres del roster reconocidos en ``names``, sin duplicados y en orden."""
+        return list(dict.fromkeys(m for m in self.resolve(names).values() if m))
+
+
+@lru_cache(maxsize=64)
+def _cached_index(roster_key: Tuple[Tuple[str, str], ...]) -> RosterIndex:
+    return RosterIndex(roster_key)
+
+
+def roster_index(roster) -> RosterIndex:
+    """Índice (cacheado por versión de plantilla) de un Team, lista de Player o de nombres."""
+    if roster is None:
+        return _cached_index(())
+    players = roster.players if hasattr(roster, "players") else roster
+    key = []
+    for p in players:
+        name = p.name if hasattr(p, "name") else str(p)
+        key.append((str(getattr(p, "id", None) or name), name))
+    return _cached_index(tuple(key))
@@ -3,11 +3,11 @@ besoccer_scraper.py — BeSoccer scraper para alineaciones y árbitros
 ====================================================================
 Cubre todas las ligas. Funciona con requests (sin JS).
 """
-import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 from datetime import datetime
 import re
+from src.data.cache_manager import cached_get
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
@@ -52,7 +52,7 @@ def fetch_lineup(home: str, away: str) -> Dict:
         home_slug = _get_slug(home)
         away_slug = _get_slug(away)
         url = f"https://es.besoccer.com/partido/{home_slug}/{away_slug}"
-        r = requests.get(url, headers=HEADERS, timeout=10)
+        r = cached_get(url, category="scraper_lineups", headers=HEADERS, timeout=10)
         if r.status_code != 200:
             return result
 
@@ -99,7 +99,7 @@ def fetch_referee(home: str, away: str) -> Optional[Dict]:
         home_slug = _get_slug(home)
         away_slug = _get_slug(away)
         url = f"https://es.besoccer.com/partido/{home_slug}/{away_slug}"
-        r = requests.get(url, headers=HEADERS, timeout=10)
+        r = cached_get(url, category="scraper_referee", headers=HEADERS, timeout=10)
         if r.status_code != 200:
             return None
 
@@ -7,12 +7,12 @@ Sources:
 - Referee:  https://www.dfb.de/schiedsrichter/ansetzungen/
 - Fallback: Resultados-Futbol, Kicker
 """
-import requests
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
 from datetime import datetime
 import re
 from src.data.scrapers.js_scraper import get_html_with_js, is_available as js_available
+from src.data.cache_manager import cached_get
 
 
 HEADERS = {
@@ -35,7 +35,7 @@ def fetch_lineup_kicker(home: str, away: str) -> Dict:
     result = {'home': [], 'away': [], 'bajas': [], 'source': None}
     try:
         url = "https://www.kicker.de/bundesliga/aufstellungen"
-        resp = requests.get(url, headers=HEADERS, timeout=12)
+        resp = cached_get(url, category="scraper_lineups", headers=HEADERS, timeout=12)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, 'html.parser')
 
@@ -84,7 +84,7 @@ def fetch_referee_dfb(home: str, away: str) -> Optional[Dict]:
                 html = get_html_with_js(url)
             
             if not html:
-                resp = requests.get(url, headers=HEADERS, timeout=12)
+                resp = cached_get(url, category="scraper_referee", headers=HEADERS, timeout=12)
                 resp.raise_for_status()
                 html = resp.text
                 
@@ -123,7 +123,7 @@ def fetch_referee_rf(home: str, away: str) -> Optional[Dict]:
             html = get_html_with_js(url)
             
         if not html:
-            resp = requests.get(url, headers=HEADERS, timeout=12)
+            resp = cached_get(url, category="scraper_fixtures", headers=HEADERS, timeout=12)
             resp.raise_for_status()
             html = resp.text
             
@@ -155,7 +155,7 @@ def fetch_referee_rf(home: str, away: str) -> Optional[Dict]:
             m_html = get_html_with_js(m_url)
             
         if not m_html:
-            resp2 = requests.get(m_url, headers=HEADERS, timeout=12)
+            resp2 = cached_get(m_url, category="scraper_referee", headers=HEADERS, timeout=12)
             m_html = resp2.text
             
         soup2 = BeautifulSoup(m_html, 'html.parser')
@@ -182,7 +182,7 @@ def fetch_referee_kicker(home: str, away: str) -> Optional[Dict]:
             html = get_html_with_js(url)
             
         if not html:
-            resp = requests.get(url, headers=HEADERS, timeout=12)
+            resp = cached_get(url, category="scraper_fixtures", headers=HEADERS, timeout=12)
             resp.raise_for_status()
             html = resp.text
             
@@ -210,7 +210,7 @@ def fetch_referee_kicker(home: str, away: str) -> Optional[Dict]:
             m_html = get_html_with_js(m_url)
             
         if not m_html:
-            resp2 = requests.get(m_url, headers=HEADERS, timeout=12)
+            resp2 = cached_get(m_url, category="scraper_referee", headers=HEADERS, timeout=12)
             m_html = resp2.text
             
         soup2 = BeautifulSoup(m_html, 'html.parser')
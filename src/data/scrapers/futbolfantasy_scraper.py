@@ -14,10 +14,10 @@ Estrategia:
      - Jugadores lesionados / sancionados
 """
 import re
-import requests
 import unicodedata
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional, Tuple
+from src.data.cache_manager import cached_get
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
@@ -84,7 +84,7 @@ def find_match_url(home: str, away: str, league: str) -> Optional[str]:
 
     for try_url in candidate_urls[:3]:  # No probar todas para no hacer muchas peticiones
         try:
-            r = requests.get(try_url, headers=HEADERS, timeout=12)
+            r = cached_get(try_url, category="scraper_fixtures", headers=HEADERS, timeout=12)
             if r.status_code != 200:
                 continue
             soup = BeautifulSoup(r.text, 'html.parser')
@@ -139,7 +139,7 @@ def scrape_match_page(match_url: str) -> Dict:
     }
 
     try:
-        r = requests.get(match_url, headers=HEADERS, timeout=12)
+        r = cached_get(match_url, category="scraper_lineups", headers=HEADERS, timeout=12)
         r.raise_for_status()
         soup = BeautifulSoup(r.text, 'html.parser')
     except Exception as e:
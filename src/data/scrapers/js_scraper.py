@@ -4,10 +4,24 @@ js_scraper.py — Playwright-based JS renderer for LAGEMA JARG74
 Fetches fully rendered HTML from JavaScript-heavy sports sites.
 Falls back gracefully to requests if Playwright is not available.
 
+Rendering goes through a process-wide ``BrowserPool``: a few worker threads,
+each owning one long-lived Chromium with a reusable context and page (the
+sync Playwright API is bound to the thread that started it). Jobs wait in a
+bounded queue; when it is full the call returns None immediately and the
+caller falls back to requests instead of piling up browsers. Images, media,
+fonts, stylesheets and ad/analytics hosts are aborted at the network layer,
+and waits are driven by a CSS selector or network idle with an upper bound
+rather than fixed sleeps.
+
 Playwright is required: pip install playwright && playwright install chromium
 """
-from typing import Optional
-import re
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+import atexit
+import os
+import queue
+import threading
 
 # Try to import playwright — will fail gracefully if not installed
 PLAYWRIGHT_AVAILABLE = False
@@ -17,72 +31,264 @@ try:
 except ImportError:
     pass
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/122.0.0.0 Safari/537.36"
+)
+LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+]
 
-def get_html_with_js(url: str, wait_for: str = "networkidle",
-                     timeout_ms: int = 15000,
-                     extra_wait_ms: int = 2000,
-                     block_images: bool = True) -> Optional[str]:
-    """
-    Fetches fully JS-rendered HTML from a URL using Playwright Chromium.
+# Nothing we parse needs these: the HTML is read after rendering, never looked at
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+BLOCKED_HOSTS = (
+    "googletagmanager.com", "google-analytics.com", "doubleclick.net",
+    "googlesyndication.com", "adservice.google.", "amazon-adsystem.com",
+    "facebook.net", "hotjar.com", "criteo.", "taboola.com", "outbrain.com",
+    "scorecardresearch.com", "quantserve.com", "chartbeat.",
+)
 
-    Args:
-        url:           Target page URL
-        wait_for:      Playwright wait state: "networkidle" | "domcontentloaded" | "load"
-        timeout_ms:    Max time to wait for page load (ms)
-        extra_wait_ms: Additional wait after load for dynamic content to settle
-        block_images:  Block image/media downloads to speed up scraping
+DEFAULT_WORKERS = int(os.getenv("LAGEMA_JS_WORKERS", "2") or 2)
+DEFAULT_QUEUE_SIZE = 8
+PAGES_PER_CONTEXT = 25       # recycle the context (cookies, memory) every N renders
+MAX_QUEUE_WAIT_S = 60.0      # how long a caller waits for its turn before giving up
 
-    Returns:
-        Full rendered HTML string, or None if failed.
-    """
-    if not PLAYWRIGHT_AVAILABLE:
-        print("    [JS] Playwright not available — run: pip install playwright && playwright install chromium")
-        return None
 
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=[
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-blink-features=AutomationControlled",
-                ]
-            )
-            context = browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/122.0.0.0 Safari/537.36"
-                ),
+class RenderQueueFull(Exception):
+    """The pool's queue is full; the caller should fall back to requests."""
+
+
+def should_block(url: str, resource_type: str, block_images: bool = True) -> bool:
+    """True if a sub-request is not needed to get the rendered HTML."""
+    if block_images and resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlsplit(url).hostname or ""
+    return any(pattern in host for pattern in BLOCKED_HOSTS)
+
+
+class _BrowserSlot:
+    """Browser, context and page owned by one worker thread."""
+
+    def __init__(self, pages_per_context: int, stats: dict):
+        self.pages_per_context = pages_per_context
+        self.block_images = True
+        self._stats = stats
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._uses = 0
+
+    def page(self):
+        """Reusable page, launching the browser or a fresh context when needed."""
+        if self._browser is None or not self._browser.is_connected():
+            self.close()
+            self._pw = sync_playwright().start()
+            self._browser = self._pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            self._stats["launches"] += 1
+        if self._page is None or self._page.is_closed() or self._uses >= self.pages_per_context:
+            self.reset()
+            self._context = self._browser.new_context(
+                user_agent=USER_AGENT,
                 locale="es-ES",
                 viewport={"width": 1280, "height": 800},
+                service_workers="block",   # otherwise SW fetches bypass routing
             )
+            self._context.route("**/*", self._route)
+            self._page = self._context.new_page()
+            self._uses = 0
+        self._uses += 1
+        return self._page
+
+    def _route(self, route):
+        request = route.request
+        if should_block(request.url, request.resource_type, self.block_images):
+            route.abort()
+        else:
+            route.continue_()
 
-            page = context.new_page()
+    def reset(self):
+        """Drop the context (after an error or every ``pages_per_context`` renders)."""
+        context, self._context, self._page = self._context, None, None
+        if context is not None:
+            try:
+                context.close()
+            except Exception:
+                pass
+
+    def close(self):
+        self.reset()
+        browser, pw, self._browser, self._pw = self._browser, self._pw, None, None
+        for closer in (getattr(browser, "close", None), getattr(pw, "stop", None)):
+            if closer:
+                try:
+                    closer()
+                except Exception:
+                    pass
 
-            # Block images/fonts/media to speed up scraping
-            if block_images:
-                page.route("**/*.{png,jpg,jpeg,gif,webp,svg,woff,woff2,ttf,mp4}", lambda r: r.abort())
 
-            # Navigate with timeout
+class BrowserPool:
+    """
+    Bounded pool of long-lived Playwright browsers.
+
+    ``submit(fn)`` queues ``fn(slot)`` to run on one of the browser threads;
+    ``render(url, ...)`` is the HTML-fetching job used by the module functions.
+    """
+
+    _STOP = object()
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, max_queue: int = DEFAULT_QUEUE_SIZE,
+                 pages_per_context: int = PAGES_PER_CONTEXT, max_queue_wait_s: float = MAX_QUEUE_WAIT_S):
+        self.max_workers = max(1, max_workers)
+        self.pages_per_context = pages_per_context
+        self.max_queue_wait_s = max_queue_wait_s
+        self.stats = {"launches": 0, "renders": 0, "errors": 0, "rejected": 0}
+        self._jobs: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._threads = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _ensure_workers(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool is shut down")
+            while len(self._threads) < self.max_workers:
+                t = threading.Thread(target=self._worker, name=f"js-browser-{len(self._threads)}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _worker(self):
+        slot = _BrowserSlot(self.pages_per_context, self.stats)
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is self._STOP:
+                    return
+                fn, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue   # caller gave up while queued
+                try:
+                    future.set_result(fn(slot))
+                except BaseException as e:
+                    self.stats["errors"] += 1
+                    slot.reset()
+                    future.set_exception(e)
+        finally:
+            slot.close()
+
+    def submit(self, fn: Callable[[_BrowserSlot], Any], block_s: float = 0.0) -> Future:
+        """Queue ``fn(slot)`` on a browser thread; RenderQueueFull if there is no room."""
+        self._ensure_workers()
+        future: Future = Future()
+        try:
+            if block_s > 0:
+                self._jobs.put((fn, future), timeout=block_s)
+            else:
+                self._jobs.put_nowait((fn, future))
+        except queue.Full:
+            self.stats["rejected"] += 1
+            raise RenderQueueFull(f"{self._jobs.maxsize} renders already queued")
+        return future
+
+    def run(self, fn: Callable[[_BrowserSlot], Any], timeout_s: Optional[float] = None) -> Any:
+        """``submit`` and wait; cancels the job if it has not started before the timeout."""
+        future = self.submit(fn)
+        try:
+            return future.result(timeout=self.max_queue_wait_s + (timeout_s or 0))
+        except FutureTimeout:
+            future.cancel()
+            raise
+
+    def render(self, url: str, wait_for: str = "networkidle", timeout_ms: int = 15000,
+               wait_selector: Optional[str] = None, settle_ms: int = 0,
+               block_images: bool = True) -> str:
+        """Rendered HTML of ``url`` (partial content if the waits time out)."""
+        def job(slot: _BrowserSlot) -> str:
+            slot.block_images = block_images
+            page = slot.page()
             try:
-                page.goto(url, wait_until=wait_for, timeout=timeout_ms)
+                page.goto(url, wait_until="domcontentloaded" if wait_selector else wait_for,
+                          timeout=timeout_ms)
+                if wait_selector:
+                    page.wait_for_selector(wait_selector, state="attached", timeout=timeout_ms)
+                elif settle_ms > 0 and wait_for != "networkidle":
+                    page.wait_for_load_state("networkidle", timeout=settle_ms)
             except PlaywrightTimeout:
                 # Partial load is often enough
                 print(f"    [JS] Timeout on {url} — using partial content")
-
-            # Small extra wait for dynamic data to render
-            if extra_wait_ms > 0:
-                page.wait_for_timeout(extra_wait_ms)
-
             html = page.content()
-            browser.close()
+            self.stats["renders"] += 1
             return html
+        return self.run(job, timeout_s=(timeout_ms * 2 + settle_ms) / 1000)
 
+    def shutdown(self, timeout_s: float = 10.0):
+        """Stop the workers and close their browsers (each in its own thread)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._jobs.put(self._STOP)
+        for t in threads:
+            t.join(timeout_s)
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Pool shared by every scraper in the process; closed at interpreter exit."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def _render(url: str, **kwargs) -> Optional[str]:
+    try:
+        return get_browser_pool().render(url, **kwargs)
+    except RenderQueueFull as e:
+        print(f"    [JS] Render queue full ({e}) — skipping {url}")
+    except FutureTimeout:
+        print(f"    [JS] Gave up waiting for a browser for {url}")
     except Exception as e:
         print(f"    [JS] Playwright error for {url}: {e}")
+    return None
+
+
+def get_html_with_js(url: str, wait_for: str = "networkidle",
+                     timeout_ms: int = 15000,
+                     extra_wait_ms: int = 2000,
+                     block_images: bool = True,
+                     wait_selector: Optional[str] = None) -> Optional[str]:
+    """
+    Fetches fully JS-rendered HTML from a URL using the shared Chromium pool.
+
+    Args:
+        url:           Target page URL
+        wait_for:      Playwright wait state: "networkidle" | "domcontentloaded" | "load"
+        timeout_ms:    Max time to wait for page load (ms)
+        extra_wait_ms: Upper bound to wait for the network to go idle after
+                       ``wait_for`` (no-op when already idle); ignored if
+                       ``wait_selector`` is given
+        block_images:  Block images/media/fonts/stylesheets to speed up scraping
+        wait_selector: CSS selector that marks the content as rendered
+
+    Returns:
+        Full rendered HTML string, or None if failed.
+    """
+    if not PLAYWRIGHT_AVAILABLE:
+        print("    [JS] Playwright not available — run: pip install playwright && playwright install chromium")
         return None
+    return _render(url, wait_for=wait_for, timeout_ms=timeout_ms, wait_selector=wait_selector,
+                   settle_ms=extra_wait_ms, block_images=block_images)
 
 
 def get_html_with_selector(url: str, wait_selector: str,
@@ -101,36 +307,7 @@ def get_html_with_selector(url: str, wait_selector: str,
     """
     if not PLAYWRIGHT_AVAILABLE:
         return None
-
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=["--no-sandbox", "--disable-dev-shm-usage"]
-            )
-            context = browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36"
-                ),
-                locale="es-ES",
-            )
-            page = context.new_page()
-            page.route("**/*.{png,jpg,jpeg,gif,webp,svg,woff,woff2,ttf}", lambda r: r.abort())
-
-            try:
-                page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
-                page.wait_for_selector(wait_selector, timeout=timeout_ms)
-            except PlaywrightTimeout:
-                print(f"    [JS] Selector '{wait_selector}' not found on {url}")
-
-            html = page.content()
-            browser.close()
-            return html
-
-    except Exception as e:
-        print(f"    [JS] Playwright selector error: {e}")
-        return None
+    return _render(url, timeout_ms=timeout_ms, wait_selector=wait_selector)
 
 
 def is_available() -> bool:
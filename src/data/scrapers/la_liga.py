@@ -7,12 +7,12 @@ Sources:
 - Referee:  https://www.rfef.es/noticias/arbitros/designaciones
 - Validate: https://www.besoccer.com
 """
-import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 from datetime import datetime
 import re
 from src.data.scrapers.js_scraper import get_html_with_js, get_html_with_selector, is_available as js_available
+from src.data.cache_manager import cached_get
 
 
 HEADERS = {
@@ -49,13 +49,14 @@ def _find_futbolfantasy_match_url(home: str, away: str) -> Optional[str]:
     html = None
     if js_available():
         print(f"    [FF] Fetching match list via Playwright JS...")
-        html = get_html_with_js(base_url, wait_for="networkidle", extra_wait_ms=3000)
+        # Match cards are in once a /partidos/ link exists; no need for idle + sleep
+        html = get_html_with_js(base_url, wait_selector='a[href*="/partidos/"]')
 
     # Fallback to requests if playwright not available or failed
     if not html:
         try:
             print(f"    [FF] Falling back to requests for match list...")
-            resp = requests.get(base_url, headers=HEADERS, timeout=12)
+            resp = cached_get(base_url, category="scraper_fixtures", headers=HEADERS, timeout=12)
             resp.raise_for_status()
             html = resp.text
         except Exception as e:
@@ -129,7 +130,7 @@ def fetch_lineup_futbolfantasy(home: str, away: str) -> Dict:
     if not html:
         try:
             print(f"    [FF] Fetching match page via requests: {match_url}")
-            resp = requests.get(match_url, headers=HEADERS, timeout=12)
+            resp = cached_get(match_url, category="scraper_lineups", headers=HEADERS, timeout=12)
             resp.raise_for_status()
             html = resp.text
         except Exception as e:
@@ -303,7 +304,7 @@ def fetch_lineup_rf(home: str, away: str) -> Dict:
             html = get_html_with_js(url)
         
         if not html:
-            resp = requests.get(url, headers=HEADERS, timeout=12)
+            resp = cached_get(url, category="scraper_fixtures", headers=HEADERS, timeout=12)
             html = resp.text
             
         soup = BeautifulSoup(html, 'html.parser')
@@ -339,7 +340,7 @@ def fetch_lineup_rf(home: str, away: str) -> Dict:
             l_html = get_html_with_js(l_url, wait_for="load", timeout_ms=30000, extra_wait_ms=5000)
             
         if not l_html:
-            resp2 = requests.get(l_url, headers=HEADERS, timeout=15)
+            resp2 = cached_get(l_url, category="scraper_lineups", headers=HEADERS, timeout=15)
             l_html = resp2.text
             
         soup2 = BeautifulSoup(l_html, 'html.parser')
@@ -437,7 +438,7 @@ def fetch_referee_futbolfantasy(home: str, away: str) -> Optional[Dict]:
     
     if not html:
         try:
-            resp = requests.get(match_url, headers=HEADERS, timeout=12)
+            resp = cached_get(match_url, category="scraper_referee", headers=HEADERS, timeout=12)
             resp.raise_for_status()
             html = resp.text
         except Exception as e:
@@ -479,7 +480,7 @@ def fetch_referee_rf(home: str, away: str) -> Optional[Dict]:
             html = get_html_with_js(url)
         
         if not html:
-            resp = requests.get(url, headers=HEADERS, timeout=12)
+            resp = cached_get(url, category="scraper_fixtures", headers=HEADERS, timeout=12)
             html = resp.text
             
         soup = BeautifulSoup(html, 'html.parser')
@@ -508,7 +509,7 @@ def fetch_referee_rf(home: str, away: str) -> Optional[Dict]:
             m_html = get_html_with_js(m_url)
             
         if not m_html:
-            resp2 = requests.get(m_url, headers=HEADERS, timeout=12)
+            resp2 = cached_get(m_url, category="scraper_referee", headers=HEADERS, timeout=12)
             m_html = resp2.text
             
         soup2 = BeautifulSoup(m_html, 'html.parser')
@@ -534,7 +535,7 @@ def fetch_referee_rfef(home: str, away: str) -> Optional[Dict]:
     """
     try:
         url = "https://www.rfef.es/noticias/arbitros/designaciones"
-        resp = requests.get(url, headers=HEADERS, timeout=12)
+        resp = cached_get(url, category="scraper_referee", headers=HEADERS, timeout=12)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, 'html.parser')
 
@@ -577,7 +578,7 @@ def fetch_referee_designaciones(home: str, away: str) -> Optional[Dict]:
     for url in urls_to_try:
         try:
             print(f"    [Designaciones] Probando: {url}")
-            resp = requests.get(url, headers=HEADERS, timeout=12)
+            resp = cached_get(url, category="scraper_referee", headers=HEADERS, timeout=12)
             if resp.status_code != 200:
                 continue
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -632,7 +633,7 @@ def fetch_referee_besoccer_v2(home: str, away: str) -> Optional[Dict]:
     for url in urls_to_try:
         try:
             print(f"    [BeSoccer v2] Probando: {url}")
-            resp = requests.get(url, headers=HEADERS, timeout=10)
+            resp = cached_get(url, category="scraper_referee", headers=HEADERS, timeout=10)
             if resp.status_code != 200:
                 continue
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -669,7 +670,7 @@ def fetch_referee_sofascore(home: str, away: str) -> Optional[Dict]:
             'User-Agent': 'Mozilla/5.0',
             'Accept': 'application/json',
         }
-        resp = requests.get(api_url, headers=headers_api, timeout=10)
+        resp = cached_get(api_url, category="scraper_fixtures", headers=headers_api, timeout=10)
         if resp.status_code != 200:
             return None
         
@@ -686,7 +687,7 @@ def fetch_referee_sofascore(home: str, away: str) -> Optional[Dict]:
                 if event_id:
                     # Get event details
                     detail_url = f"https://api.sofascore.com/api/v1/event/{event_id}"
-                    resp2 = requests.get(detail_url, headers=headers_api, timeout=10)
+                    resp2 = cached_get(detail_url, category="scraper_referee", headers=headers_api, timeout=10)
                     if resp2.status_code == 200:
                         detail = resp2.json()
                         referee = detail.get('event', {}).get('referee', {})
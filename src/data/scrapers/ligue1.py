@@ -6,12 +6,12 @@ Sources:
 - Lineups:  https://www.lequipe.fr/Football/Actualite/Compositions-probables
 - Referee:  https://fff.fr/arbitrage/designations/
 """
-import requests
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
 from datetime import datetime
 import re
 from src.data.scrapers.js_scraper import get_html_with_js, is_available as js_available
+from src.data.cache_manager import cached_get
 
 
 HEADERS = {
@@ -34,7 +34,7 @@ def fetch_lineup_lequipe(home: str, away: str) -> Dict:
     result = {'home': [], 'away': [], 'bajas': [], 'source': None}
     try:
         url = "https://www.lequipe.fr/Football/Actualite/Compositions-probables-de-la-journee-de-ligue-1/1"
-        resp = requests.get(url, headers=HEADERS, timeout=12)
+        resp = cached_get(url, category="scraper_lineups", headers=HEADERS, timeout=12)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, 'html.parser')
 
@@ -67,7 +67,7 @@ def fetch_referee_fff(home: str, away: str) -> Optional[Dict]:
     """Fetches referee from FFF official designations."""
     try:
         url = "https://fff.fr/arbitrage/designations/"
-        resp = requests.get(url, headers=HEADERS, timeout=12)
+        resp = cached_get(url, category="scraper_referee", headers=HEADERS, timeout=12)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, 'html.parser')
         text = soup.get_text(separator=' ')
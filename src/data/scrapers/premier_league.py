@@ -7,12 +7,12 @@ Sources:
 - Referee:  https://www.bbc.co.uk/sport/football
 - Validate: https://www.transfermarkt.co.uk
 """
-import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 from datetime import datetime
 import re
 from src.data.scrapers.js_scraper import get_html_with_js, is_available as js_available
+from src.data.cache_manager import cached_get
 
 
 HEADERS = {
@@ -66,7 +66,7 @@ def fetch_lineup_premierinjuries(home: str, away: str) -> Dict:
     result = {'home': [], 'away': [], 'bajas': [], 'source': None}
     try:
         url = "https://www.premierinjuries.com/injury-table.php"
-        resp = requests.get(url, headers=HEADERS, timeout=12)
+        resp = cached_get(url, category="scraper_injuries", headers=HEADERS, timeout=12)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, 'html.parser')
 
@@ -111,7 +111,7 @@ def fetch_referee_bbcsport(home: str, away: str) -> Optional[Dict]:
 
         # Search BBC Sport for the fixture
         search_url = f"https://www.bbc.co.uk/sport/football/scores-fixtures"
-        resp = requests.get(search_url, headers=HEADERS, timeout=12)
+        resp = cached_get(search_url, category="scraper_fixtures", headers=HEADERS, timeout=12)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, 'html.parser')
 
@@ -127,7 +127,7 @@ def fetch_referee_bbcsport(home: str, away: str) -> Optional[Dict]:
                     if not match_url.startswith('http'):
                         match_url = f"https://www.bbc.co.uk{match_url}"
                     # Fetch match page
-                    resp2 = requests.get(match_url, headers=HEADERS, timeout=12)
+                    resp2 = cached_get(match_url, category="scraper_referee", headers=HEADERS, timeout=12)
                     soup2 = BeautifulSoup(resp2.text, 'html.parser')
                     for el in soup2.find_all(string=re.compile(r'referee', re.I)):
                         parent = el.parent
@@ -6,12 +6,12 @@ Sources:
 - Lineups:  https://www.fantacalcio.it/probabili-formazioni-serie-a
 - Referee:  https://www.aia-figc.it/designazioni/cana/
 """
-import requests
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
 from datetime import datetime
 import re
 from src.data.scrapers.js_scraper import get_html_with_js, is_available as js_available
+from src.data.cache_manager import cached_get
 
 
 HEADERS = {
@@ -34,7 +34,7 @@ def fetch_lineup_fantacalcio(home: str, away: str) -> Dict:
     result = {'home': [], 'away': [], 'bajas': [], 'source': None}
     try:
         url = "https://www.fantacalcio.it/probabili-formazioni-serie-a"
-        resp = requests.get(url, headers=HEADERS, timeout=12)
+        resp = cached_get(url, category="scraper_lineups", headers=HEADERS, timeout=12)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, 'html.parser')
 
@@ -66,7 +66,7 @@ def fetch_referee_aia(home: str, away: str) -> Optional[Dict]:
     """Fetches referee from AIA-FIGC official designations."""
     try:
         url = "https://www.aia-figc.it/designazioni/cana/"
-        resp = requests.get(url, headers=HEADERS, timeout=12)
+        resp = cached_get(url, category="scraper_referee", headers=HEADERS, timeout=12)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, 'html.parser')
 
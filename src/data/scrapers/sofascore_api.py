@@ -6,6 +6,7 @@ import re
 import requests
 import xml.etree.ElementTree as ET
 from typing import Optional, Dict, List
+from src.data.cache_manager import cached_get
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
@@ -122,9 +123,9 @@ def _find_event(home, away, timeout=10):
 
     for q in unique_queries:
         try:
-            r = requests.get(
+            r = cached_get(
                 f"https://api.sofascore.com/api/v1/search/events?q={requests.utils.quote(q)}",
-                headers=HEADERS, timeout=timeout
+                category="scraper_fixtures", headers=HEADERS, timeout=timeout
             )
             if r.status_code != 200: continue
             events = r.json().get("events", [])
@@ -178,8 +179,8 @@ def fetch_referee(home, away):
         if not ev:
             return None
         eid = ev.get("id")
-        r = requests.get(f"https://api.sofascore.com/api/v1/event/{eid}",
-                         headers=HEADERS, timeout=8)
+        r = cached_get(f"https://api.sofascore.com/api/v1/event/{eid}",
+                       category="scraper_referee", headers=HEADERS, timeout=8)
         if r.status_code == 200:
             referee = r.json().get("event", {}).get("referee", {})
             name = referee.get("name", "")
@@ -210,7 +211,7 @@ def fetch_referee_rss(home, away):
     for q in queries:
         try:
             url = f"https://news.google.com/rss/search?q={requests.utils.quote(q)}&hl=es&gl=ES&ceid=ES:es"
-            r = requests.get(url, headers=RSS_HEADERS, timeout=8)
+            r = cached_get(url, category="rss_feeds", headers=RSS_HEADERS, timeout=8)
             if r.status_code != 200:
                 continue
             root = ET.fromstring(r.content)
@@ -284,8 +285,8 @@ def fetch_lineups(home, away):
         if not ev:
             return None
         eid = ev.get("id")
-        r = requests.get(f"https://api.sofascore.com/api/v1/event/{eid}/lineups",
-                         headers=HEADERS, timeout=8)
+        r = cached_get(f"https://api.sofascore.com/api/v1/event/{eid}/lineups",
+                       category="scraper_lineups", headers=HEADERS, timeout=8)
         if r.status_code == 404:
             return {"home": [], "away": [], "source": "SofaScore",
                     "verification_link": f"https://www.sofascore.com/es/partido/{eid}",
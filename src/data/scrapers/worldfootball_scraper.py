@@ -3,11 +3,11 @@ worldfootball_scraper.py — WorldFootball.net para árbitros e historial
 ======================================================================
 Especializado en árbitros con estadísticas históricas.
 """
-import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 from datetime import datetime
 import re
+from src.data.cache_manager import cached_get
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -56,7 +56,7 @@ def fetch_referee(home: str, away: str, league: str = "") -> Optional[Dict]:
 
         for url in urls_to_try:
             try:
-                r = requests.get(url, headers=HEADERS, timeout=8)
+                r = cached_get(url, category="scraper_referee", headers=HEADERS, timeout=8)
                 if r.status_code != 200:
                     continue
                 soup = BeautifulSoup(r.text, 'html.parser')
@@ -92,7 +92,7 @@ def fetch_referee_stats(referee_name: str) -> Dict:
     try:
         slug = _slugify(referee_name)
         url = f"https://www.worldfootball.net/referee/{slug}/"
-        r = requests.get(url, headers=HEADERS, timeout=8)
+        r = cached_get(url, category="referee_stats", headers=HEADERS, timeout=8)
         if r.status_code != 200:
             return stats
 
@@ -0,0 +1,109 @@
+"""
+Coalescencia de peticiones (single-flight) — LAGEMA JARG74
+===========================================================
+Cuando varias sesiones de Streamlit piden a la vez lo mismo (mismo partido,
+misma fecha, mismo equipo), solo la primera llamada — la "líder" — ejecuta
+la función; las demás esperan su ``Future`` y reciben el mismo resultado (o
+la misma excepción). Así la cuota de las APIs y la latencia de los scrapers
+se pagan una sola vez por clave.
+
+El grupo no guarda resultados: en cuanto la líder termina la clave se libera
+y las llamadas siguientes van a la caché del llamador (APIManager._cache,
+cached_get, ...), que la líder ya ha rellenado.
+
+Uso:
+    flights = get_flight_group("api_manager")
+    value, shared = flights.do(("fixtures", date, league), lambda: fetch(...))
+
+    class X:
+        @coalesce("api_manager")
+        def get_algo(self, a, b=None): ...
+"""
+
+import functools
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Grupo de llamadas en vuelo indexadas por clave."""
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self.stats = {"leaders": 0, "shared": 0, "errors": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any],
+           timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Ejecuta ``fn`` una sola vez por ``key`` entre las llamadas concurrentes.
+        Devuelve ``(resultado, compartido)``; ``compartido`` es True si otra
+        llamada ya en vuelo produjo el resultado.
+        """
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+                self.stats["leaders"] += 1
+            else:
+                self.stats["shared"] += 1
+
+        if not leader:
+            logger.debug(f"[SingleFlight] {self.name}: esperando llamada en vuelo {key!r}")
+            return fut.result(timeout=timeout), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self.stats["errors"] += 1
+                del self._inflight[key]
+            fut.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+        fut.set_result(result)
+        return result, False
+
+    def inflight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_flight_group(name: str) -> SingleFlight:
+    """Grupo compartido por todo el proceso (todas las sesiones de Streamlit)."""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(name)
+        return _groups[name]
+
+
+def coalesce(group: str, key: Optional[Callable[..., Hashable]] = None):
+    """
+    Decorador de métodos: las llamadas concurrentes con los mismos argumentos
+    comparten una única ejecución. ``key(*args, **kwargs)`` (sin ``self``)
+    permite normalizar la clave; por defecto se usan los argumentos tal cual.
+    """
+    def decorator(fn):
+        flights = get_flight_group(group)
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            if key is not None:
+                k = (fn.__qualname__, key(*args, **kwargs))
+            else:
+                k = (fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            return flights.do(k, lambda: fn(self, *args, **kwargs))[0]
+        return wrapper
+    return decorator
@@ -2,44 +2,54 @@ import pandas as pd
 from typing import Dict, Any
 from src.logic.ml_engine import MLEngine
 from src.data.db_manager import DataManager
-from src.data.pipeline import DataPipeline
+from src.data.pipeline import DataPipeline, FeatureStore
 
 class TrainingManager:
     """
     Orquestador para el entrenamiento continuo de los modelos de LAGEMA JARG74.
     Automatiza el ciclo: Cargar -> Procesar -> Entrenar -> Evaluar.
     """
+
+    # Por debajo de este número de partidos reales se calibra con datos sintéticos
+    MIN_REAL_SAMPLES = 50
     
     def __init__(self, db_manager: DataManager, ml_engine: MLEngine):
         self.db = db_manager
         self.ml = ml_engine
         self.pipeline = DataPipeline()
+        self.feature_store = FeatureStore(db_path=db_manager.db_path, pipeline=self.pipeline)
 
     def run_full_training_cycle(self) -> Dict[str, Any]:
         """
         Ejecuta un ciclo completo de entrenamiento con datos de la base de datos.
         """
-        # 1. Cargar datos históricos
-        # Nota: En un entorno real, esto vendría de self.db.get_all_matches()
-        # Para la demostración, generamos un dataset sintético realista
-        data = self._generate_synthetic_historical_data(n_matches=200)
-        
-        # 2. Pipeline de Feature Engineering
-        clean_data = self.pipeline.clean_match_data(data)
-        features_df = self.pipeline.extract_features(clean_data)
+        # 1-2. Histórico real (matches + predictions + resultados) → características.
+        # El FeatureStore solo procesa los partidos añadidos desde la última build.
+        source = "historico"
+        features_df = pd.DataFrame()
+        if not self.db.use_supabase:
+            features_df = self.feature_store.build()
+        if len(features_df) < self.MIN_REAL_SAMPLES:
+            print(f"[Training] Solo {len(features_df)} partidos reales "
+                  f"(mínimo {self.MIN_REAL_SAMPLES}) — calibración con dataset sintético")
+            features_df = self._generate_synthetic_historical_data(n_matches=200)
+            source = "sintetico"
         
-        # 3. Entrenamiento
+        # 3. Entrenamiento (+ estado móvil por equipo para predecir próximos partidos)
         metrics = self.ml.train(features_df)
+        self.ml.team_state = self.feature_store.team_state() if source == "historico" else {}
         
         # 4. Validación Cruzada
-        X = features_df.drop(columns=['target_winner', 'match_id'])
+        X = features_df[self.ml.FEATURE_COLUMNS]
         y = features_df['target_winner']
         cv_metrics = self.ml.cross_validate(X, y)
         
         return {
             "training_metrics": metrics,
             "cv_metrics": cv_metrics,
-            "samples_analyzed": len(features_df)
+            "samples_analyzed": len(features_df),
+            "data_source": source,
+            "feature_store": dict(self.feature_store.last_build),
         }
 
     def _generate_synthetic_historical_data(self, n_matches=100) -> pd.DataFrame:
@@ -63,6 +73,12 @@ class TrainingManager:
                 "away_xg": away_xg,
                 "home_possession": np.random.uniform(40, 60),
                 "ppda": np.random.uniform(7, 15),
+                "home_xg_roll": home_xg + np.random.normal(0, 0.2),
+                "away_xg_roll": away_xg + np.random.normal(0, 0.2),
+                "home_def_eff": np.random.normal(0, 0.4),
+                "away_def_eff": np.random.normal(0, 0.4),
+                "home_form": np.random.uniform(0.5, 2.5),
+                "away_form": np.random.uniform(0.5, 2.5),
                 "target_winner": winner
             })
             
@@ -86,43 +86,7 @@ class WebResultFetcher:
             logger.info(f"[WebFetcher] No se encontró resultado para {home_team} vs {away_team}")
             return None
 
-        # Parsear estadísticas del resultado
-        stats = result.get("stats", {})
-
-        # Córners
-        corners = stats.get("corners", {})
-        home_corners = corners.get("home", 0) or 0
-        away_corners = corners.get("away", 0) or 0
-
-        # Tarjetas
-        cards = stats.get("cards", {})
-        home_cards = (cards.get("home_yellow", 0) or 0) + (cards.get("home_red", 0) or 0)
-        away_cards = (cards.get("away_yellow", 0) or 0) + (cards.get("away_red", 0) or 0)
-
-        # Remates
-        shots = stats.get("shots", {})
-        home_shots = shots.get("home", 0) or 0
-        away_shots = shots.get("away", 0) or 0
-
-        # Remates a puerta
-        shots_on_target = stats.get("shots_on_target", {})
-        home_shots_on_target = shots_on_target.get("home", 0) or 0
-        away_shots_on_target = shots_on_target.get("away", 0) or 0
-
-        return MatchOutcome(
-            match_id=match_id,
-            home_score=result["home_score"],
-            away_score=result["away_score"],
-            home_corners=int(home_corners),
-            away_corners=int(away_corners),
-            home_cards=int(home_cards),
-            away_cards=int(away_cards),
-            home_shots=int(home_shots),
-            away_shots=int(away_shots),
-            home_shots_on_target=int(home_shots_on_target),
-            away_shots_on_target=int(away_shots_on_target),
-            actual_winner=result["winner"]
-        )
+        return self._to_outcome(match_id, result)
 
     def fetch_real_result_from_fixture(self, fixture_id: int,
                                         match_id: str) -> Optional[MatchOutcome]:
@@ -137,7 +101,35 @@ class WebResultFetcher:
         result = api.get_match_result(fixture_id=fixture_id)
         if not result:
             return None
+        return self._to_outcome(match_id, result)
+
+    def fetch_real_results(self, fixtures: Dict[str, int]) -> Dict[str, MatchOutcome]:
+        """
+        Resultados reales de varios partidos a la vez.
 
+        Args:
+            fixtures: {match_id interno: fixture_id de API-Football}
+
+        Returns:
+            {match_id: MatchOutcome} solo con los partidos ya finalizados.
+            Una jornada de 10 partidos cuesta una petición (ids=) en lugar de 30.
+        """
+        api = self.api
+        if not api or not fixtures:
+            return {}
+
+        results = api.get_match_results(list(fixtures.values()))
+        outcomes = {}
+        for match_id, fixture_id in fixtures.items():
+            result = results.get(int(fixture_id)) if fixture_id else None
+            if result:
+                outcomes[match_id] = self._to_outcome(match_id, result)
+        logger.info(f"[WebFetcher] {len(outcomes)}/{len(fixtures)} resultados reales en bloque")
+        return outcomes
+
+    @staticmethod
+    def _to_outcome(match_id: str, result: Dict[str, Any]) -> MatchOutcome:
+        """Convierte un resultado de APIManager en MatchOutcome."""
         stats = result.get("stats", {})
         corners = stats.get("corners", {})
         cards = stats.get("cards", {})
@@ -184,10 +176,13 @@ class WebResultFetcher:
         return api.api_football.get_live_fixtures(league_ids=league_ids)
 
     def get_recent_results(self, league_name: str = None, 
-                            days_back: int = 7) -> list:
+                            days_back: int = 7, with_stats: bool = False) -> list:
         """
         Obtiene resultados de los últimos N días.
         Útil para actualizar el sistema de aprendizaje.
+
+        Con ``with_stats`` cada partido lleva ``stats`` (córners, tarjetas,
+        remates), cargadas en bloque con ids= en lugar de partido a partido.
         """
         api = self.api
         if not api:
@@ -196,11 +191,26 @@ class WebResultFetcher:
         results = []
         today = datetime.now()
 
-        for i in range(days_back):
-            date = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-            fixtures = api.get_fixtures_for_date(date, league_name=league_name)
-            for f in fixtures:
-                if f.get("home_score") is not None and f.get("away_score") is not None:
-                    results.append(f)
+        if league_name and api.api_football.LEAGUE_IDS.get(league_name):
+            # Liga de API-Football: todo el rango en una sola petición
+            date_from = (today - timedelta(days=days_back - 1)).strftime("%Y-%m-%d")
+            fixtures = api.get_finished_fixtures(league_name, date_from, today.strftime("%Y-%m-%d"))
+            results = [f for f in fixtures
+                       if f.get("home_score") is not None and f.get("away_score") is not None]
+        else:
+            for i in range(days_back):
+                date = (today - timedelta(days=i)).strftime("%Y-%m-%d")
+                fixtures = api.get_fixtures_for_date(date, league_name=league_name)
+                for f in fixtures:
+                    if f.get("home_score") is not None and f.get("away_score") is not None:
+                        results.append(f)
+
+        if with_stats:
+            ids = [f["fixture_id"] for f in results if f.get("fixture_id")]
+            detailed = api.get_match_results(ids) if ids else {}
+            for f in results:
+                match = detailed.get(f.get("fixture_id"))
+                if match:
+                    f["stats"] = match["stats"]
 
         return results
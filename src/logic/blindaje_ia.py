@@ -1,6 +1,8 @@
 import re
 from typing import List, Dict, Optional
 from src.models.base import Match, Team, Player, NodeRole
+from src.data.roster_index import fold
+from src.logic.keyword_scanner import KeywordHit, KeywordScanner
 
 class BlindajeIA:
     """
@@ -32,6 +34,8 @@ class BlindajeIA:
             "titulaire", "confirmé"
         ]
     }
+    # All languages compiled once into a single accent/case-folded automaton
+    SCANNER = KeywordScanner(KEYWORDS)
 
     def __init__(self):
         pass
@@ -62,36 +66,44 @@ class BlindajeIA:
     def _get_player_status_from_context(self, player: Player, match: Match) -> str:
         """
         Mock/Internal logic to scan reports for keywords about a specific player.
+        Keyword hits come from one pass of the shared automaton and are then
+        checked for proximity to each mention of the player (either direction).
         """
         # In a real integration, Match would have a 'scraped_context' field
-        context = getattr(match, 'external_analysis_summary', "").lower()
-        
-        if player.name.lower() in context:
-            # Check for negative keywords near the name
-            for kw in self.KEYWORDS["negative"]:
-                if kw in context:
-                    # Check both directions (name followed by kw, or kw followed by name)
-                    patterns = [
-                        rf"{re.escape(player.name.lower())}[^.]*?{re.escape(kw)}",
-                        rf"{re.escape(kw)}[^.]*?{re.escape(player.name.lower())}"
-                    ]
-                    for pattern in patterns:
-                        match_obj = re.search(pattern, context)
-                        if match_obj and len(match_obj.group(0)) < 40:
-                            print(f"DEBUG: Found negative match for {player.name}: {pattern}")
-                            return "HIGH_RISK"
-                    
-            for kw in self.KEYWORDS["positive"]:
-                 if kw in context:
-                    patterns = [
-                        rf"{re.escape(player.name.lower())}.{{0,60}}{re.escape(kw)}",
-                        rf"{re.escape(kw)}.{{0,60}}{re.escape(player.name.lower())}"
-                    ]
-                    for pattern in patterns:
-                        if re.search(pattern, context):
-                            return "SAFE"
-                     
+        context = fold(getattr(match, 'external_analysis_summary', ""))
+        name = fold(player.name)
+        mentions = [(m.start(), m.end()) for m in re.finditer(re.escape(name), context)] if name else []
+        if not mentions:
+            return "NEUTRAL"
+
+        hits = self.SCANNER.scan(context)
+        # Negative keywords: same sentence and the whole span under 40 chars
+        for hit in hits:
+            if hit.category != "negative":
+                continue
+            for start, end in mentions:
+                gap, span = self._gap(context, start, end, hit)
+                if "." not in gap and span < 40:
+                    print(f"DEBUG: Found negative match for {player.name}: {hit.keyword}")
+                    return "HIGH_RISK"
+
+        # Positive keywords: up to 60 chars between name and keyword (same line)
+        for hit in hits:
+            if hit.category != "positive":
+                continue
+            for start, end in mentions:
+                gap, _ = self._gap(context, start, end, hit)
+                if len(gap) <= 60 and "\n" not in gap:
+                    return "SAFE"
+
         return "NEUTRAL"
 
+    @staticmethod
+    def _gap(context: str, start: int, end: int, hit: KeywordHit):
+        """Text between a mention [start, end) and a keyword hit, and the length of the whole span."""
+        if start <= hit.start:
+            return context[end:hit.start], hit.end - start
+        return context[hit.end:start], end - hit.start
+
     def get_elite_sources(self, league: str) -> List[str]:
         return self.SOURCES.get(league, [])
@@ -2,15 +2,50 @@
 ExternalAnalyst v4.1 — Inteligencia de Prensa con Freshness Awareness
 =====================================================================
 Integra análisis de prensa en tiempo real con awareness de calidad de datos.
+
+La parte cara (búsqueda de noticias con sentimiento) se guarda por equipo y
+día del partido con stale-while-revalidate: se sirve la última versión al
+instante y, pasada la TTL, se refresca en segundo plano. Cada instantánea
+lleva una versión (hash de su contenido) que la predicción registra en
+``press_snapshot``.
 """
 
+import hashlib
+import json
 import random
-import requests
 import re
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Dict, Tuple, List, Optional
 from bs4 import BeautifulSoup
 from src.models.base import Match, Team
+from src.data.cache_manager import cached_get
+from src.data.single_flight import get_flight_group
+from src.logic.keyword_scanner import KeywordScanner
+from src.services.metrics import METRICS
+
+# Latencia por fuente de red consultada (etiqueta source=...)
+SOURCE_METRIC = "external_source_seconds"
+
+INTEL_TTL_S = 30 * 60            # tras la TTL se sirve la versión vieja y se refresca
+INTEL_MAX_AGE_S = 2 * 86400      # instantáneas más antiguas se descartan
+
+_INTEL_FLIGHTS = get_flight_group("external_analyst")
+_REFRESH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="intel-refresh")
+
+# Keywords de sentimiento de los snippets de búsqueda (autómata compilado una vez)
+NEWS_SENTIMENT = KeywordScanner({
+    "negative": {
+        "baja": -0.04, "lesión": -0.03, "roja": -0.05, "quirófano": -0.06,
+        "duda": -0.01, "crisis": -0.04, "derrota": -0.02, "problemas": -0.02
+    },
+    "positive": {
+        "vuelve": 0.03, "recuperado": 0.03, "alta": 0.04, "listo": 0.02,
+        "motivación": 0.02, "fichaje": 0.02, "victoria": 0.01, "líder": 0.02
+    }
+})
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -70,9 +105,21 @@ class ExternalAnalyst:
         "Marseille": {"city": "Marseille", "country": "France", "papers": ["La Provence", "L'Equipe"]}
     }
 
+    ATMOSPHERES = [
+        ("INFO: Ambiente: 'Es una final', mucha presión en el vestuario.", -0.01),
+        ("INFO: Estabilidad: Rumores de mal vestuario o impagos.", -0.04),
+        ("INFO: Motivación: El club ha prometido prima por ganar.", 0.03),
+        ("INFO: Táctica: Se espera un planteamiento muy atrevido.", 0.01),
+        ("INFO: Entorno estable y concentrado.", 0.0)
+    ]
+
     def __init__(self):
-        self._cache = {}
-        self._cache_ttl = 300  # 5 minutos
+        # (equipo, día) → instantánea de noticias/sentimiento/ambiente
+        self._cache: Dict[Tuple[str, str], Dict] = {}
+        self._cache_ttl = INTEL_TTL_S
+        self._cache_lock = threading.Lock()
+        self._refreshing: Dict[Tuple[str, str], Future] = {}
+        self._clock = time.time
 
     def _get_context(self, team_name: str) -> Dict:
         """Obtiene contexto mediático del equipo."""
@@ -111,13 +158,16 @@ class ExternalAnalyst:
     def _get_papers(self, team_name: str) -> List[str]:
         return self._get_context(team_name)["papers"]
 
-    def get_detailed_intelligence(self, match: Match, freshness: Optional[str] = None) -> Dict:
+    def get_detailed_intelligence(self, match: Match, freshness: Optional[str] = None,
+                                  refresh: bool = False) -> Dict:
         """
         VERSIÓN CORREGIDA: Ahora acepta el parámetro freshness como opcional.
         
         Args:
             match: Objeto Match
             freshness: String opcional ('live', 'confirmed', 'predicted', 'fallback', 'stale')
+            refresh: vuelve a buscar la prensa de ambos equipos ahora, sin servir
+                la instantánea en caché (las llamadas siguientes ya ven la nueva)
             
         Returns:
             Dict con 'report' (texto) y 'impact' (multiplicadores numéricos)
@@ -130,11 +180,17 @@ class ExternalAnalyst:
         confidence_factor = self._get_freshness_confidence(freshness)
         
         # Obtener lesiones reales si disponibles
-        real_injuries = self._fetch_real_injuries(match)
+        with METRICS.span(SOURCE_METRIC, source="injuries"):
+            real_injuries = self._fetch_real_injuries(match)
         
+        # Prensa por equipo (caché stale-while-revalidate por día de partido)
+        day = self._match_day(match)
+        home_snap = self._team_snapshot(match.home_team, day, refresh)
+        away_snap = self._team_snapshot(match.away_team, day, refresh)
+
         # Análisis con cuantificación de impacto
-        home_news, home_impact = self._scan_and_quantify(match.home_team, real_injuries, confidence_factor)
-        away_news, away_impact = self._scan_and_quantify(match.away_team, real_injuries, confidence_factor)
+        home_news, home_impact = self._scan_and_quantify(match.home_team, real_injuries, confidence_factor, home_snap)
+        away_news, away_impact = self._scan_and_quantify(match.away_team, real_injuries, confidence_factor, away_snap)
         
         # Contexto y clima
         nat_context = self._scan_national_press(match.home_team)
@@ -174,7 +230,11 @@ class ExternalAnalyst:
                 "home": home_impact,
                 "away": away_impact,
                 "freshness": freshness,
-                "confidence_factor": confidence_factor
+                "confidence_factor": confidence_factor,
+                "snapshot": {
+                    "home": self._snapshot_ref(home_snap),
+                    "away": self._snapshot_ref(away_snap)
+                }
             }
         }
 
@@ -194,22 +254,98 @@ class ExternalAnalyst:
         return confidence_map.get(freshness, 0.5)
 
     def _fetch_real_injuries(self, match: Match) -> Dict:
-        """Obtiene lesiones reales desde LineupFetcher."""
+        """Lesiones de los dos equipos desde el índice compartido de la liga ({nombre: filas})."""
         try:
-            from src.logic.lineup_fetcher import LineupFetcher
-            from src.data.mock_provider import MockDataProvider
-            fetcher = LineupFetcher(MockDataProvider())
-            return fetcher.fetch_injuries(match.competition)
+            from src.logic.injury_index import get_injury_index
+            return get_injury_index().for_match(match.competition, match.home_team.name, match.away_team.name)
         except Exception as e:
             logger.debug(f"No se pudieron obtener lesiones: {e}")
             return {}
 
-    def _scan_and_quantify(self, team: Team, real_injuries: Dict, confidence_factor: float = 1.0) -> Tuple[str, float]:
+    # =========================================================================
+    # Caché de inteligencia por equipo y día (stale-while-revalidate)
+    # =========================================================================
+
+    @staticmethod
+    def _match_day(match: Match) -> str:
+        date = getattr(match, "date", None)
+        return date.strftime("%Y-%m-%d") if hasattr(date, "strftime") else str(date or "")[:10]
+
+    def _team_snapshot(self, team: Team, day: str, refresh: bool = False) -> Dict:
+        """
+        Noticias, sentimiento y ambiente del equipo para el día del partido.
+        La primera vez (o con ``refresh``) espera a la búsqueda; después sirve
+        la última versión y, si superó la TTL, la refresca en segundo plano.
+        """
+        key = (team.name, day)
+        with self._cache_lock:
+            snap = self._cache.get(key)
+        if snap is None or refresh:
+            snap, _ = _INTEL_FLIGHTS.do(key, lambda: self._refresh_snapshot(team, key))
+            return {**snap, "stale": False}
+        stale = self._clock() - snap["fetched_at"] > self._cache_ttl
+        if stale:
+            self._schedule_refresh(team, key)
+        return {**snap, "stale": stale}
+
+    def _refresh_snapshot(self, team: Team, key: Tuple[str, str]) -> Dict:
+        with METRICS.span(SOURCE_METRIC, source="news_search"):
+            news, sentiment = self._search_live_news_with_sentiment(team)
+        with self._cache_lock:
+            previous = self._cache.get(key)
+        # El ambiente se sortea una vez por equipo y día: no cambia con cada refresco
+        atmosphere = tuple(previous["atmosphere"]) if previous else random.choice(self.ATMOSPHERES)
+        content = json.dumps([news, sentiment, atmosphere], ensure_ascii=False)
+        snap = {
+            "version": f"{key[1]}:{hashlib.sha1(content.encode('utf-8')).hexdigest()[:10]}",
+            "news": news,
+            "sentiment": sentiment,
+            "atmosphere": atmosphere,
+            "fetched_at": self._clock()
+        }
+        now = self._clock()
+        with self._cache_lock:
+            self._cache = {k: v for k, v in self._cache.items() if now - v["fetched_at"] <= INTEL_MAX_AGE_S}
+            self._cache[key] = snap
+        return snap
+
+    def _schedule_refresh(self, team: Team, key: Tuple[str, str]):
+        with self._cache_lock:
+            if key in self._refreshing:
+                return
+
+            def run():
+                try:
+                    self._refresh_snapshot(team, key)
+                except Exception as e:
+                    logger.debug(f"Refresco de prensa fallido para {key}: {e}")
+                finally:
+                    with self._cache_lock:
+                        self._refreshing.pop(key, None)
+            self._refreshing[key] = _REFRESH_POOL.submit(run)
+
+    def wait_refreshes(self, timeout_s: float = 10.0):
+        """Espera a los refrescos de prensa en segundo plano en curso."""
+        with self._cache_lock:
+            pending = list(self._refreshing.values())
+        wait(pending, timeout=timeout_s)
+
+    @staticmethod
+    def _snapshot_ref(snap: Optional[Dict]) -> Dict:
+        """Referencia de la instantánea usada, para guardar con la predicción."""
+        if not snap:
+            return {}
+        return {"version": snap["version"], "fetched_at": round(snap["fetched_at"], 3),
+                "stale": bool(snap.get("stale"))}
+
+    def _scan_and_quantify(self, team: Team, real_injuries: Dict, confidence_factor: float = 1.0,
+                           snapshot: Optional[Dict] = None) -> Tuple[str, float]:
         """
         Escanea prensa y cuantifica impacto en probabilidades.
-        
+
         Args:
             confidence_factor: 0.0-1.0, reduce el impacto si datos son stale/fallback
+            snapshot: instantánea de prensa del equipo (por defecto la del día de hoy)
             
         Returns:
             (texto_reporte, multiplicador_impacto)
@@ -219,19 +355,19 @@ class ExternalAnalyst:
         
         # 1. Lesiones reales (alto peso)
         found_real = []
-        for team_name_scraped, players in real_injuries.items():
-            if team.name.lower() in team_name_scraped.lower() or team_name_scraped.lower() in team.name.lower():
-                for p_data in players:
-                    stat = p_data.get('status', '').lower()
-                    if 'out' in stat or 'baja' in stat or 'injure' in stat:
-                        found_real.append(f"🚨 {p_data['player']}: {p_data['reason']} (Confirmado)")
-                        base_impact -= 0.03 * confidence_factor
-                    elif 'doubt' in stat or 'duda' in stat:
-                        found_real.append(f"⏳ {p_data['player']}: Duda por {p_data['reason']}")
-                        base_impact -= 0.01 * confidence_factor
-
-        # 2. Búsqueda web con sentimiento
-        web_news, web_impact = self._search_live_news_with_sentiment(team)
+        for p_data in real_injuries.get(team.name, []):
+            stat = p_data.get('status', '').lower()
+            if 'out' in stat or 'baja' in stat or 'injure' in stat:
+                found_real.append(f"🚨 {p_data['player']}: {p_data['reason']} (Confirmado)")
+                base_impact -= 0.03 * confidence_factor
+            elif 'doubt' in stat or 'duda' in stat:
+                found_real.append(f"⏳ {p_data['player']}: Duda por {p_data['reason']}")
+                base_impact -= 0.01 * confidence_factor
+
+        # 2. Búsqueda web con sentimiento (desde la caché por equipo y día)
+        if snapshot is None:
+            snapshot = self._team_snapshot(team, time.strftime("%Y-%m-%d"))
+        web_news, web_impact = list(snapshot["news"]), snapshot["sentiment"]
         base_impact += web_impact * confidence_factor
         
         if found_real or web_news:
@@ -249,15 +385,7 @@ class ExternalAnalyst:
                 reports.append("OK: Sin incidencias de última hora reportadas.")
 
         # 3. Ambiente/entorno
-        atmospheres = [
-            ("INFO: Ambiente: 'Es una final', mucha presión en el vestuario.", -0.01),
-            ("INFO: Estabilidad: Rumores de mal vestuario o impagos.", -0.04),
-            ("INFO: Motivación: El club ha prometido prima por ganar.", 0.03),
-            ("INFO: Táctica: Se espera un planteamiento muy atrevido.", 0.01),
-            ("INFO: Entorno estable y concentrado.", 0.0)
-        ]
-        
-        choice, mod = random.choice(atmospheres)
+        choice, mod = snapshot["atmosphere"]
         reports.append(choice)
         base_impact += mod * confidence_factor
         
@@ -278,7 +406,7 @@ class ExternalAnalyst:
         }
         
         try:
-            resp = requests.get(search_url, headers=headers, timeout=5)
+            resp = cached_get(search_url, category="news_search", headers=headers, timeout=5)
             if resp.status_code == 200:
                 soup = BeautifulSoup(resp.text, 'html.parser')
                 snippets = []
@@ -287,30 +415,11 @@ class ExternalAnalyst:
                     if len(st_text) > 40:
                         snippets.append(st_text)
                 
-                # Keywords de sentimiento
-                neg_keywords = {
-                    "baja": -0.04, "lesión": -0.03, "roja": -0.05, "quirófano": -0.06, 
-                    "duda": -0.01, "crisis": -0.04, "derrota": -0.02, "problemas": -0.02
-                }
-                pos_keywords = {
-                    "vuelve": 0.03, "recuperado": 0.03, "alta": 0.04, "listo": 0.02,
-                    "motivación": 0.02, "fichaje": 0.02, "victoria": 0.01, "líder": 0.02
-                }
-                
                 for snippet in snippets[:4]:
-                    snippet_lower = snippet.lower()
-                    relevance = False
-                    
-                    for kw, val in neg_keywords.items():
-                        if kw in snippet_lower:
-                            sentiment_impact += val
-                            relevance = True
-                    for kw, val in pos_keywords.items():
-                        if kw in snippet_lower:
-                            sentiment_impact += val
-                            relevance = True
-                    
-                    if relevance:
+                    found = NEWS_SENTIMENT.found(snippet)
+                    sentiment_impact += sum(hit.weight for hit in found.values())
+
+                    if found:
                         clean = re.sub(r'\s+', ' ', snippet).strip()
                         news_found.append(f"🔗 {clean[:140]}...")
                         
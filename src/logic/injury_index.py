@@ -0,0 +1,200 @@
+"""
+InjuryIndex — Índice de lesiones por liga LAGEMA JARG74
+=======================================================
+Una sola copia en memoria del parte de lesiones de cada liga, compartida por
+todas las predicciones del proceso:
+
+- Clave: id canónico del equipo (``normalize_team``: sin acentos ni siglas),
+  así ``predict_match`` hace una búsqueda O(1) en lugar de comparar por
+  subcadena contra cada equipo scrapeado.
+- Se refresca en segundo plano: cada liga caduca a los ``max_age_s`` y el
+  primer lector que la encuentra vieja lanza un hilo de refresco mientras
+  sigue usando la versión anterior. ``start(leagues)`` arranca además un
+  refresco periódico.
+- Instantánea en disco (``data/cache/injury_index.json``): al reiniciar la
+  app se sirve el último parte conocido sin esperar al scraping.
+
+Uso:
+    index = get_injury_index()
+    index.lookup("Atlético de Madrid", "La Liga")   # → [{"player", "reason", "status"}, ...]
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.data.roster_index import normalize_team
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = os.path.join("data", "cache", "injury_index.json")
+DEFAULT_MAX_AGE_S = 30 * 60
+
+
+def _scrape_league(league: str) -> Dict[str, List[dict]]:
+    """Parte de lesiones de SportsGambler ({equipo scrapeado: [filas]})."""
+    from src.data.auto_lineup_fetcher import AutoLineupFetcher
+    return AutoLineupFetcher(data_provider=None).fetch_injuries_auto(league) or {}
+
+
+class InjuryIndex:
+    """Lesiones por liga → id canónico de equipo, con refresco en segundo plano."""
+
+    def __init__(self, fetch: Optional[Callable[[str], Dict[str, List[dict]]]] = None,
+                 snapshot_path: Optional[str] = DEFAULT_SNAPSHOT_PATH,
+                 max_age_s: float = DEFAULT_MAX_AGE_S, clock=time.time):
+        self._fetch = fetch or _scrape_league
+        self.snapshot_path = snapshot_path
+        self.max_age_s = max_age_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._leagues: Dict[str, dict] = {}       # liga → {"updated", "teams": {id: filas}}
+        self._aliases: Dict[tuple, Optional[str]] = {}
+        self._refreshing: Dict[str, threading.Thread] = {}
+        self._stop = threading.Event()
+        self._scheduler: Optional[threading.Thread] = None
+        self.stats = {"lookups": 0, "refreshes": 0, "errors": 0}
+        self._load_snapshot()
+
+    # ── Lectura ──────────────────────────────────────────────────────────────
+
+    def lookup(self, team_name: str, league: str) -> List[dict]:
+        """Lesiones del equipo en la liga ([] si no hay parte o no aparece)."""
+        self.stats["lookups"] += 1
+        entry = self._leagues.get(league)
+        if entry is None:
+            self.refresh(league)               # primera vez: hay que esperar
+            entry = self._leagues.get(league)
+        elif self._clock() - entry["updated"] > self.max_age_s:
+            self.refresh_async(league)         # mientras tanto, el parte anterior
+        if not entry:
+            return []
+        team_id = self._resolve(league, normalize_team(team_name), entry["teams"])
+        return list(entry["teams"].get(team_id, [])) if team_id else []
+
+    def for_match(self, league: str, *team_names: str) -> Dict[str, List[dict]]:
+        return {name: self.lookup(name, league) for name in team_names}
+
+    def _resolve(self, league: str, team_id: str, teams: Dict[str, list]) -> Optional[str]:
+        if team_id in teams:
+            return team_id
+        # Nombres distintos entre fuentes ("betis" / "real betis"): se busca una vez
+        key = (league, team_id)
+        if key not in self._aliases:
+            self._aliases[key] = next((t for t in teams if team_id and (team_id in t or t in team_id)), None)
+        return self._aliases[key]
+
+    # ── Refresco ─────────────────────────────────────────────────────────────
+
+    def refresh(self, league: str) -> bool:
+        """Descarga el parte de la liga y lo publica; conserva el anterior si falla."""
+        try:
+            scraped = self._fetch(league) or {}
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"[InjuryIndex] {league}: error al refrescar ({e})")
+            scraped = {}
+        teams: Dict[str, List[dict]] = {}
+        for name, rows in scraped.items():
+            team_id = normalize_team(name)
+            if team_id:
+                teams.setdefault(team_id, []).extend(rows)
+        with self._lock:
+            previous = self._leagues.get(league)
+            if not teams and previous and previous["teams"]:
+                previous["updated"] = self._clock()   # reintentar en el próximo ciclo
+                return False
+            self._leagues[league] = {"updated": self._clock(), "teams": teams}
+            self._aliases = {k: v for k, v in self._aliases.items() if k[0] != league}
+            self.stats["refreshes"] += 1
+        self._save_snapshot()
+        logger.info(f"[InjuryIndex] {league}: {sum(len(r) for r in teams.values())} bajas en {len(teams)} equipos")
+        return bool(teams)
+
+    def refresh_async(self, league: str) -> bool:
+        """Refresca en un hilo aparte; False si ya hay un refresco de esa liga en curso."""
+        def run():
+            try:
+                self.refresh(league)
+            finally:
+                with self._lock:
+                    self._refreshing.pop(league, None)
+
+        with self._lock:
+            if league in self._refreshing:
+                return False
+            thread = threading.Thread(target=run, name=f"injuries-{league}", daemon=True)
+            self._refreshing[league] = thread
+        thread.start()
+        return True
+
+    def wait(self, timeout_s: float = 10.0):
+        """Espera a los refrescos en segundo plano en curso (scripts y pruebas)."""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for t in threads:
+            t.join(timeout_s)
+
+    def start(self, leagues: Iterable[str], interval_s: Optional[float] = None):
+        """Refresco periódico de ``leagues`` en un hilo de fondo (idempotente)."""
+        leagues = list(leagues)
+        interval = interval_s or self.max_age_s
+        if self._scheduler and self._scheduler.is_alive():
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                for league in leagues:
+                    if self._stop.is_set():
+                        break
+                    self.refresh(league)
+                self._stop.wait(interval)
+        self._stop.clear()
+        self._scheduler = threading.Thread(target=loop, name="injury-index", daemon=True)
+        self._scheduler.start()
+
+    def stop(self, timeout_s: float = 5.0):
+        self._stop.set()
+        if self._scheduler:
+            self._scheduler.join(timeout_s)
+
+    # ── Instantánea en disco ─────────────────────────────────────────────────
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                self._leagues = json.load(f).get("leagues", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"[InjuryIndex] Instantánea ilegible, se ignora: {e}")
+
+    def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            data = json.dumps({"leagues": self._leagues}, ensure_ascii=False)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_path)), exist_ok=True)
+            tmp = f"{self.snapshot_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"[InjuryIndex] No se pudo guardar la instantánea: {e}")
+
+
+_default_index: Optional[InjuryIndex] = None
+_init_lock = threading.Lock()
+
+
+def get_injury_index() -> InjuryIndex:
+    """Índice compartido por todas las predicciones del proceso."""
+    global _default_index
+    with _init_lock:
+        if _default_index is None:
+            _default_index = InjuryIndex()
+        return _default_index
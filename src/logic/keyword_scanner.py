@@ -0,0 +1,111 @@
+"""
+KeywordScanner — Búsqueda de palabras clave en una pasada LAGEMA JARG74
+=======================================================================
+Motor común para el análisis de texto de prensa y alineaciones (RSSAnalyst,
+ExternalAnalyst, BlindajeIA). En lugar de recorrer cada lista de palabras con
+``kw in texto`` por titular, cada conjunto de palabras se compila UNA vez en
+un autómata:
+
+- Texto y palabras se pliegan a minúsculas sin acentos ("Lesión" = "lesion")
+  con ``fold`` del índice de nombres (src.data.roster_index).
+- Las palabras forman un trie que se traduce a una sola expresión regular
+  (prefijos comunes factorizados) dentro de un lookahead: una pasada sobre
+  el texto devuelve todas las apariciones, incluidas las solapadas
+  ("racha" y "racha positiva").
+- Cada acierto lleva su categoría y su peso.
+
+Por defecto se conserva la semántica de subcadena de los analistas
+("out" aparece en "without"); ``whole_words=True`` exige palabras completas.
+
+Uso:
+    scanner = KeywordScanner({"negative": {"lesión": -0.05}, "positive": ["vuelve"]})
+    scanner.scan("Vuelve tras la lesion")   # → [KeywordHit("vuelve", ...), KeywordHit("lesión", ...)]
+    scanner.score(texto)                    # suma de pesos de las palabras distintas encontradas
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Tuple, Union
+
+from src.data.roster_index import fold
+
+KeywordGroup = Union[Mapping[str, float], Iterable[str]]
+
+
+class KeywordHit(NamedTuple):
+    keyword: str      # palabra tal como se declaró
+    category: str
+    weight: float
+    start: int        # posición en fold(texto)
+    end: int
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex equivalente a la alternancia de ``words``, que prefiere la más larga."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        terminal = "" in node
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if terminal else "")
+
+    return build(trie)
+
+
+class KeywordScanner:
+    """Autómata de palabras clave por categorías, compilado una vez."""
+
+    def __init__(self, groups: Mapping[str, KeywordGroup], whole_words: bool = False):
+        self.whole_words = whole_words
+        self._entries: Dict[str, List[Tuple[str, str, float]]] = {}
+        for category, words in groups.items():
+            weighted = words.items() if isinstance(words, Mapping) else ((w, 0.0) for w in words)
+            for word, weight in weighted:
+                folded = fold(word).strip()
+                if folded:
+                    self._entries.setdefault(folded, []).append((word, category, float(weight)))
+        # Palabras que son prefijo de otra: el lookahead solo captura la más larga en cada posición
+        self._prefixes = {k: [p for p in self._entries if p != k and k.startswith(p)] for k in self._entries}
+        body = _trie_pattern(self._entries) if self._entries else r"(?!)"
+        if whole_words:
+            self._regex = re.compile(rf"(?=(?<!\w)({body})(?!\w))")
+        else:
+            self._regex = re.compile(rf"(?=({body}))")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def scan(self, text: str) -> List[KeywordHit]:
+        """Todas las apariciones (solapadas incluidas) en orden de posición."""
+        folded = fold(text)
+        hits = []
+        for m in self._regex.finditer(folded):
+            start = m.start(1)
+            longest = m.group(1)
+            for key in [longest] + self._prefixes[longest]:
+                end = start + len(key)
+                if key != longest and self.whole_words and end < len(folded) and \
+                        (folded[end].isalnum() or folded[end] == "_"):
+                    continue
+                hits.extend(KeywordHit(word, category, weight, start, end)
+                            for word, category, weight in self._entries[key])
+        return hits
+
+    def found(self, text: str) -> Dict[str, KeywordHit]:
+        """Primera aparición de cada palabra distinta ({palabra declarada: acierto})."""
+        first: Dict[str, KeywordHit] = {}
+        for hit in self.scan(text):
+            first.setdefault(hit.keyword, hit)
+        return first
+
+    def score(self, text: str) -> float:
+        """Suma de pesos de las palabras distintas presentes (cada una cuenta una vez)."""
+        return sum(hit.weight for hit in self.found(text).values())
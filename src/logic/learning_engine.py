@@ -47,8 +47,8 @@ class LearningEngine:
         """
         report = [f"## 🔬 Análisis de Aprendizaje: {home_team} vs {away_team}"]
 
-        # 1. Guardar resultado real en BD
-        self.db.save_resultado(outcome.match_id, {
+        # 1. Resultado real (se guarda junto al aprendizaje, en el paso 3)
+        resultado = {
             "home_score": outcome.home_score, "away_score": outcome.away_score,
             "winner": outcome.actual_winner,
             "corners": outcome.home_corners + outcome.away_corners,
@@ -60,7 +60,7 @@ class LearningEngine:
             "home_shots": outcome.home_shots, "away_shots": outcome.away_shots,
             "home_shots_on_target": outcome.home_shots_on_target,
             "away_shots_on_target": outcome.away_shots_on_target,
-        })
+        }
 
         # 2. Analizar cada mercado
         learning_records = []
@@ -105,11 +105,13 @@ class LearningEngine:
         learning_records.append(rs["record"])
         report.append(rs["texto"])
 
-        # 3. Guardar todos los registros de aprendizaje
-        self.db.save_aprendizaje(learning_records)
+        # 3. Guardar resultado + registros de aprendizaje en una única transacción
+        with self.db.transaction():
+            self.db.save_resultado(outcome.match_id, resultado)
+            self.db.save_aprendizaje(learning_records)
 
-        # 4. Ajustar factores de equipo
-        self._apply_team_adjustments(r1x2, home_team, away_team)
+            # 4. Ajustar factores de equipo
+            self._apply_team_adjustments(r1x2, home_team, away_team)
 
         # 5. Ajustar sesgos de mercado si hay patrón sistemático
         bias_report = self._detect_and_fix_systematic_bias(home_team, away_team)
@@ -21,6 +21,8 @@ from src.data.interface import DataProvider
 from src.data.auto_lineup_fetcher import AutoLineupFetcher
 from src.data.referee_source_mapper import RefereeSourceMapper
 from src.data.multi_source_fetcher import MultiSourceFetcher
+from src.data.cache_manager import cached_get
+from src.data.roster_index import roster_index
 
 # Configuración de logging profesional
 logging.basicConfig(
@@ -199,6 +201,17 @@ class LineupQualityValidator:
         }
 
 
+def match_roster_player(scraped_name: str, roster) -> Optional[str]:
+    """
+    Clasificación fuzzy de un nombre extraído (scraping/OCR) contra un roster
+    (Team o lista de jugadores/nombres). Devuelve el nombre del roster o None.
+    Usa el índice invertido cacheado de la plantilla (src/data/roster_index.py).
+    """
+    if not roster or not scraped_name:
+        return None
+    return roster_index(roster).match(scraped_name)
+
+
 class LineupFetcher:
     """
     Fetches official lineups and referee data from elite multi-source pipeline.
@@ -548,7 +561,6 @@ class LineupFetcher:
         Scraping de URL externa con validación de integridad.
         [Mantiene compatibilidad con versión anterior pero agrega validación]
         """
-        import requests
         from bs4 import BeautifulSoup
         import re
         
@@ -560,7 +572,7 @@ class LineupFetcher:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            resp = requests.get(url, headers=headers, timeout=10)
+            resp = cached_get(url, category="scraper_lineups", headers=headers, timeout=10)
             resp.raise_for_status()
             html = resp.text
             soup = BeautifulSoup(html, 'html.parser')
@@ -588,7 +600,7 @@ class LineupFetcher:
                 if found_id:
                     ajax_url = f"https://www.sportsgambler.com/lineups/lineups-load2.php?id={found_id}"
                     logger.info(f"Fetching AJAX: {ajax_url}")
-                    resp_ajax = requests.get(ajax_url, headers=headers, timeout=10)
+                    resp_ajax = cached_get(ajax_url, category="scraper_lineups", headers=headers, timeout=10)
                     if resp_ajax.status_code == 200:
                         html = resp_ajax.text
                         soup = BeautifulSoup(html, 'html.parser')
@@ -649,37 +661,13 @@ class LineupFetcher:
             logger.error(f"Error obteniendo datos de equipos: {e}")
             team_home, team_away = None, None
 
-        def fuzzy_match(scraped_name: str, roster) -> Optional[str]:
-            if not roster or not scraped_name:
-                return None
-                
-            scraped_tokens = set(scraped_name.lower().split())
-            if not scraped_tokens:
-                return None
-            
-            for p in roster.players if hasattr(roster, 'players') else roster:
-                player_name = p.name if hasattr(p, 'name') else str(p)
-                p_tokens = set(player_name.lower().split())
-                
-                if p_tokens.issubset(scraped_tokens) or scraped_tokens.issubset(p_tokens):
-                    return player_name
-                if len(scraped_tokens.intersection(p_tokens)) >= 1:
-                    return player_name
-            return None
-
         # Procesar home
         if team_home:
-            for scraped in extracted_names:
-                match = fuzzy_match(scraped, team_home)
-                if match and match not in found_home:
-                    found_home.append(match)
+            found_home = roster_index(team_home).matched(extracted_names)
                     
         # Procesar away
         if team_away:
-            for scraped in extracted_names:
-                match = fuzzy_match(scraped, team_away)
-                if match and match not in found_away:
-                    found_away.append(match)
+            found_away = roster_index(team_away).matched(extracted_names)
         
         # Validación de integridad
         integrity = self.validator.validate_lineup_integrity(found_home, found_away)
@@ -769,32 +757,11 @@ class LineupFetcher:
             logger.error(f"Error obteniendo equipos: {e}")
             team_home, team_away = None, None
 
-        def fuzzy_match(scraped_name, roster):
-            if not roster:
-                return None
-            scraped_tokens = set(scraped_name.lower().split())
-            if not scraped_tokens:
-                return None
-            for p in (roster.players if hasattr(roster, 'players') else roster):
-                player_name = p.name if hasattr(p, 'name') else str(p)
-                p_tokens = set(player_name.lower().split())
-                if p_tokens.issubset(scraped_tokens) or scraped_tokens.issubset(p_tokens):
-                    return player_name
-                if len(scraped_tokens.intersection(p_tokens)) >= 1:
-                    return player_name
-            return None
-
         if team_home:
-            for scraped in extracted_names:
-                match = fuzzy_match(scraped, team_home)
-                if match and match not in found_home:
-                    found_home.append(match)
+            found_home = roster_index(team_home).matched(extracted_names)
                     
         if team_away:
-            for scraped in extracted_names:
-                match = fuzzy_match(scraped, team_away)
-                if match and match not in found_away:
-                    found_away.append(match)
+            found_away = roster_index(team_away).matched(extracted_names)
         
         integrity = self.validator.validate_lineup_integrity(found_home, found_away)
         
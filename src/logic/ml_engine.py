@@ -1,6 +1,24 @@
+import os
+import json
+import glob
+import hashlib
+import logging
+from datetime import datetime
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+try:
+    import joblib
+except ImportError:
+    joblib = None
+
+logger = logging.getLogger(__name__)
+
+# Artefactos de modelos entrenados (los genera calibrate_models.py)
+MODEL_DIR = os.path.join("data", "models")
+MODEL_POINTER = "latest.json"
+MODEL_KEEP = 3   # artefactos antiguos que se conservan
 
 try:
     from xgboost import XGBClassifier
@@ -53,10 +71,126 @@ class MLEngine:
     Utiliza XGBoost para precisión extrema y Random Forest para robustez.
     """
     
-    def __init__(self):
+    # Columnas de entrada con las que se entrenan los modelos.
+    # Las *_roll/_def_eff/_form son medias móviles (ver src/data/pipeline.py).
+    FEATURE_COLUMNS = [
+        'home_xg', 'away_xg', 'home_possession', 'ppda',
+        'home_xg_roll', 'away_xg_roll', 'home_def_eff', 'away_def_eff',
+        'home_form', 'away_form',
+    ]
+
+    # Pesos dinámicos por liga (Ensemble 2.0): (RF, XGB)
+    # Ligas más "estadísticas" (Premier) dan más peso a XGBoost. 
+    # Ligas más tácticas/defensivas (Serie A) dan más peso a RF para robustez.
+    LEAGUE_WEIGHTS = {
+        "Premier League (Inglaterra)": (0.3, 0.7),
+        "La Liga (España)": (0.5, 0.5),
+        "Serie A (Italia)": (0.7, 0.3),
+        "Ligue 1 (Francia)": (0.6, 0.4),
+        "Bundesliga (Alemania)": (0.4, 0.6)
+    }
+
+    # Orden de salida [LOCAL, EMPATE, VISITANTE] y fallback sin entrenamiento
+    DEFAULT_PROBS = (0.35, 0.30, 0.35)
+
+    def __init__(self, model_dir: str = MODEL_DIR, autoload: bool = True):
         self.rf_model = RandomForestClassifier(n_estimators=100, random_state=74)
         self.xgb_model = XGBClassifier(use_label_encoder=False, eval_metric='mlogloss', random_state=74)
-        self.is_trained = False
+        self.model_dir = model_dir
+        self.autoload = autoload
+        self.team_state: Dict[str, Dict[str, float]] = {}
+        self.artifact_info: Dict[str, Any] = {}
+        self._trained = False
+        self._load_attempted = False
+
+    @property
+    def is_trained(self) -> bool:
+        """True si hay modelos entrenados; en el primer acceso carga el último artefacto."""
+        if not self._trained and self.autoload and not self._load_attempted:
+            self.load()
+        return self._trained
+
+    @is_trained.setter
+    def is_trained(self, value: bool):
+        self._trained = value
+
+    @classmethod
+    def schema_checksum(cls) -> str:
+        """Huella del esquema de entrada/salida: columnas, orden y clases."""
+        schema = {"features": cls.FEATURE_COLUMNS, "classes": [0, 1, 2]}
+        return hashlib.sha256(json.dumps(schema).encode()).hexdigest()[:16]
+
+    # =========================================================================
+    # PERSISTENCIA DE ARTEFACTOS
+    # =========================================================================
+
+    def save(self, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Guarda los modelos entrenados como artefacto versionado
+        (mlengine_<fecha>.joblib) y apunta latest.json a él.
+        """
+        if joblib is None:
+            raise RuntimeError("joblib no disponible: no se pueden persistir los modelos")
+        if not self._trained:
+            raise RuntimeError("No hay modelos entrenados que guardar")
+        os.makedirs(self.model_dir, exist_ok=True)
+        version = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"mlengine_{version}.joblib"
+        info = {
+            "version": version,
+            "artifact": filename,
+            "schema_checksum": self.schema_checksum(),
+            "feature_columns": list(self.FEATURE_COLUMNS),
+            "created_at": datetime.now().isoformat(),
+            **(metadata or {}),
+        }
+        path = os.path.join(self.model_dir, filename)
+        # Sin compresión: permite cargar los arrays de los árboles con mmap
+        joblib.dump({"rf": self.rf_model, "xgb": self.xgb_model,
+                     "team_state": self.team_state, "info": info}, path)
+        with open(os.path.join(self.model_dir, MODEL_POINTER), "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2, default=str)
+
+        for old in sorted(glob.glob(os.path.join(self.model_dir, "mlengine_*.joblib")))[:-MODEL_KEEP]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        self.artifact_info = info
+        logger.info(f"Modelos guardados en {path}")
+        return path
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """
+        Carga un artefacto (por defecto el de latest.json) con memory-mapping.
+        Rechaza artefactos cuyo esquema de características no coincide.
+        """
+        self._load_attempted = True
+        if joblib is None:
+            return False
+        try:
+            if path is None:
+                pointer = os.path.join(self.model_dir, MODEL_POINTER)
+                if not os.path.exists(pointer):
+                    return False
+                with open(pointer, encoding="utf-8") as f:
+                    path = os.path.join(self.model_dir, json.load(f)["artifact"])
+            artifact = joblib.load(path, mmap_mode="r")
+        except Exception as e:
+            logger.warning(f"No se pudo cargar el artefacto de modelos: {e}")
+            return False
+
+        info = artifact.get("info", {})
+        if info.get("schema_checksum") != self.schema_checksum():
+            logger.warning(f"Artefacto {os.path.basename(path)} descartado: esquema "
+                           f"{info.get('schema_checksum')} != {self.schema_checksum()}")
+            return False
+        self.rf_model, self.xgb_model = artifact["rf"], artifact["xgb"]
+        self.team_state = artifact.get("team_state") or {}
+        self.artifact_info = info
+        self._trained = True
+        logger.info(f"Modelos cargados: {info.get('artifact')} ({info.get('created_at')})")
+        return True
 
     def prepare_features(self, match_data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -71,7 +205,7 @@ class MLEngine:
 
     def train(self, historical_df: pd.DataFrame):
         """Entrena ambos modelos con el historial disponible."""
-        X = historical_df.drop(columns=['target_winner', 'match_id'])
+        X = historical_df[self.FEATURE_COLUMNS]
         y = historical_df['target_winner'] # 0: Empate, 1: Local, 2: Visitante
         
         # Split para validación interna rápida
@@ -103,39 +237,70 @@ class MLEngine:
             "cv_accuracy_std": round(scores.std(), 4)
         }
 
+    def build_match_features(self, matches: List[Any],
+                             team_state: Optional[Dict[str, Dict[str, float]]] = None) -> pd.DataFrame:
+        """
+        Matriz de características (una fila por partido) con las columnas de FEATURE_COLUMNS.
+        Acepta objetos Match. `team_state` (FeatureStore.team_state) aporta las medias
+        móviles de cada equipo; por defecto, el estado guardado con el artefacto cargado.
+        Sin estado para un equipo se usan sus datos de temporada.
+        """
+        from src.data.pipeline import form_points
+        if team_state is None:
+            team_state = self.team_state if self.is_trained else {}
+
+        def rolling_state(team):
+            state = team_state.get(team.name)
+            if state:
+                return state['xg_roll'], state['def_eff'], state['form']
+            return team.avg_xg_season or 1.35, 0.0, form_points(team.form_last_5)
+
+        rows = []
+        for match in matches:
+            home, away = match.home_team, match.away_team
+            ppdas = [p.ppda for p in list(home.players) + list(away.players) if getattr(p, 'ppda', 0) > 0]
+            h_roll, h_def, h_form = rolling_state(home)
+            a_roll, a_def, a_form = rolling_state(away)
+            rows.append({
+                'home_xg': home.avg_xg_season or 1.35,
+                'away_xg': away.avg_xg_season or 1.35,
+                'home_possession': home.avg_possession,
+                'ppda': sum(ppdas) / len(ppdas) if ppdas else 12.0,
+                'home_xg_roll': h_roll, 'away_xg_roll': a_roll,
+                'home_def_eff': h_def, 'away_def_eff': a_def,
+                'home_form': h_form, 'away_form': a_form,
+            })
+        return pd.DataFrame(rows, columns=self.FEATURE_COLUMNS)
+
+    def predict_probabilities_batch(self, match_features: pd.DataFrame, leagues: List[str]) -> np.ndarray:
+        """
+        Probabilidades para N partidos con una única llamada predict_proba por modelo.
+        Devuelve un array (N, 3) en orden [LOCAL, EMPATE, VISITANTE].
+        """
+        n = len(leagues)
+        if not self.is_trained or match_features is None:
+            # Fallback balanceado si no hay entrenamiento o características
+            return np.tile(self.DEFAULT_PROBS, (n, 1))
+
+        rf_probs = self.rf_model.predict_proba(match_features)
+        xgb_probs = self.xgb_model.predict_proba(match_features)
+
+        weights = np.array([self.LEAGUE_WEIGHTS.get(league, (0.5, 0.5)) for league in leagues])
+
+        # Ensamble por promedio pesado; las clases del modelo son 0: Empate, 1: Local, 2: Visitante
+        avg_probs = rf_probs * weights[:, :1] + xgb_probs * weights[:, 1:]
+        return avg_probs[:, [1, 0, 2]].round(4)
+
     def predict_probabilities(self, match_features: pd.DataFrame, league: str = "Unknown") -> Dict[str, float]:
         """Produce probabilidades promediadas de los modelos Ensemble con pesos dinámicos por liga."""
-        if not self.is_trained:
-            # Fallback balanceado si no hay entrenamiento
-            return {"LOCAL": 0.35, "EMPATE": 0.30, "VISITANTE": 0.35}
-            
-        if match_features is None:
-            # Reverte to fallback if no features provided even if trained
-            return {"LOCAL": 0.35, "EMPATE": 0.30, "VISITANTE": 0.35}
-
-        rf_probs = self.rf_model.predict_proba(match_features)[0]
-        xgb_probs = self.xgb_model.predict_proba(match_features)[0]
-        
-        # Pesos dinámicos por liga (Ensemble 2.0)
-        # Ligas más "estadísticas" (Premier) dan más peso a XGBoost. 
-        # Ligas más tácticas/defensivas (Serie A) dan más peso a RF para robustez.
-        league_weights = {
-            "Premier League (Inglaterra)": (0.3, 0.7), # (RF, XGB)
-            "La Liga (España)": (0.5, 0.5),
-            "Serie A (Italia)": (0.7, 0.3),
-            "Ligue 1 (Francia)": (0.6, 0.4),
-            "Bundesliga (Alemania)": (0.4, 0.6)
-        }
-        
-        w_rf, w_xgb = league_weights.get(league, (0.5, 0.5))
-        
-        # Ensamble por promedio pesado
-        avg_probs = (rf_probs * w_rf + xgb_probs * w_xgb) 
+        if match_features is not None:
+            match_features = match_features.iloc[:1]
+        home, draw, away = self.predict_probabilities_batch(match_features, [league])[0]
         
         return {
-            "LOCAL": round(avg_probs[1], 4),
-            "EMPATE": round(avg_probs[0], 4),
-            "VISITANTE": round(avg_probs[2], 4)
+            "LOCAL": float(home),
+            "EMPATE": float(draw),
+            "VISITANTE": float(away)
         }
 
     def get_feature_importance(self, feature_names: List[str]) -> pd.Series:
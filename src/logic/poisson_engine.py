@@ -4,7 +4,17 @@ PoissonEngine v4.1 — Distribución de Probabilidad con Freshness Integration
 
 import math
 from typing import Dict, Tuple, List, Optional
-from src.models.base import Team
+
+import numpy as np
+from src.models.base import Team, score_matrix_to_dict
+
+# Matriz de marcadores 0..MAX_GOALS por equipo
+MAX_GOALS = 8
+MIN_CELL_PROB = 1e-8
+GOAL_LINES = (1.5, 2.5, 3.5)
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_LOG_FACTORIALS = np.concatenate(([0.0], np.cumsum(np.log(_GOALS[1:]))))
 
 
 class PoissonEngine:
@@ -30,52 +40,98 @@ class PoissonEngine:
         except (OverflowError, ValueError):
             return 0.0
 
-    def predict_score_matrix(self, home_lambda: float, away_lambda: float, max_goals: int = 5):
-        matrix = {}
-        max_goals = min(max_goals, 8)
-        
-        for h in range(max_goals + 1):
-            prob_h = self.calculate_poisson_probability(home_lambda, h)
-            if prob_h < 1e-8:
-                continue
-                
-            for a in range(max_goals + 1):
-                prob_a = self.calculate_poisson_probability(away_lambda, a)
-                if prob_a < 1e-8:
-                    continue
-                    
-                matrix[f"{h}-{a}"] = round(prob_h * prob_a, 8)
-        
-        total_prob = sum(matrix.values())
-        if total_prob > 0 and abs(total_prob - 1.0) > 0.01:
-            matrix = {k: round(v / total_prob, 6) for k, v in matrix.items()}
-            
-        return matrix
+    def pmf_vectors(self, lambdas, max_goals: int = MAX_GOALS) -> np.ndarray:
+        """Matriz (N, max_goals+1) con P(X=k) para cada lambda, calculada en una sola pasada."""
+        max_goals = min(max_goals, MAX_GOALS)
+        lambdas = np.atleast_1d(np.asarray(lambdas, dtype=float))
+        k = _GOALS[:max_goals + 1]
+
+        positive = lambdas > 0
+        safe = np.where(positive, lambdas, 1.0)[:, None]
+        pmf = np.exp(k * np.log(safe) - safe - _LOG_FACTORIALS[:max_goals + 1])
+        # lambda <= 0: toda la masa en 0 goles
+        pmf[~positive] = 0.0
+        pmf[~positive, 0] = 1.0
+        pmf[pmf < MIN_CELL_PROB] = 0.0
+        return pmf
+
+    def pmf_vector(self, lambda_val: float, max_goals: int = MAX_GOALS) -> np.ndarray:
+        """Vector P(X=k) para k=0..max_goals."""
+        return self.pmf_vectors([lambda_val], max_goals)[0]
+
+    def score_matrices(self, home_lambdas, away_lambdas, max_goals: int = MAX_GOALS) -> np.ndarray:
+        """
+        Matrices de marcadores para N partidos: matrices[i, h, a] = P(local=h, visitante=a).
+        Producto exterior de los vectores PMF de cada partido.
+        """
+        matrices = self.pmf_vectors(home_lambdas, max_goals)[:, :, None] * self.pmf_vectors(away_lambdas, max_goals)[:, None, :]
+        matrices[matrices < MIN_CELL_PROB] = 0.0
+
+        totals = matrices.sum(axis=(1, 2))
+        renorm = (totals > 0) & (np.abs(totals - 1.0) > 0.01)
+        matrices[renorm] /= totals[renorm, None, None]
+
+        return matrices
+
+    def score_matrix(self, home_lambda: float, away_lambda: float, max_goals: int = MAX_GOALS) -> np.ndarray:
+        """Matriz de marcadores de un partido como ndarray (max_goals+1, max_goals+1)."""
+        return self.score_matrices([home_lambda], [away_lambda], max_goals)[0]
+
+    def predict_score_matrix(self, home_lambda: float, away_lambda: float, max_goals: int = 5) -> Dict[str, float]:
+        """Compatibilidad legacy: matriz en formato {"h-a": prob}."""
+        return score_matrix_to_dict(self.score_matrix(home_lambda, away_lambda, max_goals))
+
+    def batch_market_probabilities(self, matrices: np.ndarray, goal_lines: Tuple[float, ...] = GOAL_LINES) -> Dict[str, np.ndarray]:
+        """
+        Lee todos los mercados de N matrices con máscaras: 1X2 (normalizado), BTTS,
+        over por línea y marcador más probable. Devuelve un array (N,) por mercado.
+        """
+        n, rows, cols = matrices.shape
+        totals = matrices.sum(axis=(1, 2))
+        empty = totals <= 0
+        safe_totals = np.where(empty, 1.0, totals)
+
+        h_idx, a_idx = np.arange(rows)[:, None], np.arange(cols)[None, :]
+        total_goals = h_idx + a_idx
+
+        markets = {
+            "home": np.where(empty, 0.33, matrices[:, h_idx > a_idx].sum(axis=1) / safe_totals),
+            "draw": np.where(empty, 0.34, matrices[:, h_idx == a_idx].sum(axis=1) / safe_totals),
+            "away": np.where(empty, 0.33, matrices[:, h_idx < a_idx].sum(axis=1) / safe_totals),
+            "btts": np.where(empty, 0.5, matrices[:, 1:, 1:].sum(axis=(1, 2)) / safe_totals),
+        }
+        for line in goal_lines:
+            markets[f"over_{line}"] = np.where(empty, 0.5, matrices[:, total_goals > line].sum(axis=1) / safe_totals)
+
+        flat = matrices.reshape(n, -1).argmax(axis=1)
+        markets["score_home"], markets["score_away"] = np.unravel_index(flat, (rows, cols))
+        markets["score_prob"] = matrices.reshape(n, -1)[np.arange(n), flat] / safe_totals
+        return markets
+
+    def market_probabilities(self, matrix: np.ndarray, goal_lines: Tuple[float, ...] = GOAL_LINES) -> Dict:
+        """Mercados de un único partido a partir de su matriz."""
+        return self.markets_at(self.batch_market_probabilities(matrix[None], goal_lines), 0, goal_lines)
+
+    def markets_at(self, markets: Dict[str, np.ndarray], i: int, goal_lines: Tuple[float, ...] = GOAL_LINES) -> Dict:
+        """Extrae los mercados del partido i de un resultado de batch_market_probabilities."""
+        over_under = {}
+        for line in goal_lines:
+            over = float(markets[f"over_{line}"][i])
+            over_under[line] = (round(over, 4), round(1.0 - over, 4))
+
+        return {
+            "home": round(float(markets["home"][i]), 4),
+            "draw": round(float(markets["draw"][i]), 4),
+            "away": round(float(markets["away"][i]), 4),
+            "btts": round(float(markets["btts"][i]), 4),
+            "over_under": over_under,
+            "score": f"{markets['score_home'][i]}-{markets['score_away'][i]}",
+            "score_prob": round(float(markets["score_prob"][i]), 4),
+        }
 
     def calculate_match_probabilities(self, home_lambda: float, away_lambda: float, max_goals: int = 8):
-        matrix = self.predict_score_matrix(home_lambda, away_lambda, max_goals)
-        
-        prob_home = prob_draw = prob_away = 0.0
-        
-        for score, prob in matrix.items():
-            try:
-                h, a = map(int, score.split("-"))
-                if h > a:
-                    prob_home += prob
-                elif h == a:
-                    prob_draw += prob
-                else:
-                    prob_away += prob
-            except ValueError:
-                continue
-        
-        total = prob_home + prob_draw + prob_away
-        if total > 0:
-            prob_home /= total
-            prob_draw /= total
-            prob_away /= total
-        
-        return (round(prob_home, 4), round(prob_draw, 4), round(prob_away, 4))
+        markets = self.market_probabilities(self.score_matrix(home_lambda, away_lambda, max_goals))
+        return (markets["home"], markets["draw"], markets["away"])
 
     def estimate_lambdas(
         self,
@@ -7,11 +7,14 @@ Integra: BPA + Poisson + ML con convergencia segura y manejo de errores.
 Prioridad: P1-Crítico. Corrige división por cero y mezcla de modelos frágil.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 import logging
+import time
 
+import numpy as np
 import pandas as pd
 from src.models.base import Match, PredictionResult
 from src.logic.bpa_engine import BPAEngine
@@ -19,6 +22,7 @@ from src.logic.external_analyst import ExternalAnalyst
 from src.logic.poisson_engine import PoissonEngine
 from src.logic.ml_engine import MLEngine
 from src.logic.value_engine import ValueEngine
+from src.services.metrics import METRICS
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +31,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Métricas de latencia (ver src/services/metrics.py)
+STAGE_METRIC = "predict_stage_seconds"
+BATCH_STAGE_METRIC = "predict_batch_stage_seconds"
+TOTAL_METRIC = "predict_total_seconds"
+
 
 @dataclass
 class ModelWeights:
@@ -76,6 +85,8 @@ class Predictor:
         self.poisson = PoissonEngine()
         self.ml = MLEngine()
         self.value_engine = ValueEngine()
+        # Duración (s) de cada etapa de la última predicción individual
+        self.last_trace: Dict[str, float] = {}
         logger.info("Predictor v4.0 inicializado con pesos dinámicos")
 
     def _calculate_dynamic_weights(self, freshness: str, lineup_quality: Dict) -> ModelWeights:
@@ -146,9 +157,12 @@ class Predictor:
             logger.error(f"Error en cálculo BPA: {e}")
             return 0.5, 0.5, {'error': str(e)}
 
-    def _safe_poisson_calculation(self, match: Match, bpa_h: float, bpa_a: float) -> Tuple:
+    def _safe_lambdas(self, match: Match, bpa_h: float, bpa_a: float) -> Tuple[Optional[Tuple[float, float]], Optional[str]]:
         """
-        Calcula Poisson con manejo de errores y lambdas seguros.
+        Estima lambdas de Poisson con validación.
+        
+        Returns:
+            ((h_lambda, a_lambda), None) o (None, error)
         """
         try:
             h_lambda, a_lambda = self.poisson.estimate_lambdas(
@@ -165,32 +179,58 @@ class Predictor:
                 h_lambda = max(0.5, h_lambda)
                 a_lambda = max(0.5, a_lambda)
             
-            p_matrix = self.poisson.predict_score_matrix(h_lambda, a_lambda)
-            p_home, p_draw, p_away = self.poisson.calculate_match_probabilities(h_lambda, a_lambda)
+            return (h_lambda, a_lambda), None
             
-            # Validar probabilidades Poisson
-            total_poisson = p_home + p_draw + p_away
-            if abs(total_poisson - 1.0) > 0.1 or total_poisson == 0:
-                logger.warning(f"Probabilidades Poisson inválidas: {total_poisson}. Normalizando.")
-                if total_poisson > 0:
-                    p_home /= total_poisson
-                    p_draw /= total_poisson
-                    p_away /= total_poisson
-                else:
-                    p_home, p_draw, p_away = 0.33, 0.34, 0.33
+        except Exception as e:
+            logger.error(f"Error estimando lambdas: {e}")
+            return None, str(e)
+
+    def _safe_poisson_calculation(self, match: Match, bpa_h: float, bpa_a: float) -> Tuple:
+        """
+        Calcula Poisson con manejo de errores y lambdas seguros.
+        """
+        lambdas, error = self._safe_lambdas(match, bpa_h, bpa_a)
+        if error:
+            return None, error
+        
+        try:
+            h_lambda, a_lambda = lambdas
+            p_matrix = self.poisson.score_matrix(h_lambda, a_lambda)
+            all_markets = self.poisson.batch_market_probabilities(p_matrix[None])
+            markets = self.poisson.markets_at(all_markets, 0)
+            p_home, p_draw, p_away = (float(p) for p in self._poisson_1x2(all_markets)[0])
             
-            return (h_lambda, a_lambda, p_matrix, p_home, p_draw, p_away), None
+            return (h_lambda, a_lambda, p_matrix, markets, p_home, p_draw, p_away), None
             
         except Exception as e:
             logger.error(f"Error en cálculo Poisson: {e}")
             return None, str(e)
 
+    def _poisson_1x2(self, markets: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Probabilidades 1X2 de Poisson validadas, array (N, 3) [local, empate, visitante].
+        
+        Común a predict_match y predict_matches: mismo redondeo que los mercados
+        publicados (markets_at) y renormalización si la suma se aleja de 1.
+        """
+        probs = np.array([[round(float(markets[k][i]), 4) for k in ("home", "draw", "away")]
+                          for i in range(len(markets["home"]))])
+        totals = probs.sum(axis=1)
+        invalid = (np.abs(totals - 1.0) > 0.1) | (totals == 0)
+        if invalid.any():
+            logger.warning(f"Probabilidades Poisson inválidas: {totals[invalid]}. Normalizando.")
+            positive = invalid & (totals > 0)
+            probs[positive] /= totals[positive, None]
+            probs[invalid & ~positive] = (0.33, 0.34, 0.33)
+        return probs
+
     def _safe_ml_calculation(self, match: Match) -> Tuple[Dict, Optional[str]]:
         """
         Obtiene probabilidades del ML con validación.
         """
         try:
-            ml_probs = self.ml.predict_probabilities(None, league=match.competition)
+            features = self.ml.build_match_features([match])
+            ml_probs = self.ml.predict_probabilities(features, league=match.competition)
             
             # Validar estructura
             required_keys = ['LOCAL', 'EMPATE', 'VISITANTE']
@@ -226,37 +266,54 @@ class Predictor:
         - BPA aporta ventaja relativa convertida a probabilidad
         - ML aporta clasificación supervisada
         """
+        final = self._blend_probabilities_batch(
+            np.array([[p_home, p_draw, p_away]]),
+            np.array([bpa_h]), np.array([bpa_a]),
+            np.array([[ml_probs.get('LOCAL', 0.33), ml_probs.get('EMPATE', 0.34), ml_probs.get('VISITANTE', 0.33)]]),
+            np.array([[weights.poisson, weights.bpa, weights.ml]])
+        )[0]
+        return float(final[0]), float(final[1]), float(final[2])
+
+    def _blend_probabilities_batch(
+        self,
+        poisson_probs: np.ndarray,
+        bpa_h: np.ndarray, bpa_a: np.ndarray,
+        ml_probs: np.ndarray,
+        weights: np.ndarray
+    ) -> np.ndarray:
+        """
+        Versión vectorizada de la mezcla para N partidos.
+        
+        Args:
+            poisson_probs, ml_probs: arrays (N, 3) en orden [local, empate, visitante]
+            bpa_h, bpa_a: arrays (N,)
+            weights: array (N, 3) en orden [poisson, bpa, ml]
+        """
         # Convertir BPA a probabilidad adicional (clamped ±0.20 como en versión original)
-        bpa_diff = max(-0.20, min(0.20, (bpa_h - bpa_a) * 0.5))
+        bpa_diff = np.clip((bpa_h - bpa_a) * 0.5, -0.20, 0.20)
         
         # Probabilidades base desde BPA (centro en 0.35-0.30-0.35)
-        bpa_prob_home = max(0.05, min(0.95, 0.35 + bpa_diff))
-        bpa_prob_draw = max(0.05, min(0.90, 0.30 - abs(bpa_diff) * 0.3))
-        bpa_prob_away = max(0.05, min(0.95, 0.35 - bpa_diff))
+        bpa_probs = np.column_stack([
+            np.clip(0.35 + bpa_diff, 0.05, 0.95),
+            np.clip(0.30 - np.abs(bpa_diff) * 0.3, 0.05, 0.90),
+            np.clip(0.35 - bpa_diff, 0.05, 0.95),
+        ])
         
         # Normalizar BPA a 1.0
-        bpa_total = bpa_prob_home + bpa_prob_draw + bpa_prob_away
-        bpa_prob_home /= bpa_total
-        bpa_prob_draw /= bpa_total
-        bpa_prob_away /= bpa_total
-        
-        # ML probabilidades
-        ml_home = ml_probs.get('LOCAL', 0.33)
-        ml_draw = ml_probs.get('EMPATE', 0.34)
-        ml_away = ml_probs.get('VISITANTE', 0.33)
+        bpa_probs /= bpa_probs.sum(axis=1, keepdims=True)
         
         # Mezcla ponderada
-        final_home = (p_home * weights.poisson) + (bpa_prob_home * weights.bpa) + (ml_home * weights.ml)
-        final_draw = (p_draw * weights.poisson) + (bpa_prob_draw * weights.bpa) + (ml_draw * weights.ml)
-        final_away = (p_away * weights.poisson) + (bpa_prob_away * weights.bpa) + (ml_away * weights.ml)
+        final = (poisson_probs * weights[:, 0:1]) + (bpa_probs * weights[:, 1:2]) + (ml_probs * weights[:, 2:3])
         
         # Normalización final
-        total = final_home + final_draw + final_away
-        if total == 0:
+        totals = final.sum(axis=1, keepdims=True)
+        zero = totals[:, 0] == 0
+        if zero.any():
             logger.error("Total de probabilidades es 0 después de mezcla. Usando equiprobable.")
-            return 0.33, 0.34, 0.33
+            final[zero] = (0.33, 0.34, 0.33)
+            totals[zero] = 1.0
         
-        return final_home / total, final_draw / total, final_away / total
+        return final / totals
 
     def predict_match(self, match: Match, lineup_freshness: str = 'confirmed', 
                      lineup_quality: Optional[Dict] = None) -> PredictionResult:
@@ -273,68 +330,112 @@ class Predictor:
         
         logger.info(f"Iniciando predicción para {match.home_team.name} vs {match.away_team.name} "
                    f"(freshness: {lineup_freshness})")
+        t0 = time.perf_counter()
+        trace: Dict[str, float] = {}
         
         # 1. Calcular pesos dinámicos
-        weights = self._calculate_dynamic_weights(lineup_freshness, lineup_quality)
+        with METRICS.span(STAGE_METRIC, trace, stage="weights"):
+            weights = self._calculate_dynamic_weights(lineup_freshness, lineup_quality)
         
         # 2. Inteligencia externa (con awareness de freshness)
-        try:
-            intel = self.external_analyst.get_detailed_intelligence(match, freshness=lineup_freshness)
-            analysis_text = intel["report"]
-            press_impact = intel["impact"]
-        except Exception as e:
-            logger.error(f"Error obteniendo inteligencia externa: {e}")
-            analysis_text = "Análisis de prensa no disponible"
-            press_impact = {"home": 0, "away": 0}
+        with METRICS.span(STAGE_METRIC, trace, stage="intelligence"):
+            analysis_text, press_impact = self._gather_intelligence(match, lineup_freshness)
         
         # 3. BPA Analysis (con protección)
-        bpa_h, bpa_a, bpa_metadata = self._safe_bpa_calculation(match, press_impact)
+        with METRICS.span(STAGE_METRIC, trace, stage="bpa"):
+            bpa_h, bpa_a, bpa_metadata = self._safe_bpa_calculation(match, press_impact)
         
         # 4. Poisson Statistics (con protección)
-        poisson_result, poisson_error = self._safe_poisson_calculation(match, bpa_h, bpa_a)
+        with METRICS.span(STAGE_METRIC, trace, stage="poisson"):
+            poisson_result, poisson_error = self._safe_poisson_calculation(match, bpa_h, bpa_a)
         
         if poisson_error:
             # Fallback: usar solo BPA con distribución equiprobable ajustada
             logger.warning("Usando fallback Poisson (distribución equiprobable ajustada por BPA)")
             h_lambda, a_lambda = 1.3, 1.1
             p_matrix = {}
+            markets = None
             p_home, p_draw, p_away = 0.33, 0.34, 0.33
         else:
-            h_lambda, a_lambda, p_matrix, p_home, p_draw, p_away = poisson_result
+            h_lambda, a_lambda, p_matrix, markets, p_home, p_draw, p_away = poisson_result
         
         # 5. Machine Learning (con protección)
-        ml_probs, ml_error = self._safe_ml_calculation(match)
+        with METRICS.span(STAGE_METRIC, trace, stage="ml"):
+            ml_probs, ml_error = self._safe_ml_calculation(match)
         
         # 6. Hybrid Blending (mezcla segura)
-        final_home, final_draw, final_away = self._blend_probabilities(
-            p_home, p_draw, p_away,
-            bpa_h, bpa_a,
-            ml_probs,
-            weights
+        with METRICS.span(STAGE_METRIC, trace, stage="blend"):
+            final_home, final_draw, final_away = self._blend_probabilities(
+                p_home, p_draw, p_away,
+                bpa_h, bpa_a,
+                ml_probs,
+                weights
+            )
+        
+        # 7-12. Mercados secundarios, marcador, confianza, resultado y value betting
+        pred = self._assemble_prediction(
+            match, lineup_freshness, weights, analysis_text,
+            bpa_h, bpa_a, h_lambda, a_lambda, p_matrix, markets,
+            (final_home, final_draw, final_away), p_home, p_away,
+            trace=trace, press_snapshot=press_impact.get("snapshot")
         )
         
-        # 7. Mercados secundarios (usando lambdas e inteligencia)
+        total = time.perf_counter() - t0
+        METRICS.observe(TOTAL_METRIC, total, mode="single")
+        trace["total"] = round(total, 6)
+        self.last_trace = trace
+        logger.info(f"Predicción completada: H={final_home:.2%}, D={final_draw:.2%}, A={final_away:.2%} "
+                    f"({total * 1000:.0f} ms)")
+        return pred
+
+    def _gather_intelligence(self, match: Match, lineup_freshness: str) -> Tuple[str, Dict]:
+        """Obtiene el reporte de prensa y los modificadores de impacto con fallback seguro."""
         try:
-            stats = self.external_analyst.calculate_stat_markets(
-                match, bpa_h, bpa_a, h_lambda=h_lambda, a_lambda=a_lambda
-            )
+            intel = self.external_analyst.get_detailed_intelligence(match, freshness=lineup_freshness)
+            return intel["report"], intel["impact"]
         except Exception as e:
-            logger.error(f"Error calculando mercados secundarios: {e}")
-            stats = {
-                "total_goals_range": "1-2",
-                "corners": ("4-6", "3-5"),
-                "cards": ("2-4", "2-3"),
-                "shots": ("10-14", "8-12"),
-                "shots_on_target": ("3-5", "2-4")
-            }
+            logger.error(f"Error obteniendo inteligencia externa: {e}")
+            return "Análisis de prensa no disponible", {"home": 0, "away": 0}
+
+    def _assemble_prediction(
+        self,
+        match: Match,
+        lineup_freshness: str,
+        weights: ModelWeights,
+        analysis_text: str,
+        bpa_h: float, bpa_a: float,
+        h_lambda: float, a_lambda: float,
+        p_matrix, markets: Optional[Dict],
+        final_probs: Tuple[float, float, float],
+        p_home: float, p_away: float,
+        trace: Optional[Dict[str, float]] = None,
+        press_snapshot: Optional[Dict] = None,
+        stage_metric: str = STAGE_METRIC
+    ) -> PredictionResult:
+        """
+        Pasos comunes a predict_match y predict_matches tras la mezcla de modelos.
+        ``stage_metric`` separa los tiempos por etapa de la ruta individual y la batch.
+        """
+        final_home, final_draw, final_away = final_probs
         
-        # 8. Score prediction más probable
-        score_pred = "0-0"
-        if p_matrix:
+        # 7. Mercados secundarios (usando lambdas e inteligencia)
+        with METRICS.span(stage_metric, trace, stage="stat_markets"):
             try:
-                score_pred = max(p_matrix, key=p_matrix.get)
-            except Exception:
-                score_pred = f"{int(h_lambda)}-{int(a_lambda)}"
+                stats = self.external_analyst.calculate_stat_markets(
+                    match, bpa_h, bpa_a, h_lambda=h_lambda, a_lambda=a_lambda
+                )
+            except Exception as e:
+                logger.error(f"Error calculando mercados secundarios: {e}")
+                stats = {
+                    "total_goals_range": "1-2",
+                    "corners": ("4-6", "3-5"),
+                    "cards": ("2-4", "2-3"),
+                    "shots": ("10-14", "8-12"),
+                    "shots_on_target": ("3-5", "2-4")
+                }
+        
+        # 8. Score prediction más probable (argmax de la matriz)
+        score_pred = markets["score"] if markets else f"{int(h_lambda)}-{int(a_lambda)}"
         
         # 9. Referee name seguro
         ref_name = "No asignado"
@@ -345,7 +446,8 @@ class Predictor:
                 ref_name = getattr(match.referee, "name", "No asignado")
         
         # 10. Calcular confianza real
-        confidence = self._calc_confidence(final_home, final_away, bpa_h, bpa_a, p_home, p_away)
+        with METRICS.span(stage_metric, trace, stage="confidence"):
+            confidence = self._calc_confidence(final_home, final_away, bpa_h, bpa_a, p_home, p_away)
         
         # 11. Construir resultado
         pred = PredictionResult(
@@ -357,8 +459,10 @@ class Predictor:
             win_prob_away=round(final_away, 4),
             poisson_matrix=p_matrix,
             total_goals_expected=round(h_lambda + a_lambda, 2),
+            expected_goals_home=round(h_lambda, 3),
+            expected_goals_away=round(a_lambda, 3),
             total_goals_range=stats.get("total_goals_range", "1-2"),
-            both_teams_to_score_prob=self._calc_btts_prob(h_lambda, a_lambda),
+            both_teams_to_score_prob=markets["btts"] if markets else self._calc_btts_prob(h_lambda, a_lambda),
             score_prediction=score_pred,
             predicted_cards=f"🏠 {stats['cards'][0]} | ✈️ {stats['cards'][1]}",
             predicted_corners=f"🏠 {stats['corners'][0]} | ✈️ {stats['corners'][1]}",
@@ -366,6 +470,7 @@ class Predictor:
             predicted_shots_on_target=f"🏠 {stats['shots_on_target'][0]} | ✈️ {stats['shots_on_target'][1]}",
             confidence_score=confidence,
             external_analysis_summary=analysis_text,
+            press_snapshot=press_snapshot or {},
             referee_name=ref_name,
             freshness_score=lineup_freshness,  # Nuevo: guardar freshness usado
             model_weights_used={               # Nuevo: trazabilidad
@@ -377,15 +482,118 @@ class Predictor:
 
         # 12. Value Betting Detection
         if match.market_odds:
-            try:
-                pred.value_opportunities = self.value_engine.find_opportunities(pred, match.market_odds)
-            except Exception as e:
-                logger.error(f"Error en value betting: {e}")
-                pred.value_opportunities = []
+            with METRICS.span(stage_metric, trace, stage="value"):
+                try:
+                    pred.value_opportunities = self.value_engine.find_opportunities(pred, match.market_odds)
+                except Exception as e:
+                    logger.error(f"Error en value betting: {e}")
+                    pred.value_opportunities = []
         
-        logger.info(f"Predicción completada: H={final_home:.2%}, D={final_draw:.2%}, A={final_away:.2%}")
         return pred
 
+    def predict_matches(
+        self,
+        matches: List[Match],
+        lineup_freshness: Union[str, Sequence[str]] = 'confirmed',
+        lineup_quality: Optional[Dict] = None,
+        max_workers: int = 8
+    ) -> List[PredictionResult]:
+        """
+        Predicción por lotes (jornada completa o re-cálculo de temporada).
+        
+        Misma lógica que predict_match, pero Poisson, BPA->probabilidad y la mezcla se
+        calculan como arrays sobre los N partidos, el ML hace una única llamada
+        predict_proba con la matriz de características apilada y la inteligencia
+        externa se obtiene en paralelo.
+        
+        Args:
+            matches: Lista de partidos
+            lineup_freshness: Un valor común o uno por partido
+            lineup_quality: Metadata de calidad común al lote
+            max_workers: Hilos para la inteligencia externa (red)
+        """
+        if not matches:
+            return []
+        if lineup_quality is None:
+            lineup_quality = {}
+        
+        n = len(matches)
+        if isinstance(lineup_freshness, str):
+            freshness = [lineup_freshness] * n
+        else:
+            freshness = list(lineup_freshness)
+            if len(freshness) != n:
+                raise ValueError(f"lineup_freshness tiene {len(freshness)} valores para {n} partidos")
+        
+        t0 = time.perf_counter()
+        
+        # 1. Pesos dinámicos (uno por nivel de freshness distinto)
+        with METRICS.span(BATCH_STAGE_METRIC, stage="weights"):
+            weights_by_freshness = {f: self._calculate_dynamic_weights(f, lineup_quality) for f in set(freshness)}
+            weights = [weights_by_freshness[f] for f in freshness]
+            weight_arr = np.array([[w.poisson, w.bpa, w.ml] for w in weights])
+        
+        # 2. Inteligencia externa en paralelo (I/O de red)
+        with METRICS.span(BATCH_STAGE_METRIC, stage="intelligence"):
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, n))) as pool:
+                intel = list(pool.map(self._gather_intelligence, matches, freshness))
+        
+        # 3. BPA
+        with METRICS.span(BATCH_STAGE_METRIC, stage="bpa"):
+            bpa = np.array([
+                self._safe_bpa_calculation(match, press_impact)[:2]
+                for match, (_, press_impact) in zip(matches, intel)
+            ])
+        
+        # 4. Poisson vectorizado sobre los N partidos
+        with METRICS.span(BATCH_STAGE_METRIC, stage="poisson"):
+            lambdas = np.empty((n, 2))
+            valid = np.ones(n, dtype=bool)
+            for i, match in enumerate(matches):
+                match_lambdas, error = self._safe_lambdas(match, bpa[i, 0], bpa[i, 1])
+                if error:
+                    valid[i] = False
+                    match_lambdas = (1.3, 1.1)
+                lambdas[i] = match_lambdas
+            
+            matrices = self.poisson.score_matrices(lambdas[:, 0], lambdas[:, 1])
+            markets = self.poisson.batch_market_probabilities(matrices)
+            poisson_probs = self._poisson_1x2(markets)
+            poisson_probs[~valid] = (0.33, 0.34, 0.33)
+        
+        # 5. Machine Learning: una sola llamada con la matriz apilada
+        with METRICS.span(BATCH_STAGE_METRIC, stage="ml"):
+            try:
+                features = self.ml.build_match_features(matches)
+                ml_probs = self.ml.predict_probabilities_batch(features, [m.competition for m in matches])
+            except Exception as e:
+                logger.error(f"Error en cálculo ML por lotes: {e}")
+                ml_probs = np.tile((0.33, 0.34, 0.33), (n, 1))
+        
+        # 6. Hybrid Blending vectorizado
+        with METRICS.span(BATCH_STAGE_METRIC, stage="blend"):
+            final = self._blend_probabilities_batch(poisson_probs, bpa[:, 0], bpa[:, 1], ml_probs, weight_arr)
+        
+        # 7-12. Ensamblado por partido
+        results = []
+        for i, match in enumerate(matches):
+            results.append(self._assemble_prediction(
+                match, freshness[i], weights[i], intel[i][0],
+                float(bpa[i, 0]), float(bpa[i, 1]),
+                float(lambdas[i, 0]), float(lambdas[i, 1]),
+                matrices[i] if valid[i] else {},
+                self.poisson.markets_at(markets, i) if valid[i] else None,
+                (float(final[i, 0]), float(final[i, 1]), float(final[i, 2])),
+                float(poisson_probs[i, 0]), float(poisson_probs[i, 2]),
+                press_snapshot=intel[i][1].get("snapshot"),
+                stage_metric=BATCH_STAGE_METRIC
+            ))
+        
+        total = time.perf_counter() - t0
+        METRICS.observe(TOTAL_METRIC, total, mode="batch")
+        logger.info(f"Predicción por lotes completada: {n} partidos ({total * 1000:.0f} ms)")
+        return results
+
     def _calc_confidence(self, home_prob: float, away_prob: float, 
                         bpa_h: float = 0.5, bpa_a: float = 0.5,
                         p_home: float = 0.33, p_away: float = 0.33) -> float:
@@ -413,10 +621,10 @@ class Predictor:
         return round(min(score, 1.0), 2)
     
     def _calc_btts_prob(self, h_lambda: float, a_lambda: float) -> float:
-        """Calcula probabilidad de ambos equipos marcan (BTTS)."""
+        """Calcula probabilidad de ambos equipos marcan (BTTS): P(H>0) * P(A>0)."""
         try:
             prob_h_zero = self.poisson.calculate_poisson_probability(h_lambda, 0)
             prob_a_zero = self.poisson.calculate_poisson_probability(a_lambda, 0)
-            return round(1.0 - (prob_h_zero * prob_a_zero), 4)
+            return round((1.0 - prob_h_zero) * (1.0 - prob_a_zero), 4)
         except Exception:
             return 0.5  # Default si falla
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+ResultSync — Sincronización incremental de resultados LAGEMA JARG74
+====================================================================
+Mantiene al día el bucle de aprendizaje sin volver a descargar la misma
+semana en cada ejecución:
+
+1. Lee la marca de agua de la liga (timestamp del último partido finalizado
+   ya sincronizado, tabla ``sync_state``).
+2. Pide SOLO los partidos finalizados posteriores con el endpoint de rango
+   (``fixtures?from=&to=&status=FT-AET-PEN``): una petición por liga.
+3. Los cruza con los estudios pendientes (predicción sin resultado) mediante
+   un índice en memoria por pareja de equipos normalizada y fecha.
+4. Descarga estadísticas y eventos de los emparejados en bloque (ids=) y los
+   liquida con LearningEngine en UNA transacción junto con la nueva marca.
+
+Si algo falla dentro de la transacción no se guarda nada y la marca no se
+mueve: la siguiente ejecución reintenta los mismos partidos.
+
+Uso:
+    from src.logic.result_sync import ResultSync
+    report = ResultSync(db_manager=db).sync("La Liga")
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from src.data.roster_index import normalize_team
+
+logger = logging.getLogger(__name__)
+
+SYNC_SOURCE = "api_football"
+INITIAL_DAYS = 7          # primera sincronización de una liga
+DATE_TOLERANCE_DAYS = 1   # zona horaria: el partido puede caer en el día anterior/siguiente
+
+def _same_team(a: str, b: str) -> bool:
+    return bool(a and b) and (a == b or a in b or b in a)
+
+
+class PendingIndex:
+    """
+    Estudios pendientes indexados por (local, visitante) normalizados y por
+    fecha: cada partido descargado se resuelve con búsquedas O(1) en lugar de
+    recorrer todos los estudios.
+    """
+
+    def __init__(self, studies: List[dict]):
+        self._by_pair: Dict[Tuple[str, str], List[dict]] = defaultdict(list)
+        self._by_date: Dict[str, List[dict]] = defaultdict(list)
+        for s in studies:
+            s = {**s, "_home": normalize_team(s["home_team"]), "_away": normalize_team(s["away_team"])}
+            self._by_pair[(s["_home"], s["_away"])].append(s)
+            self._by_date[s["date"]].append(s)
+        self._taken = set()
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._by_date.values()) - len(self._taken)
+
+    @staticmethod
+    def _near_days(day: str) -> List[str]:
+        try:
+            d = datetime.strptime(day, "%Y-%m-%d")
+        except ValueError:
+            return [day]
+        return [(d + timedelta(days=k)).strftime("%Y-%m-%d")
+                for k in range(-DATE_TOLERANCE_DAYS, DATE_TOLERANCE_DAYS + 1)]
+
+    def match(self, home: str, away: str, day: str) -> Optional[dict]:
+        """Estudio pendiente de ese partido (y lo retira del índice) o None."""
+        h, a = normalize_team(home), normalize_team(away)
+        days = set(self._near_days(day))
+        candidates = [s for s in self._by_pair.get((h, a), []) if s["date"] in days]
+        if not candidates:
+            # Nombres distintos entre fuentes ("Betis" / "Real Betis Balompié")
+            candidates = [s for d in days for s in self._by_date.get(d, [])
+                          if _same_team(h, s["_home"]) and _same_team(a, s["_away"])]
+        for s in candidates:
+            if s["match_id"] not in self._taken:
+                self._taken.add(s["match_id"])
+                return s
+        return None
+
+
+class ResultSync:
+    """Job de sincronización incremental de resultados reales por liga."""
+
+    def __init__(self, api_manager=None, db_manager=None, learning_engine=None):
+        self._api = api_manager
+        self._db = db_manager
+        self._learning = learning_engine
+
+    @property
+    def api(self):
+        if self._api is None:
+            from src.data.api_manager import get_api_manager
+            self._api = get_api_manager()
+        return self._api
+
+    @property
+    def db(self):
+        if self._db is None:
+            from src.data.db_manager import DataManager
+            self._db = DataManager()
+        return self._db
+
+    @property
+    def learning(self):
+        if self._learning is None:
+            from src.logic.bpa_engine import BPAEngine
+            from src.logic.learning_engine import LearningEngine
+            self._learning = LearningEngine(BPAEngine(), self.db)
+        return self._learning
+
+    def sync(self, league_name: str, now: Optional[datetime] = None) -> dict:
+        """
+        Sincroniza una liga desde su marca de agua hasta hoy.
+
+        Returns:
+            {"league", "fetched", "matched", "settled", "failed", "mark_before", "mark_after"}
+        """
+        now = now or datetime.now()
+        mark = self.db.get_sync_mark(SYNC_SOURCE, league_name)
+        if mark:
+            date_from = datetime.fromtimestamp(mark).strftime("%Y-%m-%d")
+        else:
+            date_from = (now - timedelta(days=INITIAL_DAYS)).strftime("%Y-%m-%d")
+        date_to = now.strftime("%Y-%m-%d")
+
+        fixtures = [f for f in self.api.get_finished_fixtures(league_name, date_from, date_to)
+                    if (f.get("timestamp") or 0) > mark and f.get("home_score") is not None]
+        report = {"league": league_name, "fetched": len(fixtures), "matched": 0,
+                  "settled": 0, "failed": 0, "mark_before": mark, "mark_after": mark}
+        if not fixtures:
+            logger.info(f"[ResultSync] {league_name}: sin partidos nuevos desde {date_from}")
+            return report
+
+        # Emparejar con estudios pendientes (margen de un día por zona horaria)
+        day_from = (datetime.strptime(date_from, "%Y-%m-%d") - timedelta(days=DATE_TOLERANCE_DAYS))
+        day_to = now + timedelta(days=DATE_TOLERANCE_DAYS)
+        index = PendingIndex(self.db.get_pending_studies(day_from.strftime("%Y-%m-%d"),
+                                                         day_to.strftime("%Y-%m-%d")))
+        matched = []
+        for f in fixtures:
+            study = index.match(f["home_team"], f["away_team"], (f.get("date") or "")[:10])
+            if study:
+                matched.append((f, study))
+        report["matched"] = len(matched)
+
+        # Estadísticas y eventos de todos los emparejados en bloque (ids=)
+        results = self.api.get_match_results([f["fixture_id"] for f, _ in matched]) if matched else {}
+
+        from src.data.web_fetcher import WebResultFetcher
+        to_settle, failed_ts = [], []
+        for f, study in matched:
+            result = results.get(f["fixture_id"])
+            prediction = self.db.get_prediction(study["match_id"]) if result else None
+            if result is None or prediction is None:
+                failed_ts.append(f["timestamp"])
+                continue
+            to_settle.append((prediction, WebResultFetcher._to_outcome(study["match_id"], result), study))
+
+        # La marca no puede saltar un partido emparejado que no se pudo liquidar
+        newest = max(fixtures, key=lambda f: f["timestamp"])
+        new_mark, new_id = newest["timestamp"], newest["fixture_id"]
+        if failed_ts:
+            new_mark, new_id = min(failed_ts) - 1, None
+
+        with self.db.transaction():
+            for prediction, outcome, study in to_settle:
+                self.learning.process_result(prediction, outcome, study["home_team"],
+                                             study["away_team"], study.get("competition") or league_name)
+            if new_mark > mark:
+                self.db.set_sync_mark(SYNC_SOURCE, league_name, new_mark, new_id)
+
+        report.update(settled=len(to_settle), failed=len(failed_ts), mark_after=max(mark, new_mark))
+        logger.info(f"[ResultSync] {league_name}: {report['fetched']} finalizados, "
+                    f"{report['matched']} emparejados, {report['settled']} liquidados")
+        return report
+
+    def sync_all(self, leagues: List[str], now: Optional[datetime] = None) -> List[dict]:
+        return [self.sync(league, now=now) for league in leagues]
+
+    def pending_leagues(self) -> List[str]:
+        """Ligas de API-Football con algún estudio pendiente."""
+        from src.data.multi_source_fetcher import _norm_league
+        known = self.api.api_football.LEAGUE_IDS
+        leagues = {_norm_league(s["competition"]) for s in self.db.get_pending_studies() if s["competition"]}
+        return sorted(league for league in leagues if league in known)
+
+    def sync_pending(self, now: Optional[datetime] = None) -> List[dict]:
+        """Sincroniza solo las ligas que tienen estudios esperando resultado."""
+        return self.sync_all(self.pending_leagues(), now=now)
@@ -10,13 +10,20 @@ Proceso:
 3. Parsea los titulares XML
 4. Aplica análisis de sentimiento por palabras clave
 5. Devuelve análisis estructurado con impacto numérico
+
+La descarga la hace ``src/data/feed_ingestor.py``: todas las búsquedas de
+un partido en paralelo, con GET condicional y titulares deduplicados por
+GUID en un store de 7 días compartido por el proceso.
+
+Las palabras clave se buscan con ``src/logic/keyword_scanner.py``: una sola
+pasada por texto (sin acentos ni mayúsculas) da todas las palabras presentes,
+y los patrones de bajas/dudas se compilan en una regex por tipo.
 """
 
 import re
-import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-import requests
+from typing import Dict, List, Optional, Set, Tuple
+from src.data.feed_ingestor import FeedIngestor, get_feed_ingestor
+from src.logic.keyword_scanner import KeywordScanner
 
 
 # ============================================================
@@ -70,6 +77,22 @@ DUDA_PATTERNS = [
     r"(\w+ \w+) (no está al 100|arrastra molestias|con molestias)",
 ]
 
+PRIORITY_WORDS = ["lesión", "baja", "vestuario", "entrenador", "victoria",
+                  "derrota", "sanción", "renovación", "fichaje", "crisis"]
+
+# Autómatas compilados una vez por proceso
+SENTIMENT_SCANNER = KeywordScanner({"negative": NEG_KEYWORDS, "positive": POS_KEYWORDS})
+PRIORITY_SCANNER = KeywordScanner({"priority": PRIORITY_WORDS})
+
+
+def _combine_patterns(patterns: List[str]) -> re.Pattern:
+    """Una regex con un grupo con nombre (p0, p1...) por patrón: una pasada por texto."""
+    return re.compile("|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns)), re.IGNORECASE)
+
+
+BAJA_REGEX = _combine_patterns(BAJA_PATTERNS)
+DUDA_REGEX = _combine_patterns(DUDA_PATTERNS)
+
 
 class RSSAnalyst:
     """
@@ -90,58 +113,18 @@ class RSSAnalyst:
         "{team} partido resultado forma",
     ]
 
+    def __init__(self, ingestor: Optional[FeedIngestor] = None):
+        self.ingestor = ingestor or get_feed_ingestor(self.HEADERS)
+
     def fetch_google_news_rss(self, query: str, max_items: int = 8) -> List[Dict]:
         """
         Obtiene titulares de Google News RSS para una búsqueda.
-        Retorna lista de {title, source, date, snippet}
+        Retorna lista de {guid, title, source, date, snippet, published}
         """
-        encoded = requests.utils.quote(query)
-        url = f"https://news.google.com/rss/search?q={encoded}&hl=es&gl=ES&ceid=ES:es"
-
-        try:
-            resp = requests.get(url, headers=self.HEADERS, timeout=8)
-            if resp.status_code != 200:
-                return []
-
-            # Parsear XML
-            root = ET.fromstring(resp.content)
-            channel = root.find('channel')
-            if channel is None:
-                return []
-
-            items = []
-            cutoff = datetime.now() - timedelta(days=7)  # Solo últimos 7 días
-
-            for item in channel.findall('item')[:max_items]:
-                title = item.findtext('title', '') or ''
-                source = item.findtext('source', '') or ''
-                pub_date_str = item.findtext('pubDate', '') or ''
-                description = item.findtext('description', '') or ''
-
-                # Filtrar por fecha reciente
-                try:
-                    from email.utils import parsedate_to_datetime
-                    pub_date = parsedate_to_datetime(pub_date_str)
-                    if pub_date.replace(tzinfo=None) < cutoff:
-                        continue
-                except:
-                    pass
-
-                # Limpiar HTML del description
-                clean_desc = re.sub(r'<[^>]+>', '', description).strip()
-
-                items.append({
-                    "title": title,
-                    "source": source,
-                    "date": pub_date_str[:16] if pub_date_str else "",
-                    "snippet": clean_desc[:200] if clean_desc else title
-                })
-
-            return items
-
-        except Exception as e:
-            print(f"[RSSAnalyst] Error fetch RSS '{query}': {e}")
-            return []
+        return self.ingestor.ingest([query], max_items=max_items)[query]
+
+    def _team_queries(self, team_name: str) -> List[str]:
+        return [tpl.format(team=team_name) for tpl in self.SEARCH_QUERIES]
 
     def analyze_team(self, team_name: str, papers: List[str]) -> Dict:
         """
@@ -149,15 +132,20 @@ class RSSAnalyst:
         Devuelve análisis estructurado compatible con ExternalAnalyst.
         """
         print(f"    [RSS] Buscando noticias: {team_name}")
-
-        all_items = []
-        for query_tpl in self.SEARCH_QUERIES:
-            query = query_tpl.format(team=team_name)
-            items = self.fetch_google_news_rss(query, max_items=6)
-            all_items.extend(items)
-            if len(all_items) >= 15:
-                break
-
+        queries = self._team_queries(team_name)
+        self.ingestor.ingest(queries, max_items=6)
+        return self._analyze_items(team_name, self.ingestor.store.items(queries))
+
+    def analyze_match(self, home_name: str, away_name: str) -> Tuple[Dict, Dict]:
+        """Análisis de los dos equipos con las seis búsquedas descargadas a la vez."""
+        print(f"    [RSS] Buscando noticias: {home_name} / {away_name}")
+        home_q, away_q = self._team_queries(home_name), self._team_queries(away_name)
+        self.ingestor.ingest(home_q + away_q, max_items=6)
+        return (self._analyze_items(home_name, self.ingestor.store.items(home_q)),
+                self._analyze_items(away_name, self.ingestor.store.items(away_q)))
+
+    def _analyze_items(self, team_name: str, all_items: List[Dict]) -> Dict:
+        """Sentimiento, bajas y titulares clave a partir de los titulares del equipo."""
         if not all_items:
             print(f"    [RSS] Sin noticias encontradas para {team_name}")
             return self._empty_analysis()
@@ -168,21 +156,16 @@ class RSSAnalyst:
             for item in all_items
         ).lower()
 
-        # Análisis de sentimiento
-        moral = 0.0
-        for kw, val in NEG_KEYWORDS.items():
-            if kw in full_text:
-                moral += val
-        for kw, val in POS_KEYWORDS.items():
-            if kw in full_text:
-                moral += val
+        # Análisis de sentimiento: cada palabra presente suma su peso una vez
+        found = SENTIMENT_SCANNER.found(full_text)
+        moral = sum(hit.weight for hit in found.values())
 
         # Clamp entre -0.15 y +0.15
         moral = max(-0.15, min(0.15, round(moral, 3)))
 
         # Detectar bajas y dudas en titulares
-        bajas = self._extract_players(full_text, BAJA_PATTERNS)
-        dudas = self._extract_players(full_text, DUDA_PATTERNS)
+        bajas = self._extract_players(full_text, BAJA_REGEX)
+        dudas = self._extract_players(full_text, DUDA_REGEX)
 
         # Seleccionar noticias más relevantes
         noticias_clave = self._select_relevant_headlines(all_items, team_name)
@@ -190,35 +173,35 @@ class RSSAnalyst:
         # Estado del vestuario
         neg_count = sum(1 for kw in ["crisis", "tensión", "conflicto", "bronca",
                                       "malestar", "dimisión", "destituido"]
-                        if kw in full_text)
+                        if kw in found)
         pos_count = sum(1 for kw in ["motivación", "confianza", "unidad", "elogio"]
-                        if kw in full_text)
+                        if kw in found)
 
         if neg_count >= 2:
             estado_vestuario = "negativo"
-            desc_vestuario = self._build_vestuario_desc(full_text, "negativo")
+            desc_vestuario = self._build_vestuario_desc(set(found), "negativo")
         elif pos_count >= 2:
             estado_vestuario = "positivo"
-            desc_vestuario = self._build_vestuario_desc(full_text, "positivo")
+            desc_vestuario = self._build_vestuario_desc(set(found), "positivo")
         else:
             estado_vestuario = "neutro"
             desc_vestuario = "Sin incidencias relevantes en el vestuario esta semana."
 
         # Relación con la prensa
-        if any(kw in full_text for kw in ["críticas", "abucheos", "pitada", "cuestionado"]):
+        if any(kw in found for kw in ["críticas", "abucheos", "pitada", "cuestionado"]):
             relacion_prensa = "tensa"
-        elif any(kw in full_text for kw in ["elogio", "apoyo", "ovación"]):
+        elif any(kw in found for kw in ["elogio", "apoyo", "ovación"]):
             relacion_prensa = "buena"
         else:
             relacion_prensa = "normal"
 
         # Sensaciones recientes
-        if any(kw in full_text for kw in ["victoria", "invicto", "racha positiva", "líder"]):
+        if any(kw in found for kw in ["victoria", "invicto", "racha positiva", "líder"]):
             sensaciones = "positivas"
-            desc_reciente = self._build_forma_desc(full_text, "positivas")
-        elif any(kw in full_text for kw in ["derrota", "colista", "descenso", "eliminado"]):
+            desc_reciente = self._build_forma_desc(set(found), "positivas")
+        elif any(kw in found for kw in ["derrota", "colista", "descenso", "eliminado"]):
             sensaciones = "negativas"
-            desc_reciente = self._build_forma_desc(full_text, "negativas")
+            desc_reciente = self._build_forma_desc(set(found), "negativas")
         else:
             sensaciones = "neutras"
             desc_reciente = "Resultados recientes sin tendencia clara definida."
@@ -254,36 +237,29 @@ class RSSAnalyst:
             "_via_rss": True
         }
 
-    def _extract_players(self, text: str, patterns: List[str]) -> List[str]:
-        """Extrae nombres de jugadores de los titulares."""
+    def _extract_players(self, text: str, regex: re.Pattern) -> List[str]:
+        """Extrae nombres de jugadores de los titulares (regex de ``_combine_patterns``)."""
         found = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    name = match[0].strip()
-                else:
-                    name = match.strip()
-                # Filtrar nombres válidos (2 palabras, no stopwords)
-                words = name.split()
-                if len(words) >= 2 and all(len(w) > 2 for w in words):
-                    # Capitalizar
-                    name = " ".join(w.capitalize() for w in words)
-                    if name not in found:
-                        found.append(name)
+        for match in regex.finditer(text):
+            # El nombre es el primer grupo del patrón que ha encajado
+            name = (match.group(regex.groupindex[match.lastgroup] + 1) or "").strip()
+            # Filtrar nombres válidos (2 palabras, no stopwords)
+            words = name.split()
+            if len(words) >= 2 and all(len(w) > 2 for w in words):
+                # Capitalizar
+                name = " ".join(w.capitalize() for w in words)
+                if name not in found:
+                    found.append(name)
         return found[:4]
 
     def _select_relevant_headlines(self, items: List[Dict], team_name: str) -> List[str]:
         """Selecciona los titulares más relevantes."""
         relevant = []
-        priority_words = ["lesión", "baja", "vestuario", "entrenador", "victoria",
-                          "derrota", "sanción", "renovación", "fichaje", "crisis"]
 
         # Primero los de mayor relevancia
         for item in items:
             title = item.get("title", "")
-            title_lower = title.lower()
-            if any(pw in title_lower for pw in priority_words):
+            if PRIORITY_SCANNER.scan(title):
                 # Limpiar el título (quitar " - Nombre del medio" al final)
                 clean = re.sub(r'\s*[-–]\s*\S+\s*$', '', title).strip()
                 if clean and clean not in relevant:
@@ -300,33 +276,33 @@ class RSSAnalyst:
 
         return relevant[:3]
 
-    def _build_vestuario_desc(self, text: str, tipo: str) -> str:
+    def _build_vestuario_desc(self, found: Set[str], tipo: str) -> str:
         if tipo == "negativo":
-            if "destituido" in text or "dimisión" in text:
+            if "destituido" in found or "dimisión" in found:
                 return "Situación crítica en el banquillo, con rumores de destitución del entrenador."
-            if "impagos" in text:
+            if "impagos" in found:
                 return "Problemas económicos en el club afectan al ambiente del vestuario."
-            if "tensión" in text or "conflicto" in text:
+            if "tensión" in found or "conflicto" in found:
                 return "Tensiones internas en el vestuario detectadas en prensa esta semana."
             return "Ambiente de presión en el equipo según la prensa local."
         else:
-            if "renovación" in text:
+            if "renovación" in found:
                 return "Noticias de renovaciones generan buen ambiente en el vestuario."
-            if "motivación" in text or "confianza" in text:
+            if "motivación" in found or "confianza" in found:
                 return "El vestuario transmite confianza y buenas sensaciones según la prensa."
             return "Buen ambiente interno en el club esta semana."
 
-    def _build_forma_desc(self, text: str, tipo: str) -> str:
+    def _build_forma_desc(self, found: Set[str], tipo: str) -> str:
         if tipo == "positivas":
-            if "invicto" in text:
+            if "invicto" in found:
                 return "El equipo llega invicto en sus últimos partidos, con moral alta."
-            if "líder" in text:
+            if "líder" in found:
                 return "Lideran la clasificación, en un momento óptimo de forma."
             return "Buenas sensaciones en los últimos resultados del equipo."
         else:
-            if "descenso" in text:
+            if "descenso" in found:
                 return "El equipo está en zona de descenso, con gran presión sobre el vestuario."
-            if "eliminado" in text:
+            if "eliminado" in found:
                 return "Eliminación reciente que puede afectar anímicamente al grupo."
             return "Malos resultados recientes generan dudas sobre el estado del equipo."
 
@@ -1,8 +1,16 @@
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional, Dict, Any, Tuple, Union
+from pydantic import BaseModel, Field, ConfigDict, field_serializer
 from enum import Enum
 
+import numpy as np
+
+
+def score_matrix_to_dict(matrix: np.ndarray) -> Dict[str, float]:
+    """Convierte la matriz Poisson (ndarray) al formato de almacenamiento {"h-a": prob}."""
+    rows, cols = np.nonzero(matrix)
+    return {f"{h}-{a}": round(float(matrix[h, a]), 6) for h, a in zip(rows, cols)}
+
 class PlayerPosition(str, Enum):
     GOALKEEPER = "Portero"
     DEFENDER = "Defensa"
@@ -128,10 +136,12 @@ class PredictionResult(BaseModel):
     draw_prob: float
     win_prob_away: float
     
-    # Poisson Matrix (Simplified for storage)
-    poisson_matrix: Dict[str, float] = {} # e.g. {"1-0": 0.12, "2-0": 0.08}
+    # Poisson Matrix: ndarray en memoria, {"h-a": prob} al serializar/cargar desde BD
+    poisson_matrix: Union[np.ndarray, Dict[str, float]] = {} # e.g. {"1-0": 0.12, "2-0": 0.08}
     
     total_goals_expected: float
+    expected_goals_home: float = 0.0  # λ de Poisson local
+    expected_goals_away: float = 0.0  # λ de Poisson visitante
     total_goals_range: str = "0-0"
     both_teams_to_score_prob: float
     score_prediction: str = "0-0"
@@ -149,8 +159,26 @@ class PredictionResult(BaseModel):
     factor_c: float = 1.0 # Blindaje IA Confidence Factor
     elite_reports: List[Dict] = [] # Reports from Elite sources
     external_analysis_summary: str = ""
+    press_snapshot: Dict[str, Any] = {} # Versión de la prensa usada: {"home": {"version", "fetched_at", "stale"}, "away": {...}}
     referee_name: str = "Autodetectado"
 
+    @field_serializer('poisson_matrix')
+    def _serialize_poisson_matrix(self, matrix):
+        if isinstance(matrix, np.ndarray):
+            return score_matrix_to_dict(matrix)
+        return matrix
+
+    def top_scores(self, n: int = 5) -> List[Tuple[str, float]]:
+        """Los n marcadores más probables, tanto si la matriz es ndarray como dict."""
+        matrix = self.poisson_matrix
+        if isinstance(matrix, np.ndarray):
+            if matrix.size == 0:
+                return []
+            flat = np.argsort(matrix, axis=None)[::-1][:n]
+            cells = zip(*np.unravel_index(flat, matrix.shape))
+            return [(f"{h}-{a}", float(matrix[h, a])) for h, a in cells if matrix[h, a] > 0]
+        return sorted(matrix.items(), key=lambda x: x[1], reverse=True)[:n]
+
 class MatchOutcome(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True, extra="ignore")
     
@@ -0,0 +1,153 @@
+"""
+Métricas de latencia en proceso — LAGEMA JARG74
+================================================
+Tramos cronometrados (``span``) que alimentan histogramas en memoria con
+percentiles p50/p95/p99. Sirve para saber si una predicción lenta viene de la
+red (prensa, lesiones), del BPA o del modelo.
+
+Cada métrica se identifica por nombre + etiquetas (``stage="bpa"``,
+``source="news_search"``...). Se guarda una ventana de las últimas
+``HISTOGRAM_WINDOW`` muestras por serie, más el recuento y la suma totales.
+
+Exportación: ``snapshot()`` (dict), ``to_json()`` y ``to_prometheus()``
+(formato texto de Prometheus, tipo summary).
+"""
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+HISTOGRAM_WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_PREFIX = "lagema_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """Ventana acotada de muestras (segundos) con recuento y suma acumulados."""
+
+    def __init__(self, window: int = HISTOGRAM_WINDOW):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Percentil por rango más cercano sobre la ventana actual."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        idx = max(0, math.ceil(q * len(ordered)) - 1)
+        return ordered[idx]
+
+    def summary(self) -> Dict[str, float]:
+        out = {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+        }
+        for q in QUANTILES:
+            out[f"p{int(q * 100)}"] = round(self.quantile(q), 6)
+        return out
+
+
+class MetricsRegistry:
+    """Colección de histogramas de latencia, segura entre hilos."""
+
+    def __init__(self, window: int = HISTOGRAM_WINDOW):
+        self.window = window
+        self._series: Dict[str, Dict[LabelKey, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = LatencyHistogram(self.window)
+            hist.observe(seconds)
+
+    @contextmanager
+    def span(self, name: str, trace: Optional[Dict[str, float]] = None, **labels) -> Iterator[None]:
+        """
+        Cronometra el bloque y lo registra en ``name`` con las etiquetas dadas.
+        Si se pasa ``trace``, también anota la duración bajo la primera
+        etiqueta (p. ej. ``trace["bpa"] = 0.012``) para la traza de la llamada.
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            secs = time.perf_counter() - t0
+            self.observe(name, secs, **labels)
+            if trace is not None:
+                label = next(iter(labels.values()), name)
+                trace[str(label)] = round(trace.get(str(label), 0.0) + secs, 6)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> Dict[str, list]:
+        """{métrica: [{"labels": {...}, "count", "mean", "p50", "p95", "p99", ...}]}"""
+        with self._lock:
+            items = [(name, list(series.items())) for name, series in self._series.items()]
+            return {
+                name: [{"labels": dict(key), **hist.summary()} for key, hist in series]
+                for name, series in items
+            }
+
+    def rows(self) -> list:
+        """Snapshot aplanado (una fila por serie), cómodo para un DataFrame."""
+        out = []
+        for name, series in self.snapshot().items():
+            for s in series:
+                labels = ",".join(f"{k}={v}" for k, v in s["labels"].items())
+                out.append({"metric": name, "labels": labels,
+                            **{k: v for k, v in s.items() if k != "labels"}})
+        return out
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent, ensure_ascii=False)
+
+    def to_prometheus(self) -> str:
+        """Volcado en formato texto de Prometheus (summary por métrica)."""
+        lines = []
+        for name, series in sorted(self.snapshot().items()):
+            full = f"{METRIC_PREFIX}{name}"
+            lines.append(f"# TYPE {full} summary")
+            for s in series:
+                base = [f'{k}="{_escape(v)}"' for k, v in s["labels"].items()]
+                for q in QUANTILES:
+                    lbl = ",".join(base + [f'quantile="{q}"'])
+                    lines.append(f"{full}{{{lbl}}} {s[f'p{int(q * 100)}']}")
+                suffix = "{" + ",".join(base) + "}" if base else ""
+                lines.append(f"{full}_sum{suffix} {s['sum']}")
+                lines.append(f"{full}_count{suffix} {s['count']}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Registro global del proceso (compartido por Predictor, ExternalAnalyst y cached_get)
+METRICS = MetricsRegistry()
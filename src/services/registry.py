@@ -0,0 +1,191 @@
+"""
+Registro perezoso de servicios — LAGEMA JARG74
+===============================================
+Sustituye la construcción ansiosa de ``get_services``: cada servicio se
+declara con su ruta ``"modulo:Clase"`` y sus dependencias, y solo se importa
+e instancia la primera vez que alguien lo usa. El registro anota cuánto tardó
+la importación y la inicialización de cada servicio para poder diagnosticar
+arranques lentos.
+
+La recarga de módulos (``importlib.reload``) ya no se hace en cada arranque:
+solo se activa en modo desarrollo con la variable de entorno
+``LAGEMA_DEV_RELOAD=1``.
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+DEV_RELOAD_ENV = "LAGEMA_DEV_RELOAD"
+
+
+def dev_reload_enabled() -> bool:
+    """True si el modo desarrollo con recarga de módulos está activo."""
+    return os.getenv(DEV_RELOAD_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ServiceRegistry:
+    """
+    Registro de servicios con creación bajo demanda.
+
+    - ``register(name, target, deps, reload_modules)`` declara un servicio.
+      ``target`` es ``"paquete.modulo:Clase"`` o cualquier callable.
+    - ``get(name)`` importa e instancia el servicio (y sus dependencias) la
+      primera vez; después devuelve siempre la misma instancia.
+    - ``proxy(name)`` devuelve un sustituto que resuelve el servicio en el
+      primer acceso a un atributo, para poder repartir referencias sin pagar
+      su construcción.
+    - ``timings()`` expone ``import_s`` / ``init_s`` por servicio.
+    """
+
+    def __init__(self, dev_reload: Optional[bool] = None):
+        self.dev_reload = dev_reload_enabled() if dev_reload is None else dev_reload
+        self._specs: Dict[str, Tuple[Union[str, Callable], Tuple[str, ...], Tuple[str, ...]]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._reloaded: set = set()
+        self._lock = threading.RLock()
+
+    # ── Declaración ──────────────────────────────────────────────────────────
+
+    def register(self, name: str, target: Union[str, Callable],
+                 deps: Iterable[str] = (), reload_modules: Iterable[str] = ()):
+        """
+        Declara un servicio sin construirlo.
+
+        ``deps`` son nombres de otros servicios que se pasan como argumentos
+        posicionales al constructor. ``reload_modules`` son módulos extra que
+        se recargan antes de construirlo cuando el modo desarrollo está activo.
+        """
+        with self._lock:
+            self._specs[name] = (target, tuple(deps), tuple(reload_modules))
+            self._instances.pop(name, None)
+        return self
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    # ── Resolución ───────────────────────────────────────────────────────────
+
+    def get(self, name: str) -> Any:
+        """Devuelve la instancia del servicio, creándola si aún no existe."""
+        inst = self._instances.get(name)
+        if inst is not None:
+            return inst
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            if name not in self._specs:
+                raise KeyError(f"Servicio no registrado: {name}")
+            target, deps, reload_modules = self._specs[name]
+            args = [self.get(d) for d in deps]
+
+            t0 = time.perf_counter()
+            factory = self._resolve_target(target, reload_modules)
+            t1 = time.perf_counter()
+            inst = factory(*args)
+            t2 = time.perf_counter()
+
+            self._instances[name] = inst
+            self._timings[name] = {
+                "import_s": round(t1 - t0, 4),
+                "init_s": round(t2 - t1, 4),
+            }
+            print(f"[Services] {name}: import {t1 - t0:.3f}s, init {t2 - t1:.3f}s")
+            return inst
+
+    def proxy(self, name: str) -> "LazyService":
+        if name not in self._specs:
+            raise KeyError(f"Servicio no registrado: {name}")
+        return LazyService(self, name)
+
+    def reset(self, name: Optional[str] = None):
+        """Descarta instancias (todas o una) para que se reconstruyan en el próximo uso."""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+                self._timings.clear()
+                self._reloaded.clear()
+            else:
+                self._instances.pop(name, None)
+                self._timings.pop(name, None)
+
+    def timings(self) -> Dict[str, Dict[str, Any]]:
+        """Tiempos de importación e inicialización de cada servicio registrado."""
+        out = {}
+        for name in self._specs:
+            t = self._timings.get(name)
+            out[name] = {
+                "loaded": t is not None,
+                "import_s": t["import_s"] if t else None,
+                "init_s": t["init_s"] if t else None,
+            }
+        return out
+
+    # ── Internos ─────────────────────────────────────────────────────────────
+
+    def _resolve_target(self, target: Union[str, Callable], reload_modules: Tuple[str, ...]) -> Callable:
+        if self.dev_reload:
+            for mod_name in reload_modules:
+                self._import(mod_name)
+        if callable(target):
+            return target
+        mod_name, _, attr = target.partition(":")
+        module = self._import(mod_name)
+        return getattr(module, attr)
+
+    def _import(self, mod_name: str):
+        """Importa un módulo; en modo desarrollo lo recarga una vez por registro."""
+        already = mod_name in sys.modules
+        module = importlib.import_module(mod_name)
+        if self.dev_reload and already and mod_name not in self._reloaded:
+            module = importlib.reload(module)
+        self._reloaded.add(mod_name)
+        return module
+
+
+class LazyService:
+    """
+    Sustituto de un servicio: no construye nada hasta que se accede a un
+    atributo, y a partir de ahí delega todo en la instancia real.
+    """
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def _target(self):
+        return self._registry.get(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._target(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._target(), attr, value)
+
+    def __repr__(self):
+        state = "cargado" if self._registry.is_loaded(self._name) else "pendiente"
+        return f"<LazyService {self._name} ({state})>"
+
+
+def build_app_registry(dev_reload: Optional[bool] = None) -> ServiceRegistry:
+    """Registro con los servicios que usa la app de Streamlit."""
+    reg = ServiceRegistry(dev_reload=dev_reload)
+    reg.register("data_provider", "src.data.mock_provider:MockDataProvider",
+                 reload_modules=("src.models.base",))
+    reg.register("db_manager", "src.data.db_manager:DataManager")
+    reg.register("bpa_engine", "src.logic.bpa_engine:BPAEngine")
+    reg.register("predictor", "src.logic.predictors:Predictor", deps=("bpa_engine",),
+                 reload_modules=("src.logic.poisson_engine", "src.logic.external_analyst"))
+    reg.register("validator", "src.logic.validator:Validator")
+    reg.register("bankroll_manager", "src.data.bankroll_manager:BankrollManager")
+    reg.register("report_engine", "src.logic.report_engine:ReportEngine")
+    return reg
@@ -0,0 +1,85 @@
+"""
+test_batch_predictions.py - Verifica que Predictor.predict_matches (lote vectorizado)
+produce los mismos resultados que predict_match partido a partido.
+Ejecutar con: python test_batch_predictions.py
+"""
+import sys
+import os
+import time
+from datetime import datetime
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.models.base import Match, Team, Player, PlayerPosition, PlayerStatus, NodeRole
+from src.logic.predictors import Predictor
+from src.logic.bpa_engine import BPAEngine
+
+
+def create_team(name, league, xg, rating):
+    roles = [NodeRole.KEEPER, NodeRole.DEFENSIVE, NodeRole.DEFENSIVE, NodeRole.DEFENSIVE, NodeRole.DEFENSIVE,
+             NodeRole.CREATOR, NodeRole.CREATOR, NodeRole.CREATOR, NodeRole.FINALIZER, NodeRole.FINALIZER,
+             NodeRole.FINALIZER]
+    players = [
+        Player(id=f"{name}_{i}", name=f"Player {i}", team_name=name, position=PlayerPosition.MIDFIELDER,
+               node_role=role, status=PlayerStatus.TITULAR, rating_last_5=rating, ppda=10.0 + i % 3)
+        for i, role in enumerate(roles)
+    ]
+    return Team(name=name, league=league, players=players, avg_xg_season=xg, avg_xg_conceded_season=1.2)
+
+
+def build_slate(n=20):
+    matches = []
+    for i in range(n):
+        home = create_team(f"Home {i}", "La Liga", xg=0.9 + (i % 7) * 0.25, rating=6.0 + (i % 5) * 0.4)
+        away = create_team(f"Away {i}", "La Liga", xg=0.8 + (i % 4) * 0.3, rating=6.5 + (i % 3) * 0.3)
+        matches.append(Match(id=f"BATCH_{i}", home_team=home, away_team=away, date=datetime.now(),
+                             competition="La Liga", market_odds={"1": 2.1, "X": 3.3, "2": 3.6}))
+    return matches
+
+
+def offline_predictor():
+    predictor = Predictor(BPAEngine())
+    # Sin red: la inteligencia externa devuelve un reporte neutro y determinista
+    predictor.external_analyst.get_detailed_intelligence = lambda match, freshness=None: {
+        "report": "offline", "impact": {"home": 1.0, "away": 1.0}
+    }
+    return predictor
+
+
+def test_batch_matches_single():
+    predictor = offline_predictor()
+    matches = build_slate()
+
+    start = time.perf_counter()
+    batch = predictor.predict_matches(matches)
+    elapsed = time.perf_counter() - start
+
+    assert len(batch) == len(matches)
+    for match, pred in zip(matches, batch):
+        single = predictor.predict_match(match)
+        assert pred.match_id == match.id
+        assert pred.win_prob_home == single.win_prob_home
+        assert pred.draw_prob == single.draw_prob
+        assert pred.win_prob_away == single.win_prob_away
+        assert pred.score_prediction == single.score_prediction
+        assert pred.both_teams_to_score_prob == single.both_teams_to_score_prob
+        assert pred.confidence_score == single.confidence_score
+        assert pred.model_dump()["poisson_matrix"] == single.model_dump()["poisson_matrix"]
+        assert pred.value_opportunities == single.value_opportunities
+    print(f"OK: {len(matches)} partidos en lote ({elapsed * 1000:.1f} ms) coinciden con predict_match")
+
+
+def test_per_match_freshness():
+    predictor = offline_predictor()
+    matches = build_slate(4)
+    freshness = ['live', 'confirmed', 'predicted', 'stale']
+    batch = predictor.predict_matches(matches, lineup_freshness=freshness)
+    for match, fresh, pred in zip(matches, freshness, batch):
+        single = predictor.predict_match(match, lineup_freshness=fresh)
+        assert (pred.win_prob_home, pred.draw_prob, pred.win_prob_away) == \
+            (single.win_prob_home, single.draw_prob, single.win_prob_away)
+    print("OK: freshness por partido respetado")
+
+
+if __name__ == "__main__":
+    test_batch_matches_single()
+    test_per_match_freshness()
@@ -0,0 +1,51 @@
+"""
+test_benchmarks.py - Verifica el arnés de benchmarks (benchmarks/): medición,
+guardado en JSON y detección de regresiones contra una línea base.
+No necesita red.
+Ejecutar con: python test_benchmarks.py
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from benchmarks.harness import measure, save_results, load_results, compare
+from benchmarks.run_benchmarks import main as run_benchmarks
+
+
+def test_measure_and_roundtrip():
+    r = measure(lambda: sum(range(200)), repeat=3, min_time=0.005, unit_items=200)
+    print(f"Medición: {r}")
+    assert r["median_s"] > 0 and r["number"] >= 1 and r["repeat"] == 3
+    assert r["ops_per_s"] > 200
+
+    path = os.path.join(tempfile.mkdtemp(), "res.json")
+    save_results({"suma": r}, path, {"nota": "test"})
+    assert load_results(path)["suma"]["median_s"] == r["median_s"]
+
+
+def test_compare_flags_regressions():
+    base = {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}, "c": {"median_s": 1.0}}
+    cur = {"a": {"median_s": 1.5}, "b": {"median_s": 0.5}, "c": {"median_s": 1.1}, "d": {"median_s": 2.0}}
+    res = compare(base, cur, threshold=0.2)
+    assert res["a"]["status"] == "regresion" and res["a"]["ratio"] == 1.5
+    assert res["b"]["status"] == "mejora"
+    assert res["c"]["status"] == "igual"
+    assert res["d"]["status"] == "nuevo"
+
+
+def test_runner_offline_suite():
+    tmp = tempfile.mkdtemp()
+    out, baseline = os.path.join(tmp, "run.json"), os.path.join(tmp, "base.json")
+    args = ["--quick", "--only", "referee,poisson", "--out", out, "--baseline", baseline]
+    assert run_benchmarks(args + ["--save-baseline"]) == 0
+    results = load_results(out)
+    assert "poisson.score_matrix" in results and "referee.get_referee_data" in results
+    assert run_benchmarks(args + ["--compare", "--threshold", "10"]) == 0
+
+
+if __name__ == "__main__":
+    test_measure_and_roundtrip()
+    test_compare_flags_regressions()
+    test_runner_offline_suite()
+    print("OK")
@@ -0,0 +1,103 @@
+"""
+test_db_pool.py - Verifica el pool SQLite de DataManager (src/data/db_manager.py):
+WAL, reutilización de conexiones, escrituras concurrentes y unidad de trabajo.
+Usa una BD temporal, no necesita red.
+Ejecutar con: python test_db_pool.py
+"""
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+os.environ.pop("SUPABASE_URL", None)
+os.environ.pop("SUPABASE_KEY", None)
+
+from src.data.db_manager import DataManager, SQLitePool
+from src.logic.bpa_engine import BPAEngine
+from src.logic.learning_engine import LearningEngine
+from src.models.base import MatchOutcome, PredictionResult
+
+
+def _record(i, mercado="1X2"):
+    return {"match_id": f"m{i}", "mercado": mercado, "predicho": "LOCAL", "real": "LOCAL",
+            "error_magnitud": 0.1, "acierto": True, "ajuste_aplicado": 0.0,
+            "home_team": "A", "away_team": "B", "competition": "La Liga"}
+
+
+def test_pool_is_shared_and_uses_wal():
+    path = os.path.join(tempfile.mkdtemp(), "pool.db")
+    db1, db2 = DataManager(db_path=path), DataManager(db_path=path)
+    assert db1._pool is db2._pool is SQLitePool.for_path(path)
+    with db1._conn() as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    print(f"journal_mode={mode}")
+    assert mode.lower() == "wal"
+    # Conexiones reutilizadas: nunca más que el tamaño del pool
+    for i in range(20):
+        db1.save_aprendizaje([_record(i)])
+    assert len(db1._pool._all) <= db1._pool.size
+
+
+def test_concurrent_writers():
+    path = os.path.join(tempfile.mkdtemp(), "concurrent.db")
+    db = DataManager(db_path=path)
+
+    def worker(n):
+        for i in range(25):
+            db.update_team_factor("Equipo", "sesgo_local", 0.001)
+            db.save_aprendizaje([_record(n * 100 + i), _record(n * 100 + i, "Córners")])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    factor = db.get_team_factor("Equipo")
+    stats = db.get_aprendizaje_stats()
+    print(f"factor={factor['total_partidos']} | stats={stats['1X2']['total']}")
+    # update_team_factor es lectura+escritura atómica: no se pierden incrementos
+    assert factor["total_partidos"] == 150
+    assert stats["1X2"]["total"] == 150 and stats["Córners"]["total"] == 150
+
+
+def test_unit_of_work_rolls_back():
+    path = os.path.join(tempfile.mkdtemp(), "uow.db")
+    db = DataManager(db_path=path)
+    try:
+        with db.transaction():
+            db.save_resultado("x1", {"home_score": 1, "away_score": 0, "winner": "LOCAL"})
+            db.save_aprendizaje([_record(1)])
+            raise RuntimeError("fallo simulado")
+    except RuntimeError:
+        pass
+    assert db.get_aprendizaje_stats() == {}
+    assert db.get_semaforo_history() == []
+
+
+def test_process_result_single_transaction():
+    path = os.path.join(tempfile.mkdtemp(), "learning.db")
+    db = DataManager(db_path=path)
+    engine = LearningEngine(BPAEngine(), db_manager=db)
+    pred = PredictionResult(
+        match_id="p1", bpa_home=0.5, bpa_away=0.5,
+        win_prob_home=0.55, draw_prob=0.25, win_prob_away=0.20,
+        total_goals_expected=2.5, both_teams_to_score_prob=0.5,
+        predicted_corners="8-11", predicted_cards="3-5", predicted_shots="20-26",
+    )
+    out = MatchOutcome(match_id="p1", home_score=2, away_score=1, home_corners=5,
+                       away_corners=4, home_cards=2, away_cards=2, home_shots=12,
+                       away_shots=10, actual_winner="LOCAL")
+    report = engine.process_result(pred, out, "Local FC", "Visitante CF", "La Liga")
+    assert "Resumen" in report
+    stats = db.get_aprendizaje_stats()
+    print(f"Mercados registrados: {sorted(stats)}")
+    assert len(stats) == 4
+    assert db.get_team_factor("Local FC")["total_partidos"] >= 1
+
+
+if __name__ == "__main__":
+    test_pool_is_shared_and_uses_wal()
+    test_concurrent_writers()
+    test_unit_of_work_rolls_back()
+    test_process_result_single_transaction()
+    print("OK")
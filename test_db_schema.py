@@ -0,0 +1,110 @@
+"""
+test_db_schema.py - Verifica la migración v2 de DataManager (columnas tipadas en
+predictions + índices) y la agregación de aciertos en SQL sin decodificar JSON.
+Usa una BD temporal, no necesita red.
+Ejecutar con: python test_db_schema.py
+"""
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+os.environ.pop("SUPABASE_URL", None)
+os.environ.pop("SUPABASE_KEY", None)
+
+from src.data.db_manager import DataManager, SCHEMA_VERSION, parse_range
+from src.models.base import PredictionResult
+
+
+def _legacy_db(path):
+    """BD con el esquema v1 (solo blobs JSON en predictions)."""
+    conn = sqlite3.connect(path)
+    conn.execute('''CREATE TABLE matches (id TEXT PRIMARY KEY, date TEXT, competition TEXT,
+        home_team TEXT, away_team TEXT, data_json TEXT)''')
+    conn.execute('''CREATE TABLE predictions (match_id TEXT PRIMARY KEY,
+        prediction_json TEXT, created_at TEXT)''')
+    conn.execute('''CREATE TABLE resultados (match_id TEXT PRIMARY KEY, home_score INTEGER,
+        away_score INTEGER, winner TEXT, corners INTEGER, cards INTEGER, shots INTEGER,
+        shots_on_target INTEGER, home_corners INTEGER, away_corners INTEGER,
+        home_cards INTEGER, away_cards INTEGER, home_shots INTEGER, away_shots INTEGER,
+        home_shots_on_target INTEGER, away_shots_on_target INTEGER, created_at TEXT)''')
+    conn.execute("INSERT INTO matches VALUES ('old1','2025-01-10','La Liga','Sevilla','Betis','{}')")
+    conn.execute("INSERT INTO predictions VALUES (?,?,?)", ("old1", json.dumps({
+        "win_prob_home": 0.52, "draw_prob": 0.26, "win_prob_away": 0.22,
+        "total_goals_expected": 2.4, "both_teams_to_score_prob": 0.5,
+        "predicted_corners": "🏠 4-6 | ✈️ 3-5", "predicted_cards": "3-5",
+        "predicted_shots": "20-26"}), "2025-01-10T10:00"))
+    conn.execute('''INSERT INTO resultados (match_id, winner, corners, cards, shots, created_at)
+        VALUES ('old1','LOCAL',9,7,22,'2025-01-11T10:00')''')
+    conn.commit()
+    conn.close()
+
+
+def test_parse_range():
+    assert parse_range("🏠 4-6 | ✈️ 3-5") == (7, 11)
+    assert parse_range("8-11") == (8, 11)
+    assert parse_range("") == (None, None)
+
+
+def test_migration_backfills_typed_columns():
+    path = os.path.join(tempfile.mkdtemp(), "legacy.db")
+    _legacy_db(path)
+    db = DataManager(db_path=path)
+    with db._conn() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        row = conn.execute('''SELECT win_prob_home, corners_lo, corners_hi, cards_lo, shots_hi
+            FROM predictions WHERE match_id='old1' ''').fetchone()
+        plan = " ".join(r[-1] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM matches WHERE competition=? AND date>=?",
+            ("La Liga", "2025-01-01")))
+    print(f"user_version={version} | fila={row} | plan={plan}")
+    assert version == SCHEMA_VERSION
+    assert row == (0.52, 7, 11, 3, 26)
+    assert "idx_matches_comp_date" in plan
+
+
+def test_sql_semaforo_and_hit_rates():
+    path = os.path.join(tempfile.mkdtemp(), "legacy2.db")
+    _legacy_db(path)
+    db = DataManager(db_path=path)
+    history = db.get_semaforo_history()
+    print(f"Historial: {history}")
+    merc = history[0]["mercados"]
+    assert history[0]["home_team"] == "Sevilla"
+    assert merc["1X2"] == {"predicho": "LOCAL", "real": "LOCAL", "acierto": True}
+    assert merc["Córners"]["predicho"] == "7-11" and merc["Córners"]["acierto"]
+    assert merc["Tarjetas"]["acierto"] is False
+    assert merc["Remates"]["acierto"]
+
+    rates = db.get_market_hit_rates()
+    print(f"Tasas: {rates}")
+    assert rates["1X2"] == {"hits": 1, "total": 1, "precision": 100}
+    assert rates["Tarjetas"]["hits"] == 0
+    assert db.get_market_hit_rates(competition="Premier League") == {}
+
+
+def test_save_prediction_fills_columns():
+    path = os.path.join(tempfile.mkdtemp(), "new.db")
+    db = DataManager(db_path=path)
+    pred = PredictionResult(
+        match_id="n1", bpa_home=0.5, bpa_away=0.5,
+        win_prob_home=0.3, draw_prob=0.3, win_prob_away=0.4,
+        total_goals_expected=2.7, expected_goals_home=1.2, expected_goals_away=1.5,
+        both_teams_to_score_prob=0.55, predicted_corners="🏠 5-7 | ✈️ 4-5",
+    )
+    db.save_prediction(pred)
+    with db._conn() as conn:
+        row = conn.execute('''SELECT lambda_home, lambda_away, corners_lo, corners_hi, cards_lo
+            FROM predictions WHERE match_id='n1' ''').fetchone()
+    assert row == (1.2, 1.5, 9, 12, 0)
+    assert db.get_prediction("n1").expected_goals_away == 1.5
+
+
+if __name__ == "__main__":
+    test_parse_range()
+    test_migration_backfills_typed_columns()
+    test_sql_semaforo_and_hit_rates()
+    test_save_prediction_fills_columns()
+    print("OK")
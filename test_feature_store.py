@@ -0,0 +1,104 @@
+"""
+test_feature_store.py - Verifica el pipeline de entrenamiento con histórico real
+(src/data/pipeline.py): medias móviles sin fuga de datos, caché columnar por
+versión de datos y reconstrucción incremental.
+Usa una BD y una caché temporales, no necesita red.
+Ejecutar con: python test_feature_store.py
+"""
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+os.environ.pop("SUPABASE_URL", None)
+os.environ.pop("SUPABASE_KEY", None)
+
+import numpy as np
+import pandas as pd
+from src.data.db_manager import DataManager
+from src.data.pipeline import DataPipeline, FeatureStore, NEUTRAL_FORM
+from src.logic.ml_engine import MLEngine
+from src.models.base import Match, Team
+
+TEAMS = ["Sevilla", "Betis", "Valencia", "Villarreal"]
+
+
+def _play(db, i, home, away, hg, ag):
+    match = Match(
+        id=f"m{i:03d}", date=datetime(2025, 1, 1) + timedelta(days=i), competition="La Liga",
+        home_team=Team(name=home, league="La Liga", avg_xg_season=1.2 + (i % 5) * 0.1),
+        away_team=Team(name=away, league="La Liga", avg_xg_season=1.0 + (i % 3) * 0.1),
+    )
+    db.save_match(match)
+    winner = "LOCAL" if hg > ag else "VISITANTE" if ag > hg else "EMPATE"
+    db.save_resultado(match.id, {"home_score": hg, "away_score": ag, "winner": winner})
+
+
+def _setup(n):
+    tmp = tempfile.mkdtemp()
+    db = DataManager(db_path=os.path.join(tmp, "hist.db"))
+    rng = np.random.default_rng(74)
+    for i in range(n):
+        home, away = rng.choice(TEAMS, size=2, replace=False)
+        _play(db, i, home, away, int(rng.integers(0, 4)), int(rng.integers(0, 3)))
+    return db, FeatureStore(db_path=db.db_path, cache_dir=os.path.join(tmp, "features"))
+
+
+def test_rolling_features_use_only_past_matches():
+    db, store = _setup(40)
+    features = store.build()
+    print(f"Características: {features.shape} | build={store.last_build}")
+    assert list(features.columns) == ['match_id', *MLEngine.FEATURE_COLUMNS, 'target_winner']
+    assert len(features) == 40 and not features[MLEngine.FEATURE_COLUMNS].isna().any().any()
+
+    # Referencia explícita (bucle) para la forma del local en cada partido
+    raw = store.load_raw().sort_values(['date', 'match_id']).reset_index(drop=True)
+    history = {t: [] for t in TEAMS}
+    expected = []
+    for row in raw.itertuples():
+        past = history[row.home_team][-5:]
+        expected.append(np.mean(past) if past else NEUTRAL_FORM)
+        pts_h = 3 if row.home_goals > row.away_goals else 1 if row.home_goals == row.away_goals else 0
+        pts_a = 3 if row.away_goals > row.home_goals else 1 if row.home_goals == row.away_goals else 0
+        history[row.home_team].append(pts_h)
+        history[row.away_team].append(pts_a)
+    np.testing.assert_allclose(features['home_form'].to_numpy(), expected)
+
+
+def test_cache_and_incremental_rebuild():
+    db, store = _setup(30)
+    store.build()
+    assert store.last_build["cached"] is False and store.last_build["new_rows"] == 30
+
+    again = FeatureStore(db_path=store.db_path, cache_dir=store.cache_dir)
+    cached = again.build()
+    assert again.last_build["cached"] is True and len(cached) == 30
+
+    _play(db, 30, "Sevilla", "Betis", 2, 0)
+    _play(db, 31, "Valencia", "Villarreal", 1, 1)
+    rebuilt = again.build()
+    print(f"Incremental: {again.last_build}")
+    assert again.last_build["cached"] is False and again.last_build["new_rows"] == 2
+    assert len(rebuilt) == 32
+    full = DataPipeline().build_training_features(again.load_raw())
+    pd.testing.assert_frame_equal(rebuilt.reset_index(drop=True), full, check_dtype=False)
+
+
+def test_team_state_feeds_inference_features():
+    db, store = _setup(20)
+    state = store.team_state()
+    assert set(state) == set(TEAMS)
+    match = Match(id="next", date=datetime(2025, 3, 1),
+                  home_team=Team(name="Sevilla", league="La Liga"),
+                  away_team=Team(name="Nuevo CF", league="La Liga", form_last_5=["W", "W", "L"]))
+    row = MLEngine().build_match_features([match], team_state=state).iloc[0]
+    assert row['home_form'] == state["Sevilla"]["form"]
+    assert row['away_form'] == 2.0   # sin historial: racha del Team
+
+
+if __name__ == "__main__":
+    test_rolling_features_use_only_past_matches()
+    test_cache_and_incremental_rebuild()
+    test_team_state_feeds_inference_features()
+    print("OK")
@@ -0,0 +1,118 @@
+"""
+test_feed_ingestor.py - Verifica la ingesta de RSS (src/data/feed_ingestor.py) contra un
+servidor local: búsquedas en paralelo, revalidación con ETag sin re-parsear, titulares
+deduplicados por GUID, ventana temporal del store y RSSAnalyst.analyze_match.
+Ejecutar con: python test_feed_ingestor.py
+"""
+import sys
+import os
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.cache_manager import CacheManager
+from src.data.feed_ingestor import FeedIngestor, FeedStore, parse_rss
+from src.logic.rss_analyst import RSSAnalyst
+
+NOW = datetime.now(timezone.utc)
+
+
+def _rss(query):
+    team = query.split()[0]
+    shared = (f"<item><title>{team} recupera a su goleador - Diario</title><guid>shared-{team}</guid>"
+              f"<pubDate>{format_datetime(NOW)}</pubDate><source>Diario</source></item>")
+    own = (f"<item><title>{query} crisis en el vestuario</title><guid>{query}</guid>"
+           f"<pubDate>{format_datetime(NOW - timedelta(hours=2))}</pubDate><source>Radio</source></item>")
+    old = (f"<item><title>{team} noticia antigua</title><guid>old-{team}</guid>"
+           f"<pubDate>{format_datetime(NOW - timedelta(days=30))}</pubDate></item>")
+    return f"<rss><channel>{shared}{own}{old}</channel></rss>".encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = 0
+    not_modified = 0
+    delay = 0.3
+
+    def do_GET(self):
+        _Handler.hits += 1
+        time.sleep(_Handler.delay)
+        query = parse_qs(urlsplit(self.path).query)["q"][0]
+        etag = f'"{abs(hash(query))}"'
+        if self.headers.get("If-None-Match") == etag:
+            _Handler.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = _rss(query)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    return server, lambda q: f"{base}/rss?q={quote(q)}"
+
+
+def test_parse_rss_window_and_guid():
+    items = parse_rss(_rss("Sevilla lesión"))
+    assert [i["guid"] for i in items] == ["shared-Sevilla", "Sevilla lesión"]
+    assert items[0]["source"] == "Diario" and items[0]["published"]
+
+
+def test_concurrent_conditional_ingest_and_dedupe():
+    server, url_for = _serve()
+    try:
+        ingestor = FeedIngestor(url_for=url_for, cache=CacheManager(persist=False), ttl=0)
+        analyst = RSSAnalyst(ingestor=ingestor)
+        t0 = time.perf_counter()
+        home, away = analyst.analyze_match("Sevilla", "Betis")
+        elapsed = time.perf_counter() - t0
+        print(f"6 búsquedas en {elapsed:.2f}s, stats: {ingestor.stats}")
+        assert _Handler.hits == 6 and elapsed < 6 * _Handler.delay
+        assert home["resumen"].startswith("4 noticias")          # 3 propias + 1 compartida por GUID
+        assert home["estado_vestuario"] == "neutro" and home["puntuacion_moral"] != 0
+
+        # Segunda vez: el servidor responde 304 y no se vuelve a parsear
+        analyst.analyze_match("Sevilla", "Betis")
+        assert _Handler.not_modified == 6
+        assert ingestor.stats["parsed"] == 6 and ingestor.stats["unchanged"] == 6
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Sin red: copia caducada de la caché HTTP o, si no, los últimos titulares del store
+    again = analyst.analyze_team("Sevilla", [])
+    assert again["resumen"] == home["resumen"]
+
+
+def test_store_window_expires_items():
+    class Clock:
+        now = time.time()
+
+    store = FeedStore(window_days=1, clock=lambda: Clock.now)
+    store.add("q", [{"guid": "a", "title": "A", "published": None},
+                    {"guid": "b", "title": "B", "published": (datetime.now() - timedelta(hours=30)).isoformat()}])
+    assert [i["guid"] for i in store.items(["q", "q"])] == ["a"]
+    Clock.now += 2 * 86400
+    assert store.items(["q"]) == []
+
+
+if __name__ == "__main__":
+    test_parse_rss_window_and_guid()
+    test_concurrent_conditional_ingest_and_dedupe()
+    test_store_window_expires_items()
+    print("OK")
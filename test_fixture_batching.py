@@ -0,0 +1,106 @@
+"""
+test_fixture_batching.py - Verifica la carga en bloque de partidos (fixtures?ids=):
+los IDs se piden de 20 en 20 y estadísticas, eventos y alineaciones se sirven
+después desde la caché por partido. Reproduce respuestas grabadas, sin red.
+Ejecutar con: python test_fixture_batching.py
+"""
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.rate_limiter import RateLimiter, set_rate_limiter
+from src.data.replay import Cassette, interaction_key, replay_http
+
+
+def _fixture(fid, home_goals=2, away_goals=1):
+    return {
+        "fixture": {"id": fid, "referee": "Gil Manzano", "status": {"short": "FT"}},
+        "teams": {"home": {"name": f"Local {fid}"}, "away": {"name": f"Visitante {fid}"}},
+        "goals": {"home": home_goals, "away": away_goals},
+        "statistics": [
+            {"team": {"name": f"Local {fid}"}, "statistics": [
+                {"type": "Corner Kicks", "value": 7}, {"type": "Total Shots", "value": 15}]},
+        ],
+        "events": [{"type": "Card", "detail": "Yellow Card", "team": {"name": f"Local {fid}"}}],
+        "lineups": [{"team": {"name": f"Local {fid}"}, "formation": "4-3-3", "startXI": []}],
+    }
+
+
+def _record_ids(cassette, base, ids):
+    payload = {"results": len(ids), "response": [_fixture(f) for f in ids]}
+    url = f"{base}/fixtures?ids={'-'.join(str(f) for f in ids)}"
+    cassette.interactions[interaction_key("GET", url)] = [
+        {"status": 200, "headers": {}, "text": json.dumps(payload)}]
+
+
+def _isolated_limiter():
+    return set_rate_limiter(RateLimiter(os.path.join(tempfile.mkdtemp(), "limits.db")))
+
+
+def test_manager_settles_matchday_in_one_request():
+    from src.data.api_manager import APIFootballClient, APIManager
+    from src.data.web_fetcher import WebResultFetcher
+
+    base = APIFootballClient.MODES["direct"]["base_url"]
+    ids = list(range(1001, 1011))
+    cassette = Cassette(os.path.join(tempfile.mkdtemp(), "matchday.json"))
+    status = {"response": {"requests": {"current": 1, "limit_day": 100}, "account": {"firstname": "CI"}}}
+    cassette.interactions[interaction_key("GET", f"{base}/status")] = [
+        {"status": 200, "headers": {}, "text": json.dumps(status)}]
+    _record_ids(cassette, base, ids)
+
+    previous = _isolated_limiter()
+    try:
+        with replay_http(cassette) as adapter:
+            os.environ["API_FOOTBALL_KEY"] = "0123456789abcdef0123456789abcdef"
+            wf = WebResultFetcher()
+            wf._api_manager = APIManager()
+            outcomes = wf.fetch_real_results({f"M{f}": f for f in ids})
+            again = wf.fetch_real_result_from_fixture(1003, "M1003")
+            events = wf.api.api_football.get_fixture_events(1004)
+    finally:
+        os.environ.pop("API_FOOTBALL_KEY", None)
+        set_rate_limiter(previous)
+
+    print(f"Peticiones reproducidas: {adapter.stats['replayed']} (1 status + 1 ids=)")
+    assert adapter.stats["replayed"] == 2 and adapter.stats["misses"] == 0
+    assert len(outcomes) == 10
+    first = outcomes["M1001"]
+    assert first.home_score == 2 and first.actual_winner == "LOCAL"
+    assert first.home_corners == 7 and first.home_shots == 15 and first.home_cards == 1
+    assert again.home_corners == 7 and events[0]["type"] == "Card"
+
+
+def test_client_chunks_ids_and_fans_out_caches():
+    from src.data.api_football import APIFootballClient
+    from src.data.cache_manager import CacheManager
+
+    client = APIFootballClient(api_key="0123456789abcdef0123456789abcdef", cache_manager=CacheManager(persist=False))
+    ids = list(range(2001, 2026))
+    cassette = Cassette(os.path.join(tempfile.mkdtemp(), "chunks.json"))
+    _record_ids(cassette, client.BASE_URL, ids[:20])
+    _record_ids(cassette, client.BASE_URL, ids[20:])
+
+    previous = _isolated_limiter()
+    try:
+        with replay_http(cassette) as adapter:
+            found = client.get_fixtures_by_ids(ids + ids[:3])
+            assert adapter.stats["replayed"] == 2
+            assert client.get_fixture_detail(2005)["fixture"]["referee"] == "Gil Manzano"
+            assert client.get_fixture_events(2021)[0]["detail"] == "Yellow Card"
+            assert client.get_fixture_statistics(2010)[0]["statistics"][0]["value"] == 7
+            assert client.get_lineups(2024)[0]["formation"] == "4-3-3"
+            assert client.get_referee_from_fixture(2001)["name"] == "Gil Manzano"
+            assert client.get_fixtures_by_ids(ids[:5]).keys() == set(ids[:5])
+    finally:
+        set_rate_limiter(previous)
+    assert len(found) == 25
+    assert adapter.stats["replayed"] == 2, "todo lo demás sale de la caché por partido"
+
+
+if __name__ == "__main__":
+    test_manager_settles_matchday_in_one_request()
+    test_client_chunks_ids_and_fans_out_caches()
+    print("OK")
@@ -0,0 +1,181 @@
+"""
+test_http_cache.py - Verifica la caché HTTP compartida (src/data/cache_manager.py):
+TTL, revalidación ETag (304), deduplicación por contenido y expulsión LRU, y la
+caché de objetos (ObjectCache) de APIManager.
+Usa un servidor HTTP local, no necesita red.
+Ejecutar con: python test_http_cache.py
+"""
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.cache_manager import CacheManager, ObjectCache, TTLConfig, cached_get
+
+REQUESTS_SEEN = []
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        REQUESTS_SEEN.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = f"<html>{self.path.split('?')[0]}</html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_fresh_hit_and_etag_revalidation():
+    server, base = _start_server()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CacheManager(path=os.path.join(tmp, "cache.db"))
+            REQUESTS_SEEN.clear()
+
+            r1 = cached_get(f"{base}/partido", category="scraper_lineups", cache=cache, ttl=60)
+            r2 = cached_get(f"{base}/partido", category="scraper_lineups", cache=cache, ttl=60)
+            assert r1.status_code == 200 and not r1.from_cache
+            assert r2.from_cache and r2.text == r1.text
+            assert len(REQUESTS_SEEN) == 1
+
+            # Caducada: se revalida con If-None-Match y el 304 sirve la copia
+            r3 = cached_get(f"{base}/arbitro", category="scraper_referee", cache=cache, ttl=0)
+            r4 = cached_get(f"{base}/arbitro", category="scraper_referee", cache=cache, ttl=60)
+            assert REQUESTS_SEEN[-1] == ("/arbitro", '"v1"')
+            assert r4.from_cache and r4.text == r3.text
+            assert cache.stats()["revalidated"] == 1
+
+            # Persistencia: una nueva instancia lee la misma caché en disco
+            reopened = CacheManager(path=os.path.join(tmp, "cache.db"))
+            r5 = cached_get(f"{base}/partido", category="scraper_lineups", cache=reopened)
+            assert r5.from_cache
+            print(f"OK: caché HTTP {cache.stats()}")
+    finally:
+        server.shutdown()
+
+
+def test_content_addressing_and_lru():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CacheManager(path=os.path.join(tmp, "cache.db"), max_bytes=3000, max_memory_entries=2)
+        cache.put_entry("rss_feeds", "a", b"x" * 1000)
+        cache.put_entry("rss_feeds", "b", b"x" * 1000)  # mismo contenido -> mismo blob
+        assert cache.stats()["disk_bytes"] == 1000
+
+        cache.put_entry("rss_feeds", "c", b"c" * 1000)
+        time.sleep(0.01)
+        cache.get_entry("rss_feeds", "a")
+        cache.put_entry("rss_feeds", "d", b"d" * 1000)
+        cache.put_entry("rss_feeds", "e", b"e" * 1000)
+
+        stats = cache.stats()
+        assert stats["disk_bytes"] <= 3000
+        assert stats["evictions"] > 0
+        assert cache.get_entry("rss_feeds", "e") is not None
+        print(f"OK: expulsión LRU ({stats['evictions']} entradas), {stats['disk_bytes']} bytes en disco")
+
+
+def test_memory_hits_count_for_lru_and_running_total():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CacheManager(path=os.path.join(tmp, "cache.db"), max_bytes=3000, max_memory_entries=10)
+        for key in "abc":
+            cache.put_entry("rss_feeds", key, key.encode() * 1000)
+            time.sleep(0.01)
+        assert cache.get_entry("rss_feeds", "a") is not None   # acierto en memoria
+        cache.put_entry("rss_feeds", "d", b"d" * 1000)
+
+        assert cache._disk_bytes == cache.stats()["disk_bytes"] <= 3000
+        cache._memory.clear()
+        assert cache.get_entry("rss_feeds", "a") is not None    # la más usada sobrevive
+        assert cache.get_entry("rss_feeds", "b") is None
+        print("OK: los aciertos en memoria cuentan para la LRU")
+
+
+def test_eviction_error_keeps_written_entry():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CacheManager(path=os.path.join(tmp, "cache.db"))
+
+        def broken_eviction():
+            raise sqlite3.OperationalError("database is locked")
+        cache._evict_if_needed = broken_eviction
+        entry = cache.put_entry("rss_feeds", "a", b"<rss/>")
+        assert entry.key and not cache._conn.in_transaction
+        cache._memory.clear()
+        assert cache.get_entry("rss_feeds", "a") is not None
+        print("OK: un fallo al expulsar no rompe la escritura")
+
+
+def test_json_values():
+    cache = CacheManager(persist=False)
+    cache.set("standings", "140_2025", {"response": [1, 2, 3]}, "api_football")
+    assert cache.get("standings", "140_2025") == {"response": [1, 2, 3]}
+    cache.set("live_match", "1", {"x": 1}, ttl=-1)
+    assert cache.get("live_match", "1") is None
+    print("OK: valores JSON con TTL")
+
+
+def test_object_cache_ttl_bounds_and_disk_tier():
+    now = [1000.0]
+    cache = ObjectCache(max_entries=3, max_bytes=10_000, clock=lambda: now[0])
+    cache.set("live_match", "hoy", [{"status": "1H"}])
+    cache.set("standings", "140", [{"position": 1}])
+    now[0] += TTLConfig.LIVE_MATCH + 1
+    assert cache.get("live_match", "hoy") is None
+    assert cache.get("standings", "140") == [{"position": 1}]
+
+    for i in range(5):
+        cache.set("season_stats", str(i), {"i": i})
+    stats = cache.stats()
+    assert len(cache) == 3 and stats["evictions"] >= 2
+    assert cache.get("standings", "140") is None and cache.get("season_stats", "4") == {"i": 4}
+
+    small = ObjectCache(max_entries=100, max_bytes=200)
+    for i in range(10):
+        small.set("season_stats", str(i), {"payload": "x" * 40})
+    assert small.stats()["bytes"] <= 200
+
+    disk = CacheManager(persist=True, path=os.path.join(tempfile.mkdtemp(), "obj.db"))
+    ObjectCache(disk=disk, namespace="api_manager").set("standings", "39", [{"team": "Arsenal"}])
+    fresh = ObjectCache(disk=disk, namespace="api_manager")
+    assert fresh.get("standings", "39") == [{"team": "Arsenal"}]
+    assert fresh.get("standings", "39") == [{"team": "Arsenal"}]
+    assert fresh.stats()["disk_hits"] == 1 and fresh.stats()["hits"] == 2
+    print(f"OK: ObjectCache {stats}")
+
+
+def test_fixtures_ttl_short_for_empty_days():
+    from datetime import datetime, timedelta
+    from src.data.api_manager import APIManager
+
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    assert APIManager._fixtures_ttl(tomorrow, []) == TTLConfig.FIXTURES_TODAY
+    assert APIManager._fixtures_ttl(tomorrow, [{"status": "NS"}]) == TTLConfig.FIXTURES_WEEK
+    assert APIManager._fixtures_ttl(tomorrow, [{"status": "1H"}]) == TTLConfig.LIVE_MATCH
+
+
+if __name__ == "__main__":
+    test_fresh_hit_and_etag_revalidation()
+    test_content_addressing_and_lru()
+    test_memory_hits_count_for_lru_and_running_total()
+    test_eviction_error_keeps_written_entry()
+    test_json_values()
+    test_object_cache_ttl_bounds_and_disk_tier()
+    test_fixtures_ttl_short_for_empty_days()
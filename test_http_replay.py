@@ -0,0 +1,140 @@
+"""
+test_http_replay.py - Verifica la grabación/reproducción HTTP (src/data/replay.py):
+graba contra un servidor local, reproduce sin red, simula latencia, rate limit y
+cuota diaria, y sirve a APIFootballClient sin tocar la API real.
+Ejecutar con: python test_http_replay.py
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+import requests
+
+from src.data.rate_limiter import RateLimiter, set_rate_limiter
+from src.data.replay import (Cassette, CassetteMiss, REPLAY_ENV, REPLAY_MODE_ENV,
+                              install_from_env, interaction_key, replay_http, uninstall)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        _Handler.hits += 1
+        body = json.dumps({"path": self.path.split("?")[0], "results": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_record_then_replay_offline():
+    server = _serve()
+    base = f"http://127.0.0.1:{server.server_port}"
+    path = os.path.join(tempfile.mkdtemp(), "local.json")
+
+    with replay_http(path, mode="record") as adapter:
+        r = requests.get(f"{base}/fixtures", params={"date": "2026-05-12", "api_token": "SECRETO"})
+        assert r.json()["results"] == 1
+    assert adapter.stats["recorded"] == 1 and _Handler.hits == 1
+    server.shutdown()
+    server.server_close()
+
+    raw = open(path, encoding="utf-8").read()
+    assert "SECRETO" not in raw
+
+    with replay_http(path) as adapter:
+        session = requests.Session()
+        r = session.get(f"{base}/fixtures", params={"api_token": "OTRO", "date": "2026-05-12"})
+        assert r.status_code == 200 and r.json()["path"].startswith("/fixtures")
+        try:
+            session.get(f"{base}/no-grabado")
+            assert False, "debería fallar"
+        except CassetteMiss:
+            pass
+    assert adapter.stats["replayed"] == 1 and adapter.stats["misses"] == 1
+    assert _Handler.hits == 1
+
+
+def test_latency_rate_limit_and_quota():
+    path = os.path.join(tempfile.mkdtemp(), "limits.json")
+    cassette = Cassette(path)
+    url = "https://api.football-data.org/v4/competitions/PD/matches"
+    cassette.interactions[interaction_key("GET", url)] = [
+        {"status": 200, "headers": {"Content-Type": "application/json"}, "text": '{"matches": []}'}
+    ]
+    slept = []
+
+    with replay_http(cassette, latency=(0.1, 0.2), rate_limit=(3, 60), sleep=slept.append) as adapter:
+        codes = [requests.get(url).status_code for _ in range(5)]
+    print(f"Rate limit: {codes}, esperas: {slept}")
+    assert codes == [200, 200, 200, 429, 429]
+    assert len(slept) == 3 and all(0.1 <= s <= 0.2 for s in slept)
+    assert adapter.stats["throttled"] == 2
+
+    with replay_http(cassette, daily_quota=2) as adapter:
+        responses = [requests.get(url) for _ in range(3)]
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert "limit" in responses[-1].json()["errors"]["requests"]
+    assert adapter.stats["quota_exhausted"] == 1
+
+
+def test_api_football_client_replay():
+    from src.data.api_manager import APIFootballClient
+
+    key = "0123456789abcdef0123456789abcdef"
+    base = APIFootballClient.MODES["direct"]["base_url"]
+    cassette = Cassette(os.path.join(tempfile.mkdtemp(), "apif.json"))
+    status = {"response": {"requests": {"current": 1, "limit_day": 100}, "account": {"firstname": "CI"}}}
+    fixtures = {"results": 1, "response": [{"fixture": {"id": 99}}]}
+    cassette.interactions[interaction_key("GET", f"{base}/status")] = [
+        {"status": 200, "headers": {}, "text": json.dumps(status)}]
+    cassette.interactions[interaction_key("GET", f"{base}/fixtures?date=2026-05-12&league=140&season=2025")] = [
+        {"status": 200, "headers": {}, "text": json.dumps(fixtures)}]
+
+    # Cuota aislada: no gastar la del limitador compartido en data/cache
+    previous = set_rate_limiter(RateLimiter(os.path.join(tempfile.mkdtemp(), "limits.db")))
+    try:
+        with replay_http(cassette) as adapter:
+            client = APIFootballClient(api_key=key)
+            got = client.get_fixtures(date="2026-05-12", league_id=140, season=2025)
+    finally:
+        set_rate_limiter(previous)
+    assert got == fixtures["response"]
+    assert adapter.stats == {"replayed": 2, "recorded": 0, "misses": 0, "throttled": 0, "quota_exhausted": 0}
+    assert requests.Session.get_adapter.__name__ == "get_adapter"
+
+
+def test_install_from_env_reuses_active_adapter():
+    path = os.path.join(tempfile.mkdtemp(), "rerun.json")
+    os.environ[REPLAY_ENV], os.environ[REPLAY_MODE_ENV] = path, "record"
+    try:
+        first = install_from_env()
+        assert install_from_env() is first                # rerun de Streamlit: mismo adaptador
+        os.environ[REPLAY_MODE_ENV] = "replay"
+        assert install_from_env() is not first            # otro modo: adaptador nuevo
+    finally:
+        uninstall()
+        os.environ.pop(REPLAY_ENV, None)
+        os.environ.pop(REPLAY_MODE_ENV, None)
+
+
+if __name__ == "__main__":
+    test_record_then_replay_offline()
+    test_latency_rate_limit_and_quota()
+    test_api_football_client_replay()
+    test_install_from_env_reuses_active_adapter()
+    print("OK")
@@ -0,0 +1,94 @@
+"""
+test_injury_index.py - Verifica el índice de lesiones por liga (src/logic/injury_index.py):
+una descarga por liga para toda una jornada, clave canónica de equipo, refresco
+en segundo plano al caducar, conservación del parte si el refresco falla e
+instantánea en disco.
+Ejecutar con: python test_injury_index.py
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.logic.injury_index import InjuryIndex
+
+PARTE = {
+    "Atlético de Madrid": [{"player": "Koke", "reason": "Muscular", "status": "Out"}],
+    "Real Betis Balompié": [{"player": "Isco", "reason": "Tobillo", "status": "Doubtful"}],
+}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _index(fetch, clock=None, path=None):
+    return InjuryIndex(fetch=fetch, snapshot_path=path or os.path.join(tempfile.mkdtemp(), "inj.json"),
+                       max_age_s=600, clock=clock or _Clock())
+
+
+def test_one_fetch_per_league_and_canonical_lookup():
+    calls = []
+    index = _index(lambda league: calls.append(league) or PARTE)
+    for _ in range(10):
+        assert index.lookup("Atletico Madrid", "La Liga")[0]["player"] == "Koke"
+    assert index.lookup("Real Betis", "La Liga")[0]["player"] == "Isco"
+    assert index.lookup("Girona FC", "La Liga") == []
+    got = index.for_match("La Liga", "Club Atlético de Madrid", "Betis")
+    assert [r["player"] for r in got["Betis"]] == ["Isco"]
+    print(f"Descargas: {calls}, stats: {index.stats}")
+    assert calls == ["La Liga"]
+
+
+def test_stale_league_refreshes_in_background_and_keeps_data_on_failure():
+    clock = _Clock()
+    responses = [PARTE, {}]
+    calls = []
+
+    def fetch(league):
+        calls.append(league)
+        return responses.pop(0)
+
+    index = _index(fetch, clock)
+    assert index.lookup("Atletico Madrid", "La Liga")
+    clock.now += 601
+    assert index.lookup("Atletico Madrid", "La Liga")     # sirve el parte anterior
+    index.wait()
+    assert len(calls) == 2                                 # el refresco vacío no borra nada
+    assert index.lookup("Atletico Madrid", "La Liga")[0]["player"] == "Koke"
+    assert len(calls) == 2
+
+
+def test_snapshot_survives_restart():
+    path = os.path.join(tempfile.mkdtemp(), "inj.json")
+    _index(lambda league: PARTE, path=path).refresh("La Liga")
+
+    def no_network(league):
+        raise AssertionError("no debería scrapear")
+    restored = _index(no_network, path=path)
+    assert restored.lookup("Atlético de Madrid", "La Liga")[0]["reason"] == "Muscular"
+
+
+def test_external_analyst_uses_index_lookup():
+    from src.logic.external_analyst import ExternalAnalyst
+    from src.models.base import Team
+
+    analyst = ExternalAnalyst()
+    analyst._search_live_news_with_sentiment = lambda team: ([], 0.0)
+    injuries = {"Atlético de Madrid": PARTE["Atlético de Madrid"]}
+    text, impact = analyst._scan_and_quantify(Team(name="Atlético de Madrid", league="La Liga"), injuries)
+    assert "Koke" in text
+    text, _ = analyst._scan_and_quantify(Team(name="Sevilla FC", league="La Liga"), injuries)
+    assert "Koke" not in text
+
+
+if __name__ == "__main__":
+    test_one_fetch_per_league_and_canonical_lookup()
+    test_stale_league_refreshes_in_background_and_keeps_data_on_failure()
+    test_snapshot_survives_restart()
+    test_external_analyst_uses_index_lookup()
+    print("OK")
@@ -0,0 +1,112 @@
+"""
+test_intelligence_cache.py - Verifica la caché stale-while-revalidate de ExternalAnalyst:
+una búsqueda de noticias por equipo y día, versión servida sin esperar tras la TTL,
+refresco en segundo plano y versión de prensa guardada en la predicción.
+Ejecutar con: python test_intelligence_cache.py
+"""
+import sys
+import os
+import threading
+from datetime import datetime
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.logic.external_analyst import ExternalAnalyst
+from src.models.base import Match, Team
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _match(mid="SWR_1"):
+    return Match(id=mid, home_team=Team(name="Sevilla FC", league="La Liga"),
+                 away_team=Team(name="Real Betis", league="La Liga"),
+                 date=datetime(2026, 10, 18, 21, 0), competition="La Liga")
+
+
+def _analyst(searches, gate=None):
+    analyst = ExternalAnalyst()
+    analyst._clock = _Clock()
+    analyst._fetch_real_injuries = lambda match: {}
+
+    def search(team):
+        if gate is not None:
+            gate.wait(5)
+        searches.append(team.name)
+        return [f"🔗 {team.name} noticia {len(searches)}"], -0.02
+    analyst._search_live_news_with_sentiment = search
+    return analyst
+
+
+def test_one_search_per_team_and_day_across_freshness_changes():
+    searches = []
+    analyst = _analyst(searches)
+    first = analyst.get_detailed_intelligence(_match(), freshness="confirmed")
+    again = analyst.get_detailed_intelligence(_match(), freshness="predicted")
+    print(f"Búsquedas: {searches}")
+    assert sorted(searches) == ["Real Betis", "Sevilla FC"]
+    snap = first["impact"]["snapshot"]
+    assert snap["home"]["version"].startswith("2026-10-18:") and snap["home"]["stale"] is False
+    assert again["impact"]["snapshot"]["home"]["version"] == snap["home"]["version"]
+    assert again["impact"]["confidence_factor"] != first["impact"]["confidence_factor"]
+
+
+def test_stale_report_served_immediately_then_revalidated():
+    searches = []
+    gate = threading.Event()
+    gate.set()
+    analyst = _analyst(searches, gate)
+    v1 = analyst.get_detailed_intelligence(_match())["impact"]["snapshot"]["home"]["version"]
+
+    gate.clear()                                   # la búsqueda siguiente "tarda"
+    analyst._clock.now += analyst._cache_ttl + 1
+    stale = analyst.get_detailed_intelligence(_match())["impact"]["snapshot"]["home"]
+    assert stale["version"] == v1 and stale["stale"] is True
+    assert len(searches) == 2                      # nadie esperó a Google News
+    analyst.get_detailed_intelligence(_match())    # no duplica el refresco en curso
+
+    gate.set()
+    analyst.wait_refreshes()
+    assert len(searches) == 4
+    fresh = analyst.get_detailed_intelligence(_match())["impact"]["snapshot"]["home"]
+    assert fresh["version"] != v1 and fresh["stale"] is False
+
+
+def test_forced_refresh_replaces_cached_report():
+    searches = []
+    analyst = _analyst(searches)
+    v1 = analyst.get_detailed_intelligence(_match())["impact"]["snapshot"]["home"]["version"]
+    forced = analyst.get_detailed_intelligence(_match(), refresh=True)["impact"]["snapshot"]["home"]
+    assert len(searches) == 4 and forced["version"] != v1 and forced["stale"] is False
+    # Las llamadas siguientes (la predicción que se guarda) ven la versión nueva sin buscar
+    again = analyst.get_detailed_intelligence(_match())["impact"]["snapshot"]["home"]
+    assert again["version"] == forced["version"] and len(searches) == 4
+
+
+def test_prediction_records_press_snapshot():
+    from src.logic.bpa_engine import BPAEngine
+    from src.logic.predictors import Predictor
+    from src.models.base import PredictionResult
+
+    predictor = Predictor(BPAEngine())
+    searches = []
+    predictor.external_analyst = _analyst(searches)
+    pred = predictor.predict_match(_match("SWR_2"))
+    assert pred.press_snapshot["home"]["version"].startswith("2026-10-18:")
+    batch = predictor.predict_matches([_match("SWR_3")])
+    assert batch[0].press_snapshot == pred.press_snapshot
+    restored = PredictionResult.model_validate_json(pred.model_dump_json())
+    assert restored.press_snapshot == pred.press_snapshot
+    assert len(searches) == 2
+
+
+if __name__ == "__main__":
+    test_one_search_per_team_and_day_across_freshness_changes()
+    test_stale_report_served_immediately_then_revalidated()
+    test_forced_refresh_replaces_cached_report()
+    test_prediction_records_press_snapshot()
+    print("OK")
@@ -0,0 +1,100 @@
+"""
+test_js_scraper.py - Verifica el pool de navegadores de src/data/scrapers/js_scraper.py:
+cola acotada, afinidad de hilo de los trabajos, cancelación de trabajos en cola,
+reglas de bloqueo de recursos y degradación sin Playwright instalado.
+Ejecutar con: python test_js_scraper.py
+"""
+import sys
+import os
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.scrapers import js_scraper
+from src.data.scrapers.js_scraper import BrowserPool, RenderQueueFull, should_block
+
+
+def test_resource_blocking_rules():
+    assert should_block("https://www.futbolfantasy.com/logo.png", "image")
+    assert should_block("https://www.futbolfantasy.com/app.css", "stylesheet")
+    assert should_block("https://www.googletagmanager.com/gtm.js", "script")
+    assert should_block("https://securepubads.g.doubleclick.net/tag.js", "script")
+    assert not should_block("https://www.futbolfantasy.com/laliga/posibles-alineaciones", "document")
+    assert not should_block("https://www.futbolfantasy.com/js/app.js", "script")
+    assert not should_block("https://www.futbolfantasy.com/logo.png", "image", block_images=False)
+
+
+def test_queue_is_bounded_and_jobs_stay_on_worker_threads():
+    pool = BrowserPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    started = threading.Event()
+    seen_threads = []
+
+    def slow(slot):
+        started.set()
+        release.wait(5)
+        seen_threads.append(threading.get_ident())
+        return "a"
+
+    def quick(slot):
+        seen_threads.append(threading.get_ident())
+        return "b"
+
+    first = pool.submit(slow)
+    assert started.wait(5)
+    second = pool.submit(quick)          # ocupa el único hueco de la cola
+    try:
+        pool.submit(quick)
+        assert False, "la cola debería estar llena"
+    except RenderQueueFull:
+        pass
+    release.set()
+    assert first.result(5) == "a" and second.result(5) == "b"
+    print(f"Hilos: {set(seen_threads)}, stats: {pool.stats}")
+    assert len(set(seen_threads)) == 1 and threading.get_ident() not in seen_threads
+    assert pool.stats["rejected"] == 1
+    pool.shutdown()
+
+
+def test_cancelled_jobs_are_skipped_and_errors_propagate():
+    pool = BrowserPool(max_workers=1, max_queue=2)
+    release = threading.Event()
+    started = threading.Event()
+    ran = []
+
+    blocker = pool.submit(lambda slot: started.set() or release.wait(5))
+    assert started.wait(5)
+    queued = pool.submit(lambda slot: ran.append("no"))
+    assert queued.cancel()
+    failing = pool.submit(lambda slot: 1 / 0)
+    release.set()
+    assert blocker.result(5) is True
+    try:
+        failing.result(5)
+        assert False, "debería propagar la excepción"
+    except ZeroDivisionError:
+        pass
+    pool.shutdown()
+    assert ran == [] and pool.stats["errors"] == 1
+    try:
+        pool.submit(lambda slot: None)
+        assert False, "el pool cerrado no acepta trabajos"
+    except RuntimeError:
+        pass
+
+
+def test_graceful_without_playwright():
+    if js_scraper.PLAYWRIGHT_AVAILABLE:
+        print("Playwright instalado: se omite la comprobación de degradación")
+        return
+    assert js_scraper.is_available() is False
+    assert js_scraper.get_html_with_js("https://example.com") is None
+    assert js_scraper.get_html_with_selector("https://example.com", "body") is None
+    assert js_scraper._pool is None      # no se arranca ningún hilo de navegador
+
+
+if __name__ == "__main__":
+    test_resource_blocking_rules()
+    test_queue_is_bounded_and_jobs_stay_on_worker_threads()
+    test_cancelled_jobs_are_skipped_and_errors_propagate()
+    test_graceful_without_playwright()
+    print("OK")
@@ -0,0 +1,61 @@
+"""
+test_keyword_scanner.py - Verifica el autómata de palabras clave (src/logic/keyword_scanner.py):
+plegado de acentos y mayúsculas, aciertos solapados con categoría y peso, palabras completas,
+patrones de bajas combinados en RSSAnalyst y proximidad jugador/palabra en BlindajeIA.
+Ejecutar con: python test_keyword_scanner.py
+"""
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.roster_index import fold
+from src.logic.keyword_scanner import KeywordScanner
+from src.logic.blindaje_ia import BlindajeIA
+from src.logic.rss_analyst import BAJA_REGEX, RSSAnalyst, SENTIMENT_SCANNER
+from src.models.base import Player, PlayerPosition
+
+
+def test_folded_overlapping_hits():
+    scanner = KeywordScanner({"negative": {"lesión": -0.05, "lesionado": -0.05, "racha": -0.02},
+                              "positive": {"racha positiva": 0.04}})
+    hits = scanner.scan("Racha Positiva; LESIONADO sin lesion")
+    assert [(h.keyword, h.category, h.start) for h in hits] == [
+        ("racha positiva", "positive", 0), ("racha", "negative", 0),
+        ("lesionado", "negative", 16), ("lesión", "negative", 16), ("lesión", "negative", 30)]
+    assert round(scanner.score("racha positiva y lesión, otra lesión"), 3) == -0.03
+    assert fold("Ménagé ÁLTA") == "menage alta"
+
+
+def test_whole_words_option():
+    assert [h.keyword for h in KeywordScanner({"en": ["out", "fit"]}).scan("without")] == ["out"]
+    assert KeywordScanner({"en": ["out", "fit"]}, whole_words=True).scan("without benefit") == []
+    assert [h.keyword for h in KeywordScanner({"en": ["out"]}, whole_words=True).scan("ruled out.")] == ["out"]
+
+
+def test_rss_sentiment_and_players():
+    found = SENTIMENT_SCANNER.found("crisis y tension en el vestuario, vuelve el lider")
+    assert {"crisis", "tensión", "vestuario", "vuelve", "líder"} <= set(found)
+    text = "pedro gonzalez se pierde el derbi. baja confirmada de luis perez. juan lopez descartado"
+    assert RSSAnalyst._extract_players(None, text, BAJA_REGEX) == ["Pedro Gonzalez", "Juan Lopez"]
+
+
+def test_blindaje_proximity():
+    blindaje = BlindajeIA()
+    player = Player(id="1", name="Iñaki Williams", team_name="Athletic", position=PlayerPosition.FORWARD)
+
+    def status(text):
+        return blindaje._get_player_status_from_context(player, SimpleNamespace(external_analysis_summary=text))
+
+    assert status("Inaki Williams, LESIONADO esta semana") == "HIGH_RISK"
+    assert status("Iñaki Williams marca. Otro jugador con una lesión muscular") == "NEUTRAL"
+    assert status("Iñaki Williams entrena con el grupo y será titular") == "SAFE"
+    assert status("Sin noticias del equipo") == "NEUTRAL"
+
+
+if __name__ == "__main__":
+    test_folded_overlapping_hits()
+    test_whole_words_option()
+    test_rss_sentiment_and_players()
+    test_blindaje_proximity()
+    print("OK")
@@ -0,0 +1,108 @@
+"""
+test_latency_metrics.py - Verifica los histogramas de latencia (src/services/metrics.py)
+y la instrumentación por etapa de Predictor.predict_match y por fuente de ExternalAnalyst.
+No necesita red: las fuentes externas se sustituyen por funciones locales.
+Ejecutar con: python test_latency_metrics.py
+"""
+import sys
+import os
+import json
+import time
+from datetime import datetime
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.services.metrics import METRICS, MetricsRegistry
+from src.logic.predictors import Predictor, BATCH_STAGE_METRIC, STAGE_METRIC, TOTAL_METRIC
+from src.logic.external_analyst import SOURCE_METRIC
+from src.logic.bpa_engine import BPAEngine
+from src.models.base import Match, Team, Player, PlayerPosition, PlayerStatus, NodeRole
+
+
+def create_team(name, league, xg, rating):
+    roles = [NodeRole.KEEPER] + [NodeRole.DEFENSIVE] * 4 + [NodeRole.CREATOR] * 3 + [NodeRole.FINALIZER] * 3
+    players = [
+        Player(id=f"{name}_{i}", name=f"Player {i}", team_name=name, position=PlayerPosition.MIDFIELDER,
+               node_role=role, status=PlayerStatus.TITULAR, rating_last_5=rating, ppda=10.0 + i % 3)
+        for i, role in enumerate(roles)
+    ]
+    return Team(name=name, league=league, players=players, avg_xg_season=xg, avg_xg_conceded_season=1.2)
+
+
+def test_histogram_percentiles_and_exports():
+    reg = MetricsRegistry()
+    for ms in range(1, 101):
+        reg.observe("demo_seconds", ms / 1000.0, stage="x")
+    (series,) = reg.snapshot()["demo_seconds"]
+    print(f"Resumen: {series}")
+    assert series["count"] == 100
+    assert series["p50"] == 0.05 and series["p95"] == 0.095 and series["p99"] == 0.099
+    assert series["labels"] == {"stage": "x"}
+
+    prom = reg.to_prometheus()
+    assert '# TYPE lagema_demo_seconds summary' in prom
+    assert 'lagema_demo_seconds{stage="x",quantile="0.95"} 0.095' in prom
+    assert 'lagema_demo_seconds_count{stage="x"} 100' in prom
+    assert json.loads(reg.to_json())["demo_seconds"][0]["max"] == 0.1
+
+
+def test_span_records_trace():
+    reg = MetricsRegistry()
+    trace = {}
+    with reg.span("demo_seconds", trace, stage="slow"):
+        time.sleep(0.01)
+    assert trace["slow"] >= 0.01
+    assert reg.snapshot()["demo_seconds"][0]["count"] == 1
+
+
+def test_predict_match_stage_and_source_spans():
+    METRICS.reset()
+    predictor = Predictor(BPAEngine())
+    analyst = predictor.external_analyst
+    analyst._fetch_real_injuries = lambda match: {}
+    analyst._search_live_news_with_sentiment = lambda team: ([], 0.0)
+
+    home = create_team("Home FC", "La Liga", xg=1.6, rating=7.2)
+    away = create_team("Away FC", "La Liga", xg=1.1, rating=6.8)
+    match = Match(id="LAT_1", home_team=home, away_team=away, date=datetime.now(),
+                  competition="La Liga", market_odds={"1": 2.0, "X": 3.3, "2": 3.8})
+    predictor.predict_match(match)
+
+    trace = predictor.last_trace
+    print(f"Traza: {trace}")
+    for stage in ("weights", "intelligence", "bpa", "poisson", "ml", "blend",
+                  "stat_markets", "confidence", "value", "total"):
+        assert stage in trace, stage
+
+    snap = METRICS.snapshot()
+    stages = {s["labels"]["stage"] for s in snap[STAGE_METRIC]}
+    assert {"bpa", "poisson", "ml", "value"} <= stages
+    assert snap[TOTAL_METRIC][0]["labels"] == {"mode": "single"}
+    sources = {s["labels"]["source"]: s["count"] for s in snap[SOURCE_METRIC]}
+    assert sources == {"injuries": 1, "news_search": 2}
+
+
+def test_batch_stages_stay_out_of_single_histogram():
+    METRICS.reset()
+    predictor = Predictor(BPAEngine())
+    analyst = predictor.external_analyst
+    analyst._fetch_real_injuries = lambda match: {}
+    analyst._search_live_news_with_sentiment = lambda team: ([], 0.0)
+
+    matches = [Match(id=f"LAT_B{i}", home_team=create_team(f"Home {i}", "La Liga", 1.5, 7.0),
+                     away_team=create_team(f"Away {i}", "La Liga", 1.2, 6.9), date=datetime.now(),
+                     competition="La Liga", market_odds={"1": 2.1, "X": 3.2, "2": 3.6})
+               for i in range(3)]
+    predictor.predict_matches(matches)
+
+    snap = METRICS.snapshot()
+    assert STAGE_METRIC not in snap
+    batch = {s["labels"]["stage"]: s["count"] for s in snap[BATCH_STAGE_METRIC]}
+    assert batch["stat_markets"] == 3 and batch["confidence"] == 3 and batch["bpa"] == 1
+
+
+if __name__ == "__main__":
+    test_histogram_percentiles_and_exports()
+    test_span_records_trace()
+    test_predict_match_stage_and_source_spans()
+    test_batch_stages_stay_out_of_single_histogram()
+    print("OK")
@@ -0,0 +1,87 @@
+"""
+test_market_stats.py - Verifica las estadísticas materializadas de aciertos
+(estadisticas_mercado): global, por competición, por equipo y ventana móvil,
+incluida la migración que las construye desde un histórico existente.
+Usa una BD temporal, no necesita red.
+Ejecutar con: python test_market_stats.py
+"""
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+os.environ.pop("SUPABASE_URL", None)
+os.environ.pop("SUPABASE_KEY", None)
+
+from src.data.db_manager import DataManager, STATS_WINDOW
+
+
+def _rec(mercado, acierto, home="Sevilla", away="Betis", comp="La Liga", err=0.5):
+    return {"match_id": f"{home}-{away}", "mercado": mercado, "predicho": "x", "real": "y",
+            "error_magnitud": err, "acierto": acierto, "ajuste_aplicado": 0.0,
+            "home_team": home, "away_team": away, "competition": comp}
+
+
+def _full_recompute(db):
+    """Referencia: recalcular desde la tabla completa como hacía la versión anterior."""
+    with db._conn() as conn:
+        rows = conn.execute("SELECT mercado, COUNT(*), SUM(acierto) FROM aprendizaje GROUP BY mercado").fetchall()
+    return {m: (t, a) for m, t, a in rows}
+
+
+def test_incremental_matches_full_recompute():
+    db = DataManager(db_path=os.path.join(tempfile.mkdtemp(), "stats.db"))
+    for i in range(30):
+        db.save_aprendizaje([
+            _rec("1X2", i % 3 == 0),
+            _rec("Córners", i % 2 == 0, comp="Premier League" if i % 5 == 0 else "La Liga"),
+        ])
+    stats = db.get_aprendizaje_stats()
+    reference = _full_recompute(db)
+    print(f"Materializado: {stats['1X2']} | referencia: {reference['1X2']}")
+    for m, (total, hits) in reference.items():
+        assert stats[m]["total"] == total and stats[m]["aciertos"] == hits
+    assert stats["1X2"]["error_medio"] == 0.5
+    assert stats["1X2"]["ventana_total"] == STATS_WINDOW
+
+    premier = db.get_market_stats("competicion", "Premier League")
+    assert premier["Córners"]["total"] == 6 and "1X2" not in premier
+    betis = db.get_market_stats("equipo", "Betis")
+    assert betis["1X2"]["total"] == 30
+
+
+def test_rolling_window():
+    db = DataManager(db_path=os.path.join(tempfile.mkdtemp(), "window.db"))
+    db.save_aprendizaje([_rec("1X2", False) for _ in range(STATS_WINDOW)])
+    db.save_aprendizaje([_rec("1X2", True) for _ in range(STATS_WINDOW // 2)])
+    s = db.get_market_stats()["1X2"]
+    print(f"Global {s['precision']}% | ventana {s['precision_ventana']}%")
+    assert s["precision_ventana"] == 50.0
+    assert s["precision"] == round(10 / 30 * 100, 1)
+
+
+def test_migration_builds_stats_from_history():
+    path = os.path.join(tempfile.mkdtemp(), "legacy.db")
+    DataManager(db_path=path)   # crea el esquema actual
+    conn = sqlite3.connect(path)
+    conn.executemany('''INSERT INTO aprendizaje (match_id, mercado, acierto, error_magnitud,
+        home_team, away_team, competition) VALUES ('m', ?, ?, 1.0, 'A', 'B', 'Serie A')''',
+        [("Tarjetas", 1), ("Tarjetas", 0), ("Remates", 1)])
+    conn.execute("DELETE FROM estadisticas_mercado")
+    conn.execute("PRAGMA user_version = 2")
+    conn.commit()
+    conn.close()
+
+    db = DataManager(db_path=path)
+    stats = db.get_market_stats("competicion", "Serie A")
+    print(f"Tras migración: {stats}")
+    assert stats["Tarjetas"]["total"] == 2 and stats["Tarjetas"]["aciertos"] == 1
+    assert db.get_market_hit_rates()["Remates"] == {"hits": 1, "total": 1, "precision": 100}
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_recompute()
+    test_rolling_window()
+    test_migration_builds_stats_from_history()
+    print("OK")
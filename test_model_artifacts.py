@@ -0,0 +1,73 @@
+"""
+test_model_artifacts.py - Verifica la persistencia de MLEngine (src/logic/ml_engine.py):
+artefacto versionado, carga perezosa en la primera predicción y rechazo de
+artefactos con un esquema de características distinto.
+Usa un directorio temporal, no necesita red.
+Ejecutar con: python test_model_artifacts.py
+"""
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+import numpy as np
+from src.data.training_manager import TrainingManager
+from src.logic.ml_engine import MLEngine, MODEL_POINTER
+
+
+def _trained_engine(model_dir):
+    ml = MLEngine(model_dir=model_dir, autoload=False)
+    data = TrainingManager._generate_synthetic_historical_data(None, n_matches=200)
+    ml.train(data)
+    ml.team_state = {"Sevilla": {"xg_roll": 1.7, "def_eff": 0.2, "form": 2.0}}
+    return ml, data
+
+
+def test_save_and_lazy_load():
+    model_dir = tempfile.mkdtemp()
+    ml, data = _trained_engine(model_dir)
+    path = ml.save(metadata={"samples": len(data)})
+    with open(os.path.join(model_dir, MODEL_POINTER)) as f:
+        info = json.load(f)
+    print(f"Artefacto: {info['artifact']} | checksum {info['schema_checksum']}")
+    assert os.path.basename(path) == info["artifact"]
+    assert info["schema_checksum"] == MLEngine.schema_checksum()
+
+    fresh = MLEngine(model_dir=model_dir)
+    assert fresh._trained is False and fresh._load_attempted is False   # nada cargado aún
+    features = data[MLEngine.FEATURE_COLUMNS].iloc[:5]
+    probs = fresh.predict_probabilities_batch(features, ["La Liga (España)"] * 5)
+    expected = ml.predict_probabilities_batch(features, ["La Liga (España)"] * 5)
+    assert fresh.is_trained and fresh.team_state["Sevilla"]["form"] == 2.0
+    np.testing.assert_allclose(probs, expected)
+    assert not np.allclose(probs, MLEngine.DEFAULT_PROBS)
+
+
+def test_schema_mismatch_is_rejected():
+    model_dir = tempfile.mkdtemp()
+    ml, _ = _trained_engine(model_dir)
+    ml.save()
+    pointer = os.path.join(model_dir, MODEL_POINTER)
+    original = MLEngine.FEATURE_COLUMNS
+    try:
+        MLEngine.FEATURE_COLUMNS = original + ["nueva_feature"]
+        other = MLEngine(model_dir=model_dir)
+        assert other.is_trained is False
+        assert other.predict_probabilities(None)["EMPATE"] == MLEngine.DEFAULT_PROBS[1]
+    finally:
+        MLEngine.FEATURE_COLUMNS = original
+    assert os.path.exists(pointer)
+
+
+def test_missing_artifact_keeps_defaults():
+    empty = MLEngine(model_dir=tempfile.mkdtemp())
+    assert empty.is_trained is False
+    assert empty.predict_probabilities(None) == {"LOCAL": 0.35, "EMPATE": 0.30, "VISITANTE": 0.35}
+
+
+if __name__ == "__main__":
+    test_save_and_lazy_load()
+    test_schema_mismatch_is_rejected()
+    test_missing_artifact_keeps_defaults()
+    print("OK")
@@ -0,0 +1,72 @@
+"""
+test_poisson_matrix.py - Verifica que la matriz Poisson vectorizada (ndarray)
+reproduce el cálculo celda a celda y que los mercados se leen de la matriz.
+Ejecutar con: python test_poisson_matrix.py
+"""
+import sys
+import os
+import math
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+import numpy as np
+from src.logic.poisson_engine import PoissonEngine
+from src.models.base import PredictionResult
+
+
+def _legacy_cell(lam, k):
+    return (math.exp(-lam) * (lam ** k)) / math.factorial(k)
+
+
+def test_matrix_matches_cell_by_cell():
+    engine = PoissonEngine()
+    for h_lambda, a_lambda in [(1.6, 1.1), (0.4, 3.2), (2.8, 0.3)]:
+        matrix = engine.score_matrix(h_lambda, a_lambda)
+        assert matrix.shape == (9, 9)
+        for h in range(9):
+            for a in range(9):
+                expected = _legacy_cell(h_lambda, h) * _legacy_cell(a_lambda, a)
+                if expected < 1e-8:
+                    continue
+                assert abs(matrix[h, a] - expected) < 1e-9, (h, a)
+        print(f"OK: λ=({h_lambda}, {a_lambda}) matriz idéntica a la versión celda a celda")
+
+
+def test_markets_from_matrix():
+    engine = PoissonEngine()
+    h_lambda, a_lambda = 1.7, 0.9
+    markets = engine.market_probabilities(engine.score_matrix(h_lambda, a_lambda))
+
+    assert abs(markets["home"] + markets["draw"] + markets["away"] - 1.0) < 1e-3
+    assert markets["home"] > markets["away"]
+    expected_btts = (1 - math.exp(-h_lambda)) * (1 - math.exp(-a_lambda))
+    assert abs(markets["btts"] - expected_btts) < 1e-3
+    over, under = markets["over_under"][2.5]
+    assert abs(over + under - 1.0) < 1e-3
+    assert markets["score"] == "1-0"
+    print(f"OK: mercados {markets['home']}/{markets['draw']}/{markets['away']}, BTTS {markets['btts']}")
+
+
+def test_matrix_serialized_as_dict():
+    engine = PoissonEngine()
+    matrix = engine.score_matrix(1.4, 1.2)
+    pred = PredictionResult(
+        match_id="M1", bpa_home=0.5, bpa_away=0.5,
+        win_prob_home=0.4, draw_prob=0.3, win_prob_away=0.3,
+        poisson_matrix=matrix, total_goals_expected=2.6,
+        both_teams_to_score_prob=0.5,
+    )
+    assert isinstance(pred.poisson_matrix, np.ndarray)
+    dumped = pred.model_dump()["poisson_matrix"]
+    assert isinstance(dumped, dict) and "1-1" in dumped
+    assert pred.top_scores(1)[0][0] == "1-1"
+
+    # Estudios antiguos en BD guardan el dict directamente
+    reloaded = PredictionResult.model_validate_json(pred.model_dump_json())
+    assert reloaded.top_scores(3) == sorted(dumped.items(), key=lambda x: x[1], reverse=True)[:3]
+    print("OK: ndarray en memoria, dict al serializar")
+
+
+if __name__ == "__main__":
+    test_matrix_matches_cell_by_cell()
+    test_markets_from_matrix()
+    test_matrix_serialized_as_dict()
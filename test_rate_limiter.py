@@ -0,0 +1,160 @@
+"""
+test_rate_limiter.py - Verifica el limitador compartido (src/data/rate_limiter.py):
+token bucket, cuota diaria por prioridad, bloqueo tras 429 sin dormir, estado
+compartido entre instancias (procesos) y rechazo en los clientes.
+No necesita red.
+Ejecutar con: python test_rate_limiter.py
+"""
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.rate_limiter import (
+    Priority, ProviderLimits, RateLimiter, RateLimitExceeded,
+    current_priority, request_priority, set_rate_limiter
+)
+
+
+class _Clock:
+    def __init__(self, t=1_780_000_000.0):
+        self.t = t
+        self.slept = []
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, secs):
+        self.slept.append(secs)
+        self.t += secs
+
+
+def _limiter(limits, clock, path=None):
+    path = path or os.path.join(tempfile.mkdtemp(), "limits.db")
+    return RateLimiter(path, limits=limits, clock=clock, sleep=clock.sleep)
+
+
+def test_bucket_burst_and_refill():
+    clock = _Clock()
+    rl = _limiter({"p": ProviderLimits(per_minute=60, burst=3, daily_quota=None)}, clock)
+    for _ in range(3):
+        rl.acquire("p", Priority.BACKGROUND)
+    try:
+        rl.acquire("p", Priority.BACKGROUND)
+        assert False, "BACKGROUND no debe esperar"
+    except RateLimitExceeded as e:
+        assert e.reason == "rate" and 0 < e.retry_after <= 1.0
+    assert clock.slept == []
+
+    # CRITICAL espera hasta 2s por el siguiente token (1 token/s)
+    rl.acquire("p", Priority.CRITICAL)
+    assert len(clock.slept) == 1 and abs(clock.slept[0] - 1.0) < 1e-6
+    clock.t += 10
+    assert rl.status("p")["tokens"] == 3
+
+
+def test_quota_shares_by_priority():
+    clock = _Clock()
+    rl = _limiter({"p": ProviderLimits(per_minute=6000, burst=100, daily_quota=10)}, clock)
+    for _ in range(6):
+        assert rl.try_acquire("p", Priority.BACKGROUND)
+    assert not rl.try_acquire("p", Priority.BACKGROUND)
+    with request_priority(Priority.NORMAL):
+        assert rl.try_acquire("p") and rl.try_acquire("p") and rl.try_acquire("p")
+        assert not rl.try_acquire("p")
+    assert rl.try_acquire("p", Priority.CRITICAL)
+    try:
+        rl.acquire("p", Priority.CRITICAL)
+        assert False
+    except RateLimitExceeded as e:
+        assert e.reason == "quota" and e.retry_after > 0
+    assert rl.status("p")["used_today"] == 10
+    assert clock.slept == []
+
+    rl.sync_remaining("p", 0)
+    clock.t += 86400
+    assert rl.try_acquire("p", Priority.BACKGROUND), "la cuota se renueva cada día"
+
+
+def test_penalize_and_shared_state():
+    clock = _Clock()
+    limits = {"p": ProviderLimits(per_minute=60, burst=2, daily_quota=100)}
+    path = os.path.join(tempfile.mkdtemp(), "limits.db")
+    a, b = _limiter(limits, clock, path), _limiter(limits, clock, path)
+
+    a.acquire("p")
+    b.acquire("p")
+    assert not a.try_acquire("p"), "el cubo se comparte entre instancias"
+    assert a.status("p")["used_today"] == 2
+
+    clock.t += 5
+    b.penalize("p", retry_after=30)
+    try:
+        a.acquire("p", Priority.CRITICAL)
+        assert False
+    except RateLimitExceeded as e:
+        assert e.reason == "blocked" and 29 <= e.retry_after <= 30
+    assert clock.slept == []
+    clock.t += 31
+    assert a.try_acquire("p")
+
+
+def test_client_rejects_instead_of_sleeping():
+    from src.data.api_manager import FootballDataClient
+    from src.data.replay import Cassette, interaction_key, replay_http
+
+    tmp = tempfile.mkdtemp()
+    previous = set_rate_limiter(RateLimiter(os.path.join(tmp, "limits.db")))
+    try:
+        client = FootballDataClient(api_key="k")
+        url = f"{client.BASE_URL}/competitions/PD/matches"
+        cassette = Cassette(os.path.join(tmp, "fd.json"))
+        cassette.interactions[interaction_key("GET", url)] = [
+            {"status": 429, "headers": {"Retry-After": "45"}, "text": json.dumps({"message": "slow down"})}]
+        with replay_http(cassette) as adapter:
+            assert client._get("competitions/PD/matches") is None
+            assert client._get("competitions/PD/matches") is None
+        status = client.rate_limiter.status(client.PROVIDER)
+        print(f"Estado tras 429: {status}")
+        assert adapter.stats["replayed"] == 1, "la segunda petición no sale mientras dura el bloqueo"
+        assert 40 <= status["blocked_for"] <= 45
+    finally:
+        set_rate_limiter(previous)
+
+
+def test_lineups_and_referee_use_caller_priority():
+    from datetime import datetime, timedelta
+    from src.data.api_football import APIFootballClient
+    from src.data.multi_source_fetcher import _kickoff_priority
+
+    client = APIFootballClient(api_key="k")
+    seen = []
+
+    def request(*args, **kwargs):
+        seen.append(current_priority())
+        return {"response": []}
+
+    def fixture_detail(fixture_id):
+        request()
+        return {"fixture": {"referee": None}}
+    client._request = request
+    client.get_fixture_detail = fixture_detail
+
+    client.get_lineups(1)
+    client.get_referee_from_fixture(1)
+    with request_priority(_kickoff_priority(datetime.now() + timedelta(days=3))):
+        client.get_lineups(1)
+    with request_priority(_kickoff_priority(datetime.now() + timedelta(hours=1))):
+        client.get_lineups(1)
+        client.get_referee_from_fixture(1)
+    assert seen == [Priority.NORMAL] * 3 + [Priority.CRITICAL] * 2
+
+
+if __name__ == "__main__":
+    test_bucket_burst_and_refill()
+    test_quota_shares_by_priority()
+    test_penalize_and_shared_state()
+    test_client_rejects_instead_of_sleeping()
+    test_lineups_and_referee_use_caller_priority()
+    print("OK")
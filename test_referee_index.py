@@ -0,0 +1,80 @@
+"""
+test_referee_index.py - Verifica el índice de árbitros (src/data/referee_database.py):
+nombre completo sin acentos, apellidos únicos, alias, candidatos ambiguos sin resolver y
+árbitros/alias aprendidos de API-Football guardados en disco.
+Ejecutar con: python test_referee_index.py
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.referee_database import (REFEREE_DB, RefereeIndex, enrich_referee,
+                                       find_referees, get_referee_data)
+
+
+def test_ranked_lookup():
+    assert find_referees("Jesus Gil Manzano") == [("Jesús Gil Manzano", 1.0)]
+    assert find_referees("J. Gil Manzano, Spain")[0] == ("Jesús Gil Manzano", 0.95)
+    assert get_referee_data("Árbitro Oliver")["name"] == "Michael Oliver"
+    assert get_referee_data("Sánchez Martínez") is REFEREE_DB["Sánchez Martínez"]
+    assert get_referee_data("Slavko Vincic")["match_confidence"] == 1.0
+
+
+def test_wrong_or_ambiguous_names_are_not_resolved():
+    # Antes: "martínez" contenido en la consulta → Sánchez Martínez
+    ranked = find_referees("Martínez Munuera")
+    print(f"Martínez Munuera → {ranked}")
+    assert get_referee_data("Martínez Munuera") == {}
+    assert get_referee_data("Marco") == {}                  # Marco Guida / Marco Fritz
+    assert get_referee_data("John Smith") == {}             # solo coincide el nombre de pila
+    assert get_referee_data("Por Confirmar") == {} and find_referees("") == []
+
+
+def test_learned_referees_and_aliases_persist():
+    path = os.path.join(tempfile.mkdtemp(), "referees_learned.json")
+    index = RefereeIndex(REFEREE_DB, learned_path=path)
+    assert index.lookup("Alejandro Quintero González") is None
+    profile = {"matches_count": 12, "strictness": "HIGH", "avg_cards": 5.4}
+    assert index.learn("Alejandro Quintero González, Spain", profile, "La Liga") == "Alejandro Quintero González"
+    assert index.learn("M. Oliver") == "Michael Oliver"                # alias de un árbitro conocido
+    assert index.learn("Desconocido Sin Perfil") is None
+
+    reloaded = RefereeIndex(REFEREE_DB, learned_path=path)
+    assert reloaded.lookup("Quintero González") == ("Alejandro Quintero González", 0.95)
+    assert reloaded.data("Alejandro Quintero González")["avg_cards"] == 5.4
+    assert reloaded.find("M. Oliver")[0] == ("Michael Oliver", 0.95)
+    assert len(reloaded) == len(REFEREE_DB) + 1
+
+
+def test_repeated_learn_does_not_rebuild():
+    path = os.path.join(tempfile.mkdtemp(), "referees_learned.json")
+    index = RefereeIndex(REFEREE_DB, learned_path=path)
+    profile = {"matches_count": 12, "strictness": "HIGH", "avg_cards": 5.4}
+    index.learn("Alejandro Quintero González", profile, "La Liga")
+    index.learn("M. Oliver")
+    calls = []
+    index._build = lambda: calls.append("build")
+    index._save_learned = lambda: calls.append("save")
+    for _ in range(5):
+        assert index.learn("Alejandro Quintero González", profile, "La Liga") == "Alejandro Quintero González"
+        assert index.learn("M. Oliver") == "Michael Oliver"
+        assert index.learn("Gil Manzano") == "Jesús Gil Manzano"     # alias automático
+        assert index.learn("Michael Oliver") == "Michael Oliver"
+    assert calls == []
+    index.learn("Alejandro Quintero González", {**profile, "matches_count": 13}, "La Liga")
+    assert calls == ["build", "save"]
+
+
+def test_enrich_referee_uses_index():
+    ref = enrich_referee({"name": "D. Makkelie, Netherlands"})
+    assert ref["avg_cards"] == REFEREE_DB["Danny Makkelie"]["avg_cards"] and ref["_is_fallback"] is False
+
+
+if __name__ == "__main__":
+    test_ranked_lookup()
+    test_wrong_or_ambiguous_names_are_not_resolved()
+    test_learned_referees_and_aliases_persist()
+    test_repeated_learn_does_not_rebuild()
+    test_enrich_referee_uses_index()
+    print("OK")
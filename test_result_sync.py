@@ -0,0 +1,128 @@
+"""
+test_result_sync.py - Verifica la sincronización incremental de resultados
+(src/logic/result_sync.py): marca de agua por liga, emparejado con estudios
+pendientes y liquidación en una transacción. Usa una BD temporal y un APIManager
+de prueba que cuenta las peticiones, no necesita red.
+Ejecutar con: python test_result_sync.py
+"""
+import sys
+import os
+import tempfile
+from datetime import datetime
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+os.environ.pop("SUPABASE_URL", None)
+os.environ.pop("SUPABASE_KEY", None)
+
+from src.data.db_manager import DataManager
+from src.models.base import PredictionResult
+from src.logic.result_sync import PendingIndex, ResultSync, normalize_team
+
+NOW = datetime(2026, 5, 18, 12, 0)
+
+
+class _FakeAPIFootball:
+    LEAGUE_IDS = {"La Liga": 140}
+
+
+class _FakeAPI:
+    """Devuelve partidos finalizados del rango pedido y registra cada llamada."""
+
+    api_football = _FakeAPIFootball()
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.range_calls, self.result_calls = [], []
+
+    def get_finished_fixtures(self, league_name, date_from, date_to):
+        self.range_calls.append((league_name, date_from, date_to))
+        return [f for f in self.fixtures if date_from <= f["date"][:10] <= date_to]
+
+    def get_match_results(self, ids):
+        self.result_calls.append(list(ids))
+        return {f["fixture_id"]: {
+            "home_score": f["home_score"], "away_score": f["away_score"],
+            "winner": "LOCAL" if f["home_score"] > f["away_score"] else "EMPATE",
+            "stats": {"corners": {"home": 5, "away": 4}, "cards": {"home_yellow": 2},
+                      "shots": {"home": 12, "away": 9}, "shots_on_target": {}},
+        } for f in self.fixtures if f["fixture_id"] in ids}
+
+
+def _fixture(fid, home, away, day, hour=20):
+    ts = int(datetime(2026, 5, day, hour).timestamp())
+    return {"fixture_id": fid, "home_team": home, "away_team": away, "timestamp": ts,
+            "date": f"2026-05-{day:02d}T{hour:02d}:00:00+00:00", "home_score": 2, "away_score": 1}
+
+
+def _study(db, mid, home, away, day):
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO matches VALUES (?,?,?,?,?,?)",
+                     (mid, f"2026-05-{day:02d}T21:00:00", "LaLiga EA Sports", home, away, "{}"))
+    db.save_prediction(PredictionResult(
+        match_id=mid, bpa_home=1.4, bpa_away=1.1, win_prob_home=0.5, draw_prob=0.27,
+        win_prob_away=0.23, total_goals_expected=2.5, both_teams_to_score_prob=0.5,
+        predicted_corners="8-11", predicted_cards="3-5", predicted_shots="18-24"))
+
+
+def test_pending_index_matches_names_and_dates():
+    index = PendingIndex([
+        {"match_id": "A", "home_team": "Real Betis", "away_team": "Sevilla FC", "date": "2026-05-12", "competition": ""},
+        {"match_id": "B", "home_team": "Club Atlético de Madrid", "away_team": "Girona", "date": "2026-05-13", "competition": ""},
+    ])
+    assert normalize_team("Club Atlético de Madrid") == "atletico madrid"
+    assert index.match("Betis", "Sevilla", "2026-05-12")["match_id"] == "A"
+    assert index.match("Atletico Madrid", "Girona FC", "2026-05-14")["match_id"] == "B"
+    assert index.match("Betis", "Sevilla", "2026-05-12") is None, "cada estudio se liquida una vez"
+    assert len(index) == 0
+
+
+def test_incremental_sync_settles_once_and_advances_mark():
+    db = DataManager(db_path=os.path.join(tempfile.mkdtemp(), "sync.db"))
+    _study(db, "BET_SEV", "Real Betis", "Sevilla", 12)
+    _study(db, "ATM_GIR", "Atlético de Madrid", "Girona", 16)
+    _study(db, "VAL_VIL", "Valencia", "Villarreal", 25)   # aún no jugado
+    api = _FakeAPI([_fixture(1, "Real Betis", "Sevilla FC", 12),
+                    _fixture(2, "Atletico Madrid", "Girona", 16),
+                    _fixture(3, "Osasuna", "Getafe", 17)])
+    sync = ResultSync(api_manager=api, db_manager=db)
+
+    report = sync.sync("La Liga", now=NOW)
+    print(f"Sync 1: {report}")
+    assert report["fetched"] == 3 and report["matched"] == 2 and report["settled"] == 2
+    assert api.range_calls == [("La Liga", "2026-05-11", "2026-05-18")]
+    assert api.result_calls == [[1, 2]], "estadísticas en bloque, una llamada"
+    assert report["mark_after"] == api.fixtures[-1]["timestamp"]
+    assert db.get_sync_mark("api_football", "La Liga") == report["mark_after"]
+    assert [s["match_id"] for s in db.get_pending_studies()] == ["VAL_VIL"]
+    assert db.get_market_stats()["1X2"]["total"] == 2
+
+    # Segunda ejecución: desde la marca, sin volver a liquidar nada
+    api.fixtures.append(_fixture(4, "Valencia CF", "Villarreal CF", 25))
+    later = datetime(2026, 5, 26, 9, 0)
+    report = sync.sync("La Liga", now=later)
+    print(f"Sync 2: {report}")
+    assert api.range_calls[-1] == ("La Liga", "2026-05-17", "2026-05-26")
+    assert report["fetched"] == 1 and report["settled"] == 1
+    assert db.get_pending_studies() == []
+    assert db.get_market_stats()["1X2"]["total"] == 3
+    assert sync.pending_leagues() == []
+
+
+def test_mark_stops_before_unsettled_match():
+    db = DataManager(db_path=os.path.join(tempfile.mkdtemp(), "sync_fail.db"))
+    _study(db, "BET_SEV", "Real Betis", "Sevilla", 12)
+    api = _FakeAPI([_fixture(1, "Real Betis", "Sevilla", 12), _fixture(2, "Osasuna", "Getafe", 14)])
+    api.get_match_results = lambda ids: {}
+    sync = ResultSync(api_manager=api, db_manager=db)
+    assert sync.pending_leagues() == ["La Liga"]
+    report = sync.sync("La Liga", now=NOW)
+    assert report["failed"] == 1 and report["settled"] == 0
+    assert report["mark_after"] == api.fixtures[0]["timestamp"] - 1
+    assert len(db.get_pending_studies()) == 1
+
+
+if __name__ == "__main__":
+    test_pending_index_matches_names_and_dates()
+    test_incremental_sync_settles_once_and_advances_mark()
+    test_mark_stops_before_unsettled_match()
+    print("OK")
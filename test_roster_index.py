@@ -0,0 +1,77 @@
+"""
+test_roster_index.py - Verifica el índice invertido de plantillas (src/data/roster_index.py):
+acentos, apellidos compartidos ambiguos, pesos IDF, lotes, caché por versión de
+plantilla y el uso desde match_roster_player.
+Ejecutar con: python test_roster_index.py
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.roster_index import RosterIndex, name_tokens, roster_index
+from src.models.base import Player, PlayerPosition, Team
+
+
+def _team(names):
+    players = [Player(id=f"p{i}", name=n, team_name="Test FC", position=PlayerPosition.DEFENDER)
+               for i, n in enumerate(names)]
+    return Team(name="Test FC", league="La Liga", players=players)
+
+
+ROSTER = ["Lisandro Martínez", "Lautaro Martínez", "Vinícius Júnior", "Frenkie de Jong", "Pedri"]
+
+
+def test_tokens_fold_accents_and_drop_particles():
+    assert name_tokens("Vinícius Jr.") == ["vinicius"]
+    assert name_tokens("F. de Jong") == ["jong"]
+    assert name_tokens("PEDRI") == ["pedri"]
+
+
+def test_shared_surname_is_ambiguous_but_first_name_resolves():
+    index = roster_index(_team(ROSTER))
+    assert index.match("Martínez") is None
+    assert index.match("MARTINEZ") is None
+    assert index.match("Lisandro Martinez") == "Lisandro Martínez"
+    assert index.match("Lautaro") == "Lautaro Martínez"
+    assert index.match("Vinicius Jr") == "Vinícius Júnior"
+    assert index.match("de Jong") == "Frenkie de Jong"
+    assert index.match("Pedri González") == "Pedri"
+    assert index.match("Jude Bellingham") is None
+    assert index.match_id("Lisandro Martinez") == "p0"
+
+
+def test_batch_resolve_and_matched():
+    index = roster_index(ROSTER)
+    got = index.resolve(["Pedri", "Martínez", "Lautaro Martinez", "Pedri"])
+    assert got == {"Pedri": "Pedri", "Martínez": None, "Lautaro Martinez": "Lautaro Martínez"}
+    assert index.matched(["Pedri", "pedri", "Nadie"]) == ["Pedri"]
+
+
+def test_index_cached_per_roster_version():
+    team = _team(ROSTER)
+    first = roster_index(team)
+    assert roster_index(_team(ROSTER)) is first
+    team.players.append(Player(id="p9", name="Lamine Yamal", team_name="Test FC",
+                               position=PlayerPosition.FORWARD))
+    second = roster_index(team)
+    assert second is not first and len(second) == len(first) + 1
+    assert second.match("Yamal") == "Lamine Yamal"
+    assert len(roster_index(None)) == 0 and isinstance(roster_index([]), RosterIndex)
+
+
+def test_match_roster_player_uses_index():
+    from src.logic.lineup_fetcher import match_roster_player
+    team = _team(ROSTER)
+    assert match_roster_player("Lisandro Martínez", team) == "Lisandro Martínez"
+    assert match_roster_player("Martínez", team) is None
+    assert match_roster_player("", team) is None
+    assert match_roster_player("Pedri", None) is None
+
+
+if __name__ == "__main__":
+    test_tokens_fold_accents_and_drop_particles()
+    test_shared_surname_is_ambiguous_but_first_name_resolves()
+    test_batch_resolve_and_matched()
+    test_index_cached_per_roster_version()
+    test_match_roster_player_uses_index()
+    print("OK")
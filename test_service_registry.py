@@ -0,0 +1,83 @@
+"""
+test_service_registry.py - Verifica el registro perezoso de servicios
+(src/services/registry.py) y las plantillas por liga de MockDataProvider.
+No necesita red ni Streamlit.
+Ejecutar con: python test_service_registry.py
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.services.registry import ServiceRegistry, build_app_registry
+from src.data.mock_provider import MockDataProvider
+
+
+class _Engine:
+    def __init__(self):
+        self.value = 42
+
+
+class _Consumer:
+    instances = 0
+
+    def __init__(self, engine):
+        _Consumer.instances += 1
+        self.engine = engine
+
+
+def test_services_are_built_on_first_use():
+    reg = ServiceRegistry(dev_reload=False)
+    reg.register("engine", _Engine)
+    reg.register("consumer", _Consumer, deps=("engine",))
+    proxy = reg.proxy("consumer")
+    assert _Consumer.instances == 0
+    assert not reg.is_loaded("consumer")
+
+    assert proxy.engine.value == 42
+    assert reg.get("consumer") is reg.get("consumer")
+    assert reg.get("consumer").engine is reg.get("engine")
+    assert _Consumer.instances == 1
+
+    t = reg.timings()
+    print(f"Tiempos: {t}")
+    assert t["consumer"]["loaded"] and t["consumer"]["init_s"] >= 0
+    assert t["engine"]["import_s"] is not None
+
+
+def test_string_targets_and_no_reload_by_default():
+    reg = build_app_registry(dev_reload=False)
+    assert not any(v["loaded"] for v in reg.timings().values())
+    validator = reg.get("validator")
+    assert type(validator).__name__ == "Validator"
+    assert reg.timings()["validator"]["loaded"]
+    assert not reg.is_loaded("predictor")
+    try:
+        reg.get("desconocido")
+        assert False, "debería fallar"
+    except KeyError:
+        pass
+
+
+def test_rosters_built_per_league_on_demand():
+    provider = MockDataProvider()
+    assert provider.teams_db.built_leagues() == []
+
+    la_liga = provider.get_teams_by_league("Primera Liga")
+    assert "Real Madrid" in la_liga and len(la_liga) == 20
+    assert provider.teams_db.built_leagues() == []
+
+    team = provider.get_team_data("Real Madrid")
+    assert team.league == "La Liga" and len(team.players) == 11
+    assert provider.teams_db.built_leagues() == ["La Liga"]
+    assert provider.get_team_data("Real Madrid") is team
+
+    dummy = provider.get_team_data("Equipo Inventado")
+    assert len(dummy.players) == 11
+    assert "Equipo Inventado" not in provider.teams_db
+
+
+if __name__ == "__main__":
+    test_services_are_built_on_first_use()
+    test_string_targets_and_no_reload_by_default()
+    test_rosters_built_per_league_on_demand()
+    print("OK")
@@ -0,0 +1,118 @@
+"""
+test_single_flight.py - Verifica la coalescencia de peticiones (src/data/single_flight.py):
+llamadas concurrentes idénticas comparten una sola ejecución en APIManager y en
+la cascada de MultiSourceFetcher, y el resultado queda en la caché.
+No necesita red.
+Ejecutar con: python test_single_flight.py
+"""
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.single_flight import SingleFlight
+
+
+def _concurrently(fn, n=8):
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return [f.result() for f in [pool.submit(fn) for _ in range(n)]]
+
+
+def test_group_shares_result_and_errors():
+    flights = SingleFlight("test")
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"ok": True}
+
+    results = _concurrently(lambda: flights.do("k", slow))
+    assert len(calls) == 1
+    assert all(r[0] is results[0][0] for r in results)
+    assert sum(1 for _, shared in results if shared) == 7
+    assert flights.inflight() == 0
+
+    def boom():
+        time.sleep(0.2)
+        raise ValueError("caída")
+
+    errors = []
+    def call():
+        try:
+            flights.do("k", boom)
+        except ValueError as e:
+            errors.append(e)
+    _concurrently(call, n=4)
+    assert len(errors) == 4 and flights.stats["errors"] == 1
+
+
+def test_api_manager_coalesces_and_caches():
+    from src.data.api_manager import APIManager
+
+    class _SlowAPIFootball:
+        calls = 0
+
+        def get_lineups(self, fixture_id):
+            _SlowAPIFootball.calls += 1
+            time.sleep(0.2)
+            return [{"team": {"name": "Betis"}, "formation": "4-3-3",
+                     "startXI": [{"player": {"name": "Isco"}}], "substitutes": []}]
+
+    mgr = APIManager()
+    mgr.api_football = _SlowAPIFootball()
+    results = _concurrently(lambda: mgr.get_lineups_real(424242))
+    assert _SlowAPIFootball.calls == 1
+    assert all(r["home"]["start_xi"] == ["Isco"] for r in results)
+    assert mgr.get_lineups_real(424242) is results[0]
+    assert _SlowAPIFootball.calls == 1
+
+
+def test_fetcher_cascade_coalesces():
+    from src.data.multi_source_fetcher import MultiSourceFetcher, _match_key
+
+    hits = []
+    def source():
+        hits.append(threading.get_ident())
+        time.sleep(0.2)
+        return {"name": "Gil Manzano"}
+
+    fetchers = [MultiSourceFetcher(race=False) for _ in range(6)]
+    key = _match_key("Real Betis", "Sevilla FC", "2026-05-12", "La Liga")
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futs = [pool.submit(f._run_cascade, "referee", [("A", source, False)], key) for f in fetchers]
+        results = [fut.result() for fut in futs]
+    assert len(hits) == 1
+    assert all(r == {"name": "Gil Manzano"} for r in results)
+    coalesced = [f for f in fetchers if f.last_trace.get("coalesced")]
+    assert len(coalesced) == 5 and all(f.last_trace["winner"] == "A" for f in fetchers)
+    assert len({id(r) for r in results}) == 6          # cada llamador modifica su propia copia
+
+
+def test_coalesced_callers_get_source_context():
+    from src.data.multi_source_fetcher import MultiSourceFetcher, _match_key
+
+    def cascade(fetcher, ctx):
+        def sofascore():
+            time.sleep(0.2)
+            ctx["sofa_link"] = "https://www.sofascore.com/evento"
+            return {"name": "Gil Manzano"}
+        return fetcher._run_cascade("referee", [("2-SofaScore", sofascore, False)],
+                                    key=_match_key("Girona", "Getafe", "2026-05-12", "La Liga"), ctx=ctx)
+
+    ctxs = [{} for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(cascade, [MultiSourceFetcher(race=False) for _ in ctxs], ctxs))
+    results[0]["verification_link"] = "modificado"
+    assert all(r == {"name": "Gil Manzano"} for r in results[1:])
+    assert all(c == {"sofa_link": "https://www.sofascore.com/evento"} for c in ctxs)
+
+
+if __name__ == "__main__":
+    test_group_shares_result_and_errors()
+    test_api_manager_coalesces_and_caches()
+    test_fetcher_cascade_coalesces()
+    test_coalesced_callers_get_source_context()
+    print("OK")
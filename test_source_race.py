@@ -0,0 +1,111 @@
+"""
+test_source_race.py - Verifica el modo race de MultiSourceFetcher:
+prioridad, deadline, fuentes diferidas y traza de tiempos por fuente.
+Usa fuentes simuladas, no necesita red.
+Ejecutar con: python test_source_race.py
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from src.data.multi_source_fetcher import MultiSourceFetcher
+
+
+def _source(value, delay=0.0, calls=None, name=None):
+    def fn():
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        if isinstance(value, Exception):
+            raise value
+        return value
+    return fn
+
+
+def test_race_prefers_priority_over_speed():
+    msf = MultiSourceFetcher(race=True, deadline=5.0)
+    sources = [
+        ("alta", _source({"name": "A"}, delay=0.3), False),
+        ("baja", _source({"name": "B"}, delay=0.0), False),
+    ]
+    result = msf._run_cascade("referee", sources)
+    print(f"Resultado: {result} | traza: {msf.last_trace}")
+    assert result == {"name": "A"}
+    assert msf.last_trace["winner"] == "alta"
+    assert msf.last_trace["sources"]["baja"]["status"] == "ok"
+
+
+def test_race_runs_sources_concurrently():
+    msf = MultiSourceFetcher(race=True, deadline=5.0)
+    sources = [
+        ("vacia1", _source(None, delay=0.4), False),
+        ("error", _source(RuntimeError("timeout simulado"), delay=0.4), False),
+        ("buena", _source({"name": "C"}, delay=0.4), False),
+    ]
+    t0 = time.perf_counter()
+    result = msf._run_cascade("lineup", sources)
+    elapsed = time.perf_counter() - t0
+    print(f"Resultado: {result} en {elapsed:.2f}s")
+    assert result == {"name": "C"}
+    assert elapsed < 1.0, "Las fuentes deberían ejecutarse en paralelo"
+    statuses = {k: v["status"] for k, v in msf.last_trace["sources"].items()}
+    assert statuses == {"vacia1": "empty", "error": "error", "buena": "ok"}
+
+
+def test_race_deadline_takes_best_available():
+    msf = MultiSourceFetcher(race=True, deadline=0.3)
+    sources = [
+        ("lenta", _source({"name": "L"}, delay=2.0), False),
+        ("rapida", _source({"name": "R"}, delay=0.0), False),
+    ]
+    t0 = time.perf_counter()
+    result = msf._run_cascade("referee", sources)
+    elapsed = time.perf_counter() - t0
+    print(f"Resultado: {result} en {elapsed:.2f}s | traza: {msf.last_trace}")
+    assert result == {"name": "R"}
+    assert elapsed < 1.0
+    assert msf.last_trace["sources"]["lenta"]["status"] == "timeout"
+
+
+def test_deferred_source_only_after_higher_priority_misses():
+    calls = []
+    msf = MultiSourceFetcher(race=True, deadline=5.0)
+    hit = [
+        ("oficial", _source({"name": "O"}, calls=calls, name="oficial"), False),
+        ("pago", _source({"name": "P"}, calls=calls, name="pago"), True),
+    ]
+    assert msf._run_cascade("referee", hit) == {"name": "O"}
+    assert "pago" not in calls
+    assert msf.last_trace["sources"]["pago"]["status"] == "skipped"
+
+    miss = [
+        ("oficial", _source(None), False),
+        ("pago", _source({"name": "P"}), True),
+        ("scraper", _source({"name": "S"}), False),
+    ]
+    assert msf._run_cascade("referee", miss) == {"name": "P"}
+    print(f"Historial de trazas: {len(msf.traces)}")
+
+
+def test_sequential_mode_matches_race():
+    sources = [
+        ("a", _source(None), False),
+        ("b", _source({"name": "B"}), False),
+        ("c", _source({"name": "C"}), False),
+    ]
+    seq = MultiSourceFetcher(race=False)
+    assert seq._run_cascade("lineup", sources) == {"name": "B"}
+    assert seq.last_trace["mode"] == "sequential"
+    assert seq.last_trace["sources"]["c"]["status"] == "skipped"
+    race = MultiSourceFetcher(race=True)
+    assert race._run_cascade("lineup", sources) == {"name": "B"}
+
+
+if __name__ == "__main__":
+    test_race_prefers_priority_over_speed()
+    test_race_runs_sources_concurrently()
+    test_race_deadline_takes_best_available()
+    test_deferred_source_only_after_higher_priority_misses()
+    test_sequential_mode_matches_race()
+    print("OK")